@@ -1,8 +1,14 @@
+import os
 import random
+import sys
 from fractions import Fraction
 
+# Gemeinsame Ein- und Ausgabe aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from EinAusgabe import KONSOLE
+
 def bruch():
-    zaehler = random.randint(1, 10)
+    zaehler = random.randint(1, 9)  # mit 10 bliebe kein Nenner > Zaehler
     nenner = random.randint(zaehler + 1, 10)
     fraction = Fraction(zaehler, nenner)
     return fraction
@@ -29,8 +35,9 @@ def parse_fraction(fraction_str):
     except ValueError:
         return None
 
-def main():
-    print("Willkommen beim Bruchrechnen!")
+def main(ea=None):
+    ea = ea or KONSOLE
+    ea.ausgabe("Willkommen beim Bruchrechnen!")
     score = 0
     num_Frage = 5
 
@@ -41,23 +48,23 @@ def main():
         fraction2 = bruch()
         operator = random.choice(operators)
 
-        print(f"Was ergibt {fraction1} {operator} {fraction2}?")
-        user_input = input("Deine Antwort: ")
+        ea.ausgabe(f"Was ergibt {fraction1} {operator} {fraction2}?")
+        user_input = ea.eingabe("Deine Antwort: ")
 
         user_fraction = parse_fraction(user_input)
         if user_fraction is not None:
             user_antwort_decimal, user_antwort_fraction = antwort_berechnen(fraction1, fraction2, operator)
             if user_fraction == user_antwort_fraction:
-                print("Super! Richtig!")
+                ea.ausgabe("Super! Richtig!")
                 score += 1
             else:
-                print(f"Falsch! Die richtige Antwort ist {user_antwort_decimal} oder {user_antwort_fraction}.")
+                ea.ausgabe(f"Falsch! Die richtige Antwort ist {user_antwort_decimal} oder {user_antwort_fraction}.")
         else:
-            print("Ungueltige Eingabe. Bitte geben Sie eine gueltige Bruch- oder Dezimalzahl ein.")
+            ea.ausgabe("Ungueltige Eingabe. Bitte geben Sie eine gueltige Bruch- oder Dezimalzahl ein.")
 
-        print()
+        ea.ausgabe()
 
-    print(f"Quiz abgeschlossen! Du hast {score}/{num_Frage} richtig! Gut gemacht!")
+    ea.ausgabe(f"Quiz abgeschlossen! Du hast {score}/{num_Frage} richtig! Gut gemacht!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,466 @@
+"""
+Bruchrechnen in großen Mengen: Ergebnistabelle, Batch-Generator und Massenbewertung.
+
+Brüche werden als zwei ganzzahlige NumPy-Arrays (Zähler, Nenner) dargestellt, gekürzt
+mit np.gcd und mit dem Vorzeichen im Zähler - so sind zwei gekürzte Brüche genau dann
+gleich, wenn Zähler und Nenner gleich sind. Für den kleinen Zahlenbereich von bruch()
+(echte Brüche mit Nenner bis 10) liegen alle Ergebnisse (a/b, op, c/d) vorberechnet in
+einer Tabelle; für größere Bereiche wird blockweise gerechnet.
+
+    >>> generator = Bruchgenerator(seed=1)
+    >>> aufgaben = generator.erzeugen(1000000)
+    >>> richtig = bewerten(antworten, aufgaben.ergebnis_zaehler, aufgaben.ergebnis_nenner)
+
+Aufruf (Vergleich mit dem bisherigen Weg über Fraction):
+    python Bruchtabelle.py [--anzahl 1000000] [--max-nenner 10]
+"""
+import argparse
+import math
+import random
+import re
+import time
+from fractions import Fraction
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+OPERATIONEN = ("+", "-", "*", "/")
+PLUS, MINUS, MAL, GETEILT = range(4)
+
+# Wie in bruch(): Zähler 1 bis MAX_NENNER - 1, Nenner größer als der Zähler
+MAX_NENNER = 10
+
+# Bis zu so vielen Einträgen wird eine Ergebnistabelle angelegt (8 Byte je Zähler und Nenner)
+TABELLEN_GRENZE = 4000000
+
+
+def kuerzen(zaehler: np.ndarray, nenner: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kürzt Brüche elementweise und zieht das Vorzeichen in den Zähler (Nenner > 0).
+    Ein Nenner 0 (Division durch 0) bleibt 0 und muss vom Aufrufer ausgeschlossen werden.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (Zähler, Nenner) gekürzt
+    """
+    teiler = np.gcd(zaehler, nenner)
+    teiler[teiler == 0] = 1
+    vorzeichen = np.where(nenner < 0, -1, 1)
+    return zaehler // teiler * vorzeichen, nenner // teiler * vorzeichen
+
+
+def verknuepfen(zaehler_1: np.ndarray, nenner_1: np.ndarray, operation: np.ndarray,
+                zaehler_2: np.ndarray, nenner_2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rechnet (zaehler_1/nenner_1) OPERATIONEN[operation] (zaehler_2/nenner_2) elementweise.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Das gekürzte Ergebnis (Nenner 0 bei Division durch 0)
+    """
+    kreuz_1 = zaehler_1 * nenner_2
+    kreuz_2 = zaehler_2 * nenner_1
+    produkt_nenner = nenner_1 * nenner_2
+    zaehler = np.select([operation == PLUS, operation == MINUS, operation == MAL],
+                        [kreuz_1 + kreuz_2, kreuz_1 - kreuz_2, zaehler_1 * zaehler_2], kreuz_1)
+    nenner = np.where(operation == GETEILT, kreuz_2, produkt_nenner)
+    return kuerzen(zaehler, nenner)
+
+
+def als_text(zaehler: int, nenner: int) -> str:
+    """
+    Ein Bruch wie str(Fraction): "3/4", bei Nenner 1 nur der Zähler.
+    """
+    return str(zaehler) if nenner == 1 else f"{zaehler}/{nenner}"
+
+
+def operanden(max_nenner: int = MAX_NENNER) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Alle Operanden von bruch() als (Zähler, Nenner),
+                                       also 1 <= Zähler < Nenner <= max_nenner (ungekürzt)
+    """
+    zaehler, nenner = np.triu_indices(max_nenner + 1, k=1)
+    echt = zaehler >= 1
+    return zaehler[echt].astype(np.int64), nenner[echt].astype(np.int64)
+
+
+def tabellen_groesse(max_nenner: int) -> int:
+    """
+    Returns:
+        int: Anzahl der Einträge einer Ergebnistabelle für max_nenner
+    """
+    anzahl_operanden = max_nenner * (max_nenner - 1) // 2
+    return anzahl_operanden ** 2 * len(OPERATIONEN)
+
+
+class Ergebnistabelle:
+    """
+    Alle Ergebnisse (a/b, op, c/d) für die Operanden von bruch(), gekürzt.
+    zaehler[i, op, j] / nenner[i, op, j] ist das Ergebnis von Operand i op Operand j.
+    """
+
+    def __init__(self, max_nenner: int = MAX_NENNER):
+        self.max_nenner = max_nenner
+        self.operand_zaehler, self.operand_nenner = operanden(max_nenner)
+        anzahl = len(self.operand_zaehler)
+
+        # Operand (Zähler, Nenner) -> Index in der Tabelle
+        self.index = np.full((max_nenner + 1, max_nenner + 1), -1, dtype=np.int64)
+        self.index[self.operand_zaehler, self.operand_nenner] = np.arange(anzahl)
+
+        links, operation, rechts = np.meshgrid(np.arange(anzahl), np.arange(len(OPERATIONEN)),
+                                               np.arange(anzahl), indexing="ij")
+        zaehler, nenner = verknuepfen(self.operand_zaehler[links], self.operand_nenner[links], operation,
+                                      self.operand_zaehler[rechts], self.operand_nenner[rechts])
+        self.zaehler = zaehler
+        self.nenner = nenner
+
+    def __len__(self) -> int:
+        return self.zaehler.size
+
+    def nachschlagen(self, zaehler_1, nenner_1, operation, zaehler_2, nenner_2) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Schlägt die Ergebnisse für Arrays von Operanden nach (alle Operanden müssen echte
+        Brüche mit Nenner bis max_nenner sein).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Zähler, Nenner) der Ergebnisse
+        """
+        links = self.index[zaehler_1, nenner_1]
+        rechts = self.index[zaehler_2, nenner_2]
+        return self.zaehler[links, operation, rechts], self.nenner[links, operation, rechts]
+
+
+class Bruchaufgaben(NamedTuple):
+    """
+    Ein Block von Aufgaben als Spalten: (zaehler_1/nenner_1) op (zaehler_2/nenner_2)
+    = ergebnis_zaehler/ergebnis_nenner. Die Operanden sind wie in bruch() ungekürzt gezogen.
+    """
+    zaehler_1: np.ndarray
+    nenner_1: np.ndarray
+    operation: np.ndarray
+    zaehler_2: np.ndarray
+    nenner_2: np.ndarray
+    ergebnis_zaehler: np.ndarray
+    ergebnis_nenner: np.ndarray
+
+    @property
+    def anzahl(self) -> int:
+        return len(self.operation)
+
+    def zeilen(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yields:
+            Tuple[str, str]: (frage, antwort) wie im Quiz, z.B. ("1/2 + 1/3", "5/6")
+        """
+        zaehler_1, nenner_1 = kuerzen(self.zaehler_1, self.nenner_1)
+        zaehler_2, nenner_2 = kuerzen(self.zaehler_2, self.nenner_2)
+        for a, b, op, c, d, e, f in zip(zaehler_1.tolist(), nenner_1.tolist(), self.operation.tolist(),
+                                        zaehler_2.tolist(), nenner_2.tolist(),
+                                        self.ergebnis_zaehler.tolist(), self.ergebnis_nenner.tolist()):
+            yield f"{als_text(a, b)} {OPERATIONEN[op]} {als_text(c, d)}", als_text(e, f)
+
+
+class Bruchgenerator:
+    """
+    Erzeugt Bruchaufgaben blockweise. Die Operanden werden wie in bruch() gezogen
+    (erst der Zähler, dann ein größerer Nenner); die Ergebnisse kommen aus der
+    Ergebnistabelle oder werden für größere Bereiche vektorisiert berechnet.
+    """
+
+    # Tabellen je max_nenner, damit sie nur einmal berechnet werden
+    _tabellen: Dict[int, Ergebnistabelle] = {}
+
+    def __init__(self, max_nenner: int = MAX_NENNER, mischung: Optional[Dict[str, float]] = None,
+                 tabelle: Optional[bool] = None, seed: Optional[int] = None):
+        """
+        Args:
+            max_nenner: Größter Nenner (Zähler 1 bis max_nenner - 1)
+            mischung: Gewicht je Rechenzeichen (Standard: alle vier gleich oft)
+            tabelle: True/False erzwingt bzw. verbietet die Ergebnistabelle,
+                     None = Tabelle bis TABELLEN_GRENZE Einträge
+            seed: Startwert für reproduzierbare Aufgaben
+        """
+        if max_nenner < 2:
+            raise ValueError("max_nenner muss mindestens 2 sein")
+        if mischung is None:
+            mischung = dict.fromkeys(OPERATIONEN, 1)
+        unbekannt = set(mischung) - set(OPERATIONEN)
+        if unbekannt:
+            raise ValueError(f"Unbekannte Rechenart: {', '.join(sorted(unbekannt))}")
+        gewichte = np.array([mischung.get(zeichen, 0) for zeichen in OPERATIONEN], dtype=np.float64)
+        if gewichte.min() < 0 or gewichte.sum() <= 0:
+            raise ValueError("Die Mischung braucht mindestens ein positives Gewicht")
+
+        self.max_nenner = max_nenner
+        self.anteile = gewichte / gewichte.sum()
+        self.rng = np.random.default_rng(seed)
+
+        if tabelle is None:
+            tabelle = tabellen_groesse(max_nenner) <= TABELLEN_GRENZE
+        self.tabelle = self.ergebnistabelle(max_nenner) if tabelle else None
+
+    @classmethod
+    def ergebnistabelle(cls, max_nenner: int = MAX_NENNER) -> Ergebnistabelle:
+        tabelle = cls._tabellen.get(max_nenner)
+        if tabelle is None:
+            tabelle = cls._tabellen[max_nenner] = Ergebnistabelle(max_nenner)
+        return tabelle
+
+    def _bruch(self, anzahl: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Private Methode zur internen Verwendung.
+        Wie bruch(): Zähler gleichverteilt, dann ein Nenner zwischen Zähler + 1 und max_nenner.
+        """
+        zaehler = self.rng.integers(1, self.max_nenner - 1, size=anzahl, endpoint=True)
+        nenner = self.rng.integers(zaehler + 1, self.max_nenner, endpoint=True)
+        return zaehler, nenner
+
+    def erzeugen(self, anzahl: int) -> Bruchaufgaben:
+        """
+        Erzeugt anzahl Aufgaben mit Ergebnis (Division durch 0 kommt nicht vor, weil
+        alle Operanden positiv sind).
+
+        Returns:
+            Bruchaufgaben: Der Block
+        """
+        zaehler_1, nenner_1 = self._bruch(anzahl)
+        zaehler_2, nenner_2 = self._bruch(anzahl)
+        operation = self.rng.choice(len(OPERATIONEN), size=anzahl, p=self.anteile).astype(np.int8)
+        if self.tabelle is not None:
+            ergebnis = self.tabelle.nachschlagen(zaehler_1, nenner_1, operation, zaehler_2, nenner_2)
+        else:
+            ergebnis = verknuepfen(zaehler_1, nenner_1, operation, zaehler_2, nenner_2)
+        return Bruchaufgaben(zaehler_1, nenner_1, operation, zaehler_2, nenner_2, *ergebnis)
+
+    def bloecke(self, anzahl: int, blockgroesse: int = 100000) -> Iterator[Bruchaufgaben]:
+        """
+        Yields:
+            Bruchaufgaben: Blöcke mit höchstens blockgroesse Aufgaben
+        """
+        while anzahl > 0:
+            block = self.erzeugen(min(anzahl, blockgroesse))
+            anzahl -= block.anzahl
+            yield block
+
+
+# Platzhalter für ungültige Antworten in antworten_parsen (Nenner 0)
+UNGUELTIG = (0, 0)
+
+# Größter Betrag von Zähler und Nenner einer gelesenen Zahl. Größere (z.B. "0,333333333333333333333")
+# passen nicht in int64 und gelten als ungültig; so bleiben auch die Ergebnisse der Aufgaben
+# in int64 (Produkte zweier Werte unter 2^62)
+GROESSTER_WERT = 2 ** 31 - 1
+
+
+@lru_cache(maxsize=65536)
+def antwort_parsen(antwort: str) -> Optional[Tuple[int, int]]:
+    """
+    Eine Antwort als (Zähler, Nenner), ungekürzt; None wenn sie keine Zahl ist.
+    Ganze Zahlen, "a/b" und gemischte Zahlen ("1 1/2", "-2 3/4") ohne Umweg über
+    Fraction, alles andere (z.B. "0.75", auch mit Komma "0,75") wie parse_fraction über
+    Fraction. Bei vielen Antworten wiederholen sich die Eingaben, deshalb wird
+    zwischengespeichert. Zähler oder Nenner über GROESSTER_WERT (auch gekürzt) ergeben None.
+    """
+    bruch = _bruch_lesen(antwort)
+    if bruch is None:
+        return None
+    zaehler, nenner = bruch
+    if abs(zaehler) > GROESSTER_WERT or nenner > GROESSTER_WERT:
+        teiler = math.gcd(zaehler, nenner)
+        zaehler, nenner = zaehler // teiler, nenner // teiler
+        if abs(zaehler) > GROESSTER_WERT or nenner > GROESSTER_WERT:
+            return None
+    return zaehler, nenner
+
+
+def _bruch_lesen(antwort: str) -> Optional[Tuple[int, int]]:
+    """
+    Private Methode zur internen Verwendung.
+    antwort_parsen ohne Begrenzung (Python-Ganzzahlen beliebiger Größe).
+    """
+    text = antwort.strip().replace(",", ".")
+    zaehler, strich, nenner = text.partition("/")
+    try:
+        if not strich:
+            return int(text), 1
+        nenner = int(nenner)
+        ganz, _, zaehler = zaehler.strip().rpartition(" ")
+        zaehler = int(zaehler)
+        if nenner != 0 and not ganz:
+            return (zaehler, nenner) if nenner > 0 else (-zaehler, -nenner)
+        if nenner > 0 and zaehler >= 0:
+            # Gemischte Zahl: das Vorzeichen der ganzen Zahl gilt für den ganzen Bruch
+            vorzeichen = -1 if ganz.lstrip().startswith("-") else 1
+            return vorzeichen * (abs(int(ganz)) * nenner + zaehler), nenner
+    except ValueError:
+        pass
+    try:
+        bruch = Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return bruch.numerator, bruch.denominator
+
+
+# Rechenzeichen in Aufgabentexten (auch die handschriftlichen Varianten)
+RECHENZEICHEN = {"+": PLUS, "-": MINUS, "−": MINUS, "*": MAL, "×": MAL, "·": MAL,
+                 "/": GETEILT, ":": GETEILT, "÷": GETEILT}
+
+_AUFGABE = re.compile(r"^\s*(-?[\d.,/]+)\s*([-+*/:−×·÷])\s*(-?[\d.,/]+)\s*$")
+
+
+@lru_cache(maxsize=65536)
+def aufgabe_parsen(aufgabe: str) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    Eine Aufgabe wie "1/2 + 1/3", "17 * 4" oder "3:4" als
+    (zaehler_1, nenner_1, operation, zaehler_2, nenner_2); None wenn sie nicht lesbar ist.
+    Kopfrechenaufgaben sind damit Bruchaufgaben mit Nenner 1. Ein "=" oder "?" am Ende
+    wird ignoriert.
+    """
+    text = aufgabe.strip().rstrip("=?").strip()
+    teile = text.split()
+    if len(teile) != 3 or teile[1] not in RECHENZEICHEN:
+        treffer = _AUFGABE.match(text)
+        if treffer is None:
+            return None
+        teile = treffer.groups()
+    links = antwort_parsen(teile[0])
+    rechts = antwort_parsen(teile[2])
+    if links is None or rechts is None:
+        return None
+    return links[0], links[1], RECHENZEICHEN[teile[1]], rechts[0], rechts[1]
+
+
+def antworten_parsen(antworten: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        Tuple: (Zähler, Nenner, gültig) als Arrays; ungültige Antworten haben 0/1
+    """
+    geparst = [bruch or UNGUELTIG for bruch in map(antwort_parsen, antworten)]
+    paare = np.fromiter(chain.from_iterable(geparst), dtype=np.int64, count=2 * len(geparst)).reshape(-1, 2)
+    zaehler, nenner = paare[:, 0], paare[:, 1]
+    gueltig = nenner != 0
+    return zaehler, np.where(gueltig, nenner, 1), gueltig
+
+
+def gleich(zaehler_1: np.ndarray, nenner_1: np.ndarray, zaehler_2: np.ndarray,
+           nenner_2: np.ndarray) -> np.ndarray:
+    """
+    Vergleicht Brüche elementweise über Kreuz (a/b == c/d genau dann wenn a*d == c*b).
+    Zeilen, deren Produkte int64 überschreiten könnten (ein Wert über GROESSTER_WERT),
+    werden einzeln mit Python-Ganzzahlen verglichen.
+
+    Returns:
+        np.ndarray: True je gleichem Paar
+    """
+    with np.errstate(over="ignore"):
+        ergebnis = zaehler_1 * nenner_2 == zaehler_2 * nenner_1
+    gross = np.flatnonzero((np.abs(zaehler_1) > GROESSTER_WERT) | (nenner_1 > GROESSTER_WERT)
+                           | (np.abs(zaehler_2) > GROESSTER_WERT) | (nenner_2 > GROESSTER_WERT))
+    for i in gross.tolist():
+        ergebnis[i] = int(zaehler_1[i]) * int(nenner_2[i]) == int(zaehler_2[i]) * int(nenner_1[i])
+    return ergebnis
+
+
+def bewerten(antworten: Sequence[str], ergebnis_zaehler: np.ndarray,
+             ergebnis_nenner: np.ndarray) -> np.ndarray:
+    """
+    Bewertet viele Antworten auf einmal gegen die erwarteten (gekürzten) Ergebnisse.
+    Verglichen wird über Kreuz (a/b == c/d genau dann wenn a*d == c*b), die Antworten
+    müssen also nicht gekürzt sein: "2/4" und "0.5" sind richtig für 1/2.
+
+    Returns:
+        np.ndarray: True je richtiger Antwort (ungültige Eingaben sind falsch)
+    """
+    zaehler, nenner, gueltig = antworten_parsen(antworten)
+    return gueltig & gleich(zaehler, nenner, ergebnis_zaehler, ergebnis_nenner)
+
+
+def _benchmark(anzahl: int, max_nenner: int):
+    """
+    Private Methode zur internen Verwendung.
+    Vergleicht bruch()/antwort_berechnen und Fraction-Vergleich mit Tabelle, Generator und bewerten.
+    """
+    from Bruchrechnen import antwort_berechnen, bruch, parse_fraction
+
+    def zeit(funktion):
+        start = time.perf_counter()
+        ergebnis = funktion()
+        return time.perf_counter() - start, ergebnis
+
+    mit_tabelle = tabellen_groesse(max_nenner) <= TABELLEN_GRENZE
+    if mit_tabelle:
+        start = time.perf_counter()
+        tabelle = Ergebnistabelle(max_nenner)
+        print(f"Ergebnistabelle: {len(tabelle)} Einträge in {(time.perf_counter() - start) * 1000:.1f}ms")
+    else:
+        print(f"Keine Ergebnistabelle ({tabellen_groesse(max_nenner)} Einträge > {TABELLEN_GRENZE})")
+
+    random.seed(1)
+    operatoren = list(OPERATIONEN)
+
+    def fraction_weg(anzahl):
+        aufgaben = []
+        for _ in range(anzahl):
+            bruch_1, bruch_2, operator = bruch(), bruch(), random.choice(operatoren)
+            aufgaben.append((bruch_1, operator, bruch_2, antwort_berechnen(bruch_1, bruch_2, operator)[1]))
+        return aufgaben
+
+    # Der Weg über Fraction ist langsam: mit höchstens 200000 Aufgaben messen und hochrechnen
+    anzahl_fraction = min(anzahl, 200000)
+    faktor = anzahl / anzahl_fraction
+    dauer_fraction, fraction_aufgaben = zeit(lambda: fraction_weg(anzahl_fraction))
+
+    dauer_rechnen, aufgaben = zeit(lambda: Bruchgenerator(max_nenner, tabelle=False, seed=1).erzeugen(anzahl))
+    if mit_tabelle:
+        dauer_tabelle, _ = zeit(lambda: Bruchgenerator(max_nenner, tabelle=True, seed=1).erzeugen(anzahl))
+
+    # Antworten: 70% richtig (teils ungekürzt oder als Dezimalzahl), der Rest um 1 daneben
+    zufall = random.Random(2)
+    antworten = []
+    for (_, antwort), zaehler, nenner in zip(aufgaben.zeilen(), aufgaben.ergebnis_zaehler.tolist(),
+                                             aufgaben.ergebnis_nenner.tolist()):
+        wurf = zufall.random()
+        if wurf < 0.5:
+            antworten.append(antwort)
+        elif wurf < 0.6:
+            antworten.append(f"{zaehler * 2}/{nenner * 2}")
+        elif wurf < 0.7 and nenner in (1, 2, 4, 5, 8, 10):
+            antworten.append(str(zaehler / nenner))
+        else:
+            antworten.append(als_text(zaehler + nenner, nenner))
+
+    def fraction_bewerten():
+        return [parse_fraction(antwort) == Fraction(zaehler, nenner) for antwort, zaehler, nenner
+                in zip(antworten[:anzahl_fraction], aufgaben.ergebnis_zaehler[:anzahl_fraction].tolist(),
+                       aufgaben.ergebnis_nenner[:anzahl_fraction].tolist())]
+
+    dauer_fraction_bewerten, erwartet = zeit(fraction_bewerten)
+    dauer_bewerten, richtig = zeit(lambda: bewerten(antworten, aufgaben.ergebnis_zaehler, aufgaben.ergebnis_nenner))
+    assert richtig[:anzahl_fraction].tolist() == erwartet
+
+    # Stichprobe: Tabelle und Fraction rechnen gleich (die Operanden von bruch() liegen in der Tabelle)
+    for bruch_1, operator, bruch_2, ergebnis in fraction_aufgaben[:10000] if mit_tabelle and max_nenner >= MAX_NENNER else []:
+        zaehler, nenner = tabelle.nachschlagen(bruch_1.numerator, bruch_1.denominator, OPERATIONEN.index(operator),
+                                               bruch_2.numerator, bruch_2.denominator)
+        assert Fraction(int(zaehler), int(nenner)) == ergebnis
+
+    print(f"{anzahl} Aufgaben erzeugen:")
+    print(f"  bruch() + antwort_berechnen   {dauer_fraction * faktor:8.2f}s"
+          f"{' (hochgerechnet)' if faktor > 1 else ''}")
+    if mit_tabelle:
+        print(f"  Bruchgenerator mit Tabelle    {dauer_tabelle:8.3f}s")
+    print(f"  Bruchgenerator ohne Tabelle   {dauer_rechnen:8.3f}s")
+    print(f"{anzahl} Antworten bewerten ({richtig.mean():.1%} richtig):")
+    print(f"  parse_fraction + Fraction ==  {dauer_fraction_bewerten * faktor:8.2f}s"
+          f"{' (hochgerechnet)' if faktor > 1 else ''}")
+    print(f"  bewerten                      {dauer_bewerten:8.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bruchrechnen: Tabelle und Generator gegen Fraction")
+    parser.add_argument("--anzahl", type=int, default=1000000)
+    parser.add_argument("--max-nenner", type=int, default=MAX_NENNER)
+    argumente = parser.parse_args()
+    _benchmark(argumente.anzahl, argumente.max_nenner)
@@ -0,0 +1,362 @@
+"""
+Korrigiert viele Antwortbögen für Kopfrechnen und Bruchrechnen auf einmal.
+
+Eingabe ist eine CSV-, TSV- oder JSONL-Datei mit einem Datensatz pro Antwort
+(Spalten schueler, aufgabe, antwort), z.B.
+
+    schueler,aufgabe,antwort
+    Anna,17 * 4,68
+    Anna,1/2 + 1/3,5/6
+    Ben,3/4 - 1/2,"0,25"
+
+Die Datei wird zeilenweise in Blöcken gelesen; Aufgaben und Antworten werden über die
+zwischengespeicherten Parser aus Bruchtabelle gelesen (ganze Zahlen, Dezimalzahlen,
+Brüche, gemischte Zahlen), das erwartete Ergebnis und der Vergleich laufen vektorisiert
+über den ganzen Block. Gespeichert wird nur eine Zeile pro Schüler, der Speicherbedarf
+hängt also nicht von der Anzahl der Antworten ab. Große Dateien werden in Abschnitte
+zerlegt und von mehreren Prozessen gleichzeitig korrigiert.
+
+Aufruf:
+    python Massenkorrektur.py antworten.csv auswertung.csv [--prozesse 4] [--stellen 2]
+    python Massenkorrektur.py --testdaten 1000000 antworten.csv auswertung.csv
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Bruchtabelle import UNGUELTIG, Bruchgenerator, als_text, antwort_parsen, aufgabe_parsen, gleich, verknuepfen
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from Datenquellen import schreibe_datei
+
+# Spaltennamen der Eingabe (schueler, aufgabe, antwort)
+EINGABE_SPALTEN = ("schueler", "aufgabe", "antwort")
+
+# Spalten der Auswertung
+AUSWERTUNG_SPALTEN = ("schueler", "anzahl", "richtig", "falsch", "ungueltig", "quote")
+
+# Datensätze pro vektorisiertem Block (Testdaten) bzw. Bytes pro gelesenem Block
+BLOCKGROESSE = 65536
+LESEPUFFER = 2 * 1024 * 1024
+
+# Ab dieser Dateigröße (Bytes) wird auf mehrere Prozesse verteilt
+PROZESS_GRENZE = 16 * 1024 * 1024
+
+# Platzhalter für nicht lesbare Aufgaben (Nenner 0)
+KEINE_AUFGABE = (0, 0, 0, 0, 0)
+
+
+class Auswertung:
+    """
+    Zähler pro Schüler: Anzahl Antworten, davon richtig und davon nicht lesbar
+    (keine Zahl oder Aufgabe nicht lesbar). Mehrere Auswertungen lassen sich
+    zusammenführen (siehe zusammenfuehren), z.B. aus mehreren Prozessen.
+    """
+
+    def __init__(self):
+        self.namen: List[str] = []
+        self.index: Dict[str, int] = {}
+        # Spalten: anzahl, richtig, ungueltig
+        self.zaehler = np.zeros((0, 3), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.namen)
+
+    def ids(self, schueler: Sequence[str]) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Die Nummer jedes Schülers (neue Schüler werden angelegt)
+        """
+        index = self.index
+        namen = self.namen
+        ids = np.empty(len(schueler), dtype=np.int64)
+        for i, name in enumerate(schueler):
+            nummer = index.get(name)
+            if nummer is None:
+                nummer = index[name] = len(namen)
+                namen.append(name)
+            ids[i] = nummer
+        return ids
+
+    def hinzufuegen(self, ids: np.ndarray, richtig: np.ndarray, ungueltig: np.ndarray):
+        """
+        Zählt einen korrigierten Block (je ein Eintrag pro Antwort) dazu.
+        """
+        anzahl = len(self.namen)
+        if anzahl > len(self.zaehler):
+            neu = np.zeros((max(anzahl, 2 * len(self.zaehler)), 3), dtype=np.int64)
+            neu[:len(self.zaehler)] = self.zaehler
+            self.zaehler = neu
+        self.zaehler[:anzahl, 0] += np.bincount(ids, minlength=anzahl)
+        self.zaehler[:anzahl, 1] += np.bincount(ids, weights=richtig, minlength=anzahl).astype(np.int64)
+        self.zaehler[:anzahl, 2] += np.bincount(ids, weights=ungueltig, minlength=anzahl).astype(np.int64)
+
+    def zusammenfuehren(self, andere: "Auswertung"):
+        if len(andere) == 0:
+            return
+        ids = self.ids(andere.namen)
+        anzahl = len(self.namen)
+        if anzahl > len(self.zaehler):
+            neu = np.zeros((anzahl, 3), dtype=np.int64)
+            neu[:len(self.zaehler)] = self.zaehler
+            self.zaehler = neu
+        np.add.at(self.zaehler, ids, andere.zaehler[:len(andere)])
+
+    def zeilen(self) -> Iterator[Tuple[str, int, int, int, int, float]]:
+        """
+        Yields:
+            Tuple: (schueler, anzahl, richtig, falsch, ungueltig, quote) nach Namen sortiert
+        """
+        for name in sorted(self.namen):
+            anzahl, richtig, ungueltig = self.zaehler[self.index[name]].tolist()
+            yield name, anzahl, richtig, anzahl - richtig - ungueltig, ungueltig, round(richtig / anzahl, 4)
+
+
+def block_korrigieren(aufgaben: Sequence[str], antworten: Sequence[str],
+                      stellen: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Korrigiert einen Block von Antworten.
+
+    Args:
+        aufgaben: Aufgabentexte ("17 * 4", "1/2 + 1/3", ...)
+        antworten: Die Antworten dazu
+        stellen: Wenn angegeben, zählen Dezimalantworten als richtig, die auf so viele
+                 Nachkommastellen gerundet dem Ergebnis entsprechen (z.B. 0.33 für 1/3)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (richtig, ungueltig) je Antwort
+    """
+    anzahl = len(aufgaben)
+    aufgabe = np.fromiter(chain.from_iterable(a or KEINE_AUFGABE for a in map(aufgabe_parsen, aufgaben)),
+                          dtype=np.int64, count=5 * anzahl).reshape(-1, 5)
+    antwort = np.fromiter(chain.from_iterable(a or UNGUELTIG for a in map(antwort_parsen, antworten)),
+                          dtype=np.int64, count=2 * anzahl).reshape(-1, 2)
+
+    ergebnis_zaehler, ergebnis_nenner = verknuepfen(aufgabe[:, 0], aufgabe[:, 1], aufgabe[:, 2],
+                                                    aufgabe[:, 3], aufgabe[:, 4])
+    zaehler, nenner = antwort[:, 0], antwort[:, 1]
+    # Nicht lesbare Aufgaben und Divisionen durch 0 haben den Nenner 0
+    gueltig = (nenner != 0) & (ergebnis_nenner != 0)
+    # Zu große Zahlen liest antwort_parsen nicht (ungültig); die Ergebnisse der übrigen
+    # Aufgaben passen in int64, große werden von gleich() genau verglichen
+    richtig = gueltig & gleich(zaehler, nenner, ergebnis_zaehler, ergebnis_nenner)
+    if stellen is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            abstand = np.abs(zaehler / nenner - ergebnis_zaehler / ergebnis_nenner)
+        richtig |= gueltig & (abstand <= 0.5 * 10.0 ** -stellen + 1e-12)
+    return richtig, ~gueltig
+
+
+def _format(dateipfad: str, format: Optional[str]) -> str:
+    """
+    Private Methode zur internen Verwendung.
+    """
+    format = format or os.path.splitext(dateipfad)[1].lstrip(".").lower()
+    if format not in ("csv", "tsv", "jsonl"):
+        raise ValueError(f"Unbekanntes Format: {format}")
+    return format
+
+
+def _kopfzeile(dateipfad: str, format: str, spalten: Sequence[str]) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Private Methode zur internen Verwendung.
+    Liest bei CSV/TSV die Kopfzeile.
+
+    Returns:
+        Tuple: (Byte-Position nach der Kopfzeile, Spaltennummern von schueler, aufgabe, antwort)
+    """
+    if format == "jsonl":
+        return 0, ()
+    with open(dateipfad, "rb") as datei:
+        zeile = datei.readline()
+    kopf = next(csv.reader([zeile.decode("utf-8-sig")], delimiter="\t" if format == "tsv" else ","))
+    kopf = [name.strip() for name in kopf]
+    try:
+        return len(zeile), tuple(kopf.index(name) for name in spalten)
+    except ValueError:
+        raise ValueError(f"Die Kopfzeile braucht die Spalten {', '.join(spalten)}, gefunden: {', '.join(kopf)}")
+
+
+def _abschnitt_lesen(dateipfad: str, format: str, start: int, ende: int, spalten: Sequence[str],
+                     positionen: Tuple[int, ...]) -> Iterator[Tuple[List[str], List[str], List[str]]]:
+    """
+    Private Methode zur internen Verwendung.
+    Liest die Zeilen, die in [start, ende) beginnen, in Blöcken von etwa LESEPUFFER Bytes.
+    Ein Abschnitt, der mitten in einer Zeile beginnt, überspringt sie (sie gehört zum vorigen).
+
+    Yields:
+        Tuple: (schueler, aufgaben, antworten) eines Blocks
+    """
+    mindestlaenge = max(positionen, default=0) + 1
+    with open(dateipfad, "rb") as datei:
+        datei.seek(max(start - 1, 0))
+        if start > 0 and datei.read(1) != b"\n":
+            start += len(datei.readline())
+        position = start
+        while position < ende:
+            # Ganze Zeilen, zusammen etwa LESEPUFFER Bytes; nur die, die vor ende beginnen
+            zeilen = datei.readlines(LESEPUFFER)
+            if not zeilen:
+                break
+            for anzahl, zeile in enumerate(zeilen):
+                if position >= ende:
+                    del zeilen[anzahl:]
+                    break
+                position += len(zeile)
+            zeilen = b"".join(zeilen).decode("utf-8").splitlines()
+
+            if format == "jsonl":
+                datensaetze = [json.loads(zeile) for zeile in zeilen if zeile.strip()]
+                yield tuple([str(satz.get(name, "")) for satz in datensaetze] for name in spalten)
+            else:
+                reader = csv.reader(zeilen, delimiter="\t" if format == "tsv" else ",")
+                datensaetze = [satz for satz in reader if len(satz) >= mindestlaenge]
+                yield tuple([satz[spalte] for satz in datensaetze] for spalte in positionen)
+
+
+def abschnitt_korrigieren(dateipfad: str, format: str, start: int, ende: int,
+                          spalten: Sequence[str] = EINGABE_SPALTEN, positionen: Tuple[int, ...] = (),
+                          stellen: Optional[int] = None) -> Auswertung:
+    """
+    Korrigiert einen Abschnitt der Datei (läuft auch in einem eigenen Prozess).
+
+    Returns:
+        Auswertung: Die Zähler pro Schüler für diesen Abschnitt
+    """
+    auswertung = Auswertung()
+    for schueler, aufgaben, antworten in _abschnitt_lesen(dateipfad, format, start, ende, spalten, positionen):
+        richtig, ungueltig = block_korrigieren(aufgaben, antworten, stellen)
+        auswertung.hinzufuegen(auswertung.ids(schueler), richtig, ungueltig)
+    return auswertung
+
+
+def korrigieren(dateipfad: str, format: Optional[str] = None, spalten: Sequence[str] = EINGABE_SPALTEN,
+                stellen: Optional[int] = None, prozesse: Optional[int] = None) -> Auswertung:
+    """
+    Korrigiert alle Antworten einer Datei.
+
+    Args:
+        dateipfad: CSV/TSV mit Kopfzeile oder JSONL (eine Zeile pro Datensatz, keine
+                   Zeilenumbrüche innerhalb von Feldern)
+        format: "csv", "tsv" oder "jsonl" (Standard: aus der Dateiendung)
+        spalten: Namen der Spalten für Schüler, Aufgabe und Antwort
+        stellen: Toleranz für gerundete Dezimalantworten (siehe block_korrigieren)
+        prozesse: Anzahl Prozesse (Standard: alle CPUs ab PROZESS_GRENZE Bytes, sonst 1)
+
+    Returns:
+        Auswertung: Die Zähler pro Schüler
+    """
+    format = _format(dateipfad, format)
+    start, positionen = _kopfzeile(dateipfad, format, spalten)
+    groesse = os.path.getsize(dateipfad)
+    if prozesse is None:
+        prozesse = (os.cpu_count() or 1) if groesse >= PROZESS_GRENZE else 1
+
+    if prozesse <= 1:
+        return abschnitt_korrigieren(dateipfad, format, start, groesse, spalten, positionen, stellen)
+
+    # Mehr Abschnitte als Prozesse, damit ungleich schnelle Abschnitte sich ausgleichen
+    grenzen = np.linspace(start, groesse, 4 * prozesse + 1).astype(np.int64).tolist()
+    auswertung = Auswertung()
+    with ProcessPoolExecutor(max_workers=prozesse) as pool:
+        teile = [pool.submit(abschnitt_korrigieren, dateipfad, format, von, bis, spalten, positionen, stellen)
+                 for von, bis in zip(grenzen, grenzen[1:])]
+        for teil in teile:
+            auswertung.zusammenfuehren(teil.result())
+    return auswertung
+
+
+def auswertung_schreiben(dateipfad: str, auswertung: Auswertung, format: Optional[str] = None) -> int:
+    """
+    Schreibt eine Zeile pro Schüler als CSV, TSV oder JSONL.
+
+    Returns:
+        int: Anzahl der geschriebenen Schüler
+    """
+    return schreibe_datei(dateipfad, AUSWERTUNG_SPALTEN, auswertung.zeilen(), format=format)
+
+
+def testdaten_schreiben(dateipfad: str, anzahl: int, schueler: int = 1000, seed: int = 1) -> int:
+    """
+    Schreibt anzahl zufällige Antworten (halb Kopfrechnen, halb Bruchrechnen) als CSV:
+    richtig als ganze Zahl, Bruch, gemischte Zahl oder Dezimalzahl, falsch oder unlesbar.
+
+    Returns:
+        int: Anzahl der geschriebenen Datensätze
+    """
+    zufall = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    namen = [f"Schueler {i:04d}" for i in range(schueler)]
+    geschrieben = 0
+    with open(dateipfad, "w", newline="", encoding="utf-8") as datei:
+        writer = csv.writer(datei)
+        writer.writerow(EINGABE_SPALTEN)
+        bruchgenerator = Bruchgenerator(seed=seed)
+        while geschrieben < anzahl:
+            groesse = min(BLOCKGROESSE, anzahl - geschrieben)
+            haelfte = groesse // 2
+            a = rng.integers(1, 100, size=haelfte, endpoint=True)
+            b = rng.integers(1, 100, size=haelfte, endpoint=True)
+            operation = rng.integers(0, 3, size=haelfte, endpoint=True)
+            # Wie Kopfrechnen: a >= b und Division exakt
+            a, b = np.maximum(a, b), np.minimum(a, b)
+            a = np.where(operation == 3, a - a % b, a)
+            zeichen = np.array(["+", "-", "*", "/"])[operation]
+            aufgaben = [f"{x} {z} {y}" for x, z, y in zip(a.tolist(), zeichen.tolist(), b.tolist())]
+            brueche = bruchgenerator.erzeugen(groesse - haelfte)
+            aufgaben += [frage for frage, _ in brueche.zeilen()]
+
+            spalten = np.array([aufgabe_parsen(aufgabe) for aufgabe in aufgaben], dtype=np.int64).T
+            ergebnisse = zip(*(spalte.tolist() for spalte in verknuepfen(*spalten)))
+
+            zeilen = []
+            for aufgabe, (zaehler, nenner) in zip(aufgaben, ergebnisse):
+                wurf = zufall.random()
+                if wurf < 0.55:
+                    antwort = als_text(zaehler, nenner)
+                elif wurf < 0.62 and abs(zaehler) > nenner > 1:
+                    ganz = abs(zaehler) // nenner
+                    antwort = f"{'-' if zaehler < 0 else ''}{ganz} {abs(zaehler) - ganz * nenner}/{nenner}"
+                elif wurf < 0.7 and nenner in (1, 2, 4, 5, 8, 10):
+                    antwort = str(zaehler / nenner).replace(".", ",")
+                elif wurf < 0.97:
+                    antwort = als_text(zaehler + nenner, nenner)
+                else:
+                    antwort = "weiß nicht"
+                zeilen.append((zufall.choice(namen), aufgabe, antwort))
+            writer.writerows(zeilen)
+            geschrieben += groesse
+    return geschrieben
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antwortbögen für Kopfrechnen und Bruchrechnen korrigieren")
+    parser.add_argument("eingabe", help="CSV/TSV/JSONL mit den Spalten schueler, aufgabe, antwort")
+    parser.add_argument("ausgabe", help="Auswertung pro Schüler (.csv, .tsv oder .jsonl)")
+    parser.add_argument("--prozesse", type=int, help="Anzahl Prozesse (Standard: automatisch)")
+    parser.add_argument("--stellen", type=int, help="Gerundete Dezimalantworten mit so vielen Stellen erlauben")
+    parser.add_argument("--testdaten", type=int, metavar="ANZAHL",
+                        help="Vorher ANZAHL zufällige Antworten nach eingabe schreiben")
+    argumente = parser.parse_args()
+
+    if argumente.testdaten:
+        start = time.perf_counter()
+        testdaten_schreiben(argumente.eingabe, argumente.testdaten)
+        print(f"{argumente.testdaten} Testantworten in {time.perf_counter() - start:.1f}s geschrieben")
+
+    start = time.perf_counter()
+    auswertung = korrigieren(argumente.eingabe, stellen=argumente.stellen, prozesse=argumente.prozesse)
+    schueler = auswertung_schreiben(argumente.ausgabe, auswertung)
+    dauer = time.perf_counter() - start
+    anzahl, richtig, ungueltig = auswertung.zaehler[:len(auswertung)].sum(axis=0).tolist()
+    print(f"{anzahl} Antworten von {schueler} Schülern in {dauer:.2f}s korrigiert "
+          f"({anzahl / dauer:.0f}/s): {richtig} richtig, {ungueltig} nicht lesbar")
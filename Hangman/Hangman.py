@@ -1,8 +1,16 @@
 #encoding: latin-1
+import os
 import random
-import requests
+import sys
+
+# Gemeinsame Ein- und Ausgabe aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from EinAusgabe import KONSOLE
 
 def waehleWort():
+    # Erst hier importiert, damit hangman() mit vorgegebenem Wort ohne requests luft
+    import requests
+
     api_url = "https://random-word-api.herokuapp.com/word?lang=de"
 
     try:
@@ -17,29 +25,31 @@ def waehleWort():
         print(f"Fehler bei der API-Anfrage: {e}")
         return None
     
-def hangman():
-    wort = waehleWort()
+def hangman(wort=None, ea=None):
+    ea = ea or KONSOLE
+    if wort is None:
+        wort = waehleWort()
     geratene_buchstaben = set()
     max_fehler = 6
     fehler = 0
     wort_geloest = False
 
-    print("Willkommen beim Hangman-Spiel!")
-    print("_ " * len(wort))
+    ea.ausgabe("Willkommen beim Hangman-Spiel!")
+    ea.ausgabe("_ " * len(wort))
 
     while not wort_geloest and fehler < max_fehler:
-        geraten = input("Rate einen Buchstaben: ").lower()
+        geraten = ea.eingabe("Rate einen Buchstaben: ").lower()
 
         if len(geraten) == 1 and geraten.isalpha():
             if geraten in geratene_buchstaben:
-                print("Du hast diesen Buchstaben bereits geraten. Versuche es erneut.")
+                ea.ausgabe("Du hast diesen Buchstaben bereits geraten. Versuche es erneut.")
             elif geraten in wort:
                 geratene_buchstaben.add(geraten)
             else:
                 fehler += 1
-                print(f"Falsch! Du hast {fehler} von {max_fehler} Fehlern gemacht.")
+                ea.ausgabe(f"Falsch! Du hast {fehler} von {max_fehler} Fehlern gemacht.")
         else:
-            print("Ungltige Eingabe. Gib einen einzelnen Buchstaben ein.")
+            ea.ausgabe("Ungltige Eingabe. Gib einen einzelnen Buchstaben ein.")
 
         aktueller_stand = ""
         for buchstabe in wort:
@@ -48,13 +58,13 @@ def hangman():
             else:
                 aktueller_stand += "_ "
 
-        print(aktueller_stand)
+        ea.ausgabe(aktueller_stand)
 
         if "_" not in aktueller_stand:
             wort_geloest = True
-            print("Glckwunsch! Du hast das Wort richtig geraten.")
+            ea.ausgabe("Glckwunsch! Du hast das Wort richtig geraten.")
         elif fehler == max_fehler:
-            print(f"Leider verloren! Das richtige Wort war '{wort}'.")
+            ea.ausgabe(f"Leider verloren! Das richtige Wort war '{wort}'.")
 
 if __name__ == "__main__":
     hangman()
@@ -1,6 +1,12 @@
-
+#encoding: latin-1
 import random
 import os
+import sys
+
+# Gemeinsame Antwortprfung aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from Antwortpruefung import antwort_pruefen
+from EinAusgabe import KONSOLE
 
 def load_irregular_verbs(file_path):
     irregular_verbs = []
@@ -20,7 +26,8 @@ def load_irregular_verbs(file_path):
 def choose_random_verb(verbs_list):
     return random.choice(verbs_list)
 
-def irregular_verbs_trainer(irregular_verbs):
+def irregular_verbs_trainer(irregular_verbs, ea=None):
+    ea = ea or KONSOLE
     score = 0
     num_Frage = 5
 
@@ -34,28 +41,29 @@ def irregular_verbs_trainer(irregular_verbs):
         tense = random.choice(list(random_verb.keys()))
         correct_form = random_verb[tense]
 
-        user_input = input(f"What is the {tense.replace('_',' ')} form of '{verb}'? ")
+        user_input = ea.eingabe(f"What is the {tense.replace('_',' ')} form of '{verb}'? ")
 
-        if user_input == correct_form:
-            print("Correct!")
+        if antwort_pruefen(correct_form, user_input).richtig:
+            ea.ausgabe("Correct!")
             score +=1
         else:
-            print(f"Wrong. The correct answer is '{correct_form}'.")
+            ea.ausgabe(f"Wrong. The correct answer is '{correct_form}'.")
 
         
-        print()
+        ea.ausgabe()
 
-    print(f"Quiz abgeschlossen! Du hast {score}/{num_Frage} richtig! Gut gemacht!")
+    ea.ausgabe(f"Quiz abgeschlossen! Du hast {score}/{num_Frage} richtig! Gut gemacht!")
 
 # Pfade zur Datei mit unregelmigen Verben
 file_path = 'irregular_verbs.txt'  # Passe den Pfad entsprechend an
 
-if os.path.exists(file_path):
-    # Lade die unregelmigen Verben aus der Datei
-    irregular_verbs = load_irregular_verbs(file_path)
-    # Starte den Trainer
-    irregular_verbs_trainer(irregular_verbs)
-else:
-    print(f"Irregular Verb File {file_path} nicht gefunden!")
+if __name__ == "__main__":
+    if os.path.exists(file_path):
+        # Lade die unregelmigen Verben aus der Datei
+        irregular_verbs = load_irregular_verbs(file_path)
+        # Starte den Trainer
+        irregular_verbs_trainer(irregular_verbs)
+    else:
+        print(f"Irregular Verb File {file_path} nicht gefunden!")
     
 
@@ -0,0 +1,385 @@
+"""
+Erzeugt Kopfrechenaufgaben (+, -, *, /) blockweise mit NumPy.
+
+Statt jede Aufgabe einzeln mit randint zu ziehen und danach zu korrigieren, werden
+ganze Blöcke auf einmal gezogen, die Einschränkungen als Masken geprüft und nur die
+ungültigen Aufgaben neu gezogen. Division wird direkt als b * Quotient gebaut und ist
+damit immer exakt.
+
+    >>> generator = Aufgabengenerator(seed=1)
+    >>> aufgaben = generator.erzeugen(1000000)
+    >>> schreiben("arbeitsblatt.csv", generator.bloecke(10000, eindeutig=True))
+"""
+import argparse
+import os
+import time
+from itertools import chain
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Die Operationen, wie sie in den Aufgaben angezeigt werden (Index = Code im Block)
+OPERATIONEN = ("+", "-", "*", "/")
+PLUS, MINUS, MAL, GETEILT = range(4)
+
+# Spalten der exportierten Dateien (passend zu Datenquellen.standard_abbildung)
+SPALTEN = ("frage", "antwort", "schwierigkeitsgrad")
+
+# Es wird etwas mehr gezogen als fehlt, damit meist eine Runde reicht
+UEBERSCHUSS = 1.25
+MAX_RUNDEN = 100
+# Höchstens so viele Aufgaben pro Runde ziehen (bei kleiner Quote würde es sonst riesig)
+MAX_ZIEHUNG = 1 << 20
+# So viele Runden nacheinander ohne neue Aufgabe (jede viermal so groß wie die vorige,
+# bis MAX_ZIEHUNG): es gibt keine mehr
+MAX_LEERE_RUNDEN = 8
+
+
+class Aufgaben(NamedTuple):
+    """
+    Ein Block von Aufgaben als Spalten: Aufgabe i ist a[i] OPERATIONEN[operation[i]] b[i].
+    """
+    a: np.ndarray
+    operation: np.ndarray
+    b: np.ndarray
+    ergebnis: np.ndarray
+
+    @property
+    def anzahl(self) -> int:
+        return len(self.a)
+
+    def schwierigkeitsgrade(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: 1 für + und -, 2 für * und /, jeweils +1 ab einem Ergebnis von 1000
+        """
+        return 1 + (self.operation >= MAL) + (np.abs(self.ergebnis) >= 1000)
+
+    def einzeln(self) -> Iterator[Tuple[int, str, int, object]]:
+        """
+        Yields:
+            Tuple: (a, Rechenzeichen, b, ergebnis) für jede Aufgabe des Blocks
+        """
+        zeichen = [OPERATIONEN[code] for code in self.operation.tolist()]
+        return zip(self.a.tolist(), zeichen, self.b.tolist(), self.ergebnis.tolist())
+
+    def zeilen(self) -> Iterator[Tuple[str, str, int]]:
+        """
+        Yields:
+            Tuple[str, str, int]: (frage, antwort, schwierigkeitsgrad) für Trainer und Export
+        """
+        for (a, zeichen, b, ergebnis), grad in zip(self.einzeln(), self.schwierigkeitsgrade().tolist()):
+            yield f"{a} {zeichen} {b}", _zahl_text(ergebnis), grad
+
+
+def _zahl_text(zahl) -> str:
+    """
+    Private Methode zur internen Verwendung.
+    Ganze Zahlen ohne Nachkommastellen (auch wenn sie als float vorliegen).
+    """
+    if isinstance(zahl, float) and zahl.is_integer():
+        return str(int(zahl))
+    return str(zahl)
+
+
+class Aufgabengenerator:
+    def __init__(self, bereich_a: Tuple[int, int] = (1, 100), bereich_b: Tuple[int, int] = (1, 100),
+                 mischung: Optional[Dict[str, float]] = None, nicht_negativ: bool = True,
+                 ganzzahlige_division: bool = True, groesstes_ergebnis: Optional[int] = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            bereich_a: Kleinster und größter Wert des ersten Operanden (einschließlich)
+            bereich_b: Kleinster und größter Wert des zweiten Operanden (einschließlich)
+            mischung: Gewicht je Rechenzeichen, z.B. {"+": 1, "*": 2}; fehlende kommen nicht vor
+                      (Standard: alle vier gleich oft)
+            nicht_negativ: True = keine negativen Ergebnisse (bei - werden a und b getauscht)
+            ganzzahlige_division: True = a ist immer ein Vielfaches von b,
+                                  False = beliebiges a, Ergebnis auf 2 Stellen gerundet
+            groesstes_ergebnis: Optionale Obergrenze für den Betrag des Ergebnisses
+            seed: Startwert für reproduzierbare Aufgaben
+        """
+        if bereich_a[0] > bereich_a[1] or bereich_b[0] > bereich_b[1]:
+            raise ValueError("Ungültiger Zahlenbereich")
+        if mischung is None:
+            mischung = dict.fromkeys(OPERATIONEN, 1)
+        unbekannt = set(mischung) - set(OPERATIONEN)
+        if unbekannt:
+            raise ValueError(f"Unbekannte Rechenart: {', '.join(sorted(unbekannt))}")
+
+        gewichte = np.array([mischung.get(zeichen, 0) for zeichen in OPERATIONEN], dtype=np.float64)
+        if gewichte.min() < 0 or gewichte.sum() <= 0:
+            raise ValueError("Die Mischung braucht mindestens ein positives Gewicht")
+
+        self.bereich_a = (int(bereich_a[0]), int(bereich_a[1]))
+        self.bereich_b = (int(bereich_b[0]), int(bereich_b[1]))
+        self.anteile = gewichte / gewichte.sum()
+        self.nicht_negativ = nicht_negativ
+        self.ganzzahlige_division = ganzzahlige_division
+        self.groesstes_ergebnis = groesstes_ergebnis
+        self.rng = np.random.default_rng(seed)
+
+    def erzeugen(self, anzahl: int, eindeutig: bool = False) -> Aufgaben:
+        """
+        Erzeugt anzahl Aufgaben, die alle Einschränkungen erfüllen.
+
+        Args:
+            anzahl: Anzahl der Aufgaben
+            eindeutig: True = keine Aufgabe kommt doppelt vor
+
+        Returns:
+            Aufgaben: Der Block in Ziehungsreihenfolge
+
+        Gibt es für eine Rechenart nicht genug verschiedene Aufgaben (z.B. Divisionen im
+        Bereich 1-100), füllen die anderen Rechenarten auf.
+        """
+        gesehen = np.empty(0, dtype=np.int64) if eindeutig else None
+        return self._auffuellen(anzahl, gesehen)[0]
+
+    def bloecke(self, anzahl: int, blockgroesse: int = 100000, eindeutig: bool = False) -> Iterator[Aufgaben]:
+        """
+        Erzeugt anzahl Aufgaben in Blöcken, z.B. zum Schreiben großer Arbeitsblätter
+        ohne alles im Speicher zu halten. Die Eindeutigkeit gilt über alle Blöcke.
+
+        Yields:
+            Aufgaben: Blöcke mit höchstens blockgroesse Aufgaben
+        """
+        gesehen = np.empty(0, dtype=np.int64) if eindeutig else None
+        while anzahl > 0:
+            block, gesehen = self._auffuellen(min(anzahl, blockgroesse), gesehen)
+            anzahl -= block.anzahl
+            yield block
+
+    def einzeln(self, blockgroesse: int = 1000) -> Iterator[Tuple[int, str, int, object]]:
+        """
+        Endloser Vorrat einzelner Aufgaben für das interaktive Üben.
+
+        Yields:
+            Tuple: (a, Rechenzeichen, b, ergebnis)
+        """
+        while True:
+            yield from self._auffuellen(blockgroesse, None)[0].einzeln()
+
+    def _ziehen(self, anzahl: int) -> Tuple[Aufgaben, np.ndarray]:
+        """
+        Private Methode zur internen Verwendung.
+        Zieht einen Rohblock und gibt ihn mit der Maske der gültigen Aufgaben zurück.
+        """
+        rng = self.rng
+        operation = rng.choice(len(OPERATIONEN), size=anzahl, p=self.anteile).astype(np.int8)
+        a = rng.integers(self.bereich_a[0], self.bereich_a[1], size=anzahl, endpoint=True)
+        b = rng.integers(self.bereich_b[0], self.bereich_b[1], size=anzahl, endpoint=True)
+        gueltig = np.ones(anzahl, dtype=bool)
+
+        if self.nicht_negativ:
+            # Wie bisher: bei a < b werden die Operanden getauscht, sofern sie im Bereich bleiben
+            tauschen = ((operation == MINUS) & (a < b)
+                        & (b >= self.bereich_a[0]) & (b <= self.bereich_a[1])
+                        & (a >= self.bereich_b[0]) & (a <= self.bereich_b[1]))
+            a, b = np.where(tauschen, b, a), np.where(tauschen, a, b)
+
+        division = operation == GETEILT
+        gueltig &= ~division | (b != 0)
+        teiler = np.where(b == 0, 1, b)
+        if self.ganzzahlige_division and division.any():
+            # a = b * q mit einem zufälligen Quotienten q, für den a im Bereich liegt
+            grenze_1 = self.bereich_a[0] / teiler
+            grenze_2 = self.bereich_a[1] / teiler
+            q_min = np.ceil(np.minimum(grenze_1, grenze_2)).astype(np.int64)
+            q_max = np.floor(np.maximum(grenze_1, grenze_2)).astype(np.int64)
+            gueltig &= ~division | (q_min <= q_max)
+            q = rng.integers(q_min, np.maximum(q_min, q_max), endpoint=True)
+            a = np.where(division, teiler * q, a)
+
+        ergebnis = np.where(operation == PLUS, a + b,
+                   np.where(operation == MINUS, a - b,
+                   np.where(operation == MAL, a * b, a // teiler)))
+        if not self.ganzzahlige_division:
+            ergebnis = np.where(division, np.round(a / teiler, 2), ergebnis)
+
+        if self.nicht_negativ:
+            gueltig &= ergebnis >= 0
+        if self.groesstes_ergebnis is not None:
+            gueltig &= np.abs(ergebnis) <= self.groesstes_ergebnis
+        return Aufgaben(a, operation, b, ergebnis), gueltig
+
+    def _schluessel(self, aufgaben: Aufgaben) -> np.ndarray:
+        """
+        Private Methode zur internen Verwendung.
+        Eine Zahl pro Aufgabe (a, Operation, b), gleich genau dann wenn die Aufgabe gleich ist.
+        """
+        spanne_b = self.bereich_b[1] - self.bereich_b[0] + 1
+        return (((aufgaben.a - self.bereich_a[0]) * len(OPERATIONEN) + aufgaben.operation) * spanne_b
+                + (aufgaben.b - self.bereich_b[0]))
+
+    def _schluesselraum(self) -> int:
+        """
+        Private Methode zur internen Verwendung.
+        Anzahl möglicher Schlüssel - eine obere Grenze für die Anzahl verschiedener Aufgaben.
+        """
+        return ((self.bereich_a[1] - self.bereich_a[0] + 1) * len(OPERATIONEN)
+                * (self.bereich_b[1] - self.bereich_b[0] + 1))
+
+    @staticmethod
+    def _neue(schluessel: np.ndarray, auswahl: np.ndarray, gesehen: np.ndarray) -> np.ndarray:
+        """
+        Private Methode zur internen Verwendung.
+        Die Einträge von auswahl, deren Schlüssel zum ersten Mal vorkommen und nicht in
+        gesehen (sortiert) liegen - in der ursprünglichen Reihenfolge. Eine stabile Sortierung
+        statt np.unique/np.isin, weil beides hier mehrfach sortieren bzw. hashen würde.
+        """
+        ordnung = np.argsort(schluessel, kind="stable")
+        sortiert = schluessel[ordnung]
+        erste = np.ones(len(sortiert), dtype=bool)
+        erste[1:] = sortiert[1:] != sortiert[:-1]
+        if len(gesehen):
+            position = np.minimum(np.searchsorted(gesehen, sortiert), len(gesehen) - 1)
+            erste &= gesehen[position] != sortiert
+        return auswahl[np.sort(ordnung[erste])]
+
+    def _auffuellen(self, anzahl: int, gesehen: Optional[np.ndarray]) -> Tuple[Aufgaben, Optional[np.ndarray]]:
+        """
+        Private Methode zur internen Verwendung.
+        Zieht so lange nach, bis anzahl gültige (und bei gesehen != None neue) Aufgaben da sind.
+
+        Args:
+            anzahl: Anzahl der gewünschten Aufgaben
+            gesehen: Sortierte Schlüssel der bereits erzeugten Aufgaben, oder None ohne Eindeutigkeit
+
+        Returns:
+            Tuple: (Aufgaben, gesehen inklusive der neuen Schlüssel)
+        """
+        if gesehen is not None and len(gesehen) + anzahl > self._schluesselraum():
+            raise ValueError(f"Zahlenbereich zu klein: höchstens {self._schluesselraum() - len(gesehen)} "
+                             f"weitere verschiedene Aufgaben, verlangt sind {anzahl}")
+
+        teile = []
+        fehlend = anzahl
+        quote = 1.0
+        leere_runden = 0
+        for _ in range(MAX_RUNDEN):
+            if fehlend <= 0 or leere_runden >= MAX_LEERE_RUNDEN:
+                break
+            if leere_runden:
+                gezogen = min(gezogen * 4, MAX_ZIEHUNG)
+            else:
+                gezogen = min(int(fehlend / quote * UEBERSCHUSS) + 16, MAX_ZIEHUNG)
+            roh, gueltig = self._ziehen(gezogen)
+            auswahl = np.flatnonzero(gueltig)
+
+            if gesehen is not None:
+                # Doppelte im Block und schon erzeugte Aufgaben verwerfen, Reihenfolge beibehalten
+                auswahl = self._neue(self._schluessel(roh)[auswahl], auswahl, gesehen)[:fehlend]
+                # Eine Runde ohne neue Aufgabe kann Pech sein, mehrere hintereinander kaum
+                leere_runden = 0 if len(auswahl) else leere_runden + 1
+                gesehen = np.sort(np.concatenate([gesehen, self._schluessel(roh)[auswahl]]))
+            else:
+                auswahl = auswahl[:fehlend]
+
+            # Anteil brauchbarer Aufgaben (gültig und neu) bestimmt die Größe der nächsten Runde
+            quote = max(len(auswahl) / gezogen, 0.01)
+            teile.append(Aufgaben(*(spalte[auswahl] for spalte in roh)))
+            fehlend -= len(auswahl)
+
+        if not teile:
+            teile.append(self._ziehen(0)[0])
+        if fehlend > 0:
+            raise ValueError(f"Zahlenbereich zu klein: nur {anzahl - fehlend} von {anzahl} Aufgaben "
+                             f"möglich mit diesen Einschränkungen")
+        return Aufgaben(*(np.concatenate(spalten) for spalten in zip(*teile))), gesehen
+
+
+def zeilen(bloecke: Iterable[Aufgaben]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Yields:
+        Tuple[str, str, int]: (frage, antwort, schwierigkeitsgrad) aller Blöcke
+    """
+    return chain.from_iterable(block.zeilen() for block in bloecke)
+
+
+# Zeilenvorlagen je Format; Aufgaben enthalten nur Ziffern, Leerzeichen, Rechenzeichen und
+# Punkte, deshalb ist weder CSV-Quoting noch JSON-Escaping nötig
+ZEILENVORLAGEN = {
+    "csv": "{0},{1},{2}\n",
+    "tsv": "{0}\t{1}\t{2}\n",
+    "jsonl": '{{"frage": "{0}", "antwort": "{1}", "schwierigkeitsgrad": {2}}}\n',
+}
+
+
+def schreiben(dateipfad: str, bloecke: Iterable[Aufgaben], format: Optional[str] = None) -> int:
+    """
+    Schreibt die Aufgaben als CSV, TSV oder JSONL (Format aus der Dateiendung, falls nicht
+    angegeben), ein write pro Block. Das Ergebnis entspricht Datenquellen.schreibe_datei und
+    lässt sich mit Trainer.importieren wieder einlesen.
+
+    Returns:
+        int: Anzahl der geschriebenen Aufgaben
+    """
+    if format is None:
+        format = os.path.splitext(dateipfad)[1].lstrip(".").lower()
+    if format not in ZEILENVORLAGEN:
+        raise ValueError(f"Unbekanntes Format: {format}")
+    vorlage = ZEILENVORLAGEN[format].format
+
+    anzahl = 0
+    with open(dateipfad, "w", encoding="utf-8", newline="") as datei:
+        if format != "jsonl":
+            datei.write(vorlage(*SPALTEN))
+        for block in bloecke:
+            datei.write("".join([vorlage(*zeile) for zeile in block.zeilen()]))
+            anzahl += block.anzahl
+    return anzahl
+
+
+def in_trainer(trainer, bloecke: Iterable[Aufgaben], chunk_groesse: int = 10000) -> int:
+    """
+    Speichert die Aufgaben blockweise in einer Trainer-Tabelle (siehe Trainer.speichern_viele).
+
+    Returns:
+        int: Anzahl der gespeicherten Aufgaben
+    """
+    return trainer.speichern_viele(zeilen(bloecke), chunk_groesse)
+
+
+def _bereich(text: str) -> Tuple[int, int]:
+    """
+    Private Methode zur internen Verwendung.
+    "1:100" -> (1, 100)
+    """
+    von, bis = text.split(":")
+    return int(von), int(bis)
+
+
+def _mischung(text: str) -> Dict[str, float]:
+    """
+    Private Methode zur internen Verwendung.
+    "+:1,*:2" -> {"+": 1.0, "*": 2.0}
+    """
+    return {zeichen: float(gewicht) for zeichen, gewicht in (teil.rsplit(":", 1) for teil in text.split(","))}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kopfrechenaufgaben in großen Mengen erzeugen")
+    parser.add_argument("anzahl", type=int, nargs="?", default=1000000)
+    parser.add_argument("--datei", help="Zieldatei (.csv, .tsv oder .jsonl), sonst nur Zeitmessung")
+    parser.add_argument("--a", type=_bereich, default=(1, 100), help="Bereich des ersten Operanden, z.B. 1:100")
+    parser.add_argument("--b", type=_bereich, default=(1, 100), help="Bereich des zweiten Operanden, z.B. 1:100")
+    parser.add_argument("--mischung", type=_mischung, help='Gewichte je Rechenart, z.B. "+:1,-:1,*:2,/:1"')
+    parser.add_argument("--max", type=int, dest="groesstes_ergebnis", help="Größtes erlaubtes Ergebnis")
+    parser.add_argument("--eindeutig", action="store_true", help="Keine Aufgabe doppelt")
+    parser.add_argument("--seed", type=int)
+    argumente = parser.parse_args()
+
+    generator = Aufgabengenerator(argumente.a, argumente.b, argumente.mischung,
+                                  groesstes_ergebnis=argumente.groesstes_ergebnis, seed=argumente.seed)
+    start = time.perf_counter()
+    if argumente.datei:
+        anzahl = schreiben(argumente.datei, generator.bloecke(argumente.anzahl, eindeutig=argumente.eindeutig))
+        print(f"{anzahl} Aufgaben in {time.perf_counter() - start:.2f}s nach {argumente.datei} geschrieben")
+    else:
+        aufgaben = generator.erzeugen(argumente.anzahl, eindeutig=argumente.eindeutig)
+        dauer = time.perf_counter() - start
+        print(f"{aufgaben.anzahl} Aufgaben in {dauer * 1000:.0f}ms "
+              f"({aufgaben.anzahl / dauer / 1e6:.1f} Mio/s)")
+        for a, zeichen, b, ergebnis in list(aufgaben.einzeln())[:5]:
+            print(f"  {a} {zeichen} {b} = {ergebnis}")
@@ -1,43 +1,30 @@
-from random import *
+import os
+import sys
 
-gesamt = 0
-richtige = 0
-while True:
-    rechenart = randint(1,4)
-    rechenArtZeichen = ""
-    a = randint(1,100)
-    b = randint(1,100)
-    if rechenart == 1:
-        richtigesErgebnis = a+b
-        rechenArtZeichen = "+"
-    if rechenart == 2:
-        richtigesErgebnis = a*b
-        rechenArtZeichen = "*"
-    if rechenart ==3:
-        if a < b:
-            temp = b
-            b = a
-            a=temp
-        richtigesErgebnis = a-b
-        rechenArtZeichen = "-"
-    if rechenart ==4:
-        if a < b:
-            temp = b
-            b = a
-            a=temp
-        m = a%b 
-        if m > 0:
-            a = a-m
-        richtigesErgebnis = a/b
-        rechenArtZeichen = "/"        
-    eingabe = input("(e für Ende) " + str(a)+" "+rechenArtZeichen+" "+ str(b) + " = ") #Hier warten wir auf die Eingabe des Benutzers
-    if eingabe == 'e':
-        break
-    gesamt = gesamt +1
-    ergebnis = int(eingabe)
-    if richtigesErgebnis == ergebnis:
-        print("richtig!!!")
-        richtige = richtige +1
-    else:
-        print("falsch!!! richtig wäre: "+str(richtigesErgebnis)) 
-print ("Du hast "+str(gesamt)+" Fragen beantwortet! Davon waren "+str(richtige)+"!")
\ No newline at end of file
+# Gemeinsame Ein- und Ausgabe aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from EinAusgabe import KONSOLE
+
+from Aufgabengenerator import Aufgabengenerator
+
+def kopfrechnen(generator=None, ea=None):
+    ea = ea or KONSOLE
+    generator = generator or Aufgabengenerator()
+    gesamt = 0
+    richtige = 0
+    # Die Aufgaben kommen blockweise aus dem Generator (Subtraktion nie negativ, Division immer exakt)
+    for a, rechenArtZeichen, b, richtigesErgebnis in generator.einzeln():
+        eingabe = ea.eingabe("(e für Ende) " + str(a)+" "+rechenArtZeichen+" "+ str(b) + " = ") #Hier warten wir auf die Eingabe des Benutzers
+        if eingabe == 'e':
+            break
+        gesamt = gesamt +1
+        ergebnis = int(eingabe)
+        if richtigesErgebnis == ergebnis:
+            ea.ausgabe("richtig!!!")
+            richtige = richtige +1
+        else:
+            ea.ausgabe("falsch!!! richtig wäre: "+str(richtigesErgebnis)) 
+    ea.ausgabe("Du hast "+str(gesamt)+" Fragen beantwortet! Davon waren "+str(richtige)+"!")
+
+if __name__ == "__main__":
+    kopfrechnen()
@@ -1,45 +1,61 @@
+#encoding: latin-1
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-# Definiere die Funktion
-def f(x):
-    return x**3 - 3*x**2 + 1
+from Polynomanalyse import analysieren, auswerten, polynom_text
+
+# Standardbeispiel f(x) = x^3 - 3x^2 + 1, Koeffizienten hchster Grad zuerst
+BEISPIEL = [1, -3, 0, 1]
+
+
+def kurvendiskussion(koeffizienten):
+    """
+    Kurvendiskussion eines beliebigen Polynoms: gibt Nullstellen, Extrem- und Wendepunkte
+    sowie die Monotonie aus und zeichnet f und f'.
 
-# Definiere die Ableitung der Funktion
-def f_prime(x):
-    return 3*x**2 - 6*x
+    Args:
+        koeffizienten: Koeffizienten des Polynoms, hchster Grad zuerst
+    """
+    analyse = analysieren(koeffizienten)
+    print(analyse.beschreibung(0))
 
-# Definiere den Definitionsbereich der Funktion
-x = np.linspace(-2, 4, 400)
+    # Extremstellen (Nullstellen von f') und Wendestellen (Nullstellen von f'') mit Funktionswerten
+    extremstellen = analyse.extremstellen[0][~np.isnan(analyse.extremstellen[0])]
+    extremwerte = analyse.extremwerte[0][~np.isnan(analyse.extremstellen[0])]
+    wendestellen = analyse.wendestellen[0][~np.isnan(analyse.wendestellen[0])]
+    wendewerte = analyse.wendewerte[0][~np.isnan(analyse.wendestellen[0])]
 
-# Berechne die Funktionswerte und Ableitungswerte fr jeden x-Wert
-y = f(x)
-y_prime = f_prime(x)
+    # Definitionsbereich so whlen, dass alle besonderen Stellen zu sehen sind
+    stellen = np.concatenate([analyse.nullstellen[0], extremstellen, wendestellen, [0.0]])
+    stellen = stellen[~np.isnan(stellen)]
+    x = np.linspace(stellen.min() - 2, stellen.max() + 2, 400)
 
-# Plotte die Funktion und ihre Ableitung
-plt.figure(figsize=(10, 6))
+    # Berechne die Funktionswerte und Ableitungswerte fr jeden x-Wert
+    y = auswerten(analyse.koeffizienten, x[None, :])[0]
+    y_prime = auswerten(analyse.ableitung_1, x[None, :])[0]
 
-# Funktion
-plt.plot(x, y, label='f(x) = $x^3 - 3x^2 + 1$')
+    # Plotte die Funktion und ihre Ableitung
+    plt.figure(figsize=(10, 6))
+    plt.plot(x, y, label=f"f(x) = ${polynom_text(analyse.koeffizienten[0])}$")
+    plt.plot(x, y_prime, label=f"f'(x) = ${polynom_text(analyse.ableitung_1[0])}$", linestyle='dashed')
 
-# Ableitung
-plt.plot(x, y_prime, label="f'(x) = $3x^2 - 6x$", linestyle='dashed')
+    # Markiere die Extremstellen und die Wendepunkte der Funktion
+    plt.scatter(extremstellen, extremwerte, color='red', marker='o', label='Extremstellen')
+    plt.scatter(wendestellen, wendewerte, color='green', marker='o', label='Wendepunkte')
 
-# Markiere die Nullstellen der Ableitung (Extremstellen der Funktion)
-roots = np.roots([3, -6])
-plt.scatter(roots, f(roots), color='red', marker='o', label='Extremstellen')
+    plt.axhline(0, color='black',linewidth=0.5)
+    plt.axvline(0, color='black',linewidth=0.5)
 
-# Markiere die Wendepunkte der Funktion (Nullstellen der zweiten Ableitung)
-second_derivative = np.polyder([3, -6])
-inflection_points = np.roots(second_derivative)
-plt.scatter(inflection_points, f(inflection_points), color='green', marker='o', label='Wendepunkte')
+    plt.legend()
+    plt.title('Kurvendiskussion')
+    plt.xlabel('x-Achse')
+    plt.ylabel('y-Achse')
+    plt.grid(color = 'gray', linestyle = '--', linewidth = 0.5)
+    plt.show()
 
-plt.axhline(0, color='black',linewidth=0.5)
-plt.axvline(0, color='black',linewidth=0.5)
 
-plt.legend()
-plt.title('Kurvendiskussion')
-plt.xlabel('x-Achse')
-plt.ylabel('y-Achse')
-plt.grid(color = 'gray', linestyle = '--', linewidth = 0.5)
-plt.show()
+if __name__ == "__main__":
+    # Koeffizienten auch als Argumente, z.B. python Kurvendiskussion.py 1 0 -1 0 0
+    kurvendiskussion([float(zahl) for zahl in sys.argv[1:]] or BEISPIEL)
@@ -0,0 +1,433 @@
+"""
+Kurvendiskussion für beliebige Polynome, vektorisiert über viele Polynome auf einmal.
+
+Ein Polynom ist eine Zeile von Koeffizienten, höchster Grad zuerst (wie bei np.polyval,
+np.polyder und np.roots): [1, -3, 0, 1] ist x³ - 3x² + 1. Viele Polynome gleichen
+Grades liegen als Zeilen eines 2D-Arrays vor. Ergebnisse mit unterschiedlich vielen
+Einträgen pro Polynom (Nullstellen, Extremstellen, ...) sind aufsteigend sortiert und
+mit NaN aufgefüllt.
+
+    >>> analyse = analysieren([1, -3, 0, 1])
+    >>> print(analyse.beschreibung(0))
+    >>> analyse = analysieren(uebungspolynome(100000, grad=3, seed=1))
+
+Aufruf (Zeitmessung):
+    python Polynomanalyse.py [--anzahl 100000] [--grad 3]
+"""
+import argparse
+import time
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+# Art einer Stelle mit waagrechter Tangente (extremart)
+HOCHPUNKT = -1
+SATTELPUNKT = 0
+TIEFPUNKT = 1
+
+# Nullstellen mit einem kleineren Imaginärteil (relativ) gelten als reell,
+# Nullstellen mit einem kleineren Abstand (relativ) als dieselbe Nullstelle
+IMAGINAER_TOLERANZ = 1e-6
+GLEICH_TOLERANZ = 1e-6
+
+# Eine k-fache Nullstelle zerfällt in der Eigenwertrechnung in k Werte im Abstand von
+# etwa 1e-16^(1/k); Eigenwerte, die näher beieinander liegen, werden gemittelt - aber nur,
+# wenn Polynom und Ableitung am Mittelwert (relativ) verschwinden, sonst sind es
+# verschiedene nahe Nullstellen wie 1 und 1.0004
+HAEUFUNG_TOLERANZ = 1e-3
+MEHRFACH_TOLERANZ = 1e-13
+
+# Newton-Schritte, um die Nullstellen aus den Eigenwerten nachzubessern
+NEWTON_SCHRITTE = 2
+
+
+def als_matrix(koeffizienten) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Die Koeffizienten als float-Array mit einer Zeile pro Polynom
+    """
+    matrix = np.asarray(koeffizienten, dtype=np.float64)
+    return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+
+def ableiten(koeffizienten, ordnung: int = 1) -> np.ndarray:
+    """
+    np.polyder für alle Zeilen auf einmal: jeder Koeffizient wird mit seinem Exponenten
+    multipliziert, der letzte fällt weg. Ein Polynom vom Grad 0 hat die Ableitung [0].
+
+    Returns:
+        np.ndarray: Die Koeffizienten der ordnung-ten Ableitungen
+    """
+    matrix = als_matrix(koeffizienten)
+    for _ in range(ordnung):
+        grad = matrix.shape[1] - 1
+        if grad == 0:
+            return np.zeros_like(matrix)
+        matrix = matrix[:, :-1] * np.arange(grad, 0, -1)
+    return matrix
+
+
+def auswerten(koeffizienten, x) -> np.ndarray:
+    """
+    np.polyval zeilenweise (Horner-Schema): Zeile i des Ergebnisses enthält
+    Polynom i an den Stellen x[i] (NaN bleibt NaN).
+
+    Args:
+        koeffizienten: Ein Polynom pro Zeile
+        x: Eine Stelle für alle, eine Stelle pro Polynom oder eine Zeile Stellen pro Polynom
+
+    Returns:
+        np.ndarray: Die Funktionswerte, eine Zeile pro Polynom
+    """
+    matrix = als_matrix(koeffizienten)
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim < 2:
+        x = np.broadcast_to(x.reshape(-1, 1), (len(matrix), 1))
+    y = np.zeros(x.shape)
+    for spalte in range(matrix.shape[1]):
+        y = y * x + matrix[:, spalte:spalte + 1]
+    return y
+
+
+def _kompakt(werte: np.ndarray) -> np.ndarray:
+    """
+    Private Methode zur internen Verwendung.
+    Sortiert jede Zeile aufsteigend (NaN ans Ende) und streicht fast gleiche Werte.
+    """
+    werte = np.sort(werte, axis=1)
+    if werte.shape[1] > 1:
+        abstand = np.diff(werte, axis=1)
+        doppelt = abstand <= GLEICH_TOLERANZ * (1 + np.abs(werte[:, 1:]))
+        werte[:, 1:][doppelt] = np.nan
+        werte = np.sort(werte, axis=1)
+    return werte
+
+
+def _wurzeln(koeffizienten: np.ndarray) -> np.ndarray:
+    """
+    Private Methode zur internen Verwendung.
+    Reelle Nullstellen von Polynomen mit Leitkoeffizient ungleich 0, unsortiert,
+    nicht reell = NaN. Grad 1 und 2 über die Formeln, ab Grad 3 über die Eigenwerte
+    der Begleitmatrizen (wie np.roots, aber für alle Zeilen in einem Aufruf).
+    """
+    anzahl, breite = koeffizienten.shape
+    grad = breite - 1
+    if grad == 0:
+        return np.empty((anzahl, 0))
+    if grad == 1:
+        return -koeffizienten[:, 1:2] / koeffizienten[:, :1]
+    if grad == 2:
+        a, b, c = koeffizienten.T
+        diskriminante = b * b - 4 * a * c
+        # Rundungsfehler bei doppelten Nullstellen nicht als "keine Nullstelle" werten
+        diskriminante[(diskriminante < 0) & (-diskriminante <= 1e-12 * b * b)] = 0
+        wurzel = np.sqrt(np.where(diskriminante >= 0, diskriminante, np.nan))
+        # Numerisch stabile Form: erst die betragsgrößere Nullstelle, dann über Vieta
+        q = -0.5 * (b + np.where(b >= 0, wurzel, -wurzel))
+        x_1 = q / a
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_2 = np.where(q != 0, c / q, x_1)
+        return np.column_stack([x_1, x_2])
+
+    begleitmatrix = np.zeros((anzahl, grad, grad))
+    begleitmatrix[:, 0, :] = -koeffizienten[:, 1:] / koeffizienten[:, :1]
+    begleitmatrix[:, np.arange(1, grad), np.arange(grad - 1)] = 1
+    eigenwerte = np.linalg.eigvals(begleitmatrix)
+    ableitung = ableiten(koeffizienten)
+    # Mehrfache Nullstellen: jeden Eigenwert durch den Mittelwert seiner Häufung ersetzen
+    # (zweimal, damit auch die Ränder einer breiten Häufung zusammenfinden)
+    gemittelt = eigenwerte
+    for _ in range(2):
+        nah = np.abs(gemittelt[:, :, None] - gemittelt[:, None, :]) <= \
+            HAEUFUNG_TOLERANZ * (1 + np.abs(gemittelt[:, :, None]))
+        gemittelt = (nah * gemittelt[:, None, :]).sum(axis=2) / nah.sum(axis=2)
+    # Nur echte mehrfache Nullstellen: Polynom und Ableitung sind dort 0 (gemessen an der
+    # Summe der Beträge ihrer Glieder, also bis auf Rundungsfehler). Zwischen zwei nahen
+    # verschiedenen Nullstellen im Abstand 2h ist das Polynom etwa h² mal den Rest
+    stelle = gemittelt.real
+    mehrfach = (nah.sum(axis=2) > 1) & (np.abs(gemittelt.imag) <= HAEUFUNG_TOLERANZ * (1 + np.abs(stelle)))
+    for polynom in (koeffizienten, ableitung):
+        mehrfach &= np.abs(auswerten(polynom, stelle)) <= \
+            MEHRFACH_TOLERANZ * auswerten(np.abs(polynom), np.abs(stelle))
+    eigenwerte = np.where(mehrfach, stelle, eigenwerte)
+    reell = np.abs(eigenwerte.imag) <= IMAGINAER_TOLERANZ * np.maximum(1, np.abs(eigenwerte.real))
+    x = np.where(reell, eigenwerte.real, np.nan)
+
+    for _ in range(NEWTON_SCHRITTE):
+        steigung = auswerten(ableitung, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            schritt = auswerten(koeffizienten, x) / steigung
+        # Bei mehrfachen Nullstellen ist die Steigung ~0: dort nicht nachbessern
+        x = np.where(~mehrfach & np.isfinite(schritt) & (np.abs(schritt) < 1e-3 * (1 + np.abs(x))), x - schritt, x)
+    return x
+
+
+def nullstellen(koeffizienten) -> np.ndarray:
+    """
+    Die verschiedenen reellen Nullstellen jedes Polynoms. Führende Nullen in einer Zeile
+    senken den Grad dieser Zeile; das Nullpolynom hat hier keine Nullstellen.
+
+    Returns:
+        np.ndarray: (Anzahl Polynome, Grad), aufsteigend sortiert, mit NaN aufgefüllt
+    """
+    matrix = als_matrix(koeffizienten)
+    anzahl, breite = matrix.shape
+    ergebnis = np.full((anzahl, max(breite - 1, 0)), np.nan)
+
+    # Zeilen nach ihrem tatsächlichen Grad gruppieren (Anzahl führender Nullen)
+    ungleich_null = matrix != 0
+    fuehrende_nullen = np.where(ungleich_null.any(axis=1), ungleich_null.argmax(axis=1), breite)
+    for nullen in np.unique(fuehrende_nullen):
+        if nullen >= breite - 1:
+            continue
+        zeilen = fuehrende_nullen == nullen
+        wurzeln = _wurzeln(matrix[zeilen, nullen:])
+        ergebnis[zeilen, :wurzeln.shape[1]] = wurzeln
+    return _kompakt(ergebnis)
+
+
+def _vorzeichen_links_rechts(koeffizienten: np.ndarray, stellen: np.ndarray):
+    """
+    Private Methode zur internen Verwendung.
+    Vorzeichen des Polynoms knapp links und rechts jeder Stelle (sortiert, NaN am Ende):
+    geprüft wird in halbem Abstand zur Nachbarstelle (höchstens 0.5), damit zwischen
+    Stelle und Prüfpunkt keine weitere Nullstelle liegt.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (links, rechts) mit -1, 0 oder 1
+    """
+    anzahl = len(stellen)
+    unendlich = np.full((anzahl, 1), np.inf)
+    abstand = np.diff(stellen, axis=1)
+    links = np.concatenate([unendlich, abstand], axis=1)
+    rechts = np.concatenate([abstand, unendlich], axis=1)
+    # NaN-Nachbarn (keine weitere Stelle) zählen als unendlich weit weg
+    links = np.where(np.isnan(links), np.inf, links)
+    rechts = np.where(np.isnan(rechts), np.inf, rechts)
+    h = np.minimum(np.minimum(links, rechts), 1.0) / 2
+    return (np.sign(auswerten(koeffizienten, stellen - h)),
+            np.sign(auswerten(koeffizienten, stellen + h)))
+
+
+class Analyse(NamedTuple):
+    """
+    Ergebnis von analysieren. Zeile i gehört zu Polynom i; Stellen sind aufsteigend
+    sortiert und mit NaN aufgefüllt, die Werte dazu stehen an derselben Position.
+    """
+    koeffizienten: np.ndarray
+    ableitung_1: np.ndarray
+    ableitung_2: np.ndarray
+    nullstellen: np.ndarray
+    extremstellen: np.ndarray       # alle Stellen mit f'(x) = 0
+    extremwerte: np.ndarray
+    extremart: np.ndarray           # HOCHPUNKT, TIEFPUNKT oder SATTELPUNKT
+    wendestellen: np.ndarray        # f''(x) = 0 mit Vorzeichenwechsel (inkl. Sattelpunkte)
+    wendewerte: np.ndarray
+    monotonie_grenzen: np.ndarray   # die Hoch- und Tiefpunkte
+    monotonie_start: np.ndarray     # 1 = steigend, -1 = fallend links vom ersten Grenzpunkt, 0 = konstant
+
+    @property
+    def anzahl(self) -> int:
+        return len(self.koeffizienten)
+
+    def monotonie(self, i: int) -> List[tuple]:
+        """
+        Returns:
+            List[tuple]: (von, bis, richtung) für Polynom i, richtung 1 = steigend,
+                         -1 = fallend, 0 = konstant; die Ränder sind -inf und inf
+        """
+        grenzen = [-np.inf] + [x for x in self.monotonie_grenzen[i].tolist() if not np.isnan(x)] + [np.inf]
+        richtung = int(self.monotonie_start[i])
+        intervalle = []
+        for von, bis in zip(grenzen, grenzen[1:]):
+            intervalle.append((von, bis, richtung))
+            richtung = -richtung
+        return intervalle
+
+    def beschreibung(self, i: int) -> str:
+        """
+        Die Kurvendiskussion von Polynom i als Text (wie in einer Musterlösung).
+        """
+        arten = {HOCHPUNKT: "Hochpunkt", TIEFPUNKT: "Tiefpunkt", SATTELPUNKT: "Sattelpunkt"}
+        zeilen = [f"f(x) = {polynom_text(self.koeffizienten[i])}",
+                  f"f'(x) = {polynom_text(self.ableitung_1[i])}",
+                  f"f''(x) = {polynom_text(self.ableitung_2[i])}"]
+
+        stellen = [_zahl(x) for x in self.nullstellen[i] if not np.isnan(x)]
+        zeilen.append("Nullstellen: " + (", ".join(f"x = {x}" for x in stellen) or "keine"))
+
+        punkte = [f"{arten[int(art)]} ({_zahl(x)} | {_zahl(y)})"
+                  for x, y, art in zip(self.extremstellen[i], self.extremwerte[i], self.extremart[i])
+                  if not np.isnan(x)]
+        zeilen.append("Extrempunkte: " + (", ".join(punkte) or "keine"))
+
+        punkte = [f"({_zahl(x)} | {_zahl(y)})" for x, y in zip(self.wendestellen[i], self.wendewerte[i])
+                  if not np.isnan(x)]
+        zeilen.append("Wendepunkte: " + (", ".join(punkte) or "keine"))
+
+        namen = {1: "steigend", -1: "fallend", 0: "konstant"}
+        zeilen.append("Monotonie: " + ", ".join(f"{namen[richtung]} auf ({_zahl(von)}, {_zahl(bis)})"
+                                               for von, bis, richtung in self.monotonie(i)))
+        return "\n".join(zeilen)
+
+
+def _zahl(x: float) -> str:
+    """
+    Private Methode zur internen Verwendung.
+    Auf 4 Stellen gerundet, ohne überflüssige Nullen ("2", "-0.5774", "-inf").
+    """
+    if np.isinf(x):
+        return "inf" if x > 0 else "-inf"
+    text = f"{round(float(x), 4) + 0.0:.4f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def polynom_text(koeffizienten) -> str:
+    """
+    Ein Polynom als Text, z.B. [1, -3, 0, 1] -> "x^3 - 3x^2 + 1".
+    """
+    koeffizienten = np.asarray(koeffizienten, dtype=np.float64)
+    grad = len(koeffizienten) - 1
+    teile = []
+    for exponent, koeffizient in zip(range(grad, -1, -1), koeffizienten.tolist()):
+        if koeffizient == 0:
+            continue
+        betrag = _zahl(abs(koeffizient))
+        potenz = "" if exponent == 0 else "x" if exponent == 1 else f"x^{exponent}"
+        if potenz and betrag == "1":
+            betrag = ""
+        vorzeichen = "-" if koeffizient < 0 else "+"
+        teile.append(f"{vorzeichen} {betrag}{potenz}" if teile else f"{'-' if koeffizient < 0 else ''}{betrag}{potenz}")
+    return " ".join(teile) or "0"
+
+
+def analysieren(koeffizienten) -> Analyse:
+    """
+    Kurvendiskussion für ein Polynom oder viele Polynome gleicher Länge (eine Zeile pro
+    Polynom): Ableitungen, Nullstellen, Extrem- und Sattelpunkte (über den
+    Vorzeichenwechsel von f'), Wendepunkte (Vorzeichenwechsel von f'') und Monotonie.
+
+    Returns:
+        Analyse: Die Ergebnisse als Arrays
+    """
+    matrix = als_matrix(koeffizienten)
+    ableitung_1 = ableiten(matrix)
+    ableitung_2 = ableiten(ableitung_1)
+
+    kritisch = nullstellen(ableitung_1)
+    links, rechts = _vorzeichen_links_rechts(ableitung_1, kritisch)
+    extremart = np.where((links > 0) & (rechts < 0), HOCHPUNKT,
+                         np.where((links < 0) & (rechts > 0), TIEFPUNKT, SATTELPUNKT)).astype(np.int8)
+
+    wende = nullstellen(ableitung_2)
+    links, rechts = _vorzeichen_links_rechts(ableitung_2, wende)
+    wende = _kompakt(np.where(links * rechts < 0, wende, np.nan))
+
+    grenzen = _kompakt(np.where(extremart != SATTELPUNKT, kritisch, np.nan))
+    # Richtung links von allen kritischen Stellen (ohne kritische Stellen: bei x = 0)
+    links_aussen = np.where(np.isnan(kritisch[:, :1]), 0.0, kritisch[:, :1] - 1) if kritisch.shape[1] else \
+        np.zeros((len(matrix), 1))
+    monotonie_start = np.sign(auswerten(ableitung_1, links_aussen))[:, 0].astype(np.int8)
+
+    return Analyse(matrix, ableitung_1, ableitung_2, nullstellen(matrix),
+                   kritisch, auswerten(matrix, kritisch), extremart,
+                   wende, auswerten(matrix, wende), grenzen, monotonie_start)
+
+
+def uebungspolynome(anzahl: int, grad: int = 3, bereich: int = 4, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Übungspolynome mit ganzzahligen Nullstellen: a * (x - r1) * ... * (x - r_grad) mit
+    r aus [-bereich, bereich] und a aus {-2, -1, 1, 2}.
+
+    Returns:
+        np.ndarray: (anzahl, grad + 1) Koeffizienten, höchster Grad zuerst
+    """
+    rng = np.random.default_rng(seed)
+    polynome = rng.choice(np.array([-2.0, -1.0, 1.0, 2.0]), size=(anzahl, 1))
+    for nullstelle in rng.integers(-bereich, bereich, size=(grad, anzahl), endpoint=True):
+        # Mit (x - r) multiplizieren: Koeffizienten um eins verschieben minus r mal die alten
+        neu = np.zeros((anzahl, polynome.shape[1] + 1))
+        neu[:, :-1] = polynome
+        neu[:, 1:] -= polynome * nullstelle[:, None]
+        polynome = neu
+    return polynome
+
+
+def _vergleich_einzeln(polynome: np.ndarray, analyse: Analyse, toleranz: float = HAEUFUNG_TOLERANZ) -> int:
+    """
+    Private Methode zur internen Verwendung.
+    Rechnet Ableitungen und kritische Stellen pro Polynom mit np.polyder/np.roots nach.
+    np.roots trifft mehrfache Nullstellen nur auf etwa toleranz genau, daher der Vergleich
+    mit dieser Toleranz.
+
+    Returns:
+        int: Anzahl der Polynome, bei denen sich die Ergebnisse unterscheiden
+    """
+    abweichungen = 0
+    for i, polynom in enumerate(polynome):
+        ableitung_1 = np.polyder(polynom)
+        ableitung_2 = np.polyder(ableitung_1)
+        kritisch = np.roots(ableitung_1)
+        kritisch = kritisch[np.abs(kritisch.imag) <= toleranz].real
+        erwartet = np.sort(kritisch)
+        if len(erwartet) > 1:
+            erwartet = erwartet[np.r_[True, np.diff(erwartet) > toleranz]]
+        gefunden = analyse.extremstellen[i][~np.isnan(analyse.extremstellen[i])]
+        if (not np.array_equal(ableitung_1, analyse.ableitung_1[i][-len(ableitung_1):])
+                or not np.array_equal(ableitung_2, analyse.ableitung_2[i][-len(ableitung_2):])
+                or len(erwartet) != len(gefunden) or not np.allclose(erwartet, gefunden, atol=toleranz)):
+            abweichungen += 1
+    return abweichungen
+
+
+def _vergleich_nahe(anzahl: int, grad: int = 3, seed: Optional[int] = None) -> int:
+    """
+    Private Methode zur internen Verwendung.
+    Polynome mit zwei verschiedenen, nahe beieinander liegenden Nullstellen (Abstand 1e-4
+    bis 1e-2) und sonst ganzzahligen: nullstellen() darf sie nicht zu einer mitteln und
+    muss dieselben Nullstellen liefern wie np.roots pro Polynom.
+
+    Returns:
+        int: Anzahl der Polynome, bei denen sich die Ergebnisse unterscheiden
+    """
+    rng = np.random.default_rng(seed)
+    grad = max(grad, 2)
+    abweichungen = 0
+    for _ in range(anzahl):
+        nah = rng.uniform(-4, 4)
+        andere = rng.choice(np.arange(-4.5, 5), size=grad - 2, replace=False)
+        wurzeln = np.concatenate([[nah, nah + 10 ** rng.uniform(-4, -2)], andere])
+        polynom = np.poly(wurzeln)
+        erwartet = np.roots(polynom)
+        erwartet = np.unique(np.round(erwartet[np.abs(erwartet.imag) <= 1e-9].real, 9))
+        gefunden = nullstellen(polynom)[0]
+        gefunden = gefunden[~np.isnan(gefunden)]
+        if len(erwartet) != len(gefunden) or not np.allclose(erwartet, gefunden, atol=1e-7):
+            abweichungen += 1
+    return abweichungen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kurvendiskussion für viele Polynome")
+    parser.add_argument("--anzahl", type=int, default=100000)
+    parser.add_argument("--grad", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    argumente = parser.parse_args()
+
+    polynome = uebungspolynome(argumente.anzahl, argumente.grad, seed=argumente.seed)
+    start = time.perf_counter()
+    analyse = analysieren(polynome)
+    dauer = time.perf_counter() - start
+
+    stichprobe = min(argumente.anzahl, 10000)
+    start = time.perf_counter()
+    abweichungen = _vergleich_einzeln(polynome[:stichprobe], analyse)
+    dauer_einzeln = (time.perf_counter() - start) * argumente.anzahl / stichprobe
+
+    print(f"{argumente.anzahl} Polynome vom Grad {argumente.grad}:")
+    print(f"  analysieren (vektorisiert)        {dauer:8.3f}s")
+    print(f"  np.polyder/np.roots pro Polynom   {dauer_einzeln:8.3f}s (hochgerechnet, ohne Monotonie)")
+    print(f"  Abweichungen in {stichprobe} Stichproben: {abweichungen}")
+    print(f"  Abweichungen bei nahen Nullstellen: {_vergleich_nahe(1000, argumente.grad, argumente.seed)} von 1000")
+    print()
+    print(analyse.beschreibung(0))
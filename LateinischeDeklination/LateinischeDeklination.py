@@ -1,4 +1,11 @@
+#encoding: latin-1
+import os
 import random
+import sys
+
+# Gemeinsame Ein- und Ausgabe aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from EinAusgabe import KONSOLE
 
 # Funktion zum Laden der Deklinationen aus der externen Datei
 def lade_deklinationen_aus_datei(dateipfad):
@@ -17,9 +24,11 @@ def lade_deklinationen_aus_datei(dateipfad):
     return deklinationen
 
 # Lateinische Substantive und ihre Deklinationen
-deklinationen = lade_deklinationen_aus_datei("deklinationen.txt")
+# (neben diesem Skript, damit es auch aus einem anderen Verzeichnis importiert werden kann)
+deklinationen = lade_deklinationen_aus_datei(os.path.join(os.path.dirname(os.path.abspath(__file__)), "deklinationen.txt"))
 
-def lateinische_deklination_ueben():
+def lateinische_deklination_ueben(ea=None):
+    ea = ea or KONSOLE
     # Whle ein zuflliges Substantiv
     substantiv = random.choice(list(deklinationen.keys()))
 
@@ -27,20 +36,20 @@ def lateinische_deklination_ueben():
     korrekte_deklinationen = deklinationen[substantiv]
 
     # Zeige das ausgewhlte Substantiv an und fordere die Eingabe der Deklinationen
-    print(f"Deklination von: {substantiv}")
+    ea.ausgabe(f"Deklination von: {substantiv}")
     antworten = {}
     for fall in ["genitiv", "dativ", "akkusativ", "ablativ"]:
-        antworten[fall] = input(f"Gib die {fall} Form ein: ")
+        antworten[fall] = ea.eingabe(f"Gib die {fall} Form ein: ")
 
     # berprfe die eingegebenen Deklinationen
     richtig = True
     for fall, antwort in antworten.items():
         if antwort != korrekte_deklinationen[fall]:
             richtig = False
-            print(f"Falsch! Die richtige {fall} Form ist: {korrekte_deklinationen[fall]}")
+            ea.ausgabe(f"Falsch! Die richtige {fall} Form ist: {korrekte_deklinationen[fall]}")
 
     if richtig:
-        print("Richtig! Gut gemacht!")
+        ea.ausgabe("Richtig! Gut gemacht!")
 
 if __name__ == "__main__":
     while True:
@@ -0,0 +1,155 @@
+"""
+Gemeinsame Antwortprüfung für alle Lernprogramme.
+
+Die gespeicherte Antwort wird einmal in einen Schlüssel umgewandelt (normalisiert,
+Alternativen getrennt), die Eingabe bei jeder Antwort nur noch normalisiert und
+verglichen. Kleine Tippfehler werden über einen begrenzten Editierabstand erkannt.
+
+    >>> pruefen(schluessel("got/gotten"), "Gotten ")
+    Pruefergebnis(richtig=True, tippfehler=False, abstand=0)
+    >>> pruefen(schluessel("Schön"), "schoen")
+    Pruefergebnis(richtig=True, tippfehler=False, abstand=0)
+    >>> pruefen(schluessel("learnt; learned"), "learned/learnt")
+    Pruefergebnis(richtig=True, tippfehler=False, abstand=0)
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, NamedTuple
+
+# Trennzeichen zwischen den Alternativen im gespeicherten Schlüssel
+TRENNER = "|"
+
+UMLAUTE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+# Alternativen: "got/gotten", "Haus; Gebäude", "a | b" - aber nicht "3/4"
+_ALTERNATIVEN = re.compile(r"\s*(?:[;|]|(?<!\d)/|/(?!\d))\s*")
+_SATZZEICHEN = ".,:;!?\"'"
+
+
+class Pruefergebnis(NamedTuple):
+    richtig: bool      # richtig (auch mit erlaubtem Tippfehler)
+    tippfehler: bool   # nur wegen der Tippfehler-Toleranz richtig
+    abstand: int       # Editierabstand zur nächsten Alternative (über der Grenze: Grenze + 1)
+
+
+def normalisieren(text: str) -> str:
+    """
+    Bringt eine Antwort in eine vergleichbare Form: Unicode NFKC, casefold,
+    Umlaute als ae/oe/ue/ss, Leerraum zusammengefasst, Satzzeichen am Rand entfernt.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(UMLAUTE)
+    return " ".join(text.split()).strip(_SATZZEICHEN + " ")
+
+
+def alternativen(text: str) -> List[str]:
+    """
+    Returns:
+        List[str]: Die normalisierten Alternativen einer Antwort ("got/gotten" -> ["got", "gotten"])
+    """
+    teile = [normalisieren(teil) for teil in _ALTERNATIVEN.split(text)]
+    return [teil for teil in teile if teil] or [normalisieren(text)]
+
+
+@lru_cache(maxsize=65536)
+def schluessel(korrekte_antwort: str) -> str:
+    """
+    Der Schlüssel einer gespeicherten Antwort: alle Alternativen sortiert, getrennt durch
+    TRENNER ("gotten/got" und "got/gotten" ergeben denselben Schlüssel).
+    Wird beim Speichern berechnet (und für wiederholte Antworten zwischengespeichert).
+    """
+    return TRENNER.join(sorted(set(alternativen(korrekte_antwort))))
+
+
+def erlaubte_tippfehler(alternative: str) -> int:
+    """
+    Wie viele Tippfehler bei dieser Alternative noch als richtig zählen:
+    keine bei Zahlen und kurzen Wörtern ("Haus"/"Maus"), einer bis 8 Zeichen, sonst zwei.
+    """
+    if len(alternative) < 5 or any(zeichen.isdigit() for zeichen in alternative):
+        return 0
+    return 1 if len(alternative) <= 8 else 2
+
+
+def editierabstand(a: str, b: str, grenze: int) -> int:
+    """
+    Editierabstand (Einfügen, Löschen, Ersetzen, Vertauschen benachbarter Zeichen),
+    begrenzt: berechnet wird nur das Band |i - j| <= grenze der Tabelle, und sobald
+    eine ganze Zeile über grenze liegt, wird abgebrochen. Aufwand O(Länge * grenze).
+
+    Returns:
+        int: Der Abstand, oder grenze + 1 wenn er größer als grenze ist
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > grenze:
+        return grenze + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    zu_gross = grenze + 1
+    n = len(a)
+    vorvorige = None
+    vorige = [i if i <= grenze else zu_gross for i in range(n + 1)]
+    for j in range(1, len(b) + 1):
+        aktuelle = [zu_gross] * (n + 1)
+        if j <= grenze:
+            aktuelle[0] = j
+        zeichen_b = b[j - 1]
+        zeilen_minimum = aktuelle[0]
+        for i in range(max(1, j - grenze), min(n, j + grenze) + 1):
+            wert = vorige[i - 1] + (a[i - 1] != zeichen_b)
+            if vorige[i] + 1 < wert:
+                wert = vorige[i] + 1
+            if aktuelle[i - 1] + 1 < wert:
+                wert = aktuelle[i - 1] + 1
+            if (vorvorige is not None and i > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == zeichen_b and vorvorige[i - 2] + 1 < wert):
+                wert = vorvorige[i - 2] + 1
+            aktuelle[i] = min(wert, zu_gross)
+            if wert < zeilen_minimum:
+                zeilen_minimum = wert
+        # Keine spätere Zeile kann kleiner werden als das Minimum dieser Zeile
+        if zeilen_minimum > grenze:
+            return zu_gross
+        vorvorige, vorige = vorige, aktuelle
+    return min(vorige[n], zu_gross)
+
+
+def pruefen(gespeicherter_schluessel: str, benutzer_antwort: str) -> Pruefergebnis:
+    """
+    Prüft eine Eingabe gegen den Schlüssel einer gespeicherten Antwort.
+    Der Aufwand hängt nur von der Länge der Antworten ab, nicht von der Größe des Decks.
+
+    Args:
+        gespeicherter_schluessel: Ergebnis von schluessel(korrekte_antwort)
+        benutzer_antwort: Die Eingabe des Benutzers
+
+    Returns:
+        Pruefergebnis: richtig, tippfehler und abstand
+    """
+    eingabe = normalisieren(benutzer_antwort)
+    moeglich = gespeicherter_schluessel.split(TRENNER)
+    if eingabe in moeglich:
+        return Pruefergebnis(True, False, 0)
+    # Die ganze Antwort abgetippt ("got/gotten"): jeder Teil muss eine Alternative sein
+    if _ALTERNATIVEN.search(benutzer_antwort):
+        teile = alternativen(benutzer_antwort)
+        if all(teil in moeglich for teil in teile):
+            return Pruefergebnis(True, False, 0)
+
+    bester = None
+    for alternative in moeglich:
+        grenze = erlaubte_tippfehler(alternative)
+        abstand = editierabstand(eingabe, alternative, grenze)
+        if abstand <= grenze:
+            return Pruefergebnis(True, True, abstand)
+        bester = abstand if bester is None else min(bester, abstand)
+    return Pruefergebnis(False, False, bester)
+
+
+def antwort_pruefen(korrekte_antwort: str, benutzer_antwort: str) -> Pruefergebnis:
+    """
+    Kurzform für pruefen(schluessel(korrekte_antwort), benutzer_antwort).
+    """
+    return pruefen(schluessel(korrekte_antwort), benutzer_antwort)
@@ -0,0 +1,223 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple
+
+from Trainer import Trainer
+
+
+class AsyncTrainer:
+    """
+    Asyncio-Schnittstelle zum Trainer, damit ein Prozess viele Lernende gleichzeitig bedienen kann.
+    Lesende Datenbankzugriffe laufen auf einem begrenzten Thread-Pool, alle Antworten
+    werden von genau einem Schreiber-Thread gesammelt verbucht.
+    """
+
+    # Maximale Anzahl Antworten, die der Schreiber in einem Durchgang verbucht
+    MAX_SCHREIB_BLOCK = 1000
+
+    def __init__(self, db_name: str, table_name: str, max_leser: Optional[int] = None,
+                 trainer: Optional[Trainer] = None, **trainer_argumente):
+        """
+        Initialisiert den AsyncTrainer.
+
+        Args:
+            db_name: Name der SQLite Datenbankdatei
+            table_name: Name der Tabelle für dieses Themengebiet
+            max_leser: Anzahl Threads für Lesezugriffe (Standard: Größe des Leser-Pools)
+            trainer: Bereits vorhandener Trainer (optional, sonst wird einer erstellt)
+            trainer_argumente: Weitere Argumente für den Trainer (z.B. planer)
+        """
+        self.trainer = trainer if trainer is not None else Trainer(db_name, table_name, **trainer_argumente)
+        if max_leser is None:
+            max_leser = self.trainer.verbindungen.max_leser
+
+        self._leser = ThreadPoolExecutor(max_workers=max_leser, thread_name_prefix="trainer-leser")
+        self._schreiber = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trainer-schreiber")
+        self._warteschlange: Optional[asyncio.Queue] = None
+        self._schreib_task: Optional[asyncio.Task] = None
+
+    async def _lesen(self, funktion, *args, **kwargs):
+        """
+        Führt einen lesenden Trainer-Aufruf im Leser-Pool aus.
+        Private Methode zur internen Verwendung.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._leser, partial(funktion, *args, **kwargs))
+
+    async def _schreiben(self, funktion, *args, **kwargs):
+        """
+        Führt einen schreibenden Trainer-Aufruf im Schreiber-Thread aus.
+        Private Methode zur internen Verwendung.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._schreiber, partial(funktion, *args, **kwargs))
+
+    async def fragen(self, anzahl: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                     nur_faellige: bool = False) -> List[Tuple[int, str, str]]:
+        """
+        Holt Fragen für eine Übung (zufällig oder die fälligen Karten).
+
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort)
+        """
+        if nur_faellige:
+            return await self._lesen(self.trainer.naechste_faellige, anzahl, schwierigkeitsgrad)
+        return await self._lesen(self.trainer.stichprobe, anzahl, schwierigkeitsgrad)
+
+    async def antwort_abgeben(self, id: int, korrekte_antwort: str, benutzer_antwort: str) -> bool:
+        """
+        Prüft eine Antwort und verbucht sie über den Schreiber.
+        Die Coroutine endet, sobald die Antwort im Statistik-Puffer vorgemerkt ist.
+
+        Args:
+            id: ID der Frage
+            korrekte_antwort: Die gespeicherte Antwort
+            benutzer_antwort: Die Eingabe des Benutzers
+
+        Returns:
+            bool: True wenn die Antwort richtig war
+        """
+        richtig = self.trainer.antwort_pruefen(korrekte_antwort, benutzer_antwort)
+        await self.verbuchen(id, richtig)
+        return richtig
+
+    async def verbuchen(self, id: int, richtig: bool, qualitaet: Optional[int] = None):
+        """
+        Reiht eine bereits geprüfte Antwort beim Schreiber ein und wartet auf die Verbuchung.
+        """
+        if self._schreib_task is None:
+            self._warteschlange = asyncio.Queue()
+            self._schreib_task = asyncio.create_task(self._schreiber_schleife())
+
+        erledigt = asyncio.get_running_loop().create_future()
+        await self._warteschlange.put(((id, richtig, qualitaet), erledigt))
+        await erledigt
+
+    async def _schreiber_schleife(self):
+        """
+        Sammelt alle wartenden Antworten und verbucht sie mit einem Aufruf im Schreiber-Thread.
+        Private Methode zur internen Verwendung.
+        """
+        beenden = False
+        while not beenden:
+            block = [await self._warteschlange.get()]
+            while not self._warteschlange.empty() and len(block) < self.MAX_SCHREIB_BLOCK:
+                block.append(self._warteschlange.get_nowait())
+
+            # None ist das Signal zum Beenden (nach den bis dahin eingereihten Antworten)
+            if None in block:
+                block = [eintrag for eintrag in block if eintrag is not None]
+                beenden = True
+            if not block:
+                continue
+
+            try:
+                await self._schreiben(self.trainer.antworten_verbuchen, [antwort for antwort, _ in block])
+            except Exception as e:
+                for _, erledigt in block:
+                    if not erledigt.done():
+                        erledigt.set_exception(e)
+                continue
+
+            for _, erledigt in block:
+                if not erledigt.done():
+                    erledigt.set_result(None)
+
+    async def statistik(self) -> dict:
+        """
+        Returns:
+            dict: Die Statistiken des Themengebiets (siehe Trainer.statistik)
+        """
+        # statistik() schreibt vorher den Puffer, deshalb im Schreiber-Thread
+        return await self._schreiben(self.trainer.statistik)
+
+    def sitzung(self, anzahl_fragen: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                nur_faellige: bool = False) -> "UebungsSitzung":
+        """
+        Erstellt eine Übungssitzung, die unabhängig von input()/print() abläuft.
+        """
+        return UebungsSitzung(self, anzahl_fragen, schwierigkeitsgrad, nur_faellige)
+
+    async def schliessen(self):
+        """
+        Beendet den Schreiber, schreibt den Puffer und schließt den Trainer.
+        """
+        if self._schreib_task is not None:
+            await self._warteschlange.put(None)
+            await self._schreib_task
+            self._schreib_task = None
+
+        await self._schreiben(self.trainer.schliessen)
+        self._leser.shutdown()
+        self._schreiber.shutdown()
+
+
+class UebungsSitzung:
+    """
+    Eine Übung eines Lernenden: Fragen abholen, Antworten abgeben, Ergebnis abfragen.
+    Entspricht Trainer.ueben, aber ohne Terminal-Ein-/Ausgabe.
+    """
+
+    def __init__(self, async_trainer: AsyncTrainer, anzahl_fragen: int = 10,
+                 schwierigkeitsgrad: Optional[int] = None, nur_faellige: bool = False):
+        self.async_trainer = async_trainer
+        self.anzahl_fragen = anzahl_fragen
+        self.schwierigkeitsgrad = schwierigkeitsgrad
+        self.nur_faellige = nur_faellige
+
+        self.fragen: List[Tuple[int, str, str]] = []
+        self.position = 0
+        self.richtige_antworten = 0
+
+    async def starten(self) -> int:
+        """
+        Lädt die Fragen der Sitzung.
+
+        Returns:
+            int: Anzahl der Fragen in dieser Sitzung
+        """
+        self.fragen = await self.async_trainer.fragen(self.anzahl_fragen, self.schwierigkeitsgrad,
+                                                      self.nur_faellige)
+        self.position = 0
+        self.richtige_antworten = 0
+        return len(self.fragen)
+
+    @property
+    def beendet(self) -> bool:
+        return self.position >= len(self.fragen)
+
+    def aktuelle_frage(self) -> Optional[Tuple[int, str]]:
+        """
+        Returns:
+            Tuple: (id, frage) der aktuellen Frage oder None wenn die Sitzung beendet ist
+        """
+        if self.beendet:
+            return None
+        id, frage, _ = self.fragen[self.position]
+        return id, frage
+
+    async def antworten(self, benutzer_antwort: str) -> Tuple[bool, str]:
+        """
+        Beantwortet die aktuelle Frage und geht zur nächsten.
+
+        Returns:
+            Tuple: (richtig, korrekte_antwort)
+        """
+        if self.beendet:
+            raise RuntimeError("Die Sitzung ist bereits beendet.")
+
+        id, _, korrekte_antwort = self.fragen[self.position]
+        self.position += 1
+        richtig = await self.async_trainer.antwort_abgeben(id, korrekte_antwort, benutzer_antwort)
+        if richtig:
+            self.richtige_antworten += 1
+        return richtig, korrekte_antwort
+
+    def ergebnis(self) -> dict:
+        """
+        Returns:
+            dict: beantwortet, richtig und prozent der bisherigen Sitzung
+        """
+        prozent = self.richtige_antworten / self.position * 100 if self.position else 0.0
+        return {"beantwortet": self.position, "richtig": self.richtige_antworten, "prozent": prozent}
@@ -0,0 +1,646 @@
+"""
+Messungen für den Trainer.
+
+Aufruf:
+    python Benchmark.py stichprobe [--groessen 10000 100000 1000000]
+    python Benchmark.py stress [--threads 16] [--sekunden 5] [--zeilen 100000]
+    python Benchmark.py async [--sitzungen 2000] [--fragen 10] [--zeilen 100000]
+    python Benchmark.py server [--clients 16] [--sekunden 5] [--fragen 10] [--einzeln]
+    python Benchmark.py suche [--zeilen 1000000]
+    python Benchmark.py messung [--zeilen 100000] [--runden 20000]
+    python Benchmark.py cache [--zeilen 1000000]
+    python Benchmark.py sicherung [--zeilen 200000]
+    python Benchmark.py foederation [--themen 50] [--dateien 5] [--zeilen 20000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import sqlite3
+
+from AsyncTrainer import AsyncTrainer
+from FoederierterTrainer import FoederierterTrainer
+from Messung import Messung, MessVerbindung
+from QuizServer import QuizClient, QuizServer
+from Sicherung import Sicherung, bericht_ausgeben
+from Trainer import Trainer
+from Verbindungsmanager import Verbindungsmanager
+
+
+def _testdatenbank(verzeichnis: str, anzahl: int, table_name: str = "benchmark",
+                   verbindungsmanager=None) -> Trainer:
+    """
+    Legt eine Datenbank mit anzahl zufälligen Fragen an (Schwierigkeitsgrad 1-5).
+    """
+    trainer = Trainer(os.path.join(verzeichnis, f"benchmark_{anzahl}.db"), table_name,
+                      verbindungsmanager=verbindungsmanager)
+    trainer.speichern_viele(((f"Frage {i}", f"Antwort {i}", random.randint(1, 5)) for i in range(anzahl)),
+                            eine_transaktion=True)
+    return trainer
+
+
+def _messen(funktion, wiederholungen: int) -> float:
+    """
+    Returns:
+        float: Median der Laufzeit in Millisekunden
+    """
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append((time.perf_counter() - start) * 1000)
+    return statistics.median(zeiten)
+
+
+def benchmark_stichprobe(groessen, anzahl_fragen: int = 10, wiederholungen: int = 5):
+    """
+    Vergleicht die alte Auswahl (lesen() + random.sample) mit Trainer.stichprobe.
+    """
+    print(f"{'Zeilen':>10} | {'alt (ms)':>10} | {'neu (ms)':>10} | {'alt, Grad 3':>12} | {'neu, Grad 3':>12}")
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for groesse in groessen:
+            trainer = _testdatenbank(verzeichnis, groesse)
+
+            alt = _messen(lambda: random.sample(trainer.lesen(), anzahl_fragen), wiederholungen)
+            neu = _messen(lambda: trainer.stichprobe(anzahl_fragen), wiederholungen)
+            alt_grad = _messen(lambda: random.sample(trainer.lesen(schwierigkeitsgrad=3), anzahl_fragen),
+                               wiederholungen)
+            neu_grad = _messen(lambda: trainer.stichprobe(anzahl_fragen, schwierigkeitsgrad=3), wiederholungen)
+
+            print(f"{groesse:>10} | {alt:>10.2f} | {neu:>10.2f} | {alt_grad:>12.2f} | {neu_grad:>12.2f}")
+            trainer.schliessen()
+
+
+def _perzentil(werte, p: float) -> float:
+    """
+    Returns:
+        float: Das p-Perzentil (0-100) der Werte
+    """
+    if not werte:
+        return 0.0
+    werte = sorted(werte)
+    return werte[min(len(werte) - 1, int(len(werte) * p / 100))]
+
+
+def benchmark_stress(threads: int = 16, sekunden: float = 5.0, zeilen: int = 100000):
+    """
+    Viele Threads lesen (Stichproben, fällige Karten) und beantworten gleichzeitig Fragen.
+    Verglichen wird der gemeinsame Verbindungsmanager (WAL) mit einer eigenen
+    Verbindung pro Trainer im klassischen Rollback-Journal-Modus.
+    Am Ende wird geprüft, dass keine Antwort verloren gegangen ist.
+    """
+    ohne_wal = dict(Verbindungsmanager.STANDARD_PRAGMAS, journal_mode="DELETE", synchronous="FULL")
+
+    for modus in ("gemeinsam (WAL)", "getrennt (Rollback-Journal)"):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            gemeinsam = modus.startswith("gemeinsam")
+            vorlage = Verbindungsmanager(os.path.join(verzeichnis, f"benchmark_{zeilen}.db"),
+                                         pragmas=None if gemeinsam else ohne_wal)
+            trainer = _testdatenbank(verzeichnis, zeilen, verbindungsmanager=vorlage)
+            trainer.schliessen()
+            vorlage.schliessen()
+            db_name = os.path.join(verzeichnis, f"benchmark_{zeilen}.db")
+
+            antworten = [0] * threads
+            latenzen = [[] for _ in range(threads)]
+            ende = time.perf_counter() + sekunden
+
+            def lernender(nummer: int):
+                if gemeinsam:
+                    t = Trainer(db_name, "benchmark")
+                    manager = None
+                else:
+                    manager = Verbindungsmanager(db_name, max_leser=1, pragmas=ohne_wal)
+                    t = Trainer(db_name, "benchmark", verbindungsmanager=manager)
+                durchlauf = 0
+                while time.perf_counter() < ende:
+                    start = time.perf_counter()
+                    if durchlauf % 10 == 0:
+                        fragen = t.naechste_faellige(5)
+                    else:
+                        fragen = t.stichprobe(5)
+                    for id, frage, antwort in fragen:
+                        richtig = random.random() < 0.7
+                        t.antwort_verbuchen(id, richtig)
+                        antworten[nummer] += 1
+                    latenzen[nummer].append((time.perf_counter() - start) * 1000)
+                    durchlauf += 1
+                t.schliessen()
+                if manager is not None:
+                    manager.schliessen()
+
+            start = time.perf_counter()
+            arbeiter = [threading.Thread(target=lernender, args=(i,)) for i in range(threads)]
+            for thread in arbeiter:
+                thread.start()
+            for thread in arbeiter:
+                thread.join()
+            dauer = time.perf_counter() - start
+
+            pruefer = Trainer(db_name, "benchmark")
+            with pruefer.verbindungen.lesen() as verbindung:
+                gespeichert = verbindung.execute(
+                    "SELECT SUM(richtig_beantwortet + falsch_beantwortet) FROM benchmark").fetchone()[0]
+            pruefer.schliessen()
+
+            alle_latenzen = [wert for liste in latenzen for wert in liste]
+            print(f"\n=== {modus}: {threads} Threads, {zeilen} Zeilen ===")
+            print(f"Antworten: {sum(antworten)} ({sum(antworten) / dauer:.0f}/s), gespeichert: {gespeichert}")
+            print(f"Latenz pro Runde (5 Fragen): p50 {_perzentil(alle_latenzen, 50):.2f} ms, "
+                  f"p99 {_perzentil(alle_latenzen, 99):.2f} ms")
+            if gespeichert != sum(antworten):
+                print("WARNUNG: Es sind Antworten verloren gegangen!")
+
+
+async def _async_last(db_name: str, sitzungen: int, fragen: int):
+    """
+    Lässt alle Sitzungen gleichzeitig auf einem AsyncTrainer laufen.
+    Private Funktion zur internen Verwendung.
+    """
+    async_trainer = AsyncTrainer(db_name, "benchmark")
+    latenzen = []
+
+    async def lernender():
+        sitzung = async_trainer.sitzung(fragen)
+        await sitzung.starten()
+        while not sitzung.beendet:
+            korrekt = sitzung.fragen[sitzung.position][2]
+            eingabe = korrekt if random.random() < 0.7 else "falsch"
+            start = time.perf_counter()
+            await sitzung.antworten(eingabe)
+            latenzen.append((time.perf_counter() - start) * 1000)
+        return sitzung.position
+
+    start = time.perf_counter()
+    beantwortet = sum(await asyncio.gather(*(lernender() for _ in range(sitzungen))))
+    dauer = time.perf_counter() - start
+    await async_trainer.schliessen()
+    return beantwortet, dauer, latenzen
+
+
+def benchmark_async(sitzungen: int = 2000, fragen: int = 10, zeilen: int = 100000):
+    """
+    Simuliert viele gleichzeitige Übungssitzungen auf einem AsyncTrainer und
+    misst Antworten pro Sekunde sowie die Latenz bis eine Antwort verbucht ist.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = _testdatenbank(verzeichnis, zeilen)
+        db_name = trainer.db_name
+        trainer.schliessen()
+
+        beantwortet, dauer, latenzen = asyncio.run(_async_last(db_name, sitzungen, fragen))
+
+        pruefer = Trainer(db_name, "benchmark")
+        with pruefer.verbindungen.lesen() as verbindung:
+            gespeichert = verbindung.execute(
+                "SELECT SUM(richtig_beantwortet + falsch_beantwortet) FROM benchmark").fetchone()[0]
+        pruefer.schliessen()
+
+    print(f"=== AsyncTrainer: {sitzungen} Sitzungen x {fragen} Fragen, {zeilen} Zeilen ===")
+    print(f"Antworten: {beantwortet} ({beantwortet / dauer:.0f}/s), gespeichert: {gespeichert}")
+    print(f"Latenz pro Antwort: p50 {_perzentil(latenzen, 50):.2f} ms, "
+          f"p99 {_perzentil(latenzen, 99):.2f} ms")
+    if gespeichert != beantwortet:
+        print("WARNUNG: Es sind Antworten verloren gegangen!")
+
+
+def benchmark_server(clients: int = 16, sekunden: float = 5.0, fragen: int = 10,
+                     zeilen: int = 100000, einzeln: bool = False):
+    """
+    Lasttest für den QuizServer, komplett lokal: Server im Hintergrund-Thread,
+    jeder Client holt über eine keep-alive Verbindung Fragen und schickt die
+    Antworten gesammelt (oder mit einzeln=True jede für sich) zurück.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = _testdatenbank(verzeichnis, zeilen)
+        db_name = trainer.db_name
+        trainer.schliessen()
+
+        server = QuizServer(db_name, port=0)
+        server.starten(im_hintergrund=True)
+        host, port = server.adresse
+
+        antworten = [0] * clients
+        latenzen_fragen = [[] for _ in range(clients)]
+        latenzen_antworten = [[] for _ in range(clients)]
+        ende = time.perf_counter() + sekunden
+
+        def client(nummer: int):
+            quiz = QuizClient(host, port, "benchmark")
+            while time.perf_counter() < ende:
+                start = time.perf_counter()
+                auswahl = quiz.naechste_fragen(fragen)
+                latenzen_fragen[nummer].append((time.perf_counter() - start) * 1000)
+
+                # Antworten haben die Form "Antwort <n>" zu "Frage <n>"
+                abgaben = [{"id": f["id"],
+                            "antwort": f["frage"].replace("Frage", "Antwort") if random.random() < 0.7 else "?"}
+                           for f in auswahl]
+                for block in ([abgaben] if not einzeln else [[a] for a in abgaben]):
+                    start = time.perf_counter()
+                    quiz.antworten_abgeben(block)
+                    latenzen_antworten[nummer].append((time.perf_counter() - start) * 1000)
+                antworten[nummer] += len(abgaben)
+            quiz.schliessen()
+
+        start = time.perf_counter()
+        arbeiter = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in arbeiter:
+            thread.start()
+        for thread in arbeiter:
+            thread.join()
+        dauer = time.perf_counter() - start
+
+        cache = server.cache.zaehler()
+        server.beenden()
+
+        pruefer = Trainer(db_name, "benchmark")
+        with pruefer.verbindungen.lesen() as verbindung:
+            gespeichert = verbindung.execute(
+                "SELECT SUM(richtig_beantwortet + falsch_beantwortet) FROM benchmark").fetchone()[0]
+        pruefer.schliessen()
+
+    anfragen = sum(map(len, latenzen_fragen)) + sum(map(len, latenzen_antworten))
+    print(f"=== QuizServer: {clients} Clients, {fragen} Fragen pro Runde, "
+          f"Antworten {'einzeln' if einzeln else 'gesammelt'} ===")
+    print(f"Anfragen: {anfragen} ({anfragen / dauer:.0f}/s), "
+          f"Antworten: {sum(antworten)} ({sum(antworten) / dauer:.0f}/s), gespeichert: {gespeichert}")
+    for name, latenzen in (("GET fragen", latenzen_fragen), ("POST antworten", latenzen_antworten)):
+        werte = [wert for liste in latenzen for wert in liste]
+        print(f"{name:>15}: p50 {_perzentil(werte, 50):.2f} ms, p95 {_perzentil(werte, 95):.2f} ms, "
+              f"p99 {_perzentil(werte, 99):.2f} ms")
+    print(f"Cache: {cache['treffer']} Treffer, {cache['fehlgriffe']} Fehlgriffe")
+    if gespeichert != sum(antworten):
+        print("WARNUNG: Es sind Antworten verloren gegangen!")
+
+
+def _kunstwort(zufall: random.Random) -> str:
+    """
+    Ein Zufallswort aus 4-10 Buchstaben, ungefähr mit deutscher Buchstabenhäufigkeit.
+    Private Funktion zur internen Verwendung.
+    """
+    buchstaben = "eeeeeeennnnnniiiiiisssssrrrrrraaaaatttttddddhhhhuuuulllccgggmmoobbwwffkkzpvjyxq"
+    return "".join(zufall.choice(buchstaben) for _ in range(zufall.randint(4, 10)))
+
+
+def benchmark_suche(zeilen: int = 1000000, wiederholungen: int = 20):
+    """
+    Misst Trainer.suchen (Wort, Präfix, mit Tippfehler) auf einem Deck mit
+    Zufallswörtern und vergleicht mit einer LIKE-Suche über die ganze Tabelle.
+    """
+    zufall = random.Random(1)
+    woerter = list({_kunstwort(zufall) for _ in range(50000)})
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = Trainer(os.path.join(verzeichnis, "suche.db"), "benchmark")
+        start = time.perf_counter()
+        trainer.speichern_viele(((" ".join(zufall.choices(woerter, k=4)), " ".join(zufall.choices(woerter, k=2)),
+                                  zufall.randint(1, 5)) for _ in range(zeilen)), eine_transaktion=True)
+        print(f"Import mit Suchindex: {zeilen / (time.perf_counter() - start):.0f} Zeilen/s")
+
+        def tippfehler(wort):
+            i = zufall.randrange(1, len(wort) - 1)
+            return wort[:i] + zufall.choice("aeinrst".replace(wort[i], "")) + wort[i + 1:]
+
+        def vertauscht(wort):
+            i = zufall.randrange(1, len(wort) - 1)
+            return wort[:i - 1] + wort[i] + wort[i - 1] + wort[i + 1:]
+
+        for name, fehler in (("falscher Buchstabe", tippfehler), ("vertauschte Buchstaben", vertauscht)):
+            gefunden = 0
+            for _ in range(200):
+                wort = zufall.choice(woerter)
+                treffer = trainer.unscharf_suchen(fehler(wort))
+                gefunden += any(wort in f"{frage} {antwort}".split() for _, frage, antwort in treffer)
+            print(f"Unscharf, {name}: in {gefunden / 2:.0f}% der Fälle ist das richtige Wort unter den Treffern")
+
+        faelle = {
+            "Wort": lambda: trainer.suchen(zufall.choice(woerter), unscharf=False),
+            "Präfix (4 Zeichen)": lambda: trainer.suchen(zufall.choice(woerter)[:4], unscharf=False),
+            "zwei Wörter": lambda: trainer.suchen(" ".join(zufall.choices(woerter, k=2)), unscharf=False),
+            "Tippfehler": lambda: trainer.unscharf_suchen(tippfehler(zufall.choice(woerter))),
+        }
+        for name, funktion in faelle.items():
+            print(f"{name:>20}: {_messen(funktion, wiederholungen):8.2f} ms (Median)")
+
+        def like_suche():
+            with trainer.verbindungen.lesen() as verbindung:
+                muster = f"%{zufall.choice(woerter)}%"
+                verbindung.execute("SELECT id, frage, antwort FROM benchmark WHERE frage LIKE ? OR antwort LIKE ? "
+                                   "LIMIT 20", (muster, muster)).fetchall()
+
+        print(f"{'LIKE %wort%':>20}: {_messen(like_suche, 3):8.2f} ms (Median)")
+        trainer.schliessen()
+
+
+class _EinfacheVerbindung(sqlite3.Connection):
+    """
+    sqlite3.Connection ohne überschriebene Methoden, als Vergleich für benchmark_messung.
+    """
+    messung = None
+
+
+def benchmark_messung(zeilen: int = 100000, runden: int = 20000):
+    """
+    Misst den Aufwand der Messung: gleiche Arbeit (Stichprobe + Antworten verbuchen)
+    mit einfachen sqlite3-Verbindungen, mit MessVerbindung ohne Messung und mit Messung.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = _testdatenbank(verzeichnis, zeilen)
+        db_name = trainer.db_name
+        trainer.schliessen()
+
+        varianten = (("sqlite3.Connection", _EinfacheVerbindung, None),
+                     ("Messung aus", MessVerbindung, None),
+                     ("Messung an", MessVerbindung, Messung(langsam_ms=50)))
+        ergebnisse = {}
+        for name, klasse, messung in varianten:
+            Verbindungsmanager.VERBINDUNGSKLASSE = klasse
+            trainer = Trainer(db_name, "benchmark", messung=messung)
+            zeiten = []
+            for _ in range(runden):
+                start = time.perf_counter()
+                fragen = trainer.stichprobe(5)
+                trainer.antworten_verbuchen((id, True) for id, _, _ in fragen)
+                zeiten.append((time.perf_counter() - start) * 1e6)
+            trainer.schliessen()
+            ergebnisse[name] = statistics.median(zeiten)
+        Verbindungsmanager.VERBINDUNGSKLASSE = MessVerbindung
+
+    basis = ergebnisse["sqlite3.Connection"]
+    for name, wert in ergebnisse.items():
+        print(f"{name:>20}: {wert:8.1f} µs pro Runde (Median), {(wert / basis - 1) * 100:+5.1f}%")
+
+
+def _speicher_messen(funktion):
+    """
+    Returns:
+        Tuple: (Ergebnis von funktion(), belegter Speicher des Ergebnisses in Bytes)
+    """
+    tracemalloc.start()
+    vorher = tracemalloc.get_traced_memory()[0]
+    ergebnis = funktion()
+    belegt = tracemalloc.get_traced_memory()[0] - vorher
+    tracemalloc.stop()
+    return ergebnis, belegt
+
+
+def benchmark_cache(zeilen: int = 1000000, wiederholungen: int = 200):
+    """
+    Speicher pro Karte: Tupel aus lesen() gegen den spaltenweisen DeckCache,
+    und Stichproben/Filter aus dem Cache gegen SQLite.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = _testdatenbank(verzeichnis, zeilen)
+        db_name = trainer.db_name
+
+        tupel, tupel_bytes = _speicher_messen(trainer.lesen)
+        del tupel
+        spalten = ("id", "frage", "antwort", "schwierigkeitsgrad", "richtig_beantwortet",
+                   "falsch_beantwortet", "erstellt_am")
+        tupel7, tupel7_bytes = _speicher_messen(lambda: list(trainer.lesen_stream(spalten=spalten)))
+        del tupel7
+        trainer.schliessen()
+
+        trainer = Trainer(db_name, "benchmark", deck_cache=True)
+        start = time.perf_counter()
+        _, cache_bytes = _speicher_messen(trainer.deck_cache.laden)
+        ladezeit = time.perf_counter() - start
+
+        print(f"{'Darstellung':>28} | {'MB':>8} | {'Bytes/Karte':>11}")
+        for name, belegt in ((f"lesen() ({len(trainer.SPALTEN)}-Tupel)", tupel_bytes),
+                             (f"{len(spalten)}-Tupel", tupel7_bytes),
+                             ("DeckCache (tracemalloc)", cache_bytes),
+                             ("DeckCache (Spalten)", trainer.deck_cache.speicherbedarf())):
+            print(f"{name:>28} | {belegt / 1e6:>8.1f} | {belegt / zeilen:>11.1f}")
+        print(f"Laden des Caches: {ladezeit:.2f}s (mit tracemalloc)")
+
+        ohne_cache = Trainer(db_name, "benchmark")
+        messungen = (
+            ("stichprobe(10)", lambda t: t.stichprobe(10)),
+            ("stichprobe(10, Grad 3)", lambda t: t.stichprobe(10, schwierigkeitsgrad=3)),
+        )
+        print(f"\n{'':>28} | {'SQLite (ms)':>11} | {'Cache (ms)':>11}")
+        for name, funktion in messungen:
+            sqlite_ms = _messen(lambda: funktion(ohne_cache), wiederholungen)
+            cache_ms = _messen(lambda: funktion(trainer), wiederholungen)
+            print(f"{name:>28} | {sqlite_ms:>11.3f} | {cache_ms:>11.3f}")
+        filter_ms = _messen(lambda: trainer.deck_cache.filtern(schwierigkeitsgrad=3, nur_unbeantwortet=True), 5)
+        print(f"{'filtern(Grad 3, neu)':>28} | {'':>11} | {filter_ms:>11.3f}")
+        ohne_cache.schliessen()
+        trainer.schliessen()
+
+
+def benchmark_sicherung(zeilen: int = 200000):
+    """
+    Sicherung, Snapshot und Kompaktierung, während ein Thread wie ueben() Antworten
+    verbucht und schreibt. Gemessen wird, wie lange eine Übungsrunde dabei höchstens dauert.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        trainer = _testdatenbank(verzeichnis, zeilen)
+        sicherung = Sicherung(trainer.db_name)
+        runden = []
+        stopp = threading.Event()
+
+        def ueben():
+            while not stopp.is_set():
+                start = time.perf_counter()
+                fragen = trainer.stichprobe(10)
+                trainer.antworten_verbuchen((id, random.random() < 0.7) for id, _, _ in fragen)
+                trainer.statistik_puffer.flush()
+                runden.append((start, (time.perf_counter() - start) * 1000))
+                time.sleep(0.001)
+
+        def runden_waehrend(aufgabe):
+            start = time.perf_counter()
+            ergebnis = aufgabe()
+            ende = time.perf_counter()
+            zeiten = [dauer for zeitpunkt, dauer in list(runden) if start <= zeitpunkt <= ende]
+            if zeiten:
+                print(f"    {len(zeiten)} Übungsrunden, p50 {_perzentil(zeiten, 50):.1f} ms, "
+                      f"p99 {_perzentil(zeiten, 99):.1f} ms, max {max(zeiten):.1f} ms")
+            return ergebnis
+
+        thread = threading.Thread(target=ueben)
+        thread.start()
+        try:
+            print("Ohne Sicherung:")
+            runden_waehrend(lambda: time.sleep(1))
+
+            for seiten in (-1, 1024, 128):
+                ziel = os.path.join(verzeichnis, f"sicherung_{seiten}.db")
+                print(f"Sicherung, {'alles auf einmal' if seiten < 0 else f'{seiten} Seiten pro Schritt'}:")
+                bericht_ausgeben(runden_waehrend(lambda: sicherung.sichern(ziel, seiten_pro_schritt=seiten)))
+                with sqlite3.connect(ziel) as kopie:
+                    anzahl, antworten = kopie.execute(
+                        "SELECT COUNT(*), SUM(richtig_beantwortet + falsch_beantwortet) FROM benchmark").fetchone()
+                print(f"    Sicherung: {anzahl} Fragen, {antworten} verbuchte Antworten")
+
+            print("Snapshot:")
+            bericht_ausgeben(runden_waehrend(lambda: sicherung.snapshot(os.path.join(verzeichnis, "snapshot.db"))))
+
+            # Ein zusammenhängender ID-Bereich, damit ganze Seiten frei werden (jede dritte
+            # Zeile zu löschen ließe nur halb leere Seiten zurück, die kompaktieren nicht freigibt)
+            with trainer.verbindungen.schreiben() as verbindung:
+                groesste_id = verbindung.execute("SELECT MAX(id) FROM benchmark").fetchone()[0]
+                verbindung.execute("DELETE FROM benchmark WHERE id > ? AND id <= ?",
+                                   (groesste_id // 3, 2 * groesste_id // 3))
+                verbindung.commit()
+            print("Kompaktierung nach dem Löschen eines Drittels:")
+            bericht_ausgeben(runden_waehrend(lambda: sicherung.kompaktieren(seiten_pro_schritt=128)))
+        finally:
+            stopp.set()
+            thread.join()
+            sicherung.schliessen()
+            trainer.schliessen()
+
+
+def _anweisungen(messung: Messung) -> int:
+    """
+    Returns:
+        int: Anzahl der bisher gemessenen SQL-Anweisungen
+    """
+    return sum(werte["anzahl"] for werte in messung.metriken()["sql"].values())
+
+
+def benchmark_foederation(themen: int = 50, dateien: int = 5, zeilen: int = 20000,
+                          fragen: int = 20, wiederholungen: int = 50):
+    """
+    Gemischte Wiederholung über viele Themengebiete: ein Trainer pro Themengebiet
+    (je eine Abfrage) gegen den FoederiertenTrainer (eine Abfrage über alle).
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        quellen = [(os.path.join(verzeichnis, f"themen_{i % dateien}.db"), f"thema_{i}") for i in range(themen)]
+        verbindungen = {}
+        einzeln = []
+        for db_name, table_name in quellen:
+            if db_name not in verbindungen:
+                verbindungen[db_name] = Verbindungsmanager(db_name)
+            trainer = Trainer(db_name, table_name, verbindungsmanager=verbindungen[db_name])
+            trainer.speichern_viele(((f"{table_name} Frage {i}", f"Antwort {i}", random.randint(1, 5))
+                                     for i in range(zeilen)), eine_transaktion=True)
+            einzeln.append(trainer)
+
+        messung = Messung()
+        for manager in verbindungen.values():
+            manager.messung_setzen(messung)
+        foederiert = FoederierterTrainer(quellen, messung=messung)
+
+        def gemischt_einzeln(funktion):
+            ergebnis = []
+            for quelle, anzahl in Counter(random.choices(range(themen), k=fragen)).items():
+                ergebnis += funktion(einzeln[quelle], anzahl)
+            return ergebnis
+
+        messungen = (
+            (f"stichprobe({fragen})",
+             lambda: gemischt_einzeln(lambda t, k: t.stichprobe(k)),
+             lambda: foederiert.stichprobe(fragen)),
+            (f"stichprobe({fragen}, Grad 3)",
+             lambda: gemischt_einzeln(lambda t, k: t.stichprobe(k, schwierigkeitsgrad=3)),
+             lambda: foederiert.stichprobe(fragen, schwierigkeitsgrad=3)),
+            (f"naechste_faellige({fragen})",
+             lambda: [t.naechste_faellige(fragen) for t in einzeln],
+             lambda: foederiert.naechste_faellige(fragen)),
+            ("statistik()",
+             lambda: [t.statistik() for t in einzeln],
+             foederiert.statistik),
+        )
+        print(f"{themen} Themengebiete in {dateien} Dateien, je {zeilen} Fragen\n")
+        print(f"{'':>26} | {'einzeln (ms)':>12} | {'Anweisungen':>11} | {'föderiert (ms)':>14} | {'Anweisungen':>11}")
+        for name, ohne, mit in messungen:
+            vorher = _anweisungen(messung)
+            ohne_ms = _messen(ohne, wiederholungen)
+            ohne_anweisungen = (_anweisungen(messung) - vorher) / wiederholungen
+            vorher = _anweisungen(messung)
+            mit_ms = _messen(mit, wiederholungen)
+            mit_anweisungen = (_anweisungen(messung) - vorher) / wiederholungen
+            print(f"{name:>26} | {ohne_ms:>12.2f} | {ohne_anweisungen:>11.1f} | "
+                  f"{mit_ms:>14.2f} | {mit_anweisungen:>11.1f}")
+
+        # Antworten über alle Quellen verbuchen und gegen die Statistik der Einzel-Trainer prüfen
+        auswahl = foederiert.stichprobe(1000)
+        foederiert.antworten_verbuchen((quelle, id, random.random() < 0.7) for quelle, id, _, _ in auswahl)
+        quellen_statistik = foederiert.statistik()["quellen"]
+        abweichend = [quelle.name for quelle, trainer in zip(foederiert.quellen, einzeln)
+                      if trainer.statistik() != quellen_statistik[quelle.name]]
+        print(f"\n{len(auswahl)} Antworten verbucht, Statistik pro Quelle "
+              f"{'stimmt' if not abweichend else f'weicht ab: {abweichend}'}")
+
+        foederiert.schliessen()
+        for trainer in einzeln:
+            trainer.schliessen()
+        for manager in verbindungen.values():
+            manager.schliessen()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Messungen für den Trainer")
+    unterbefehle = parser.add_subparsers(dest="befehl", required=True)
+
+    stichprobe = unterbefehle.add_parser("stichprobe", help="lesen()+random.sample gegen stichprobe()")
+    stichprobe.add_argument("--groessen", type=int, nargs="+", default=[10000, 100000, 1000000])
+    stichprobe.add_argument("--anzahl", type=int, default=10)
+
+    stress = unterbefehle.add_parser("stress", help="viele Threads lesen und antworten gleichzeitig")
+    stress.add_argument("--threads", type=int, default=16)
+    stress.add_argument("--sekunden", type=float, default=5.0)
+    stress.add_argument("--zeilen", type=int, default=100000)
+
+    async_last = unterbefehle.add_parser("async", help="viele gleichzeitige Sitzungen auf dem AsyncTrainer")
+    async_last.add_argument("--sitzungen", type=int, default=2000)
+    async_last.add_argument("--fragen", type=int, default=10)
+    async_last.add_argument("--zeilen", type=int, default=100000)
+
+    server = unterbefehle.add_parser("server", help="Lasttest für den HTTP/JSON Quiz-Server")
+    server.add_argument("--clients", type=int, default=16)
+    server.add_argument("--sekunden", type=float, default=5.0)
+    server.add_argument("--fragen", type=int, default=10)
+    server.add_argument("--zeilen", type=int, default=100000)
+    server.add_argument("--einzeln", action="store_true", help="jede Antwort mit eigener Anfrage schicken")
+
+    suche = unterbefehle.add_parser("suche", help="Volltext- und unscharfe Suche")
+    suche.add_argument("--zeilen", type=int, default=1000000)
+
+    messung = unterbefehle.add_parser("messung", help="Aufwand der Messung (aus/an)")
+    messung.add_argument("--zeilen", type=int, default=100000)
+    messung.add_argument("--runden", type=int, default=20000)
+
+    cache = unterbefehle.add_parser("cache", help="Speicher und Stichproben des DeckCaches")
+    cache.add_argument("--zeilen", type=int, default=1000000)
+
+    sicherung = unterbefehle.add_parser("sicherung", help="Sicherung/Snapshot/Kompaktierung während geübt wird")
+    sicherung.add_argument("--zeilen", type=int, default=200000)
+
+    foederation = unterbefehle.add_parser("foederation", help="gemischte Wiederholung über viele Themengebiete")
+    foederation.add_argument("--themen", type=int, default=50)
+    foederation.add_argument("--dateien", type=int, default=5)
+    foederation.add_argument("--zeilen", type=int, default=20000)
+
+    argumente = parser.parse_args()
+    if argumente.befehl == "stichprobe":
+        benchmark_stichprobe(argumente.groessen, argumente.anzahl)
+    elif argumente.befehl == "stress":
+        benchmark_stress(argumente.threads, argumente.sekunden, argumente.zeilen)
+    elif argumente.befehl == "async":
+        benchmark_async(argumente.sitzungen, argumente.fragen, argumente.zeilen)
+    elif argumente.befehl == "server":
+        benchmark_server(argumente.clients, argumente.sekunden, argumente.fragen,
+                         argumente.zeilen, argumente.einzeln)
+    elif argumente.befehl == "suche":
+        benchmark_suche(argumente.zeilen)
+    elif argumente.befehl == "messung":
+        benchmark_messung(argumente.zeilen, argumente.runden)
+    elif argumente.befehl == "cache":
+        benchmark_cache(argumente.zeilen)
+    elif argumente.befehl == "sicherung":
+        benchmark_sicherung(argumente.zeilen)
+    elif argumente.befehl == "foederation":
+        benchmark_foederation(argumente.themen, argumente.dateien, argumente.zeilen)
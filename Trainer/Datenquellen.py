@@ -0,0 +1,259 @@
+import csv
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Ein Datensatz für den Trainer: (frage, antwort, schwierigkeitsgrad)
+Datensatz = Tuple[str, str, int]
+
+# Eine Abbildung macht aus einer Rohzeile der Quelle null, einen oder mehrere Datensätze
+Abbildung = Callable[[object], Iterable[Datensatz]]
+
+
+def lese_zeilen(dateipfad: str, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Liest eine Textdatei Zeile für Zeile (ohne die ganze Datei zu laden).
+    Leere Zeilen werden übersprungen.
+
+    Args:
+        dateipfad: Pfad zur Textdatei
+        encoding: Zeichenkodierung der Datei
+
+    Yields:
+        str: Die Zeile ohne führende und abschließende Leerzeichen
+    """
+    with open(dateipfad, "r", encoding=encoding) as datei:
+        for zeile in datei:
+            zeile = zeile.strip()
+            if zeile:
+                yield zeile
+
+
+def lese_csv(dateipfad: str, trennzeichen: str = ",", kopfzeile: bool = True,
+             encoding: str = "utf-8") -> Iterator[object]:
+    """
+    Liest eine CSV-Datei zeilenweise.
+
+    Args:
+        dateipfad: Pfad zur CSV-Datei
+        trennzeichen: Spaltentrenner (Standard: Komma)
+        kopfzeile: True wenn die erste Zeile Spaltennamen enthält
+        encoding: Zeichenkodierung der Datei
+
+    Yields:
+        dict (mit Kopfzeile) oder list (ohne Kopfzeile) pro Zeile
+    """
+    with open(dateipfad, "r", newline="", encoding=encoding) as datei:
+        if kopfzeile:
+            yield from csv.DictReader(datei, delimiter=trennzeichen)
+        else:
+            yield from csv.reader(datei, delimiter=trennzeichen)
+
+
+def lese_tsv(dateipfad: str, kopfzeile: bool = False, encoding: str = "utf-8") -> Iterator[object]:
+    """
+    Liest eine tabulatorgetrennte Datei zeilenweise (siehe lese_csv).
+    """
+    return lese_csv(dateipfad, trennzeichen="\t", kopfzeile=kopfzeile, encoding=encoding)
+
+
+def lese_jsonl(dateipfad: str, encoding: str = "utf-8") -> Iterator[object]:
+    """
+    Liest eine JSON-Lines Datei (ein JSON-Objekt pro Zeile).
+
+    Yields:
+        Das geparste JSON-Objekt jeder Zeile
+    """
+    for zeile in lese_zeilen(dateipfad, encoding):
+        yield json.loads(zeile)
+
+
+# ---------------------------------------------------------------------------
+# Abbildungen: Rohzeile -> Datensätze
+# ---------------------------------------------------------------------------
+
+def standard_abbildung(rohzeile: object) -> Iterable[Datensatz]:
+    """
+    Standard-Abbildung für Dateien die bereits Frage/Antwort enthalten.
+
+    Unterstützt:
+        dict mit den Schlüsseln 'frage', 'antwort' und optional 'schwierigkeitsgrad'
+        list/tuple mit 2 oder 3 Einträgen
+        str mit Tabulator getrennten Feldern
+    """
+    if isinstance(rohzeile, dict):
+        felder = (rohzeile["frage"], rohzeile["antwort"], rohzeile.get("schwierigkeitsgrad") or 1)
+    elif isinstance(rohzeile, str):
+        felder = rohzeile.split("\t")
+    else:
+        felder = rohzeile
+
+    if len(felder) < 2:
+        return []
+    schwierigkeitsgrad = int(felder[2]) if len(felder) > 2 and felder[2] not in ("", None) else 1
+    return [(felder[0], felder[1], schwierigkeitsgrad)]
+
+
+def irregular_verbs_abbildung(rohzeile: object) -> Iterable[Datensatz]:
+    """
+    Abbildung für irregular_verbs.txt (Format: "begin, begins, began, begun").
+    Pro Verb entstehen drei Fragen mit steigender Schwierigkeit.
+    """
+    teile = [teil.strip() for teil in rohzeile.split(",")] if isinstance(rohzeile, str) else list(rohzeile)
+    if len(teile) != 4:
+        return []
+    verb, present_s, past_s, past_participle = teile
+    return [
+        (f"What is the present singular form of '{verb}'?", present_s, 1),
+        (f"What is the past singular form of '{verb}'?", past_s, 2),
+        (f"What is the past participle form of '{verb}'?", past_participle, 3),
+    ]
+
+
+def deklinationen_abbildung(rohzeile: object) -> Iterable[Datensatz]:
+    """
+    Abbildung für deklinationen.txt (Format: "rosa rosae rosae rosam rosa").
+    Pro Substantiv entsteht eine Frage je Fall.
+    """
+    teile = rohzeile.split() if isinstance(rohzeile, str) else list(rohzeile)
+    if len(teile) != 5:
+        return []
+    nominativ = teile[0]
+    faelle = ["genitiv", "dativ", "akkusativ", "ablativ"]
+    return [(f"Gib die {fall} Form von '{nominativ}' ein", form, 2)
+            for fall, form in zip(faelle, teile[1:])]
+
+
+def periodensystem_abbildung(rohzeile: object) -> Iterable[Datensatz]:
+    """
+    Abbildung für PeriodicTableofElements.csv (Zeilen als dict aus lese_csv).
+    Die Datei ist latin-1 kodiert, also encoding='latin-1' angeben.
+    Der Schwierigkeitsgrad richtet sich nach der Periode des Elements.
+    """
+    try:
+        periode = int(rohzeile["Period"])
+    except (KeyError, ValueError):
+        return []
+    schwierigkeitsgrad = min(5, max(1, periode - 1))
+    ordnungszahl = rohzeile["Atomic Number"].strip()
+    element = rohzeile["Element"].strip()
+    symbol = rohzeile["Symbol"].strip()
+    return [
+        (f"Welches Atom hat die Ordnungszahl {ordnungszahl}?", symbol, schwierigkeitsgrad),
+        (f"Welches Symbol hat {element}?", symbol, schwierigkeitsgrad),
+    ]
+
+
+# Registrierte Abbildungen, damit sie auch per Name angegeben werden können
+ABBILDUNGEN: Dict[str, Abbildung] = {
+    "standard": standard_abbildung,
+    "irregular_verbs": irregular_verbs_abbildung,
+    "deklinationen": deklinationen_abbildung,
+    "periodensystem": periodensystem_abbildung,
+}
+
+
+def datensaetze_aus_datei(dateipfad: str, format: Optional[str] = None,
+                          abbildung: Optional[object] = None,
+                          encoding: str = "utf-8") -> Iterator[Datensatz]:
+    """
+    Liest eine Datei als Strom von Datensätzen für Trainer.speichern_viele.
+
+    Args:
+        dateipfad: Pfad zur Datei
+        format: 'csv', 'tsv', 'jsonl' oder 'txt' (Standard: aus der Dateiendung)
+        abbildung: Name aus ABBILDUNGEN oder eigene Funktion (Standard: standard_abbildung)
+        encoding: Zeichenkodierung der Datei
+
+    Yields:
+        Datensatz: (frage, antwort, schwierigkeitsgrad)
+    """
+    if format is None:
+        format = os.path.splitext(dateipfad)[1].lstrip(".").lower() or "txt"
+
+    if abbildung is None:
+        abbildung = standard_abbildung
+    elif isinstance(abbildung, str):
+        if abbildung not in ABBILDUNGEN:
+            raise ValueError(f"Unbekannte Abbildung: {abbildung}")
+        abbildung = ABBILDUNGEN[abbildung]
+
+    if format == "csv":
+        rohzeilen = lese_csv(dateipfad, encoding=encoding)
+    elif format == "tsv":
+        rohzeilen = lese_tsv(dateipfad, encoding=encoding)
+    elif format == "jsonl":
+        rohzeilen = lese_jsonl(dateipfad, encoding=encoding)
+    elif format == "txt":
+        rohzeilen = lese_zeilen(dateipfad, encoding=encoding)
+    else:
+        raise ValueError(f"Unbekanntes Format: {format}")
+
+    for rohzeile in rohzeilen:
+        yield from abbildung(rohzeile)
+
+
+# ---------------------------------------------------------------------------
+# Export: Zeilen -> Datei
+# ---------------------------------------------------------------------------
+
+def schreibe_csv(dateipfad: str, spalten: Sequence[str], zeilen: Iterable[Sequence],
+                 trennzeichen: str = ",", encoding: str = "utf-8") -> int:
+    """
+    Schreibt Zeilen mit Kopfzeile als CSV-Datei (zeilenweise, ohne Zwischenspeicher).
+
+    Args:
+        dateipfad: Pfad der Zieldatei
+        spalten: Spaltennamen für die Kopfzeile
+        zeilen: Iterable von Zeilen (Tupel in der Reihenfolge von spalten)
+        trennzeichen: Spaltentrenner (Standard: Komma)
+        encoding: Zeichenkodierung der Datei
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen
+    """
+    anzahl = 0
+    with open(dateipfad, "w", newline="", encoding=encoding) as datei:
+        writer = csv.writer(datei, delimiter=trennzeichen)
+        writer.writerow(spalten)
+        for zeile in zeilen:
+            writer.writerow(zeile)
+            anzahl += 1
+    return anzahl
+
+
+def schreibe_jsonl(dateipfad: str, spalten: Sequence[str], zeilen: Iterable[Sequence],
+                   encoding: str = "utf-8") -> int:
+    """
+    Schreibt Zeilen als JSON-Lines Datei (ein Objekt pro Zeile, Spaltennamen als Schlüssel).
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen
+    """
+    anzahl = 0
+    with open(dateipfad, "w", encoding=encoding) as datei:
+        for zeile in zeilen:
+            datei.write(json.dumps(dict(zip(spalten, zeile)), ensure_ascii=False))
+            datei.write("\n")
+            anzahl += 1
+    return anzahl
+
+
+def schreibe_datei(dateipfad: str, spalten: Sequence[str], zeilen: Iterable[Sequence],
+                   format: Optional[str] = None, encoding: str = "utf-8") -> int:
+    """
+    Schreibt Zeilen als CSV, TSV oder JSONL (Format aus der Dateiendung, falls nicht angegeben).
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen
+    """
+    if format is None:
+        format = os.path.splitext(dateipfad)[1].lstrip(".").lower()
+
+    if format == "csv":
+        return schreibe_csv(dateipfad, spalten, zeilen, encoding=encoding)
+    if format == "tsv":
+        return schreibe_csv(dateipfad, spalten, zeilen, trennzeichen="\t", encoding=encoding)
+    if format == "jsonl":
+        return schreibe_jsonl(dateipfad, spalten, zeilen, encoding=encoding)
+    raise ValueError(f"Unbekanntes Format: {format}")
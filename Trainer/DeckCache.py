@@ -0,0 +1,472 @@
+import random
+import re
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import Antwortpruefung
+
+
+class _TextSpalte:
+    """
+    Die Texte einer Spalte als UTF-8 in einem einzigen bytearray, adressiert über
+    Start und Länge je Zeile. Mit zusammenfassen=True werden gleiche Texte (z.B. häufige
+    Antworten) beim Laden nur einmal abgelegt; neue und geänderte Texte werden hinten angehängt.
+    """
+
+    def __init__(self, zusammenfassen: bool = False):
+        self.daten = bytearray()
+        self.start = array("Q")
+        self.laenge = array("I")
+        self.zusammenfassen = zusammenfassen
+        # Beim Laden: Text -> start << 32 | laenge der bereits abgelegten Texte
+        self._bekannt: Optional[Dict[str, int]] = None
+
+    def laden_beginnen(self):
+        self._bekannt = {} if self.zusammenfassen else None
+
+    def laden_beenden(self):
+        self._bekannt = None
+
+    def _ablegen(self, text: str) -> Tuple[int, int]:
+        kodiert = text.encode("utf-8")
+        start = len(self.daten)
+        self.daten += kodiert
+        return start, len(kodiert)
+
+    def anhaengen(self, text: str):
+        start, laenge = self._ablegen(text)
+        self.start.append(start)
+        self.laenge.append(laenge)
+
+    def erweitern(self, texte: Iterable[str]):
+        # Wie anhaengen() für viele Texte, aber ohne Python-Schleife mit einzelnen
+        # Anhängen: die neuen Texte werden einmal kodiert und angehängt
+        texte = list(texte)
+        bekannt = self._bekannt
+        neu = texte if bekannt is None else [text for text in dict.fromkeys(texte) if text not in bekannt]
+        kodiert = [text.encode("utf-8") for text in neu]
+        laengen = list(map(len, kodiert))
+        starts = accumulate(laengen, initial=len(self.daten))
+        self.daten += b"".join(kodiert)
+        if bekannt is None:
+            self.start.extend(starts)
+            del self.start[-1]
+            self.laenge.extend(laengen)
+            return
+
+        bekannt.update(zip(neu, [start << 32 | laenge for start, laenge in zip(starts, laengen)]))
+        eintraege = list(map(bekannt.__getitem__, texte))
+        self.start.extend([eintrag >> 32 for eintrag in eintraege])
+        self.laenge.extend([eintrag & 0xFFFFFFFF for eintrag in eintraege])
+
+    def einfuegen(self, position: int, text: str):
+        start, laenge = self._ablegen(text)
+        self.start.insert(position, start)
+        self.laenge.insert(position, laenge)
+
+    def setzen(self, position: int, text: str):
+        self.start[position], self.laenge[position] = self._ablegen(text)
+
+    def entfernen(self, position: int):
+        del self.start[position]
+        del self.laenge[position]
+
+    def __getitem__(self, position: int) -> str:
+        start = self.start[position]
+        return self.daten[start:start + self.laenge[position]].decode("utf-8")
+
+    def speicherbedarf(self) -> int:
+        return sys.getsizeof(self.daten) + sys.getsizeof(self.start) + sys.getsizeof(self.laenge)
+
+
+class DeckCache:
+    """
+    Spaltenweiser Zwischenspeicher eines Themengebiets im Arbeitsspeicher.
+    Die Tabelle wird einmal geladen; IDs, Schwierigkeitsgrad, Zähler und Fälligkeit
+    liegen in array-Spalten, Frage, Antwort und Antwort-Schlüssel als UTF-8 (siehe
+    _TextSpalte) - statt eines Tupels mit eigenen Python-Objekten pro Zeile.
+
+    Der Trainer hält den Cache bei speichern, bearbeiten, loeschen und beim Verbuchen
+    von Antworten zeilengenau aktuell; Massenimporte machen ihn ungültig, er wird
+    dann beim nächsten Zugriff neu geladen. Änderungen anderer Trainer oder Prozesse
+    an derselben Tabelle sieht er erst nach ungueltig_machen().
+    """
+
+    # Zeilen pro fetchmany beim Laden
+    LADE_BLOCK_GROESSE = 10000
+    # Bis zu diesem Anteil gesuchter Zeilen (Stichprobe mit Schwierigkeitsgrad)
+    # werden zufällige Positionen verworfen statt die Spalte zu durchsuchen
+    MIN_ANTEIL_ZUFALL = 0.05
+
+    def __init__(self, verbindungen, table_name: str, statistik_puffer=None):
+        """
+        Initialisiert den (noch leeren) Cache. Geladen wird beim ersten Zugriff.
+
+        Args:
+            verbindungen: Verbindungsmanager, über dessen Leser geladen wird
+            table_name: Name der Tabelle des Themengebiets
+            statistik_puffer: Wird vor dem Laden geschrieben, damit die Zähler stimmen (optional)
+        """
+        self.verbindungen = verbindungen
+        self.table_name = table_name
+        self.statistik_puffer = statistik_puffer
+        self.geladen = False
+        self.ladevorgaenge = 0
+        self._fehlgeschlagen = False
+        self._sperre = threading.RLock()
+        self._leeren()
+
+    def _leeren(self):
+        """
+        Legt leere Spalten an.
+        Private Methode zur internen Verwendung.
+        """
+        self._ids = array("q")
+        self._grad = bytearray()
+        self._richtig = array("I")
+        self._falsch = array("I")
+        self._faellig_am = array("d")
+        self._frage = _TextSpalte()
+        self._antwort = _TextSpalte(zusammenfassen=True)
+        self._schluessel = _TextSpalte(zusammenfassen=True)
+        self._anzahl_pro_grad = Counter()
+
+    def laden(self) -> bool:
+        """
+        Lädt die ganze Tabelle blockweise in die Spalten.
+
+        Returns:
+            bool: True wenn erfolgreich geladen, False bei Fehler
+        """
+        self._puffer_schreiben(immer=True)
+        with self._sperre:
+            return self._laden()
+
+    def _puffer_schreiben(self, immer: bool = False):
+        """
+        Schreibt vor dem Laden den Statistik-Puffer, damit die Zähler stimmen.
+        Muss vor self._sperre aufgerufen werden: flush() braucht die Schreibsperre der
+        Datenbank, und wer die hält, darf danach nicht auf diesen Cache warten.
+        Private Methode zur internen Verwendung.
+        """
+        if self.statistik_puffer is not None and (immer or not self.geladen):
+            self.statistik_puffer.flush()
+
+    def _laden(self) -> bool:
+        """
+        Lädt die Tabelle; der Aufrufer hält self._sperre.
+        Private Methode zur internen Verwendung.
+        """
+        self._leeren()
+        textspalten = (self._frage, self._antwort, self._schluessel)
+        for spalte in textspalten:
+            spalte.laden_beginnen()
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+                cursor.execute(f'''
+                    SELECT id, frage, antwort, antwort_schluessel, COALESCE(schwierigkeitsgrad, 0),
+                           COALESCE(richtig_beantwortet, 0), COALESCE(falsch_beantwortet, 0),
+                           COALESCE(faellig_am, 0.0)
+                    FROM {self.table_name} ORDER BY id
+                ''')
+                while True:
+                    zeilen = cursor.fetchmany(self.LADE_BLOCK_GROESSE)
+                    if not zeilen:
+                        break
+                    self._block_anhaengen(zeilen)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Fehler beim Laden des Deck-Caches: {e}")
+            self._leeren()
+            self.geladen = False
+            self._fehlgeschlagen = True
+            return False
+        finally:
+            for spalte in textspalten:
+                spalte.laden_beenden()
+
+        self.geladen = True
+        self.ladevorgaenge += 1
+        return True
+
+    def _bereit(self) -> bool:
+        """
+        Lädt den Cache, falls nötig. Nach einem Fehler wird erst nach
+        ungueltig_machen() wieder versucht zu laden.
+        Private Methode zur internen Verwendung.
+        """
+        return self.geladen or (not self._fehlgeschlagen and self._laden())
+
+    def ungueltig_machen(self):
+        """
+        Verwirft den Inhalt; beim nächsten Zugriff wird neu geladen.
+        """
+        with self._sperre:
+            self._leeren()
+            self.geladen = False
+            self._fehlgeschlagen = False
+
+    def _block_anhaengen(self, zeilen: List[Tuple]):
+        """
+        Hängt einen Block geladener Zeilen spaltenweise an (extend statt append pro Feld).
+        Private Methode zur internen Verwendung.
+        """
+        ids, fragen, antworten, schluessel, grade, richtig, falsch, faellig_am = zip(*zeilen)
+        self._ids.extend(ids)
+        self._grad.extend(grade)
+        self._richtig.extend(richtig)
+        self._falsch.extend(falsch)
+        self._faellig_am.extend(faellig_am)
+        self._frage.erweitern(fragen)
+        self._antwort.erweitern(antworten)
+        self._schluessel.erweitern(s if s is not None else Antwortpruefung.schluessel(a)
+                                   for s, a in zip(schluessel, antworten))
+        self._anzahl_pro_grad.update(grade)
+
+    def _anhaengen(self, id, frage, antwort, schluessel, grad, richtig, falsch, faellig_am):
+        """
+        Hängt eine neue Zeile an (IDs kommen aufsteigend).
+        Private Methode zur internen Verwendung.
+        """
+        grad = grad or 0
+        self._ids.append(id)
+        self._grad.append(grad)
+        self._richtig.append(richtig or 0)
+        self._falsch.append(falsch or 0)
+        self._faellig_am.append(faellig_am or 0.0)
+        self._frage.anhaengen(frage)
+        self._antwort.anhaengen(antwort)
+        self._schluessel.anhaengen(schluessel if schluessel is not None else Antwortpruefung.schluessel(antwort))
+        self._anzahl_pro_grad[grad] += 1
+
+    def _position(self, id: int) -> Optional[int]:
+        """
+        Returns:
+            int: Position der ID in den Spalten (binäre Suche) oder None
+        """
+        position = bisect_left(self._ids, id)
+        if position < len(self._ids) and self._ids[position] == id:
+            return position
+        return None
+
+    def __len__(self) -> int:
+        self._puffer_schreiben()
+        with self._sperre:
+            return len(self._ids) if self._bereit() else 0
+
+    def __contains__(self, id: int) -> bool:
+        self._puffer_schreiben()
+        with self._sperre:
+            return self._bereit() and self._position(id) is not None
+
+    # --- Änderungen, vom Trainer nach erfolgreichem Schreiben aufgerufen ---
+
+    def einfuegen(self, id: int, frage: str, antwort: str, schwierigkeitsgrad: int = 1):
+        """
+        Übernimmt eine neu gespeicherte Karte.
+        """
+        with self._sperre:
+            if not self.geladen:
+                return
+            if not 0 <= (schwierigkeitsgrad or 0) <= 255:
+                # Passt nicht in die Byte-Spalte: beim nächsten Zugriff neu laden (und scheitern)
+                self.ungueltig_machen()
+                return
+            if not self._ids or id > self._ids[-1]:
+                self._anhaengen(id, frage, antwort, None, schwierigkeitsgrad, 0, 0, 0.0)
+                return
+            position = bisect_left(self._ids, id)
+            if position < len(self._ids) and self._ids[position] == id:
+                # Schon beim Neuladen zwischen Commit und diesem Aufruf übernommen
+                return
+            grad = schwierigkeitsgrad or 0
+            self._ids.insert(position, id)
+            self._grad.insert(position, grad)
+            self._richtig.insert(position, 0)
+            self._falsch.insert(position, 0)
+            self._faellig_am.insert(position, 0.0)
+            self._frage.einfuegen(position, frage)
+            self._antwort.einfuegen(position, antwort)
+            self._schluessel.einfuegen(position, Antwortpruefung.schluessel(antwort))
+            self._anzahl_pro_grad[grad] += 1
+
+    def aendern(self, id: int, frage: Optional[str] = None, antwort: Optional[str] = None,
+                schwierigkeitsgrad: Optional[int] = None):
+        """
+        Übernimmt die geänderten Felder einer Karte.
+        """
+        with self._sperre:
+            position = self._position(id) if self.geladen else None
+            if position is None:
+                return
+            if frage is not None:
+                self._frage.setzen(position, frage)
+            if antwort is not None:
+                self._antwort.setzen(position, antwort)
+                self._schluessel.setzen(position, Antwortpruefung.schluessel(antwort))
+            if schwierigkeitsgrad is not None:
+                if not 0 <= schwierigkeitsgrad <= 255:
+                    self.ungueltig_machen()
+                    return
+                self._anzahl_pro_grad[self._grad[position]] -= 1
+                self._grad[position] = schwierigkeitsgrad
+                self._anzahl_pro_grad[schwierigkeitsgrad] += 1
+
+    def entfernen(self, id: int):
+        """
+        Entfernt eine gelöschte Karte.
+        """
+        with self._sperre:
+            position = self._position(id) if self.geladen else None
+            if position is None:
+                return
+            self._anzahl_pro_grad[self._grad[position]] -= 1
+            for spalte in (self._ids, self._grad, self._richtig, self._falsch, self._faellig_am,
+                           self._frage, self._antwort, self._schluessel):
+                if isinstance(spalte, _TextSpalte):
+                    spalte.entfernen(position)
+                else:
+                    del spalte[position]
+
+    def antwort_verbuchen(self, id: int, richtig: bool, faellig_am: float):
+        """
+        Zählt eine Antwort und übernimmt die neue Fälligkeit.
+        """
+        with self._sperre:
+            position = self._position(id) if self.geladen else None
+            if position is None:
+                return
+            if richtig:
+                self._richtig[position] += 1
+            else:
+                self._falsch[position] += 1
+            self._faellig_am[position] = faellig_am
+
+    # --- Abfragen ---
+
+    def _zeile(self, position: int) -> Tuple[int, str, str]:
+        return self._ids[position], self._frage[position], self._antwort[position]
+
+    def zeile(self, id: int) -> Optional[Tuple[int, str, str]]:
+        """
+        Returns:
+            Tuple: (id, frage, antwort) oder None wenn die ID nicht vorhanden ist
+        """
+        self._puffer_schreiben()
+        with self._sperre:
+            position = self._position(id) if self._bereit() else None
+            return self._zeile(position) if position is not None else None
+
+    def antwort_schluessel(self, id: int) -> Optional[str]:
+        """
+        Returns:
+            str: Der gespeicherte Antwort-Schlüssel (siehe Antwortpruefung) oder None
+        """
+        self._puffer_schreiben()
+        with self._sperre:
+            position = self._position(id) if self._bereit() else None
+            return self._schluessel[position] if position is not None else None
+
+    def _positionen_mit_grad(self, schwierigkeitsgrad: int) -> List[int]:
+        """
+        Alle Positionen mit diesem Schwierigkeitsgrad (Suche in C über die Byte-Spalte).
+        Private Methode zur internen Verwendung.
+        """
+        muster = re.escape(bytes([schwierigkeitsgrad]))
+        return [treffer.start() for treffer in re.finditer(muster, self._grad)]
+
+    def stichprobe(self, anzahl: int, schwierigkeitsgrad: Optional[int] = None
+                   ) -> Optional[List[Tuple[int, str, str]]]:
+        """
+        Wählt zufällige Karten aus, ohne SQLite zu verwenden (vgl. Trainer.stichprobe).
+
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort) in zufälliger Reihenfolge,
+                         None wenn der Cache nicht geladen werden konnte
+        """
+        self._puffer_schreiben()
+        with self._sperre:
+            if not self._bereit():
+                return None
+            if anzahl <= 0:
+                return []
+
+            if schwierigkeitsgrad is None:
+                positionen = random.sample(range(len(self._ids)), min(anzahl, len(self._ids)))
+            elif not 0 <= schwierigkeitsgrad <= 255:
+                positionen = []
+            else:
+                passend = self._anzahl_pro_grad[schwierigkeitsgrad]
+                anzahl = min(anzahl, passend)
+                if passend >= len(self._ids) * self.MIN_ANTEIL_ZUFALL and anzahl * 4 <= passend:
+                    # Zufällige Positionen ziehen und die mit anderem Grad verwerfen
+                    gefunden = set()
+                    while len(gefunden) < anzahl:
+                        position = random.randrange(len(self._ids))
+                        if self._grad[position] == schwierigkeitsgrad:
+                            gefunden.add(position)
+                    positionen = list(gefunden)
+                    random.shuffle(positionen)
+                else:
+                    positionen = random.sample(self._positionen_mit_grad(schwierigkeitsgrad), anzahl)
+
+            return [self._zeile(position) for position in positionen]
+
+    def filtern(self, schwierigkeitsgrad: Optional[int] = None, faellig_bis: Optional[float] = None,
+                max_erfolgsrate: Optional[float] = None, nur_unbeantwortet: bool = False,
+                anzahl: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """
+        Filtert die Karten im Speicher, z.B. "alle schwierigen, die ich oft falsch habe".
+
+        Args:
+            schwierigkeitsgrad: Nur dieser Schwierigkeitsgrad (optional)
+            faellig_bis: Nur Karten, die bis zu diesem Unix-Zeitstempel fällig sind (optional)
+            max_erfolgsrate: Nur beantwortete Karten mit höchstens dieser Erfolgsrate 0-1 (optional)
+            nur_unbeantwortet: Nur Karten, die noch nie beantwortet wurden
+            anzahl: Höchstens so viele Treffer (optional)
+
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort) in der Reihenfolge der IDs
+        """
+        self._puffer_schreiben()
+        with self._sperre:
+            if not self._bereit():
+                return []
+            if schwierigkeitsgrad is None:
+                positionen = range(len(self._ids))
+            elif 0 <= schwierigkeitsgrad <= 255:
+                positionen = self._positionen_mit_grad(schwierigkeitsgrad)
+            else:
+                positionen = []
+
+            richtig, falsch, faellig_am = self._richtig, self._falsch, self._faellig_am
+            treffer = []
+            for position in positionen:
+                if faellig_bis is not None and faellig_am[position] > faellig_bis:
+                    continue
+                beantwortet = richtig[position] + falsch[position]
+                if nur_unbeantwortet and beantwortet:
+                    continue
+                if max_erfolgsrate is not None and (
+                        not beantwortet or richtig[position] > max_erfolgsrate * beantwortet):
+                    continue
+                treffer.append(self._zeile(position))
+                if anzahl is not None and len(treffer) >= anzahl:
+                    break
+            return treffer
+
+    def speicherbedarf(self) -> int:
+        """
+        Returns:
+            int: Belegter Speicher aller Spalten in Bytes
+        """
+        with self._sperre:
+            spalten = (self._ids, self._grad, self._richtig, self._falsch, self._faellig_am)
+            return (sum(sys.getsizeof(spalte) for spalte in spalten)
+                    + sum(spalte.speicherbedarf() for spalte in (self._frage, self._antwort, self._schluessel)))
@@ -0,0 +1,187 @@
+"""
+Austauschbare Ein- und Ausgabe für die Lernprogramme.
+
+Die Quiz-Funktionen fragen über ea.eingabe() und schreiben über ea.ausgabe(), statt
+input()/print() direkt aufzurufen. Ohne Angabe wird die Konsole verwendet; für Tests und
+Messungen übernimmt ein Skript die Antworten (aus einer Liste, einer Datei oder von einem
+simulierten Lernenden) und zeichnet die Ausgaben auf.
+
+    >>> skript = Skript(["4", "e"])
+    >>> kopfrechnen(ea=skript)          # Kopfrechnen/Kopfrechnen.py
+    >>> skript.ausgaben
+    >>> Skript(Lernender(loeser, trefferquote=0.7), max_eingaben=1000000).ausfuehren(quiz)
+"""
+import random
+import time
+from collections import deque
+from typing import Callable, Iterable, Optional, Union
+
+from Datenquellen import lese_zeilen
+from Messung import FeinesHistogramm
+
+# Eine Antwortquelle bekommt den Bildschirminhalt seit der letzten Eingabe
+# (Ausgaben und zuletzt die Eingabeaufforderung) und liefert die Antwort
+Antwortquelle = Callable[[str], str]
+
+
+class SkriptEnde(EOFError):
+    """
+    Das Skript hat keine Antworten mehr (wie EOFError von input() am Ende von stdin).
+    """
+
+
+class Konsole:
+    """
+    Ein- und Ausgabe über input() und print() - das bisherige Verhalten.
+    """
+
+    def eingabe(self, aufforderung: str = "") -> str:
+        return input(aufforderung)
+
+    def ausgabe(self, text: str = ""):
+        print(text)
+
+
+# Standard für alle Quiz-Funktionen, wenn kein ea übergeben wird
+KONSOLE = Konsole()
+
+
+class Skript:
+    """
+    Ein- und Ausgabe ohne Benutzer: die Antworten kommen aus einer Antwortquelle,
+    die Ausgaben werden gezählt und auf Wunsch aufgezeichnet.
+
+    Zwischen zwei Eingaben wird die Zeit gemessen, die das Quiz für die Auswertung der
+    Antwort und das Stellen der nächsten Frage braucht (die Zeit der Antwortquelle
+    zählt nicht mit).
+    """
+
+    def __init__(self, antworten: Union[Iterable[str], Antwortquelle], max_eingaben: Optional[int] = None,
+                 mitschreiben: Union[bool, int] = True):
+        """
+        Args:
+            antworten: Iterable der Antworten oder eine Antwortquelle (z.B. Lernender)
+            max_eingaben: Nach so vielen Eingaben endet das Skript (SkriptEnde)
+            mitschreiben: True = alle Ausgaben in ausgaben sammeln, Zahl = nur die letzten n,
+                          False = nur zählen
+        """
+        if callable(antworten):
+            self._quelle = antworten
+            self._antworten = None
+        else:
+            self._quelle = None
+            self._antworten = iter(antworten)
+        self.max_eingaben = max_eingaben
+
+        if mitschreiben is True:
+            self.ausgaben = []
+        elif mitschreiben:
+            self.ausgaben = deque(maxlen=mitschreiben)
+        else:
+            self.ausgaben = None
+
+        self.eingaben = 0
+        self.anzahl_ausgaben = 0
+        self.latenz = FeinesHistogramm()
+        self._bildschirm = []
+        self._letzte_eingabe = None
+
+    @classmethod
+    def aus_datei(cls, dateipfad: str, encoding: str = "utf-8", **optionen) -> "Skript":
+        """
+        Ein Skript mit den Antworten aus einer Textdatei (eine Antwort pro Zeile).
+        """
+        return cls(lese_zeilen(dateipfad, encoding=encoding), **optionen)
+
+    def eingabe(self, aufforderung: str = "") -> str:
+        jetzt = time.perf_counter()
+        if self._letzte_eingabe is not None:
+            self.latenz.hinzufuegen((jetzt - self._letzte_eingabe) * 1000)
+
+        if self.max_eingaben is not None and self.eingaben >= self.max_eingaben:
+            raise SkriptEnde("Maximale Anzahl Eingaben erreicht")
+        self.ausgabe(aufforderung)
+
+        if self._quelle is not None:
+            antwort = self._quelle("\n".join(self._bildschirm))
+        else:
+            antwort = next(self._antworten, None)
+            if antwort is None:
+                raise SkriptEnde("Keine Antworten mehr")
+        self._bildschirm = []
+        self.eingaben += 1
+        self._letzte_eingabe = time.perf_counter()
+        return antwort
+
+    def ausgabe(self, text: str = ""):
+        self.anzahl_ausgaben += 1
+        self._bildschirm.append(text)
+        if self.ausgaben is not None:
+            self.ausgaben.append(text)
+
+    def ausfuehren(self, quiz: Callable, *args, **kwargs) -> int:
+        """
+        Startet quiz(*args, ea=self, **kwargs) immer wieder, bis das Skript endet.
+        Ohne max_eingaben muss die Antwortquelle irgendwann enden.
+
+        Returns:
+            int: Anzahl der begonnenen Durchläufe
+        """
+        laeufe = 0
+        try:
+            while True:
+                laeufe += 1
+                quiz(*args, ea=self, **kwargs)
+                # Eine Runde ohne Eingabe würde nie enden
+                if self.eingaben == 0:
+                    break
+        except SkriptEnde:
+            pass
+        return laeufe
+
+
+def daneben(richtig: Optional[str]) -> str:
+    """
+    Eine sicher falsche, aber gültig aussehende Antwort: Zahlen um eins verschoben,
+    Text durch einen längeren ersetzt (ein angehängtes Zeichen fiele noch unter die
+    Tippfehler-Toleranz der Antwortprüfung).
+    """
+    if richtig is None:
+        return "?"
+    if richtig.lstrip("-").isdigit():
+        return str(int(richtig) + 1)
+    return "x" * (len(richtig) + 3)
+
+
+class Lernender:
+    """
+    Simulierter Lernender: kennt die richtige Antwort über einen Löser und gibt sie mit
+    der Wahrscheinlichkeit trefferquote, sonst eine falsche Antwort.
+
+        lernender = Lernender(lambda bildschirm: loesung_nachschlagen(bildschirm), trefferquote=0.7)
+        skript = Skript(lernender, max_eingaben=100000, mitschreiben=False)
+    """
+
+    def __init__(self, loeser: Callable[[str], Optional[str]], trefferquote: float = 0.8,
+                 falsch: Callable[[Optional[str]], str] = daneben, seed: Optional[int] = None):
+        """
+        Args:
+            loeser: Liefert zum Bildschirminhalt die richtige Antwort (None = unbekannt)
+            trefferquote: Anteil der richtigen Antworten (0-1)
+            falsch: Macht aus der richtigen Antwort (oder None) eine falsche
+            seed: Startwert für reproduzierbare Läufe
+        """
+        self.loeser = loeser
+        self.trefferquote = trefferquote
+        self.falsch = falsch
+        self.zufall = random.Random(seed)
+        self.richtig = 0
+        self.falsch_beantwortet = 0
+
+    def __call__(self, bildschirm: str) -> str:
+        loesung = self.loeser(bildschirm)
+        if loesung is not None and self.zufall.random() < self.trefferquote:
+            self.richtig += 1
+            return loesung
+        self.falsch_beantwortet += 1
+        return self.falsch(loesung)
@@ -0,0 +1,559 @@
+import os
+import random
+import re
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import Antwortpruefung
+from EinAusgabe import KONSOLE
+from Messung import Messung, gemessen
+from StatistikPuffer import StatistikPuffer
+from Trainer import Trainer
+from Verbindungsmanager import Verbindungsmanager
+from Wiederholung import Lernstand, SM2Planer
+
+
+class Quelle(NamedTuple):
+    name: str         # "datei.tabelle", Schlüssel in statistik()["quellen"]
+    db_name: str      # Datenbankdatei
+    table_name: str   # Tabelle des Themengebiets
+    schema: str       # Name der angehängten Datenbank (ATTACH ... AS schema)
+
+
+class FoederierterTrainer:
+    """
+    Übt viele Themengebiete aus mehreren Datenbankdateien gemeinsam.
+
+    Alle Dateien werden an eine einzige Verbindung angehängt (ATTACH), die Tabellen
+    der Themengebiete über UNION ALL Views (alle_fragen, alle_zusammenfassungen,
+    alle_histogramme) zusammengefasst. Stichproben, fällige Karten und Statistiken
+    über alle Themengebiete sind damit jeweils eine einzige Abfrage, statt einer
+    Abfrage (und Verbindung) pro Themengebiet.
+
+    Geschrieben wird weiterhin pro Themengebiet: jede Quelle hat ihren eigenen
+    Statistik-Puffer, die Updates laufen über schema.tabelle, so dass die Trigger
+    der Quelle ihre Zusammenfassungen wie bei einem normalen Trainer mitführen.
+
+    Fragen werden als Tupel (quelle, id, frage, antwort) geliefert; quelle ist der
+    Index in self.quellen.
+    """
+
+    # SQLite hängt höchstens 10 Dateien an eine Verbindung an (SQLITE_MAX_ATTACHED),
+    # beliebig viele Themengebiete pro Datei sind aber möglich
+    MAX_DATEIEN = 10
+    TABELLEN_MUSTER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+    # Pragmas, die pro angehängter Datei gelten (die übrigen gelten für die Verbindung)
+    DATEI_PRAGMAS = ("auto_vacuum", "journal_mode", "synchronous", "cache_size")
+
+    # Stichprobe: pro gewünschter Frage so viele zufällige IDs ziehen (Lücken, Doppelte) ...
+    STICHPROBE_UEBERZIEHUNG = 2
+    # ... plus so viele, und mit Schwierigkeitsgrad zusätzlich mal diesen Faktor
+    STICHPROBE_ZUSCHLAG = 8
+    STICHPROBE_FILTER_FAKTOR = 5
+    # Höchstens so viele Abfragen, wenn einzelne Quellen zu wenige Fragen liefern
+    STICHPROBE_RUNDEN = 5
+    # Maximale Anzahl SQL-Parameter pro Abfrage beim Lesen der Lernstände
+    IN_BLOCK_GROESSE = 500
+
+    def __init__(self, quellen: Iterable[Tuple[str, str]],
+                 statistik_puffer_groesse: int = 100, statistik_puffer_alter: float = 5.0,
+                 planer=None, messung: Optional[Messung] = None):
+        """
+        Hängt alle Dateien an und legt die Views an. Fehlende oder ältere Tabellen
+        werden vorher wie von Trainer angelegt bzw. ergänzt.
+
+        Args:
+            quellen: Paare (db_name, table_name), z.B. [("englisch.db", "vokabeln"),
+                     ("mathe.db", "kopfrechnen"), ("mathe.db", "bruchrechnen")]
+            statistik_puffer_groesse: Antwort-Statistiken werden pro Quelle gesammelt
+                                      geschrieben, sobald so viele Fragen offen sind
+            statistik_puffer_alter: ... oder die älteste offene Antwort so viele Sekunden alt ist
+            planer: Planer für die verteilte Wiederholung (Standard: SM2Planer)
+            messung: Messung für Laufzeiten von Methoden und SQL-Anweisungen (optional)
+
+        Raises:
+            ValueError: Bei ungültigen Tabellennamen, doppelten Quellen oder mehr
+                        als MAX_DATEIEN verschiedenen Dateien
+        """
+        self.planer = planer if planer is not None else SM2Planer()
+        self.messung = messung
+
+        schemas: Dict[str, str] = {}
+        self.quellen: List[Quelle] = []
+        for db_name, table_name in quellen:
+            if not self.TABELLEN_MUSTER.match(table_name):
+                raise ValueError(f"Ungültiger Tabellenname: {table_name!r}")
+            pfad = os.path.abspath(db_name)
+            if pfad not in schemas:
+                schemas[pfad] = f"quelle_{len(schemas)}"
+            name = f"{os.path.splitext(os.path.basename(db_name))[0]}.{table_name}"
+            if any(q.name == name for q in self.quellen):
+                raise ValueError(f"Quelle doppelt angegeben: {name}")
+            self.quellen.append(Quelle(name, db_name, table_name, schemas[pfad]))
+        if not self.quellen:
+            raise ValueError("Keine Quellen angegeben")
+        if len(schemas) > self.MAX_DATEIEN:
+            raise ValueError(f"Höchstens {self.MAX_DATEIEN} Dateien möglich, angegeben: {len(schemas)}")
+
+        # Eigene Verbindung, an die alle Dateien angehängt werden
+        self.verbindungen = Verbindungsmanager(":memory:")
+        if messung is not None:
+            self.verbindungen.messung_setzen(messung)
+        self._anhaengen(schemas)
+        self._tabellen_pruefen()
+        self._views_erstellen()
+        self._stichprobe_sql: Dict[Tuple, str] = {}
+
+        self.statistik_puffer = [
+            StatistikPuffer(self.verbindungen, f"{quelle.schema}.{quelle.table_name}",
+                            statistik_puffer_groesse, statistik_puffer_alter)
+            for quelle in self.quellen
+        ]
+
+    def _anhaengen(self, schemas: Dict[str, str]):
+        """
+        Hängt jede Datei einmal an und setzt ihre Pragmas (WAL wie beim Trainer).
+        Private Methode zur internen Verwendung.
+        """
+        with self.verbindungen.schreiben() as verbindung:
+            for pfad, schema in schemas.items():
+                verbindung.execute(f"ATTACH DATABASE ? AS {schema}", (pfad,))
+                for name in self.DATEI_PRAGMAS:
+                    verbindung.execute(f"PRAGMA {schema}.{name} = {Verbindungsmanager.STANDARD_PRAGMAS[name]}")
+
+    def _tabellen_pruefen(self):
+        """
+        Legt fehlende Tabellen an bzw. ergänzt ältere Tabellen um Spalten, Indizes und
+        Zusammenfassungen, indem kurz ein Trainer für sie geöffnet wird.
+        Private Methode zur internen Verwendung.
+        """
+        for quelle in self.quellen:
+            with self.verbindungen.lesen() as verbindung:
+                spalten = {zeile[1] for zeile in
+                           verbindung.execute(f"PRAGMA {quelle.schema}.table_info({quelle.table_name})")}
+                zusammenfassung = verbindung.execute(
+                    f"SELECT 1 FROM {quelle.schema}.sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                    (f"{quelle.table_name}_zusammenfassung", f"{quelle.table_name}_histogramm")).fetchall()
+            if set(Trainer.SPALTEN) <= spalten and len(zusammenfassung) == 2:
+                continue
+            trainer = Trainer(quelle.db_name, quelle.table_name)
+            trainer.schliessen()
+
+    def _views_erstellen(self):
+        """
+        Erstellt die UNION ALL Views über alle Quellen (TEMP, da nur temporäre Views
+        Tabellen aus angehängten Dateien lesen dürfen).
+        Private Methode zur internen Verwendung.
+        """
+        fragen = " UNION ALL ".join(f'''
+            SELECT {i} AS quelle, id, frage, antwort, antwort_schluessel, schwierigkeitsgrad,
+                   richtig_beantwortet, falsch_beantwortet, faellig_am
+            FROM {q.schema}.{q.table_name}''' for i, q in enumerate(self.quellen))
+        zusammenfassungen = " UNION ALL ".join(f'''
+            SELECT {i} AS quelle, schwierigkeitsgrad, anzahl, richtig, falsch
+            FROM {q.schema}.{q.table_name}_zusammenfassung''' for i, q in enumerate(self.quellen))
+        histogramme = " UNION ALL ".join(f'''
+            SELECT {i} AS quelle, klasse, anzahl
+            FROM {q.schema}.{q.table_name}_histogramm''' for i, q in enumerate(self.quellen))
+
+        with self.verbindungen.schreiben() as verbindung:
+            for name, abfrage in (("alle_fragen", fragen), ("alle_zusammenfassungen", zusammenfassungen),
+                                  ("alle_histogramme", histogramme)):
+                verbindung.execute(f"DROP VIEW IF EXISTS temp.{name}")
+                verbindung.execute(f"CREATE TEMP VIEW {name} AS {abfrage}")
+
+    def _tabelle(self, quelle: int) -> str:
+        """
+        Private Methode zur internen Verwendung.
+
+        Returns:
+            str: schema.tabelle der Quelle
+        """
+        return f"{self.quellen[quelle].schema}.{self.quellen[quelle].table_name}"
+
+    @gemessen
+    def stichprobe(self, anzahl: int, schwierigkeitsgrad: Optional[int] = None,
+                   gewichte: Optional[Sequence[float]] = None) -> List[Tuple[int, int, str, str]]:
+        """
+        Gemischte Stichprobe über alle Themengebiete in einer Abfrage.
+
+        Die Fragen werden zufällig auf die Quellen verteilt (gewichte, Standard: jede
+        Quelle gleich, unabhängig von ihrer Größe). Pro Quelle zieht SQLite selbst
+        zufällige IDs zwischen kleinster und größter ID (beide über den Index) und
+        übernimmt die vorhandenen, wie Trainer.stichprobe - alle Quellen zusammen
+        in einer UNION ALL Abfrage. Nur Quellen, die zu wenige Fragen liefern (klein,
+        sehr lückenhaft oder leer), werden in einer weiteren Abfrage vollständig
+        gemischt; ihr Rest geht an die übrigen Quellen.
+
+        Args:
+            anzahl: Anzahl der gewünschten Fragen
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            gewichte: Relative Anteile der Quellen (gleiche Reihenfolge wie self.quellen)
+
+        Returns:
+            List[Tuple]: Tupel (quelle, id, frage, antwort) in zufälliger Reihenfolge,
+                         weniger als anzahl wenn nicht genug Fragen vorhanden sind
+
+        Raises:
+            ValueError: Wenn nicht genau ein Gewicht pro Quelle angegeben ist
+        """
+        if gewichte is None:
+            gewichte = [1.0] * len(self.quellen)
+        elif len(gewichte) != len(self.quellen):
+            raise ValueError(f"{len(gewichte)} Gewichte für {len(self.quellen)} Quellen angegeben")
+        aktiv = [i for i, gewicht in enumerate(gewichte) if gewicht > 0]
+        gefunden: Dict[Tuple[int, int], Tuple] = {}
+        vollstaendig = set()   # Quellen, die in der letzten Runde zu wenig geliefert haben
+        filter_sql = "" if schwierigkeitsgrad is None else " AND schwierigkeitsgrad = ?"
+        filter_params = [] if schwierigkeitsgrad is None else [schwierigkeitsgrad]
+
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                for _ in range(self.STICHPROBE_RUNDEN):
+                    fehlend = anzahl - len(gefunden)
+                    if fehlend <= 0 or not aktiv:
+                        break
+                    quoten = Counter(random.choices(aktiv, [gewichte[i] for i in aktiv], k=fehlend))
+
+                    if vollstaendig:
+                        sql, params = self._stichprobe_vollstaendig(quoten, vollstaendig, gefunden,
+                                                                    filter_sql, filter_params)
+                    else:
+                        sql, params = self._stichprobe_zufaellig(quoten, aktiv, filter_sql, filter_params)
+                    cursor = verbindung.execute(sql, params)
+
+                    geliefert = Counter()
+                    for zeile in cursor.fetchall():
+                        if (zeile[0], zeile[1]) not in gefunden:
+                            gefunden[zeile[0], zeile[1]] = zeile
+                            geliefert[zeile[0]] += 1
+
+                    # Wer zu wenig geliefert hat, wird beim nächsten Mal vollständig gemischt -
+                    # liefert er auch dann zu wenig, ist er erschöpft
+                    erschoepft = {q for q in vollstaendig if geliefert[q] < quoten[q]}
+                    vollstaendig = {q for q in quoten if geliefert[q] < quoten[q]} - erschoepft
+                    aktiv = [q for q in aktiv if q not in erschoepft]
+
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Stichprobe: {e}")
+            return []
+
+        auswahl = list(gefunden.values())[:anzahl]
+        random.shuffle(auswahl)
+        return auswahl
+
+    def _stichprobe_zufaellig(self, quoten: Counter, aktiv: List[int], filter_sql: str,
+                              filter_params: list) -> Tuple[str, list]:
+        """
+        Abfrage für eine Runde der Stichprobe: pro aktiver Quelle zufällige IDs ziehen
+        (Quellen ohne Quote mit LIMIT 0). Der Text hängt nur von den aktiven Quellen und
+        dem Filter ab, SQLite kann die übersetzte Anweisung also wiederverwenden.
+        Private Methode zur internen Verwendung.
+
+        Returns:
+            Tuple[str, list]: SQL und Parameter
+        """
+        schluessel = (tuple(aktiv), filter_sql)
+        sql = self._stichprobe_sql.get(schluessel)
+        if sql is None:
+            teile = []
+            for quelle in aktiv:
+                tabelle = self._tabelle(quelle)
+                teile.append(f'''
+                    SELECT * FROM (
+                        SELECT {quelle}, id, frage, antwort FROM {tabelle}
+                        WHERE id IN (
+                            SELECT b.kleinste + abs(random() % (b.groesste - b.kleinste + 1))
+                            FROM (SELECT (SELECT MIN(id) FROM {tabelle} WHERE 1{filter_sql}) AS kleinste,
+                                         (SELECT MAX(id) FROM {tabelle} WHERE 1{filter_sql}) AS groesste) AS b,
+                                 zahlen
+                            WHERE zahlen.n <= ?){filter_sql}
+                        LIMIT ?)''')
+            sql = f'''
+                WITH RECURSIVE zahlen(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM zahlen WHERE n < ?)
+                {" UNION ALL ".join(teile)}
+            '''
+            self._stichprobe_sql[schluessel] = sql
+
+        faktor = self.STICHPROBE_FILTER_FAKTOR if filter_sql else 1
+        params = [(max(quoten.values()) * self.STICHPROBE_UEBERZIEHUNG + self.STICHPROBE_ZUSCHLAG) * faktor]
+        for quelle in aktiv:
+            quote = quoten[quelle]
+            ziehungen = (quote * self.STICHPROBE_UEBERZIEHUNG + self.STICHPROBE_ZUSCHLAG) * faktor if quote else 0
+            params += filter_params * 2 + [ziehungen] + filter_params + [quote]
+        return sql, params
+
+    def _stichprobe_vollstaendig(self, quoten: Counter, vollstaendig: set, gefunden: dict,
+                                 filter_sql: str, filter_params: list) -> Tuple[str, list]:
+        """
+        Abfrage für eine weitere Runde der Stichprobe: Quellen, die zu wenig geliefert
+        haben, werden vollständig gemischt (ohne die schon gefundenen Fragen), die
+        übrigen wie in _stichprobe_zufaellig gezogen.
+        Private Methode zur internen Verwendung.
+
+        Returns:
+            Tuple[str, list]: SQL und Parameter
+        """
+        teile, params = [], []
+        zufaellig = [quelle for quelle in sorted(quoten) if quelle not in vollstaendig]
+        if zufaellig:
+            sql, params = self._stichprobe_zufaellig(quoten, zufaellig, filter_sql, filter_params)
+            teile.append(sql)
+        for quelle in sorted(vollstaendig & quoten.keys()):
+            bekannt = [id for q, id in gefunden if q == quelle]
+            teile.append(f'''
+                SELECT * FROM (
+                    SELECT {quelle}, id, frage, antwort FROM {self._tabelle(quelle)}
+                    WHERE id NOT IN ({", ".join("?" * len(bekannt))}){filter_sql}
+                    ORDER BY random() LIMIT ?)''')
+            params += bekannt + filter_params + [quoten[quelle]]
+        return " UNION ALL ".join(teile), params
+
+    @gemessen
+    def naechste_faellige(self, anzahl: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                          jetzt: Optional[float] = None) -> List[Tuple[int, int, str, str]]:
+        """
+        Die am längsten fälligen Karten aller Themengebiete in einer Abfrage: pro
+        Quelle eine Bereichsabfrage über den Index auf faellig_am (höchstens anzahl
+        Zeilen), die Teilergebnisse werden von SQLite zusammengeführt.
+
+        Args:
+            anzahl: Maximale Anzahl der Karten
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            jetzt: Zeitpunkt als Unix-Zeitstempel (Standard: aktuelle Zeit)
+
+        Returns:
+            List[Tuple]: Tupel (quelle, id, frage, antwort), die fälligste zuerst
+        """
+        if jetzt is None:
+            jetzt = time.time()
+
+        # Noch nicht geschriebene Lernstände können Karten schon weitergeschoben haben
+        vorgemerkt = [puffer.vorgemerkte_lernstaende() for puffer in self.statistik_puffer]
+        limit = anzahl + max(len(staende) for staende in vorgemerkt)
+        filter_sql = "" if schwierigkeitsgrad is None else " AND schwierigkeitsgrad = ?"
+
+        teile, params = [], []
+        for i in range(len(self.quellen)):
+            teile.append(f'''
+                SELECT * FROM (
+                    SELECT {i}, id, frage, antwort, faellig_am FROM {self._tabelle(i)}
+                    WHERE faellig_am <= ?{filter_sql} ORDER BY faellig_am LIMIT ?)''')
+            params += [jetzt] + ([] if schwierigkeitsgrad is None else [schwierigkeitsgrad]) + [limit]
+
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.execute(f"{' UNION ALL '.join(teile)} ORDER BY faellig_am LIMIT ?",
+                                            params + [limit])
+                faellige = [zeile[:4] for zeile in cursor.fetchall()
+                            if zeile[1] not in vorgemerkt[zeile[0]]
+                            or vorgemerkt[zeile[0]][zeile[1]].faellig_am <= jetzt]
+                return faellige[:anzahl]
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen der fälligen Karten: {e}")
+            return []
+
+    def antwort_bewerten(self, korrekte_antwort: str, benutzer_antwort: str) -> Antwortpruefung.Pruefergebnis:
+        """
+        Prüft eine Antwort wie Trainer.antwort_bewerten.
+
+        Returns:
+            Pruefergebnis: (richtig, tippfehler, abstand)
+        """
+        return Antwortpruefung.antwort_pruefen(korrekte_antwort, benutzer_antwort)
+
+    def antwort_verbuchen(self, quelle: int, id: int, richtig: bool, qualitaet: Optional[int] = None):
+        """
+        Verbucht eine Antwort (siehe antworten_verbuchen).
+
+        Args:
+            quelle: Index der Quelle in self.quellen
+            id: ID der Frage in ihrer Quelle
+            richtig: True wenn richtig beantwortet, False wenn falsch
+            qualitaet: Qualität der Antwort 0-5 für SM-2 (optional)
+        """
+        self.antworten_verbuchen([(quelle, id, richtig, qualitaet)])
+
+    @gemessen
+    def antworten_verbuchen(self, antworten: Iterable[Tuple]) -> int:
+        """
+        Verbucht viele Antworten aus beliebigen Quellen. Die fehlenden Lernstände werden
+        für alle Quellen zusammen mit einer Abfrage gelesen (UNION ALL), die Änderungen
+        im Statistik-Puffer der jeweiligen Quelle vorgemerkt.
+
+        Args:
+            antworten: Iterable von (quelle, id, richtig[, qualitaet])
+
+        Returns:
+            int: Anzahl der verbuchten Antworten (unbekannte Quellen/IDs werden übersprungen)
+        """
+        antworten = [(a[0], a[1], a[2], a[3] if len(a) > 3 else None) for a in antworten
+                     if 0 <= a[0] < len(self.quellen)]
+
+        staende = {}
+        for quelle, id, _, _ in antworten:
+            stand = self.statistik_puffer[quelle].lernstand(id)
+            if stand is not None:
+                staende[quelle, id] = stand
+        fehlend = sorted({(quelle, id) for quelle, id, _, _ in antworten} - staende.keys())
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                for i in range(0, len(fehlend), self.IN_BLOCK_GROESSE):
+                    pro_quelle = defaultdict(list)
+                    for quelle, id in fehlend[i:i + self.IN_BLOCK_GROESSE]:
+                        pro_quelle[quelle].append(id)
+                    teile, params = [], []
+                    for quelle, ids in pro_quelle.items():
+                        teile.append(f'''
+                            SELECT {quelle}, id, leitner_box, intervall, leichtigkeit, wiederholungen, faellig_am
+                            FROM {self._tabelle(quelle)} WHERE id IN ({", ".join("?" * len(ids))})''')
+                        params += ids
+                    for zeile in verbindung.execute(" UNION ALL ".join(teile), params).fetchall():
+                        staende[zeile[0], zeile[1]] = Lernstand(*zeile[2:])
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen des Lernstands: {e}")
+            return 0
+
+        jetzt = time.time()
+        verbucht = 0
+        for quelle, id, richtig, qualitaet in antworten:
+            stand = staende.get((quelle, id))
+            if stand is None:
+                continue
+            staende[quelle, id] = self.planer.planen(stand, richtig, jetzt, qualitaet)
+            self.statistik_puffer[quelle].lernstand_vormerken(id, staende[quelle, id])
+            self.statistik_puffer[quelle].hinzufuegen(id, richtig)
+            verbucht += 1
+        return verbucht
+
+    def flush(self) -> int:
+        """
+        Schreibt die Statistik-Puffer aller Quellen.
+
+        Returns:
+            int: Anzahl der geschriebenen Zeilen
+        """
+        return sum(puffer.flush() for puffer in self.statistik_puffer)
+
+    @gemessen
+    def statistik(self) -> dict:
+        """
+        Statistiken aller Themengebiete aus den Zusammenfassungs-Tabellen der Quellen
+        (zwei Abfragen über die Views, unabhängig von der Anzahl der Fragen).
+
+        Returns:
+            dict: gesamt (wie Trainer.statistik, über alle Quellen zusammengefasst) und
+                  quellen (Name der Quelle -> dict wie Trainer.statistik)
+        """
+        self.flush()
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                zusammenfassung = verbindung.execute('''
+                    SELECT quelle, schwierigkeitsgrad, anzahl, richtig, falsch
+                    FROM alle_zusammenfassungen WHERE anzahl > 0
+                    ORDER BY quelle, schwierigkeitsgrad
+                ''').fetchall()
+                histogramm = verbindung.execute('''
+                    SELECT quelle, klasse, anzahl FROM alle_histogramme
+                    WHERE anzahl > 0 ORDER BY quelle, klasse
+                ''').fetchall()
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen der Statistiken: {e}")
+            return {}
+
+        pro_quelle = {i: ([], {}) for i in range(len(self.quellen))}
+        gesamt_grade = defaultdict(lambda: [0, 0, 0])
+        gesamt_histogramm = Counter()
+        for quelle, grad, anzahl, richtig, falsch in zusammenfassung:
+            pro_quelle[quelle][0].append((grad, anzahl, richtig, falsch))
+            summe = gesamt_grade[grad]
+            summe[0] += anzahl
+            summe[1] += richtig
+            summe[2] += falsch
+        for quelle, klasse, anzahl in histogramm:
+            pro_quelle[quelle][1][klasse] = anzahl
+            gesamt_histogramm[klasse] += anzahl
+
+        return {
+            "gesamt": Trainer.statistik_berechnen(
+                [(grad, *gesamt_grade[grad]) for grad in sorted(gesamt_grade)],
+                dict(sorted(gesamt_histogramm.items()))),
+            "quellen": {self.quellen[i].name: Trainer.statistik_berechnen(*werte)
+                        for i, werte in pro_quelle.items()},
+        }
+
+    def ueben(self, anzahl_fragen: int = 10, schwierigkeitsgrad: Optional[int] = None,
+              nur_faellige: bool = False, ea=None):
+        """
+        Gemischte Übungseinheit über alle Themengebiete.
+
+        Args:
+            anzahl_fragen: Anzahl der zu stellenden Fragen
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            nur_faellige: True = nur fällige Karten der verteilten Wiederholung abfragen
+            ea: Ein- und Ausgabe (Standard: Konsole, siehe EinAusgabe)
+        """
+        ea = ea or KONSOLE
+        if nur_faellige:
+            ausgewaehlte_fragen = self.naechste_faellige(anzahl_fragen, schwierigkeitsgrad=schwierigkeitsgrad)
+        else:
+            ausgewaehlte_fragen = self.stichprobe(anzahl_fragen, schwierigkeitsgrad=schwierigkeitsgrad)
+
+        if not ausgewaehlte_fragen:
+            ea.ausgabe("Keine Fragen gefunden!")
+            return
+
+        richtige_antworten = 0
+        ea.ausgabe(f"\n=== Gemischte Übung mit {len(ausgewaehlte_fragen)} Fragen ===\n")
+
+        try:
+            for i, (quelle, id, frage, korrekte_antwort) in enumerate(ausgewaehlte_fragen, 1):
+                ea.ausgabe(f"Frage {i}/{len(ausgewaehlte_fragen)} [{self.quellen[quelle].name}]: {frage}")
+                ergebnis = self.antwort_bewerten(korrekte_antwort, ea.eingabe("Deine Antwort: ").strip())
+                if ergebnis.tippfehler:
+                    ea.ausgabe(f"✓ Richtig! (Achte auf die Schreibweise: {korrekte_antwort})\n")
+                elif ergebnis.richtig:
+                    ea.ausgabe("✓ Richtig!\n")
+                else:
+                    ea.ausgabe(f"✗ Falsch! Die richtige Antwort war: {korrekte_antwort}\n")
+                richtige_antworten += ergebnis.richtig
+                self.antwort_verbuchen(quelle, id, ergebnis.richtig)
+        finally:
+            self.flush()
+
+        prozent = (richtige_antworten / len(ausgewaehlte_fragen)) * 100
+        ea.ausgabe("=== Übung beendet ===")
+        ea.ausgabe(f"Richtige Antworten: {richtige_antworten}/{len(ausgewaehlte_fragen)} ({prozent:.1f}%)")
+
+    def metriken(self) -> dict:
+        """
+        Returns:
+            dict: Messwerte (nur mit messung, siehe Messung.metriken) und
+                  statistik_puffer (Name der Quelle -> Zähler des Puffers)
+        """
+        metriken = self.messung.metriken() if self.messung is not None else {}
+        metriken["statistik_puffer"] = {quelle.name: puffer.zaehler()
+                                        for quelle, puffer in zip(self.quellen, self.statistik_puffer)}
+        return metriken
+
+    def schliessen(self):
+        """
+        Schreibt alle Puffer und schließt die Verbindung.
+        """
+        for puffer in self.statistik_puffer:
+            puffer.schliessen()
+        self.verbindungen.schliessen()
+
+
+if __name__ == "__main__":
+    # Gemischte Wiederholung über die Themengebiete aus Trainer.py
+    trainer = FoederierterTrainer([("lerntrainer.db", "vokabeln"),
+                                   ("lerntrainer.db", "mathematik"),
+                                   ("lerntrainer.db", "irregular_verbs")])
+    trainer.ueben(10)
+    for name, werte in trainer.statistik()["quellen"].items():
+        print(f"{name}: {werte['gesamt']} Fragen, Erfolgsrate {werte['erfolgsrate']}")
+    trainer.schliessen()
@@ -0,0 +1,368 @@
+import bisect
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class Histogramm:
+    """
+    Latenz-Histogramm mit festen Klassen (obere Grenzen in Millisekunden).
+    Braucht unabhängig von der Anzahl der Messwerte immer gleich viel Speicher.
+    """
+
+    GRENZEN_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                  1000, 2500, 5000, 10000, float("inf"))
+
+    def __init__(self):
+        self.klassen = [0] * len(self.GRENZEN_MS)
+        self.anzahl = 0
+        self.summe_ms = 0.0
+        self.max_ms = 0.0
+
+    def hinzufuegen(self, dauer_ms: float):
+        self.klassen[bisect.bisect_left(self.GRENZEN_MS, dauer_ms)] += 1
+        self.anzahl += 1
+        self.summe_ms += dauer_ms
+        if dauer_ms > self.max_ms:
+            self.max_ms = dauer_ms
+
+    def perzentil(self, p: float) -> float:
+        """
+        Returns:
+            float: Obere Grenze der Klasse, in der das p-Perzentil (0-100) liegt
+                   (für die letzte Klasse das Maximum)
+        """
+        if self.anzahl == 0:
+            return 0.0
+        ziel = self.anzahl * p / 100
+        bisher = 0
+        for grenze, anzahl in zip(self.GRENZEN_MS, self.klassen):
+            bisher += anzahl
+            if bisher >= ziel and anzahl:
+                return min(grenze, self.max_ms)
+        return self.max_ms
+
+    def als_dict(self) -> dict:
+        return {
+            "anzahl": self.anzahl,
+            "summe_ms": round(self.summe_ms, 3),
+            "mittel_ms": round(self.summe_ms / self.anzahl, 4) if self.anzahl else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.perzentil(50), 3),
+            "p95_ms": round(self.perzentil(95), 3),
+            "p99_ms": round(self.perzentil(99), 3),
+            "histogramm": {f"<={grenze}": anzahl
+                           for grenze, anzahl in zip(self.GRENZEN_MS, self.klassen) if anzahl},
+        }
+
+
+class FeinesHistogramm(Histogramm):
+    """
+    Histogramm für sehr kurze Dauern (0.1 µs bis 10 s) mit 20 Klassen pro Zehnerpotenz:
+    ein Perzentil liegt höchstens 12 % über dem wahren Wert.
+    """
+
+    GRENZEN_MS = tuple(10 ** (k / 20) for k in range(-80, 81)) + (float("inf"),)
+
+
+class Messung:
+    """
+    Sammelt Laufzeiten von Trainer-Methoden und SQL-Anweisungen, Zeilen- und Commit-Zähler.
+    Langsame Abfragen werden mit ihrem EXPLAIN QUERY PLAN festgehalten.
+
+    Verwendung:
+        messung = Messung(langsam_ms=20, dump_datei="metriken.json", dump_intervall=60)
+        trainer = Trainer("lerntrainer.db", "vokabeln", messung=messung)
+        ...
+        print(trainer.metriken())
+    """
+
+    # Anzahl der gemerkten langsamen Abfragen (die ältesten fallen heraus)
+    MAX_LANGSAME_ABFRAGEN = 50
+
+    def __init__(self, langsam_ms: float = 50.0, dump_datei: Optional[str] = None,
+                 dump_intervall: float = 60.0):
+        """
+        Args:
+            langsam_ms: Ab dieser Dauer gilt eine SQL-Anweisung als langsam
+            dump_datei: Wenn angegeben, werden die Metriken regelmäßig als JSON hierhin geschrieben
+            dump_intervall: Sekunden zwischen zwei Dumps
+        """
+        self.langsam_ms = langsam_ms
+        self.dump_datei = dump_datei
+        self.dump_intervall = dump_intervall
+
+        self._sperre = threading.Lock()
+        self._start = time.time()
+        self.methoden: Dict[str, Histogramm] = {}
+        self.sql: Dict[str, Histogramm] = {}
+        self.sql_zeilen: Dict[str, int] = {}
+        self.commits = Histogramm()
+        self.langsame_abfragen = deque(maxlen=self.MAX_LANGSAME_ABFRAGEN)
+        self._schluessel: Dict[str, str] = {}  # SQL-Text -> normalisierter Schlüssel
+
+        self._stopp = threading.Event()
+        self._dump_thread = None
+        if dump_datei is not None:
+            self._dump_thread = threading.Thread(target=self._dump_schleife, daemon=True,
+                                                 name="messung-dump")
+            self._dump_thread.start()
+
+    def methode_erfassen(self, name: str, dauer_ms: float):
+        with self._sperre:
+            histogramm = self.methoden.get(name)
+            if histogramm is None:
+                histogramm = self.methoden[name] = Histogramm()
+            histogramm.hinzufuegen(dauer_ms)
+
+    def sql_erfassen(self, verbindung: sqlite3.Connection, sql: str, parameter, dauer_ms: float,
+                     zeilen: int):
+        """
+        Erfasst eine abgeschlossene SQL-Anweisung (Ausführen und Abholen der Zeilen).
+        Ist sie langsam, wird ihr Abfrageplan auf derselben Verbindung ermittelt.
+        """
+        schluessel = self._schluessel.get(sql)
+        if schluessel is None:
+            if len(self._schluessel) > 10000:
+                self._schluessel = {}
+            schluessel = self._schluessel[sql] = self.sql_normalisieren(sql)
+        with self._sperre:
+            histogramm = self.sql.get(schluessel)
+            if histogramm is None:
+                histogramm = self.sql[schluessel] = Histogramm()
+                self.sql_zeilen[schluessel] = 0
+            histogramm.hinzufuegen(dauer_ms)
+            self.sql_zeilen[schluessel] += max(zeilen, 0)
+
+        if dauer_ms >= self.langsam_ms:
+            try:
+                plan = [zeile[-1] for zeile in
+                        sqlite3.Connection.execute(verbindung, "EXPLAIN QUERY PLAN " + sql, parameter)]
+            except sqlite3.Error as e:
+                plan = [f"(kein Plan: {e})"]
+            with self._sperre:
+                self.langsame_abfragen.append({
+                    "zeitpunkt": time.time(),
+                    "dauer_ms": round(dauer_ms, 3),
+                    "sql": schluessel,
+                    "zeilen": zeilen,
+                    "plan": plan,
+                })
+
+    def commit_erfassen(self, dauer_ms: float):
+        with self._sperre:
+            self.commits.hinzufuegen(dauer_ms)
+
+    @staticmethod
+    def sql_normalisieren(sql: str) -> str:
+        """
+        Fasst Leerraum zusammen und kürzt IN-Listen mit Platzhaltern,
+        damit gleiche Anweisungen unter einem Schlüssel landen.
+        """
+        sql = " ".join(sql.split())
+        return re.sub(r"\?(?:\s*,\s*\?)+", "?, ...", sql)
+
+    def metriken(self) -> dict:
+        """
+        Returns:
+            dict: seit (Unix-Zeit), methoden und sql (Name bzw. Anweisung -> Histogramm-Werte,
+                  bei sql zusätzlich zeilen), commits und langsame_abfragen
+        """
+        with self._sperre:
+            sql = {}
+            for schluessel, histogramm in self.sql.items():
+                sql[schluessel] = dict(histogramm.als_dict(), zeilen=self.sql_zeilen[schluessel])
+            return {
+                "seit": self._start,
+                "methoden": {name: histogramm.als_dict() for name, histogramm in self.methoden.items()},
+                "sql": sql,
+                "commits": self.commits.als_dict(),
+                "langsame_abfragen": list(self.langsame_abfragen),
+            }
+
+    def zuruecksetzen(self):
+        """
+        Löscht alle bisherigen Messwerte.
+        """
+        with self._sperre:
+            self._start = time.time()
+            self.methoden = {}
+            self.sql = {}
+            self.sql_zeilen = {}
+            self.commits = Histogramm()
+            self.langsame_abfragen.clear()
+
+    def speichern(self, dateipfad: Optional[str] = None, zusatz: Optional[dict] = None):
+        """
+        Schreibt die Metriken als JSON. Es wird erst in eine temporäre Datei geschrieben,
+        damit Leser nie eine halb geschriebene Datei sehen.
+
+        Args:
+            dateipfad: Zieldatei (Standard: dump_datei)
+            zusatz: Weitere Werte, die mit in die Datei geschrieben werden
+        """
+        dateipfad = dateipfad or self.dump_datei
+        daten = self.metriken()
+        if zusatz:
+            daten.update(zusatz)
+        temporaer = f"{dateipfad}.tmp"
+        with open(temporaer, "w", encoding="utf-8") as datei:
+            json.dump(daten, datei, ensure_ascii=False, indent=2)
+        os.replace(temporaer, dateipfad)
+
+    def _dump_schleife(self):
+        """
+        Schreibt die Metriken alle dump_intervall Sekunden.
+        Private Methode zur internen Verwendung.
+        """
+        while not self._stopp.wait(self.dump_intervall):
+            try:
+                self.speichern()
+            except OSError as e:
+                print(f"Fehler beim Schreiben der Metriken: {e}")
+
+    def schliessen(self):
+        """
+        Beendet den regelmäßigen Dump und schreibt ein letztes Mal.
+        """
+        if self._dump_thread is not None:
+            self._stopp.set()
+            self._dump_thread.join()
+            self._dump_thread = None
+            self.speichern()
+
+
+def gemessen(methode):
+    """
+    Dekorator für Trainer-Methoden: erfasst die Laufzeit, wenn der Trainer eine Messung hat.
+    Ohne Messung kostet er nur eine Attributabfrage.
+    """
+    name = methode.__name__
+
+    @functools.wraps(methode)
+    def wrapper(self, *args, **kwargs):
+        messung = self.messung
+        if messung is None:
+            return methode(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return methode(self, *args, **kwargs)
+        finally:
+            messung.methode_erfassen(name, (time.perf_counter() - start) * 1000)
+
+    return wrapper
+
+
+class MessCursor(sqlite3.Cursor):
+    """
+    Cursor, der jede Anweisung von execute() bis zur letzten abgeholten Zeile misst.
+    """
+
+    messung: Optional[Messung] = None
+    _offen = None  # [sql, parameter, dauer_ms, zeilen] der laufenden Anweisung
+
+    def _abschliessen(self):
+        offen = self._offen
+        if offen is not None:
+            self._offen = None
+            self.messung.sql_erfassen(self.connection, *offen)
+
+    def execute(self, sql, parameter=()):
+        self._abschliessen()
+        start = time.perf_counter()
+        ergebnis = super().execute(sql, parameter)
+        dauer_ms = (time.perf_counter() - start) * 1000
+        if self.description is None:
+            # Keine Zeilen zum Abholen (INSERT, UPDATE, ...)
+            self.messung.sql_erfassen(self.connection, sql, parameter, dauer_ms, self.rowcount)
+        else:
+            self._offen = [sql, parameter, dauer_ms, 0]
+        return ergebnis
+
+    def executemany(self, sql, parameter):
+        self._abschliessen()
+        parameter = list(parameter)
+        start = time.perf_counter()
+        ergebnis = super().executemany(sql, parameter)
+        self.messung.sql_erfassen(self.connection, sql, parameter[0] if parameter else (),
+                                  (time.perf_counter() - start) * 1000, self.rowcount)
+        return ergebnis
+
+    def fetchone(self):
+        start = time.perf_counter()
+        zeile = super().fetchone()
+        if self._offen is not None:
+            self._offen[2] += (time.perf_counter() - start) * 1000
+            if zeile is None:
+                self._abschliessen()
+            else:
+                self._offen[3] += 1
+        return zeile
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        zeilen = super().fetchmany(self.arraysize if size is None else size)
+        if self._offen is not None:
+            self._offen[2] += (time.perf_counter() - start) * 1000
+            self._offen[3] += len(zeilen)
+            if not zeilen:
+                self._abschliessen()
+        return zeilen
+
+    def fetchall(self):
+        start = time.perf_counter()
+        zeilen = super().fetchall()
+        if self._offen is not None:
+            self._offen[2] += (time.perf_counter() - start) * 1000
+            self._offen[3] += len(zeilen)
+            self._abschliessen()
+        return zeilen
+
+    def close(self):
+        self._abschliessen()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._abschliessen()
+        except Exception:
+            pass
+
+
+class MessVerbindung(sqlite3.Connection):
+    """
+    Verbindung, die ihre Anweisungen und Commits an eine Messung meldet, sobald
+    messung gesetzt ist. Ohne Messung verhält sie sich wie sqlite3.Connection.
+    """
+
+    messung: Optional[Messung] = None
+
+    def cursor(self, factory=None):
+        if self.messung is None:
+            return super().cursor() if factory is None else super().cursor(factory)
+        cursor = super().cursor(factory or MessCursor)
+        cursor.messung = self.messung
+        return cursor
+
+    def execute(self, sql, parameter=()):
+        if self.messung is None:
+            return super().execute(sql, parameter)
+        return self.cursor().execute(sql, parameter)
+
+    def executemany(self, sql, parameter):
+        if self.messung is None:
+            return super().executemany(sql, parameter)
+        return self.cursor().executemany(sql, parameter)
+
+    def commit(self):
+        if self.messung is None:
+            return super().commit()
+        start = time.perf_counter()
+        super().commit()
+        self.messung.commit_erfassen((time.perf_counter() - start) * 1000)
@@ -0,0 +1,234 @@
+"""
+Durchsatz und Latenz aller Quiz-Programme ohne Benutzer.
+
+Jedes Quiz läuft über EinAusgabe.Skript mit einem simulierten Lernenden, der die
+richtige Antwort aus dem Bildschirminhalt bestimmt und mit der gewählten Trefferquote
+gibt. Gemessen werden Fragen pro Sekunde und die Latenz pro Frage (Auswertung der
+Antwort bis zur nächsten Frage); der Anteil richtiger Antworten ist der, den das Quiz
+selbst meldet.
+
+Aufruf:
+    python QuizBenchmark.py [--fragen 100000] [--quiz kopfrechnen bruchrechnen ...]
+                            [--trefferquote 0.8] [--seed 1]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from fractions import Fraction
+from typing import Callable, Dict, NamedTuple, Optional, Pattern
+
+from EinAusgabe import Lernender, Skript
+
+PROJEKTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for _projekt in ("Kopfrechnen", "Bruchrechnen", "IrregularVerbs", "LateinischeDeklination", "Hangman"):
+    sys.path.append(os.path.join(PROJEKTE, _projekt))
+
+# Wörter für Hangman (der Dienst im Original braucht Netzwerk)
+HANGMAN_WOERTER = ("haus", "schule", "fahrrad", "apfelbaum", "sonne", "mathematik", "bruch",
+                   "vokabel", "deklination", "periodensystem", "garten", "fenster")
+
+
+class Aufbau(NamedTuple):
+    quiz: Callable                                 # quiz(ea=...) - ein Durchlauf
+    loeser: Callable[[str], Optional[str]]         # Bildschirm -> richtige Antwort
+    fehlermeldung: Pattern                         # Ausgabe des Quiz zu einer falschen Antwort
+    falsch: Optional[Callable[[Optional[str]], str]] = None
+    aufraeumen: Optional[Callable[[], None]] = None
+
+
+class BewertendesSkript(Skript):
+    """
+    Skript, das zusätzlich zählt, wie oft das Quiz eine Antwort als falsch meldet.
+    """
+
+    def __init__(self, antworten, fehlermeldung: Pattern, **optionen):
+        super().__init__(antworten, **optionen)
+        self.fehlermeldung = fehlermeldung
+        self.als_falsch_gemeldet = 0
+
+    def ausgabe(self, text: str = ""):
+        super().ausgabe(text)
+        if self.fehlermeldung.match(text):
+            self.als_falsch_gemeldet += 1
+
+
+def _kopfrechnen(zufall: random.Random, verzeichnis: str) -> Aufbau:
+    from Aufgabengenerator import Aufgabengenerator
+    from Kopfrechnen import kopfrechnen
+
+    aufgabe = re.compile(r"(-?\d+) (\S) (-?\d+) = $")
+    rechnen = {"+": int.__add__, "-": int.__sub__, "*": int.__mul__, "/": int.__floordiv__}
+    generator = Aufgabengenerator(seed=zufall.randrange(2 ** 32))
+
+    def loeser(bildschirm):
+        a, zeichen, b = aufgabe.search(bildschirm).groups()
+        return str(rechnen[zeichen](int(a), int(b)))
+
+    return Aufbau(lambda ea: kopfrechnen(generator, ea=ea), loeser, re.compile("falsch!!!"))
+
+
+def _bruchrechnen(zufall: random.Random, verzeichnis: str) -> Aufbau:
+    from Bruchrechnen import antwort_berechnen, main
+
+    aufgabe = re.compile(r"Was ergibt (\S+) (\S) (\S+)\?")
+
+    def loeser(bildschirm):
+        bruch_1, operator, bruch_2 = aufgabe.search(bildschirm).groups()
+        return str(antwort_berechnen(Fraction(bruch_1), Fraction(bruch_2), operator)[1])
+
+    # Eine gültige, aber falsche Bruchzahl (sonst würde nur "Ungültige Eingabe" gemessen)
+    return Aufbau(main, loeser, re.compile("Falsch!|Ungueltige Eingabe"),
+                  lambda richtig: str(Fraction(richtig) + 1))
+
+
+def _irregular_verbs(zufall: random.Random, verzeichnis: str) -> Aufbau:
+    from IrregularVerbs import irregular_verbs_trainer, load_irregular_verbs
+
+    verben = load_irregular_verbs(os.path.join(PROJEKTE, "IrregularVerbs", "irregular_verbs.txt"))
+    formen = {(form.replace("_", " "), verb["verb"]): wert for verb in verben for form, wert in verb.items()}
+    aufgabe = re.compile(r"What is the (.+) form of '(.+)'\? $")
+
+    def loeser(bildschirm):
+        return formen[aufgabe.search(bildschirm).groups()]
+
+    return Aufbau(lambda ea: irregular_verbs_trainer(verben, ea=ea), loeser, re.compile(r"Wrong\."))
+
+
+def _lateinische_deklination(zufall: random.Random, verzeichnis: str) -> Aufbau:
+    from LateinischeDeklination import deklinationen, lateinische_deklination_ueben
+
+    substantiv = re.compile(r"Deklination von: (\S+)")
+    fall = re.compile(r"Gib die (\S+) Form ein: $")
+    aktuell = {}
+
+    def loeser(bildschirm):
+        # Das Substantiv steht nur vor der ersten Frage eines Durchlaufs auf dem Bildschirm
+        neu = substantiv.search(bildschirm)
+        if neu:
+            aktuell["substantiv"] = neu.group(1)
+        return deklinationen[aktuell["substantiv"]][fall.search(bildschirm).group(1)]
+
+    # Gemeldet wird jeder falsche Fall einzeln
+    return Aufbau(lateinische_deklination_ueben, loeser, re.compile("Falsch!"))
+
+
+def _hangman(zufall: random.Random, verzeichnis: str) -> Aufbau:
+    from Hangman import hangman
+
+    spiel = {"wort": "", "geraten": set()}
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+
+    def runde(ea):
+        spiel["wort"] = zufall.choice(HANGMAN_WOERTER)
+        spiel["geraten"] = set()
+        hangman(spiel["wort"], ea=ea)
+
+    def raten(buchstaben):
+        offen = sorted(set(buchstaben) - spiel["geraten"])
+        buchstabe = zufall.choice(offen)
+        spiel["geraten"].add(buchstabe)
+        return buchstabe
+
+    def daneben(richtig):
+        # Der vom Löser gewählte Buchstabe wurde doch nicht geraten
+        spiel["geraten"].discard(richtig)
+        return raten(set(alphabet) - set(spiel["wort"]))
+
+    # Richtig = ein noch offener Buchstabe des Worts, falsch = einer, der nicht vorkommt
+    # Ein richtiger Buchstabe wird nicht gemeldet, nur falsche, ungültige und doppelte
+    fehlermeldung = re.compile("Falsch!|Ungültige Eingabe|Du hast diesen Buchstaben bereits")
+    return Aufbau(runde, lambda bildschirm: raten(spiel["wort"]), fehlermeldung, daneben)
+
+
+def _trainer(zufall: random.Random, verzeichnis: str, zeilen: int = 10000) -> Aufbau:
+    from Trainer import Trainer
+
+    trainer = Trainer(os.path.join(verzeichnis, "quiz_benchmark.db"), "quiz")
+    trainer.speichern_viele(((f"Frage {i}", f"Antwort {i}", zufall.randint(1, 5)) for i in range(zeilen)),
+                            eine_transaktion=True)
+    frage = re.compile(r"Frage \d+/\d+: (.+)\n")
+
+    def loeser(bildschirm):
+        return "Antwort " + frage.search(bildschirm).group(1)[len("Frage "):]
+
+    return Aufbau(lambda ea: trainer.ueben(10, ea=ea), loeser, re.compile("✗ Falsch!"),
+                  aufraeumen=trainer.schliessen)
+
+
+QUIZZE: Dict[str, Callable[[random.Random, str], Aufbau]] = {
+    "kopfrechnen": _kopfrechnen,
+    "bruchrechnen": _bruchrechnen,
+    "irregular_verbs": _irregular_verbs,
+    "lateinische_deklination": _lateinische_deklination,
+    "hangman": _hangman,
+    "trainer": _trainer,
+}
+
+
+def quiz_messen(name: str, fragen: int = 100000, trefferquote: float = 0.8, seed: int = 1,
+                verzeichnis: Optional[str] = None) -> dict:
+    """
+    Lässt ein Quiz fragen-mal von einem simulierten Lernenden beantworten.
+
+    Returns:
+        dict: fragen, laeufe, sekunden, fragen_pro_s, Latenz (mittel/p50/p99/max in ms),
+              richtig (Anteil, den das Quiz als richtig gewertet hat) und beabsichtigt
+              (Anteil, den der Lernende richtig beantworten wollte)
+    """
+    random.seed(seed)
+    zufall = random.Random(seed)
+    with tempfile.TemporaryDirectory() as temp:
+        aufbau = QUIZZE[name](zufall, verzeichnis or temp)
+        lernender = Lernender(aufbau.loeser, trefferquote, seed=seed,
+                              **({"falsch": aufbau.falsch} if aufbau.falsch else {}))
+        skript = BewertendesSkript(lernender, aufbau.fehlermeldung, max_eingaben=fragen, mitschreiben=False)
+        start = time.perf_counter()
+        try:
+            laeufe = skript.ausfuehren(aufbau.quiz)
+        finally:
+            if aufbau.aufraeumen is not None:
+                aufbau.aufraeumen()
+        sekunden = time.perf_counter() - start
+
+    latenz = skript.latenz
+    return {
+        "fragen": skript.eingaben,
+        "laeufe": laeufe,
+        "sekunden": sekunden,
+        "fragen_pro_s": skript.eingaben / sekunden,
+        "mittel_ms": latenz.summe_ms / latenz.anzahl if latenz.anzahl else 0.0,
+        "p50_ms": latenz.perzentil(50),
+        "p99_ms": latenz.perzentil(99),
+        "max_ms": latenz.max_ms,
+        "richtig": 1 - skript.als_falsch_gemeldet / max(skript.eingaben, 1),
+        "beabsichtigt": lernender.richtig / max(skript.eingaben, 1),
+    }
+
+
+def benchmark_quizze(namen, fragen: int = 100000, trefferquote: float = 0.8, seed: int = 1):
+    """
+    Misst alle gewählten Quizze nacheinander und gibt eine Tabelle aus ("richtig" wertet das
+    Quiz, "gewollt" der Lernende - weichen sie ab, bewertet das Quiz falsch).
+    """
+    print(f"{'Quiz':<24} | {'Fragen':>8} | {'Fragen/s':>10} | {'mittel ms':>9} | {'p50 ms':>8} | "
+          f"{'p99 ms':>8} | {'max ms':>8} | {'richtig':>7} | {'gewollt':>7}")
+    for name in namen:
+        ergebnis = quiz_messen(name, fragen, trefferquote, seed)
+        print(f"{name:<24} | {ergebnis['fragen']:>8} | {ergebnis['fragen_pro_s']:>10.0f} | "
+              f"{ergebnis['mittel_ms']:>9.4f} | {ergebnis['p50_ms']:>8.4f} | {ergebnis['p99_ms']:>8.4f} | "
+              f"{ergebnis['max_ms']:>8.2f} | {ergebnis['richtig']:>7.1%} | {ergebnis['beabsichtigt']:>7.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durchsatz und Latenz der Quiz-Programme")
+    parser.add_argument("--fragen", type=int, default=100000, help="Fragen pro Quiz")
+    parser.add_argument("--quiz", nargs="+", choices=sorted(QUIZZE), default=list(QUIZZE))
+    parser.add_argument("--trefferquote", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=1)
+    argumente = parser.parse_args()
+
+    benchmark_quizze(argumente.quiz, argumente.fragen, argumente.trefferquote, argumente.seed)
@@ -0,0 +1,489 @@
+"""
+HTTP/JSON Schnittstelle zum Trainer, damit Browser im lokalen Netz üben können.
+
+Start:
+    python QuizServer.py lerntrainer.db [--host 0.0.0.0] [--port 8080] [--tabelle vokabeln ...]
+
+Bereitgestellt werden nur Themengebiete, die es in der Datenbank schon gibt (oder die mit
+--tabelle erlaubt sind); andere Tabellennamen ergeben 404.
+
+Endpunkte (tabelle = table_name des Themengebiets):
+    GET    /<tabelle>/fragen?anzahl=10&schwierigkeitsgrad=2&faellig=1   nächste Fragen (ohne Antwort)
+    POST   /<tabelle>/antworten     {"antworten": [{"id": 1, "antwort": "..."}, ...]}
+    GET    /<tabelle>/fragen/<id>   eine Frage mit Antwort
+    POST   /<tabelle>/fragen        {"frage": ..., "antwort": ..., "schwierigkeitsgrad": 1} oder eine Liste davon
+    PUT    /<tabelle>/fragen/<id>   {"frage": ..., "antwort": ..., "schwierigkeitsgrad": ...} (alle optional)
+    DELETE /<tabelle>/fragen/<id>
+    GET    /<tabelle>/statistik
+"""
+import argparse
+import http.client
+import json
+import re
+import socket
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from Trainer import Trainer
+
+
+class FragenCache:
+    """
+    LRU-Cache für häufig gestellte Fragen: (tabelle, id) -> (id, frage, antwort).
+    Beim Prüfen abgegebener Antworten muss so meist nicht gelesen werden.
+    """
+
+    def __init__(self, max_eintraege: int = 10000):
+        """
+        Args:
+            max_eintraege: Maximale Anzahl Fragen im Cache (die am längsten unbenutzten fliegen raus)
+        """
+        self.max_eintraege = max_eintraege
+        self._eintraege: "OrderedDict[Tuple[str, int], Tuple[int, str, str]]" = OrderedDict()
+        self._sperre = threading.Lock()
+        self.treffer = 0
+        self.fehlgriffe = 0
+
+    def holen(self, tabelle: str, id: int) -> Optional[Tuple[int, str, str]]:
+        """
+        Returns:
+            Tuple: (id, frage, antwort) oder None wenn die Frage nicht im Cache ist
+        """
+        with self._sperre:
+            zeile = self._eintraege.get((tabelle, id))
+            if zeile is None:
+                self.fehlgriffe += 1
+                return None
+            self._eintraege.move_to_end((tabelle, id))
+            self.treffer += 1
+            return zeile
+
+    def ablegen(self, tabelle: str, zeilen: List[Tuple[int, str, str]]):
+        """
+        Legt Fragen (id, frage, antwort) im Cache ab.
+        """
+        with self._sperre:
+            for zeile in zeilen:
+                self._eintraege[(tabelle, zeile[0])] = zeile
+                self._eintraege.move_to_end((tabelle, zeile[0]))
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+
+    def entfernen(self, tabelle: str, id: int):
+        """
+        Entfernt eine geänderte oder gelöschte Frage aus dem Cache.
+        """
+        with self._sperre:
+            self._eintraege.pop((tabelle, id), None)
+
+    def zaehler(self) -> dict:
+        """
+        Returns:
+            dict: eintraege, treffer, fehlgriffe und trefferquote in Prozent
+        """
+        anfragen = self.treffer + self.fehlgriffe
+        return {
+            "eintraege": len(self._eintraege),
+            "treffer": self.treffer,
+            "fehlgriffe": self.fehlgriffe,
+            "trefferquote": self.treffer / anfragen * 100 if anfragen else None,
+        }
+
+
+class QuizServer:
+    """
+    Stellt die Themengebiete einer Trainer-Datenbank per HTTP/JSON bereit.
+    Für jede Tabelle wird beim ersten Zugriff ein Trainer erstellt; alle teilen
+    sich die Verbindungen der Datenbankdatei.
+    """
+
+    # Erlaubte Tabellennamen (werden in SQL eingesetzt)
+    TABELLEN_MUSTER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+    # Hilfstabellen, die der Trainer zu jedem Themengebiet anlegt (samt den FTS5-Tabellen
+    # dazu wie {tabelle}_suche_data); sie sind selbst keine Themengebiete
+    HILFSTABELLEN = ("_zusammenfassung", "_histogramm", "_suche", "_trigramm")
+    # Obergrenze für Fragen pro Abruf
+    MAX_FRAGEN = 500
+
+    def __init__(self, db_name: str, host: str = "127.0.0.1", port: int = 8080,
+                 cache_groesse: int = 10000, tabellen: Optional[Sequence[str]] = None):
+        """
+        Initialisiert den Server (gestartet wird er mit starten()).
+
+        Args:
+            db_name: Name der SQLite Datenbankdatei
+            host: Adresse, an die der Server gebunden wird ("0.0.0.0" für das ganze LAN)
+            port: Port des Servers (0 = freien Port wählen)
+            cache_groesse: Anzahl Fragen im Cache
+            tabellen: Nur diese Themengebiete bereitstellen (fehlende werden angelegt);
+                      None = alle, die es in der Datenbank schon gibt
+        """
+        self.db_name = db_name
+        self.tabellen = frozenset(tabellen) if tabellen is not None else None
+        self.cache = FragenCache(cache_groesse)
+        self._trainer: Dict[str, Trainer] = {}
+        self._verbuchen_sperren: Dict[str, threading.Lock] = {}
+        self._sperre = threading.Lock()
+
+        self.http = ThreadingHTTPServer((host, port), _QuizAnfrage)
+        self.http.daemon_threads = True
+        self.http.quiz = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def adresse(self) -> Tuple[str, int]:
+        """
+        Returns:
+            Tuple: (host, port) an dem der Server tatsächlich lauscht
+        """
+        return self.http.server_address[:2]
+
+    def themengebiete(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Die Themengebiete, die der Server bereitstellt: die erlaubten Tabellen,
+                       sonst alle Tabellen der Datenbank außer den Hilfstabellen des Trainers
+        """
+        if self.tabellen is not None:
+            return sorted(self.tabellen)
+        with closing(sqlite3.connect(self.db_name)) as verbindung:
+            namen = {name for name, in verbindung.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite%'")}
+        hilfstabellen = {name for name in namen for thema in namen for endung in self.HILFSTABELLEN
+                         if name == thema + endung or name.startswith(thema + endung + "_")}
+        return sorted(namen - hilfstabellen)
+
+    def trainer(self, tabelle: str) -> Trainer:
+        """
+        Liefert den Trainer für ein Themengebiet (wird beim ersten Zugriff erstellt).
+        Neue Tabellen legt der Server nur an, wenn sie in tabellen erlaubt sind.
+
+        Raises:
+            ValueError: Bei ungültigem Tabellennamen
+            LookupError: Wenn es kein solches Themengebiet gibt
+        """
+        if not self.TABELLEN_MUSTER.match(tabelle):
+            raise ValueError(f"Ungültiger Tabellenname: {tabelle!r}")
+        trainer = self._trainer.get(tabelle)
+        if trainer is None:
+            if tabelle not in self.themengebiete():
+                raise LookupError(f"Unbekanntes Themengebiet: {tabelle!r}")
+            with self._sperre:
+                trainer = self._trainer.get(tabelle)
+                if trainer is None:
+                    trainer = Trainer(self.db_name, tabelle)
+                    self._verbuchen_sperren[tabelle] = threading.Lock()
+                    self._trainer[tabelle] = trainer
+        return trainer
+
+    def naechste_fragen(self, tabelle: str, anzahl: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                        nur_faellige: bool = False) -> List[dict]:
+        """
+        Wählt Fragen für eine Übung aus. Die Antworten bleiben auf dem Server.
+
+        Returns:
+            List[dict]: Liste mit {"id", "frage"}
+        """
+        trainer = self.trainer(tabelle)
+        anzahl = max(0, min(anzahl, self.MAX_FRAGEN))
+        if nur_faellige:
+            zeilen = trainer.naechste_faellige(anzahl, schwierigkeitsgrad)
+        else:
+            zeilen = trainer.stichprobe(anzahl, schwierigkeitsgrad)
+        self.cache.ablegen(tabelle, zeilen)
+        return [{"id": id, "frage": frage} for id, frage, _ in zeilen]
+
+    def antworten_abgeben(self, tabelle: str, antworten: List[dict]) -> List[dict]:
+        """
+        Prüft viele Antworten und verbucht sie gesammelt.
+
+        Args:
+            antworten: Liste mit {"id", "antwort"[, "qualitaet"]}
+
+        Returns:
+            List[dict]: Pro Antwort {"id", "richtig", "korrekte_antwort"}
+                        bzw. {"id", "fehler"} für unbekannte Fragen
+        """
+        trainer = self.trainer(tabelle)
+        ids = [int(eintrag["id"]) for eintrag in antworten]
+
+        korrekt = {}
+        fehlend = []
+        for id in ids:
+            zeile = self.cache.holen(tabelle, id)
+            if zeile is None:
+                fehlend.append(id)
+            else:
+                korrekt[id] = zeile[2]
+        if fehlend:
+            zeilen = trainer.fragen_zu_ids(fehlend)
+            self.cache.ablegen(tabelle, zeilen)
+            korrekt.update((id, antwort) for id, _, antwort in zeilen)
+
+        ergebnisse = []
+        verbuchen = []
+        for id, eintrag in zip(ids, antworten):
+            if id not in korrekt:
+                ergebnisse.append({"id": id, "fehler": "Frage nicht gefunden"})
+                continue
+            richtig = trainer.antwort_pruefen(korrekt[id], str(eintrag.get("antwort", "")))
+            verbuchen.append((id, richtig, eintrag.get("qualitaet")))
+            ergebnisse.append({"id": id, "richtig": richtig, "korrekte_antwort": korrekt[id]})
+
+        # Lernstand lesen, planen und vormerken darf pro Tabelle nur einer gleichzeitig
+        with self._verbuchen_sperren[tabelle]:
+            trainer.antworten_verbuchen(verbuchen)
+        return ergebnisse
+
+    def frage_lesen(self, tabelle: str, id: int) -> Optional[dict]:
+        """
+        Returns:
+            dict: {"id", "frage", "antwort"} oder None wenn es die Frage nicht gibt
+        """
+        zeile = self.cache.holen(tabelle, id)
+        if zeile is None:
+            zeilen = self.trainer(tabelle).fragen_zu_ids([id])
+            if not zeilen:
+                return None
+            zeile = zeilen[0]
+            self.cache.ablegen(tabelle, zeilen)
+        return {"id": zeile[0], "frage": zeile[1], "antwort": zeile[2]}
+
+    def fragen_anlegen(self, tabelle: str, daten) -> int:
+        """
+        Speichert eine Frage oder eine Liste von Fragen.
+
+        Returns:
+            int: Anzahl der gespeicherten Fragen
+        """
+        if isinstance(daten, dict):
+            daten = [daten]
+        datensaetze = [(str(d["frage"]), str(d["antwort"]), int(d.get("schwierigkeitsgrad", 1)))
+                       for d in daten]
+        trainer = self.trainer(tabelle)
+        if len(datensaetze) == 1:
+            return 1 if trainer.speichern(*datensaetze[0]) else 0
+        return trainer.speichern_viele(datensaetze)
+
+    def frage_bearbeiten(self, tabelle: str, id: int, daten: dict) -> bool:
+        """
+        Returns:
+            bool: True wenn die Frage geändert wurde
+        """
+        schwierigkeitsgrad = daten.get("schwierigkeitsgrad")
+        geaendert = self.trainer(tabelle).bearbeiten(
+            id, daten.get("frage"), daten.get("antwort"),
+            int(schwierigkeitsgrad) if schwierigkeitsgrad is not None else None)
+        self.cache.entfernen(tabelle, id)
+        return geaendert
+
+    def frage_loeschen(self, tabelle: str, id: int) -> bool:
+        """
+        Returns:
+            bool: True wenn die Frage gelöscht wurde
+        """
+        geloescht = self.trainer(tabelle).loeschen(id)
+        self.cache.entfernen(tabelle, id)
+        return geloescht
+
+    def statistik(self, tabelle: str) -> dict:
+        """
+        Returns:
+            dict: Statistik des Themengebiets (siehe Trainer.statistik) und Cache-Zähler
+        """
+        statistik = self.trainer(tabelle).statistik()
+        statistik["cache"] = self.cache.zaehler()
+        return statistik
+
+    def starten(self, im_hintergrund: bool = False):
+        """
+        Startet den Server.
+
+        Args:
+            im_hintergrund: True = in einem eigenen Thread laufen lassen und sofort zurückkehren
+        """
+        host, port = self.adresse
+        print(f"Quiz-Server läuft auf http://{host}:{port}/")
+        if im_hintergrund:
+            self._thread = threading.Thread(target=self.http.serve_forever, daemon=True)
+            self._thread.start()
+        else:
+            try:
+                self.http.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.beenden()
+
+    def beenden(self):
+        """
+        Stoppt den Server und schließt alle Trainer.
+        """
+        if self._thread is not None:
+            self.http.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.http.server_close()
+        with self._sperre:
+            for trainer in self._trainer.values():
+                trainer.schliessen()
+            self._trainer = {}
+
+
+class _QuizAnfrage(BaseHTTPRequestHandler):
+    """
+    Bearbeitet eine HTTP-Verbindung. HTTP/1.1, damit Clients die Verbindung
+    für viele Anfragen offen halten können (keep-alive).
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Kleine Antworten sofort senden statt auf das ACK des Clients zu warten
+    disable_nagle_algorithm = True
+    PFAD_MUSTER = re.compile(r"^/(?P<tabelle>[^/]+)/(?P<bereich>fragen|antworten|statistik)(?:/(?P<id>\d+))?/?$")
+
+    def do_GET(self):
+        self._bearbeiten("GET")
+
+    def do_POST(self):
+        self._bearbeiten("POST")
+
+    def do_PUT(self):
+        self._bearbeiten("PUT")
+
+    def do_DELETE(self):
+        self._bearbeiten("DELETE")
+
+    def _bearbeiten(self, methode: str):
+        """
+        Leitet eine Anfrage an den passenden QuizServer-Aufruf weiter.
+        """
+        teile = urlsplit(self.path)
+        treffer = self.PFAD_MUSTER.match(teile.path)
+        if treffer is None:
+            self._senden(404, {"fehler": "Unbekannter Pfad"})
+            return
+
+        quiz: QuizServer = self.server.quiz
+        tabelle, bereich, id = treffer["tabelle"], treffer["bereich"], treffer["id"]
+        id = int(id) if id is not None else None
+        parameter = {name: werte[-1] for name, werte in parse_qs(teile.query).items()}
+
+        try:
+            daten = self._json_lesen()
+            route = (methode, bereich, id is not None)
+
+            if route == ("GET", "fragen", False):
+                schwierigkeitsgrad = parameter.get("schwierigkeitsgrad")
+                self._senden(200, {"fragen": quiz.naechste_fragen(
+                    tabelle, int(parameter.get("anzahl", 10)),
+                    int(schwierigkeitsgrad) if schwierigkeitsgrad is not None else None,
+                    parameter.get("faellig", "0") not in ("0", "", "false"))})
+            elif route == ("POST", "antworten", False):
+                antworten = daten.get("antworten", [daten]) if isinstance(daten, dict) else daten
+                self._senden(200, {"ergebnisse": quiz.antworten_abgeben(tabelle, antworten)})
+            elif route == ("GET", "fragen", True):
+                frage = quiz.frage_lesen(tabelle, id)
+                if frage is None:
+                    self._senden(404, {"fehler": f"Frage {id} nicht gefunden"})
+                else:
+                    self._senden(200, frage)
+            elif route == ("POST", "fragen", False):
+                self._senden(201, {"gespeichert": quiz.fragen_anlegen(tabelle, daten)})
+            elif route == ("PUT", "fragen", True):
+                self._senden(200 if quiz.frage_bearbeiten(tabelle, id, daten or {}) else 404,
+                             {"id": id})
+            elif route == ("DELETE", "fragen", True):
+                self._senden(200 if quiz.frage_loeschen(tabelle, id) else 404, {"id": id})
+            elif route == ("GET", "statistik", False):
+                self._senden(200, quiz.statistik(tabelle))
+            else:
+                self._senden(405, {"fehler": f"{methode} ist hier nicht erlaubt"})
+
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._senden(400, {"fehler": f"Ungültige Anfrage: {e}"})
+        except LookupError as e:
+            self._senden(404, {"fehler": str(e)})
+
+    def _json_lesen(self):
+        """
+        Liest den JSON-Körper der Anfrage (None wenn keiner mitgeschickt wurde).
+        """
+        laenge = int(self.headers.get("Content-Length") or 0)
+        if laenge == 0:
+            return None
+        return json.loads(self.rfile.read(laenge))
+
+    def _senden(self, status: int, daten):
+        """
+        Schickt eine JSON-Antwort mit Content-Length (nötig für keep-alive).
+        """
+        koerper = json.dumps(daten, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(koerper)))
+        self.end_headers()
+        self.wfile.write(koerper)
+
+    def log_message(self, format, *args):
+        # Keine Zeile pro Anfrage auf der Konsole
+        pass
+
+
+class QuizClient:
+    """
+    Einfacher Client für den QuizServer über eine dauerhaft offene Verbindung.
+    Wird für Lasttests benutzt, funktioniert aber auch als Beispiel für eigene Clients.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, tabelle: str = "vokabeln"):
+        self.tabelle = tabelle
+        self.verbindung = http.client.HTTPConnection(host, port)
+        self.verbindung.connect()
+        # Kopf und Körper einer Anfrage werden getrennt geschrieben, ohne Nagle kein Warten darauf
+        self.verbindung.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _anfrage(self, methode: str, pfad: str, daten=None):
+        """
+        Schickt eine Anfrage und liefert (status, json).
+        """
+        koerper = json.dumps(daten).encode("utf-8") if daten is not None else None
+        kopf = {"Content-Type": "application/json"} if koerper is not None else {}
+        self.verbindung.request(methode, f"/{self.tabelle}{pfad}", body=koerper, headers=kopf)
+        antwort = self.verbindung.getresponse()
+        return antwort.status, json.loads(antwort.read())
+
+    def naechste_fragen(self, anzahl: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                        nur_faellige: bool = False) -> List[dict]:
+        pfad = f"/fragen?anzahl={anzahl}"
+        if schwierigkeitsgrad is not None:
+            pfad += f"&schwierigkeitsgrad={schwierigkeitsgrad}"
+        if nur_faellige:
+            pfad += "&faellig=1"
+        return self._anfrage("GET", pfad)[1]["fragen"]
+
+    def antworten_abgeben(self, antworten: List[dict]) -> List[dict]:
+        return self._anfrage("POST", "/antworten", {"antworten": antworten})[1]["ergebnisse"]
+
+    def statistik(self) -> dict:
+        return self._anfrage("GET", "/statistik")[1]
+
+    def schliessen(self):
+        self.verbindung.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP/JSON Quiz-Server für den Trainer")
+    parser.add_argument("db_name", nargs="?", default="lerntrainer.db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache", type=int, default=10000, help="Anzahl Fragen im Cache")
+    parser.add_argument("--tabelle", action="append", dest="tabellen",
+                        help="Nur dieses Themengebiet bereitstellen (mehrfach möglich)")
+    argumente = parser.parse_args()
+
+    QuizServer(argumente.db_name, argumente.host, argumente.port, argumente.cache, argumente.tabellen).starten()
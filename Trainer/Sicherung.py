@@ -0,0 +1,341 @@
+"""
+Sicherungen und Pflege einer Trainer-Datenbank im laufenden Betrieb.
+
+Aufruf:
+    python Sicherung.py sichern lerntrainer.db sicherung.db [--seiten 256] [--pause 0.005]
+    python Sicherung.py snapshot lerntrainer.db snapshot.db
+    python Sicherung.py regelmaessig lerntrainer.db sicherungen/ [--intervall 3600] [--behalten 24]
+    python Sicherung.py kompaktieren lerntrainer.db [--seiten 1000]
+    python Sicherung.py groesse lerntrainer.db
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Callable, List, Optional
+
+from Verbindungsmanager import Verbindungsmanager
+
+
+class Sicherung:
+    """
+    Online-Sicherung (Backup-API in Schritten), Snapshots per VACUUM INTO und
+    Kompaktierung per incremental_vacuum für eine Datenbankdatei.
+    Alles läuft neben laufenden Trainern: geschrieben wird über deren gemeinsamen
+    Verbindungsmanager, und der Schreiber wird immer nur kurz gesperrt.
+    """
+
+    # Modi von PRAGMA auto_vacuum
+    AUTO_VACUUM_MODI = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+    # Versuche, das WAL nach dem Kompaktieren vollständig zurückzuschreiben
+    CHECKPOINT_VERSUCHE = 20
+
+    def __init__(self, db_name: str, verbindungsmanager: Optional[Verbindungsmanager] = None):
+        """
+        Args:
+            db_name: Name der SQLite Datenbankdatei
+            verbindungsmanager: Eigener Verbindungsmanager (Standard: der gemeinsame
+                                Manager aller Trainer für dieselbe Datei)
+        """
+        self.db_name = db_name
+        self.verbindungen = verbindungsmanager if verbindungsmanager is not None else Verbindungsmanager.fuer(db_name)
+        self._gemeinsame_verbindungen = verbindungsmanager is None
+        self._stopp = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.letzter_bericht: Optional[dict] = None
+
+    def groesse(self) -> dict:
+        """
+        Returns:
+            dict: datei_bytes, wal_bytes, seitengroesse, seiten, freie_seiten und auto_vacuum
+        """
+        with self.verbindungen.lesen() as verbindung:
+            werte = {name: verbindung.execute(f"PRAGMA {name}").fetchone()[0]
+                     for name in ("page_size", "page_count", "freelist_count", "auto_vacuum")}
+        return {
+            "datei_bytes": _dateigroesse(self.db_name),
+            "wal_bytes": _dateigroesse(self.db_name + "-wal"),
+            "seitengroesse": werte["page_size"],
+            "seiten": werte["page_count"],
+            "freie_seiten": werte["freelist_count"],
+            "auto_vacuum": self.AUTO_VACUUM_MODI.get(werte["auto_vacuum"], werte["auto_vacuum"]),
+        }
+
+    def sichern(self, ziel: str, seiten_pro_schritt: int = 256, pause: float = 0.005,
+                fortschritt: Optional[Callable[[int, int], None]] = None) -> dict:
+        """
+        Erstellt eine Sicherung, während weiter geübt werden kann (siehe
+        Verbindungsmanager.sichern). Geschrieben wird in eine temporäre Datei,
+        die erst nach erfolgreicher Prüfung an ihren Platz kommt.
+
+        Args:
+            ziel: Dateiname der Sicherung (wird ersetzt, falls vorhanden)
+            seiten_pro_schritt: Seiten pro Schritt (kleiner = kürzere Sperren, längere Dauer)
+            pause: Sekunden zwischen zwei Schritten
+            fortschritt: Optionale Funktion fortschritt(kopierte_seiten, seiten_gesamt)
+
+        Returns:
+            dict: Bericht mit art, ziel, sekunden, bytes, schritte, neustarts, seiten, max_sperre_ms
+        """
+        temporaer = ziel + ".tmp"
+        _entfernen(temporaer)
+        start = time.perf_counter()
+        with closing(sqlite3.connect(temporaer)) as ziel_verbindung:
+            zaehler = self.verbindungen.sichern(ziel_verbindung, seiten_pro_schritt, pause, fortschritt)
+            # Die Sicherung ist ohne -wal Datei vollständig
+            ziel_verbindung.execute("PRAGMA journal_mode = DELETE")
+            pruefung = ziel_verbindung.execute("PRAGMA quick_check").fetchone()[0]
+        if pruefung != "ok":
+            _entfernen(temporaer)
+            raise sqlite3.DatabaseError(f"Sicherung fehlerhaft: {pruefung}")
+        os.replace(temporaer, ziel)
+
+        return self._bericht("sicherung", ziel, start, **zaehler)
+
+    def snapshot(self, ziel: str) -> dict:
+        """
+        Schreibt eine kompakte Kopie (VACUUM INTO). Sie wird aus einer einzigen
+        Lesetransaktion erzeugt und blockiert im WAL-Modus keinen Schreiber.
+
+        Args:
+            ziel: Dateiname des Snapshots (wird ersetzt, falls vorhanden)
+
+        Returns:
+            dict: Bericht mit art, ziel, sekunden, bytes und quelle_bytes
+        """
+        temporaer = ziel + ".tmp"
+        _entfernen(temporaer)
+        start = time.perf_counter()
+        # Eigene Verbindung: die Leser des Pools sind query_only
+        with closing(sqlite3.connect(self.db_name)) as verbindung:
+            verbindung.execute("PRAGMA busy_timeout = 5000")
+            verbindung.execute("VACUUM INTO ?", (temporaer,))
+        os.replace(temporaer, ziel)
+
+        return self._bericht("snapshot", ziel, start, quelle_bytes=_dateigroesse(self.db_name))
+
+    def snapshots_starten(self, verzeichnis: str, intervall: float = 3600, behalten: int = 24):
+        """
+        Erstellt im Hintergrund alle intervall Sekunden einen Snapshot im Verzeichnis
+        und löscht die ältesten, sodass höchstens behalten übrig bleiben.
+        """
+        os.makedirs(verzeichnis, exist_ok=True)
+        self._stopp.clear()
+        self._snapshot_thread = threading.Thread(target=self._snapshot_schleife,
+                                                 args=(verzeichnis, intervall, behalten),
+                                                 daemon=True, name="sicherung-snapshots")
+        self._snapshot_thread.start()
+
+    def _snapshot_schleife(self, verzeichnis: str, intervall: float, behalten: int):
+        """
+        Private Methode zur internen Verwendung.
+        """
+        while True:
+            try:
+                bericht = self.snapshot(self._snapshot_name(verzeichnis))
+                bericht_ausgeben(bericht)
+                for alt in self.snapshots(verzeichnis)[:-behalten]:
+                    os.remove(alt)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Fehler beim Snapshot: {e}")
+            if self._stopp.wait(intervall):
+                break
+
+    def _snapshot_name(self, verzeichnis: str) -> str:
+        """
+        Dateiname für einen neuen Snapshot: <datenbank>_<datum>_<uhrzeit>.db
+        Private Methode zur internen Verwendung.
+        """
+        basis = os.path.splitext(os.path.basename(self.db_name))[0]
+        zeitpunkt = time.strftime("%Y%m%d_%H%M%S")
+        name = os.path.join(verzeichnis, f"{basis}_{zeitpunkt}.db")
+        nummer = 1
+        while os.path.exists(name):
+            nummer += 1
+            name = os.path.join(verzeichnis, f"{basis}_{zeitpunkt}_{nummer}.db")
+        return name
+
+    def snapshots(self, verzeichnis: str) -> List[str]:
+        """
+        Returns:
+            List[str]: Die Snapshots dieser Datenbank im Verzeichnis, der älteste zuerst
+        """
+        basis = os.path.splitext(os.path.basename(self.db_name))[0] + "_"
+        namen = [os.path.join(verzeichnis, name) for name in os.listdir(verzeichnis)
+                 if name.startswith(basis) and name.endswith(".db")]
+        return sorted(namen, key=os.path.getmtime)
+
+    def kompaktieren(self, seiten_pro_schritt: int = 1000, pause: float = 0.005) -> dict:
+        """
+        Gibt freie Seiten (z.B. nach dem Löschen von Fragen) an das Dateisystem zurück.
+        Seiten, die nur teilweise leer sind, bleiben belegt - dafür gibt es snapshot().
+        Mit auto_vacuum = INCREMENTAL in Schritten von seiten_pro_schritt Seiten, zwischen
+        denen die Trainer weiter schreiben können. Ältere Dateien ohne auto_vacuum werden
+        einmalig per VACUUM umgestellt - das sperrt den Schreiber für die ganze Dauer.
+
+        Returns:
+            dict: Bericht mit art, ziel, sekunden, bytes (Datei), vorher_seiten, seiten,
+                  seitengroesse, schritte, umgestellt, max_sperre_ms und checkpoint_vollstaendig
+                  (False: die Datei schrumpft erst beim nächsten Checkpoint)
+        """
+        start = time.perf_counter()
+        vorher = self.groesse()
+        umgestellt = False
+        schritte = 0
+        max_sperre_ms = 0.0
+
+        with self.verbindungen.schreiben() as verbindung:
+            if verbindung.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                gesperrt_seit = time.perf_counter()
+                verbindung.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                verbindung.execute("VACUUM")
+                max_sperre_ms = (time.perf_counter() - gesperrt_seit) * 1000
+                umgestellt = True
+
+        while True:
+            with self.verbindungen.schreiben() as verbindung:
+                gesperrt_seit = time.perf_counter()
+                if verbindung.execute("PRAGMA freelist_count").fetchone()[0] == 0:
+                    break
+                # executescript führt das Pragma bis zum Ende aus (execute gibt nur eine Seite frei)
+                verbindung.executescript(f"PRAGMA incremental_vacuum({int(seiten_pro_schritt)});")
+                max_sperre_ms = max(max_sperre_ms, (time.perf_counter() - gesperrt_seit) * 1000)
+            schritte += 1
+            time.sleep(pause)
+
+        # Die Datei schrumpft erst, wenn das WAL ganz zurückgeschrieben ist. PASSIVE wartet
+        # auf niemanden und hält keine Schreiber auf; solange Leser noch ältere Stände
+        # sehen, bleibt es unvollständig und wird kurz darauf wiederholt
+        checkpoint_vollstaendig = self.verbindungen.nur_schreiber
+        if not checkpoint_vollstaendig:
+            with closing(sqlite3.connect(self.db_name)) as verbindung:
+                for _ in range(self.CHECKPOINT_VERSUCHE):
+                    _, log, zurueckgeschrieben = verbindung.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+                    if log == zurueckgeschrieben:
+                        checkpoint_vollstaendig = True
+                        break
+                    time.sleep(0.05)
+
+        nachher = self.groesse()
+        return self._bericht("kompaktierung", self.db_name, start,
+                             vorher_seiten=vorher["seiten"], seiten=nachher["seiten"],
+                             seitengroesse=nachher["seitengroesse"], schritte=schritte,
+                             umgestellt=umgestellt, max_sperre_ms=max_sperre_ms,
+                             checkpoint_vollstaendig=checkpoint_vollstaendig)
+
+    def _bericht(self, art: str, ziel: str, start: float, **werte) -> dict:
+        """
+        Private Methode zur internen Verwendung.
+        """
+        self.letzter_bericht = {"art": art, "ziel": ziel, "sekunden": time.perf_counter() - start,
+                                "bytes": _dateigroesse(ziel), **werte}
+        return self.letzter_bericht
+
+    def schliessen(self):
+        """
+        Beendet die regelmäßigen Snapshots und gibt die Verbindungen frei.
+        """
+        self._stopp.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        if self._gemeinsame_verbindungen:
+            self.verbindungen.freigeben()
+
+
+def _dateigroesse(dateiname: str) -> int:
+    try:
+        return os.path.getsize(dateiname)
+    except OSError:
+        return 0
+
+
+def _entfernen(dateiname: str):
+    try:
+        os.remove(dateiname)
+    except FileNotFoundError:
+        pass
+
+
+def _mb(anzahl_bytes: int) -> str:
+    return f"{anzahl_bytes / 1024 / 1024:.1f} MB"
+
+
+def bericht_ausgeben(bericht: dict):
+    """
+    Gibt einen Bericht von sichern, snapshot oder kompaktieren lesbar aus.
+    """
+    if bericht["art"] == "sicherung":
+        print(f"Sicherung nach '{bericht['ziel']}': {_mb(bericht['bytes'])} in {bericht['sekunden']:.2f}s, "
+              f"{bericht['schritte']} Schritte, {bericht['neustarts']} Neustarts, "
+              f"Schreiber höchstens {bericht['max_sperre_ms']:.1f} ms gesperrt")
+    elif bericht["art"] == "snapshot":
+        print(f"Snapshot nach '{bericht['ziel']}': {_mb(bericht['bytes'])} "
+              f"(Original {_mb(bericht['quelle_bytes'])}) in {bericht['sekunden']:.2f}s")
+    else:
+        umgestellt = ", auf auto_vacuum = INCREMENTAL umgestellt" if bericht["umgestellt"] else ""
+        if not bericht["checkpoint_vollstaendig"]:
+            umgestellt += ", Datei schrumpft beim nächsten Checkpoint"
+        seitengroesse = bericht["seitengroesse"]
+        print(f"Kompaktiert: {bericht['vorher_seiten']} -> {bericht['seiten']} Seiten "
+              f"({_mb(bericht['vorher_seiten'] * seitengroesse)} -> {_mb(bericht['seiten'] * seitengroesse)}) "
+              f"in {bericht['sekunden']:.2f}s "
+              f"({bericht['schritte']} Schritte{umgestellt}), "
+              f"Schreiber höchstens {bericht['max_sperre_ms']:.1f} ms gesperrt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sicherung und Pflege einer Trainer-Datenbank")
+    unterbefehle = parser.add_subparsers(dest="befehl", required=True)
+
+    sichern = unterbefehle.add_parser("sichern", help="Online-Sicherung mit der Backup-API")
+    sichern.add_argument("db_name")
+    sichern.add_argument("ziel")
+    sichern.add_argument("--seiten", type=int, default=256, help="Seiten pro Schritt")
+    sichern.add_argument("--pause", type=float, default=0.005, help="Sekunden zwischen zwei Schritten")
+
+    snapshot = unterbefehle.add_parser("snapshot", help="kompakte Kopie per VACUUM INTO")
+    snapshot.add_argument("db_name")
+    snapshot.add_argument("ziel")
+
+    regelmaessig = unterbefehle.add_parser("regelmaessig", help="regelmäßige Snapshots in ein Verzeichnis")
+    regelmaessig.add_argument("db_name")
+    regelmaessig.add_argument("verzeichnis")
+    regelmaessig.add_argument("--intervall", type=float, default=3600, help="Sekunden zwischen Snapshots")
+    regelmaessig.add_argument("--behalten", type=int, default=24, help="so viele Snapshots aufheben")
+
+    kompaktieren = unterbefehle.add_parser("kompaktieren", help="freie Seiten zurückgeben")
+    kompaktieren.add_argument("db_name")
+    kompaktieren.add_argument("--seiten", type=int, default=1000, help="Seiten pro Schritt")
+
+    groesse = unterbefehle.add_parser("groesse", help="Größe und freie Seiten anzeigen")
+    groesse.add_argument("db_name")
+
+    argumente = parser.parse_args()
+    if not os.path.exists(argumente.db_name):
+        parser.error(f"Datenbank '{argumente.db_name}' nicht gefunden")
+
+    sicherung = Sicherung(argumente.db_name)
+    try:
+        if argumente.befehl == "sichern":
+            bericht_ausgeben(sicherung.sichern(argumente.ziel, argumente.seiten, argumente.pause))
+        elif argumente.befehl == "snapshot":
+            bericht_ausgeben(sicherung.snapshot(argumente.ziel))
+        elif argumente.befehl == "regelmaessig":
+            sicherung.snapshots_starten(argumente.verzeichnis, argumente.intervall, argumente.behalten)
+            print("Regelmäßige Snapshots laufen, Beenden mit Strg+C.")
+            while True:
+                time.sleep(3600)
+        elif argumente.befehl == "kompaktieren":
+            bericht_ausgeben(sicherung.kompaktieren(argumente.seiten))
+        elif argumente.befehl == "groesse":
+            for name, wert in sicherung.groesse().items():
+                print(f"{name:>15}: {wert}")
+    except KeyboardInterrupt:
+        pass
+    except (sqlite3.Error, OSError) as e:
+        print(f"Fehler: {e}")
+    finally:
+        sicherung.schliessen()
@@ -0,0 +1,228 @@
+import atexit
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from Wiederholung import Lernstand
+
+
+class StatistikPuffer:
+    """
+    Write-Behind Puffer für die Antwort-Statistiken eines Trainers.
+    Sammelt richtig/falsch Zähler und den neuen Lernstand pro Frage im Speicher
+    und schreibt sie gebündelt in einer einzigen Transaktion in die Datenbank.
+    Spätestens max_alter Sekunden nach der ersten offenen Antwort schreibt ein Timer
+    im Hintergrund, auch wenn keine weitere Antwort mehr kommt.
+    """
+
+    def __init__(self, verbindungen, table_name: str,
+                 max_eintraege: int = 100, max_alter: float = 5.0):
+        """
+        Initialisiert den Puffer.
+
+        Args:
+            verbindungen: Verbindungsmanager über dessen Schreibverbindung geschrieben wird
+            table_name: Name der Tabelle des Themengebiets
+            max_eintraege: Ab so vielen verschiedenen Fragen wird geschrieben
+            max_alter: Spätestens so viele Sekunden nach der ersten ungeschriebenen Antwort
+                       wird geschrieben (Timer-Thread; 0 = bei jeder Antwort sofort)
+        """
+        self.verbindungen = verbindungen
+        self.table_name = table_name
+        self.max_eintraege = max_eintraege
+        self.max_alter = max_alter
+
+        self._deltas: Dict[int, List[int]] = {}  # id -> [richtig, falsch]
+        self._lernstaende: Dict[int, Lernstand] = {}  # id -> neuester Lernstand
+        self._aeltester_eintrag = None
+        self._timer: Optional[threading.Timer] = None
+        self._sperre = threading.RLock()
+
+        # Zähler
+        self.flush_anzahl = 0
+        self.geschriebene_zeilen = 0
+        self.letzte_batch_groesse = 0
+        self.letzte_flush_dauer = 0.0
+        self.max_flush_dauer = 0.0
+        self.gesamt_flush_dauer = 0.0
+
+        # Beim Beenden des Interpreters nichts verlieren
+        atexit.register(self.flush)
+
+    def hinzufuegen(self, id: int, richtig: bool):
+        """
+        Merkt eine Antwort vor und schreibt den Puffer, wenn eine Schwelle erreicht ist.
+
+        Args:
+            id: ID der Frage
+            richtig: True wenn richtig beantwortet, False wenn falsch
+        """
+        with self._sperre:
+            delta = self._deltas.setdefault(id, [0, 0])
+            delta[0 if richtig else 1] += 1
+
+            if self._aeltester_eintrag is None:
+                self._offen_seit_jetzt()
+
+            if (len(self._deltas) >= self.max_eintraege
+                    or time.monotonic() - self._aeltester_eintrag >= self.max_alter):
+                self.flush()
+
+    def _offen_seit_jetzt(self):
+        """
+        Private Methode zur internen Verwendung.
+        Merkt sich den Zeitpunkt der ersten offenen Antwort und startet den Timer,
+        der nach max_alter Sekunden schreibt.
+        """
+        self._aeltester_eintrag = time.monotonic()
+        if self.max_alter > 0 and self._timer is None:
+            self._timer = threading.Timer(self.max_alter, self._zeit_abgelaufen)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _zeit_abgelaufen(self):
+        """
+        Private Methode zur internen Verwendung.
+        Läuft im Timer-Thread: schreibt den Puffer, wenn der Timer noch gilt.
+        """
+        with self._sperre:
+            # Ein Flush dazwischen hat diesen Timer abgelöst
+            if self._timer is not threading.current_thread():
+                return
+            self._timer = None
+            self.flush()
+
+    def _timer_stoppen(self):
+        """
+        Private Methode zur internen Verwendung.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def lernstand_vormerken(self, id: int, stand: Lernstand):
+        """
+        Merkt den neuen Lernstand einer Frage vor (der neueste gewinnt).
+        Geschrieben wird zusammen mit den Statistiken.
+
+        Args:
+            id: ID der Frage
+            stand: Neuer Lernstand
+        """
+        with self._sperre:
+            self._lernstaende[id] = stand
+
+    def lernstand(self, id: int) -> Optional[Lernstand]:
+        """
+        Returns:
+            Lernstand: Noch nicht geschriebener Lernstand der Frage oder None
+        """
+        return self._lernstaende.get(id)
+
+    def vorgemerkte_lernstaende(self) -> Dict[int, Lernstand]:
+        """
+        Returns:
+            dict: Kopie aller noch nicht geschriebenen Lernstände (id -> Lernstand)
+        """
+        with self._sperre:
+            return dict(self._lernstaende)
+
+    def flush(self) -> int:
+        """
+        Schreibt alle vorgemerkten Änderungen in einer Transaktion.
+
+        Returns:
+            int: Anzahl der geschriebenen Zeilen
+        """
+        with self._sperre:
+            if not self._deltas and not self._lernstaende:
+                return 0
+
+            deltas = self._deltas
+            lernstaende = self._lernstaende
+            self._deltas = {}
+            self._lernstaende = {}
+            self._aeltester_eintrag = None
+            self._timer_stoppen()
+            start = time.perf_counter()
+
+            with self.verbindungen.schreiben() as verbindung:
+                try:
+                    cursor = verbindung.cursor()
+                    cursor.executemany(f'''
+                        UPDATE {self.table_name}
+                        SET richtig_beantwortet = richtig_beantwortet + ?,
+                            falsch_beantwortet = falsch_beantwortet + ?
+                        WHERE id = ?
+                    ''', [(richtig, falsch, id) for id, (richtig, falsch) in deltas.items()])
+                    cursor.executemany(f'''
+                        UPDATE {self.table_name}
+                        SET leitner_box = ?, intervall = ?, leichtigkeit = ?,
+                            wiederholungen = ?, faellig_am = ?
+                        WHERE id = ?
+                    ''', [tuple(stand) + (id,) for id, stand in lernstaende.items()])
+                    verbindung.commit()
+
+                except sqlite3.Error as e:
+                    print(f"Fehler beim Schreiben der Statistik: {e}")
+                    # Teilweise geschriebene Zeilen verwerfen, sonst würden sie mit dem
+                    # nächsten Commit zusätzlich zu den erneut vorgemerkten Deltas gezählt
+                    verbindung.rollback()
+                    # Nichts verlieren: beim nächsten Versuch erneut schreiben
+                    for id, (richtig, falsch) in deltas.items():
+                        delta = self._deltas.setdefault(id, [0, 0])
+                        delta[0] += richtig
+                        delta[1] += falsch
+                    for id, stand in lernstaende.items():
+                        self._lernstaende.setdefault(id, stand)
+                    if self._aeltester_eintrag is None:
+                        self._offen_seit_jetzt()
+                    return 0
+
+            dauer = time.perf_counter() - start
+            # Eine Frage mit Delta und Lernstand ist eine Zeile
+            geschrieben = len(deltas.keys() | lernstaende.keys())
+            self.flush_anzahl += 1
+            self.geschriebene_zeilen += geschrieben
+            self.letzte_batch_groesse = geschrieben
+            self.letzte_flush_dauer = dauer
+            self.max_flush_dauer = max(self.max_flush_dauer, dauer)
+            self.gesamt_flush_dauer += dauer
+            return geschrieben
+
+    def ausstehend(self) -> int:
+        """
+        Returns:
+            int: Anzahl der Fragen mit noch nicht geschriebenen Änderungen
+        """
+        return len(self._deltas.keys() | self._lernstaende.keys())
+
+    def zaehler(self) -> dict:
+        """
+        Liefert die Zähler des Puffers.
+
+        Returns:
+            dict: flush_anzahl, geschriebene_zeilen, letzte_batch_groesse,
+                  durchschnittliche_batch_groesse, letzte/max/durchschnittliche
+                  Flush-Dauer in Sekunden und Anzahl ausstehender Einträge
+        """
+        return {
+            "flush_anzahl": self.flush_anzahl,
+            "geschriebene_zeilen": self.geschriebene_zeilen,
+            "letzte_batch_groesse": self.letzte_batch_groesse,
+            "durchschnittliche_batch_groesse": self.geschriebene_zeilen / self.flush_anzahl if self.flush_anzahl else 0,
+            "letzte_flush_dauer": self.letzte_flush_dauer,
+            "max_flush_dauer": self.max_flush_dauer,
+            "durchschnittliche_flush_dauer": self.gesamt_flush_dauer / self.flush_anzahl if self.flush_anzahl else 0,
+            "ausstehend": self.ausstehend(),
+        }
+
+    def schliessen(self):
+        """
+        Schreibt den Rest, stoppt den Timer und meldet den Puffer vom Interpreter-Ende ab.
+        """
+        self.flush()
+        with self._sperre:
+            self._timer_stoppen()
+        atexit.unregister(self.flush)
@@ -1,6 +1,22 @@
+import difflib
 import sqlite3
 import random
-from typing import List, Tuple, Optional
+import re
+import time
+import unicodedata
+from contextlib import nullcontext
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple, Optional
+
+import Antwortpruefung
+from Antwortpruefung import Pruefergebnis
+from Datenquellen import datensaetze_aus_datei, schreibe_datei
+from DeckCache import DeckCache
+from EinAusgabe import KONSOLE
+from Messung import Messung, gemessen
+from StatistikPuffer import StatistikPuffer
+from Verbindungsmanager import Verbindungsmanager
+from Wiederholung import Lernstand, SM2Planer
 
 class Trainer:
     """
@@ -8,18 +24,77 @@ class Trainer:
     Kann für Vokabeln, Grammatik, Mathe oder andere Themenbereiche verwendet werden.
     """
     
-    def __init__(self, db_name: str, table_name: str):
+    # Maximale Anzahl SQL-Parameter pro IN (...) Abfrage
+    IN_BLOCK_GROESSE = 500
+    # Anzahl Runden mit zufälligen IDs bevor auf die Nachbarsuche gewechselt wird
+    STICHPROBE_RUNDEN = 4
+    
+    # Alle Spalten einer Themen-Tabelle (für Projektionen in lesen_stream)
+    SPALTEN = ("id", "frage", "antwort", "schwierigkeitsgrad", "richtig_beantwortet",
+               "falsch_beantwortet", "erstellt_am", "leitner_box", "intervall",
+               "leichtigkeit", "wiederholungen", "faellig_am", "antwort_schluessel")
+    
+    # Beschriftung der Erfolgsraten-Klassen im Histogramm
+    HISTOGRAMM_KLASSEN = {-1: "unbeantwortet", **{k: f"{k * 10}-{k * 10 + 9 if k < 9 else 100}%" for k in range(10)}}
+    
+    # Unscharfe Suche: so viele der seltensten Trigramme des Suchtexts werden abgefragt
+    UNSCHARF_TRIGRAMME = 8
+    # ... höchstens so viele Kandidaten pro gewünschtem Treffer bewertet
+    UNSCHARF_KANDIDATEN = 5
+    # ... und Treffer mit geringerer Ähnlichkeit (0-1, siehe unscharf_suchen) verworfen
+    UNSCHARF_MIN_AEHNLICHKEIT = 0.75
+    # Kürzere Wörter werden zusätzlich über ihre Tippfehler-Varianten gesucht
+    UNSCHARF_KURZES_WORT = 7
+    
+    # Anzahl Zeilen pro Block beim Nachtragen fehlender Antwort-Schlüssel
+    SCHLUESSEL_BLOCK_GROESSE = 5000
+    
+    # Spalten für die verteilte Wiederholung, die älteren Tabellen ggf. fehlen
+    LERNSTAND_SPALTEN = {
+        "leitner_box": "INTEGER DEFAULT 1",
+        "intervall": "REAL DEFAULT 0",
+        "leichtigkeit": "REAL DEFAULT 2.5",
+        "wiederholungen": "INTEGER DEFAULT 0",
+        "faellig_am": "REAL DEFAULT 0",
+    }
+    
+    def __init__(self, db_name: str, table_name: str,
+                 statistik_puffer_groesse: int = 100, statistik_puffer_alter: float = 5.0,
+                 planer=None, verbindungsmanager: Optional[Verbindungsmanager] = None,
+                 messung: Optional[Messung] = None, deck_cache: bool = False):
         """
         Initialisiert den Trainer mit Datenbankname und Tabellenname.
         
         Args:
             db_name: Name der SQLite Datenbankdatei
             table_name: Name der Tabelle für dieses Themengebiet
+            statistik_puffer_groesse: Antwort-Statistiken werden gesammelt geschrieben,
+                                      sobald so viele Fragen offen sind
+            statistik_puffer_alter: ... oder die älteste offene Antwort so viele Sekunden alt ist
+            planer: Planer für die verteilte Wiederholung, z.B. LeitnerPlaner()
+                    oder SM2Planer() aus Wiederholung.py (Standard: SM2Planer)
+            verbindungsmanager: Eigener Verbindungsmanager, den der Aufrufer selbst schließt
+                                (Standard: der gemeinsame Manager aller Trainer für
+                                dieselbe Datenbankdatei)
+            messung: Messung für Laufzeiten von Methoden und SQL-Anweisungen (optional,
+                     gilt für alle Verbindungen der Datei, siehe metriken())
+            deck_cache: True = das Themengebiet beim ersten Zugriff in einen DeckCache laden,
+                        Stichproben laufen dann ohne SQLite (siehe DeckCache.py)
         """
         self.db_name = db_name
         self.table_name = table_name
+        self.planer = planer if planer is not None else SM2Planer()
+        self.verbindungen = verbindungsmanager
+        self._gemeinsame_verbindungen = verbindungsmanager is None
         self.verbindung = None
+        self.messung = messung
+        self.suche_verfuegbar = False
+        self.unscharfe_suche_verfuegbar = False
         self._datenbank_initialisieren()
+        self.statistik_puffer = StatistikPuffer(self.verbindungen, self.table_name,
+                                                statistik_puffer_groesse, statistik_puffer_alter)
+        self.deck_cache = (DeckCache(self.verbindungen, self.table_name, self.statistik_puffer)
+                           if deck_cache else None)
     
     def _datenbank_initialisieren(self):
         """
@@ -27,27 +102,237 @@ class Trainer:
         Private Methode (durch _ gekennzeichnet).
         """
         try:
-            self.verbindung = sqlite3.connect(self.db_name)
-            cursor = self.verbindung.cursor()
+            # Alle Trainer für dieselbe Datei teilen sich die Verbindungen (WAL-Modus)
+            if self.verbindungen is None:
+                self.verbindungen = Verbindungsmanager.fuer(self.db_name)
+            if self.messung is not None:
+                self.verbindungen.messung_setzen(self.messung)
+            # Die gemeinsame Schreibverbindung
+            self.verbindung = self.verbindungen.schreiber
             
-            # Tabelle erstellen falls nicht vorhanden
-            cursor.execute(f'''
-                CREATE TABLE IF NOT EXISTS {self.table_name} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    frage TEXT NOT NULL,
-                    antwort TEXT NOT NULL,
-                    schwierigkeitsgrad INTEGER DEFAULT 1,
-                    richtig_beantwortet INTEGER DEFAULT 0,
-                    falsch_beantwortet INTEGER DEFAULT 0,
-                    erstellt_am TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            self.verbindung.commit()
+            with self.verbindungen.schreiben() as verbindung:
+                cursor = verbindung.cursor()
+                
+                # Tabelle erstellen falls nicht vorhanden
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {self.table_name} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        frage TEXT NOT NULL,
+                        antwort TEXT NOT NULL,
+                        schwierigkeitsgrad INTEGER DEFAULT 1,
+                        richtig_beantwortet INTEGER DEFAULT 0,
+                        falsch_beantwortet INTEGER DEFAULT 0,
+                        erstellt_am TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        leitner_box INTEGER DEFAULT 1,
+                        intervall REAL DEFAULT 0,
+                        leichtigkeit REAL DEFAULT 2.5,
+                        wiederholungen INTEGER DEFAULT 0,
+                        faellig_am REAL DEFAULT 0,
+                        antwort_schluessel TEXT
+                    )
+                ''')
+        
+                # Ältere Tabellen um die Lernstand-Spalten und den Antwort-Schlüssel ergänzen
+                cursor.execute(f"PRAGMA table_info({self.table_name})")
+                vorhandene_spalten = {zeile[1] for zeile in cursor.fetchall()}
+                for spalte, definition in {**self.LERNSTAND_SPALTEN, "antwort_schluessel": "TEXT"}.items():
+                    if spalte not in vorhandene_spalten:
+                        cursor.execute(f"ALTER TABLE {self.table_name} ADD COLUMN {spalte} {definition}")
+                self._antwort_schluessel_nachtragen(cursor)
+        
+                # Index für Filter und Stichproben nach Schwierigkeitsgrad
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_{self.table_name}_schwierigkeitsgrad
+                    ON {self.table_name} (schwierigkeitsgrad)
+                ''')
+        
+                # Index für die Warteschlange der fälligen Karten
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_{self.table_name}_faellig_am
+                    ON {self.table_name} (faellig_am)
+                ''')
+                
+                # Index für die Suche nach Karten mit einer bestimmten Antwort
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_{self.table_name}_antwort_schluessel
+                    ON {self.table_name} (antwort_schluessel)
+                ''')
+                
+                # Zusammenfassungen, die per Trigger bei jeder Änderung mitgeführt werden
+                self._zusammenfassung_erstellen(cursor)
+                
+                # Volltext- und Trigramm-Index für die Suche
+                self._suchindex_erstellen(cursor)
+                verbindung.commit()
             print(f"Datenbank '{self.db_name}' und Tabelle '{self.table_name}' bereit.")
             
         except sqlite3.Error as e:
             print(f"Fehler beim Initialisieren der Datenbank: {e}")
     
+    def _antwort_schluessel_nachtragen(self, cursor: sqlite3.Cursor):
+        """
+        Berechnet den Antwort-Schlüssel (siehe Antwortpruefung.schluessel) für alle Zeilen,
+        die noch keinen haben - blockweise, damit auch große ältere Tabellen nicht
+        vollständig in den Speicher geladen werden.
+        Private Methode zur internen Verwendung.
+        """
+        letzte_id = 0
+        while True:
+            cursor.execute(f'''
+                SELECT id, antwort FROM {self.table_name}
+                WHERE antwort_schluessel IS NULL AND id > ? ORDER BY id LIMIT ?
+            ''', (letzte_id, self.SCHLUESSEL_BLOCK_GROESSE))
+            zeilen = cursor.fetchall()
+            if not zeilen:
+                break
+            cursor.executemany(f"UPDATE {self.table_name} SET antwort_schluessel = ? WHERE id = ?",
+                               [(Antwortpruefung.schluessel(antwort), id) for id, antwort in zeilen])
+            letzte_id = zeilen[-1][0]
+    
+    def _zusammenfassung_erstellen(self, cursor: sqlite3.Cursor):
+        """
+        Legt die Zusammenfassungs-Tabellen und die Trigger an, die sie bei
+        INSERT, DELETE und UPDATE der Themen-Tabelle aktuell halten.
+        Private Methode zur internen Verwendung.
+        """
+        t = self.table_name
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (f"{t}_zusammenfassung",))
+        neu = cursor.fetchone() is None
+        
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {t}_zusammenfassung (
+                schwierigkeitsgrad INTEGER PRIMARY KEY,
+                anzahl INTEGER NOT NULL DEFAULT 0,
+                richtig INTEGER NOT NULL DEFAULT 0,
+                falsch INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {t}_histogramm (
+                klasse INTEGER PRIMARY KEY,
+                anzahl INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Zeile hinzufügen bzw. abziehen, als SQL für NEW bzw. OLD
+        def hinzufuegen(zeile):
+            return f'''
+                INSERT INTO {t}_zusammenfassung (schwierigkeitsgrad, anzahl, richtig, falsch)
+                VALUES (COALESCE({zeile}schwierigkeitsgrad, 0), 1,
+                        {zeile}richtig_beantwortet, {zeile}falsch_beantwortet)
+                ON CONFLICT(schwierigkeitsgrad) DO UPDATE SET
+                    anzahl = anzahl + 1,
+                    richtig = richtig + excluded.richtig,
+                    falsch = falsch + excluded.falsch;
+                INSERT INTO {t}_histogramm (klasse, anzahl)
+                VALUES ({self._histogramm_klasse(zeile)}, 1)
+                ON CONFLICT(klasse) DO UPDATE SET anzahl = anzahl + 1;
+            '''
+        
+        def abziehen(zeile):
+            return f'''
+                UPDATE {t}_zusammenfassung SET
+                    anzahl = anzahl - 1,
+                    richtig = richtig - {zeile}richtig_beantwortet,
+                    falsch = falsch - {zeile}falsch_beantwortet
+                WHERE schwierigkeitsgrad = COALESCE({zeile}schwierigkeitsgrad, 0);
+                UPDATE {t}_histogramm SET anzahl = anzahl - 1
+                WHERE klasse = {self._histogramm_klasse(zeile)};
+            '''
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {t}_zusammenfassung_insert AFTER INSERT ON {t}
+            BEGIN {hinzufuegen("NEW.")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {t}_zusammenfassung_delete AFTER DELETE ON {t}
+            BEGIN {abziehen("OLD.")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {t}_zusammenfassung_update
+            AFTER UPDATE OF schwierigkeitsgrad, richtig_beantwortet, falsch_beantwortet ON {t}
+            BEGIN {abziehen("OLD.")} {hinzufuegen("NEW.")} END
+        """)
+        
+        # Bestehende Tabelle: Zusammenfassung einmalig aufbauen
+        if neu:
+            self._zusammenfassung_aufbauen(cursor)
+    
+    def _suchindex_erstellen(self, cursor: sqlite3.Cursor):
+        """
+        Legt die FTS5-Indizes über frage und antwort an: {t}_suche (Wörter, mit
+        Präfix-Index) und {t}_trigramm (für Suchen mit Tippfehlern). Beide speichern
+        den Text nicht doppelt (content=) und werden per Trigger synchron gehalten.
+        Fehlt FTS5 bzw. der Trigramm-Tokenizer (ab SQLite 3.34), bleibt die Suche aus.
+        Private Methode zur internen Verwendung.
+        """
+        t = self.table_name
+        indizes = {
+            f"{t}_suche": "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'",
+            f"{t}_trigramm": "tokenize = 'trigram'",
+        }
+        
+        for index, optionen in indizes.items():
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (index,))
+            neu = cursor.fetchone() is None
+            try:
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+                        frage, antwort, content = '{t}', content_rowid = 'id', {optionen}
+                    )
+                ''')
+            except sqlite3.OperationalError as e:
+                print(f"Suchindex {index} nicht verfügbar: {e}")
+                continue
+            
+            self._suchindex_insert_trigger_erstellen(cursor, index)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {t} BEGIN
+                    INSERT INTO {index} ({index}, rowid, frage, antwort)
+                    VALUES ('delete', OLD.id, OLD.frage, OLD.antwort);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE OF frage, antwort ON {t} BEGIN
+                    INSERT INTO {index} ({index}, rowid, frage, antwort)
+                    VALUES ('delete', OLD.id, OLD.frage, OLD.antwort);
+                    INSERT INTO {index} (rowid, frage, antwort) VALUES (NEW.id, NEW.frage, NEW.antwort);
+                END
+            """)
+            
+            # Wortverzeichnis des Index (Wort bzw. Trigramm -> Anzahl Fragen), für die unscharfe Suche
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {index}_vokabular USING fts5vocab({index}, 'row')")
+            
+            # Bestehende Tabelle: Index einmalig füllen
+            if neu:
+                cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+            
+            if index == f"{t}_suche":
+                self.suche_verfuegbar = True
+            else:
+                self.unscharfe_suche_verfuegbar = True
+    
+    def _suchindizes(self) -> List[str]:
+        """
+        Namen der vorhandenen Suchindizes.
+        Private Methode zur internen Verwendung.
+        """
+        return ([f"{self.table_name}_suche"] if self.suche_verfuegbar else []) + \
+               ([f"{self.table_name}_trigramm"] if self.unscharfe_suche_verfuegbar else [])
+    
+    def _suchindex_insert_trigger_erstellen(self, cursor: sqlite3.Cursor, index: str):
+        """
+        Trigger, der neue Fragen in den Suchindex übernimmt.
+        Private Methode zur internen Verwendung.
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {self.table_name} BEGIN
+                INSERT INTO {index} (rowid, frage, antwort) VALUES (NEW.id, NEW.frage, NEW.antwort);
+            END
+        """)
+    
+    @gemessen
     def speichern(self, frage: str, antwort: str, schwierigkeitsgrad: int = 1) -> bool:
         """
         Speichert eine neue Frage-Antwort Kombination in der Datenbank.
@@ -61,19 +346,149 @@ class Trainer:
             bool: True wenn erfolgreich gespeichert, False bei Fehler
         """
         try:
-            cursor = self.verbindung.cursor()
-            cursor.execute(f'''
-                INSERT INTO {self.table_name} (frage, antwort, schwierigkeitsgrad)
-                VALUES (?, ?, ?)
-            ''', (frage, antwort, schwierigkeitsgrad))
-            self.verbindung.commit()
-            print(f"Erfolgreich gespeichert: '{frage}' -> '{antwort}'")
-            return True
+            with self.verbindungen.schreiben() as verbindung:
+                cursor = verbindung.cursor()
+                cursor.execute(f'''
+                    INSERT INTO {self.table_name} (frage, antwort, schwierigkeitsgrad, antwort_schluessel)
+                    VALUES (?, ?, ?, ?)
+                ''', (frage, antwort, schwierigkeitsgrad, Antwortpruefung.schluessel(antwort)))
+                verbindung.commit()
+                neue_id = cursor.lastrowid
             
         except sqlite3.Error as e:
             print(f"Fehler beim Speichern: {e}")
             return False
+        
+        # Den Cache erst nach der Schreibsperre anpassen (sein Laden braucht sie)
+        if self.deck_cache is not None:
+            self.deck_cache.einfuegen(neue_id, frage, antwort, schwierigkeitsgrad)
+        print(f"Erfolgreich gespeichert: '{frage}' -> '{antwort}'")
+        return True
+
+    @gemessen
+    def speichern_viele(self, datensaetze: Iterable[Tuple], chunk_groesse: int = 10000,
+                        eine_transaktion: bool = False,
+                        fortschritt: Optional[Callable[[int, float], None]] = None) -> int:
+        """
+        Speichert viele Frage-Antwort Kombinationen auf einmal (Massenimport).
+        Die Datensätze werden blockweise per executemany geschrieben,
+        statt für jeden Eintrag einzeln zu committen.
+
+        Args:
+            datensaetze: Beliebiges Iterable/Generator von (frage, antwort[, schwierigkeitsgrad])
+            chunk_groesse: Anzahl Datensätze pro executemany-Block
+            eine_transaktion: True = alles in einer Transaktion (bei Fehler wird alles verworfen),
+                              False = jeder Block wird einzeln committet
+            fortschritt: Optionale Funktion fortschritt(anzahl_bisher, sekunden_bisher)
+
+        Returns:
+            int: Anzahl der gespeicherten Einträge
+        """
+        schluessel = Antwortpruefung.schluessel
+        iterator = ((d[0], d[1], d[2] if len(d) > 2 else 1, schluessel(d[1])) for d in datensaetze)
+        gespeichert = 0
+        start = time.perf_counter()
+
+        # Bei einer Transaktion wird der Schreiber für den ganzen Import gesperrt,
+        # sonst nur pro Block, damit andere Trainer dazwischen schreiben können
+        schreibsperre = self.verbindungen.schreiben() if eine_transaktion else nullcontext(None)
+
+        try:
+            with schreibsperre:
+                while True:
+                    block = list(islice(iterator, chunk_groesse))
+                    if not block:
+                        break
+
+                    with self.verbindungen.schreiben() as verbindung:
+                        self._block_einfuegen(verbindung, block)
+                        if not eine_transaktion:
+                            verbindung.commit()
+                    gespeichert += len(block)
+
+                    if fortschritt is not None:
+                        fortschritt(gespeichert, time.perf_counter() - start)
+
+                if eine_transaktion:
+                    self.verbindung.commit()
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Massenimport: {e}")
+            if eine_transaktion:
+                return 0
+        finally:
+            if self.deck_cache is not None:
+                self.deck_cache.ungueltig_machen()
+
+        dauer = time.perf_counter() - start
+        rate = gespeichert / dauer if dauer > 0 else 0
+        print(f"{gespeichert} Einträge in {dauer:.2f}s gespeichert ({rate:.0f} Zeilen/s)")
+        return gespeichert
+
+    def _block_einfuegen(self, verbindung: sqlite3.Connection, block: List[Tuple]):
+        """
+        Fügt einen Block von Datensätzen ein. Die Suchindizes werden dabei nicht pro Zeile
+        per Trigger, sondern einmal für den ganzen Block gefüllt (mehrfach schneller).
+        Die Trigger werden in derselben Transaktion entfernt und wieder angelegt, andere
+        Verbindungen sehen sie also immer.
+        Private Methode zur internen Verwendung.
+        """
+        suchindizes = self._suchindizes()
+        if not suchindizes:
+            verbindung.executemany(f'''
+                INSERT INTO {self.table_name} (frage, antwort, schwierigkeitsgrad, antwort_schluessel)
+                VALUES (?, ?, ?, ?)
+            ''', block)
+            return
+        
+        if not verbindung.in_transaction:
+            verbindung.execute("BEGIN")
+        cursor = verbindung.cursor()
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.table_name}")
+        letzte_id = cursor.fetchone()[0]
+        for index in suchindizes:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {index}_insert")
+        
+        cursor.executemany(f'''
+            INSERT INTO {self.table_name} (frage, antwort, schwierigkeitsgrad, antwort_schluessel)
+            VALUES (?, ?, ?, ?)
+        ''', block)
+        
+        for index in suchindizes:
+            cursor.execute(f'''
+                INSERT INTO {index} (rowid, frage, antwort)
+                SELECT id, frage, antwort FROM {self.table_name} WHERE id > ?
+            ''', (letzte_id,))
+            self._suchindex_insert_trigger_erstellen(cursor, index)
     
+    @gemessen
+    def importieren(self, dateipfad: str, format: Optional[str] = None, abbildung=None,
+                    encoding: str = "utf-8", chunk_groesse: int = 10000,
+                    fortschritt: Optional[Callable[[int, float], None]] = None) -> int:
+        """
+        Importiert eine CSV/TSV/JSONL/Text-Datei zeilenweise in die Tabelle.
+        Die Datei wird dabei nie komplett in den Speicher geladen.
+
+        Args:
+            dateipfad: Pfad zur Datei
+            format: 'csv', 'tsv', 'jsonl' oder 'txt' (Standard: aus der Dateiendung)
+            abbildung: Name einer Abbildung aus Datenquellen.ABBILDUNGEN
+                       (z.B. 'irregular_verbs') oder eigene Funktion
+            encoding: Zeichenkodierung der Datei
+            chunk_groesse: Anzahl Datensätze pro executemany-Block
+            fortschritt: Optionale Funktion fortschritt(anzahl_bisher, sekunden_bisher)
+
+        Returns:
+            int: Anzahl der gespeicherten Einträge
+        """
+        try:
+            datensaetze = datensaetze_aus_datei(dateipfad, format, abbildung, encoding)
+            return self.speichern_viele(datensaetze, chunk_groesse=chunk_groesse, fortschritt=fortschritt)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Fehler beim Importieren von '{dateipfad}': {e}")
+            return 0
+
+    @gemessen
     def bearbeiten(self, id: int, neue_frage: str = None, neue_antwort: str = None, 
                    neuer_schwierigkeitsgrad: int = None) -> bool:
         """
@@ -89,45 +504,50 @@ class Trainer:
             bool: True wenn erfolgreich bearbeitet, False bei Fehler
         """
         try:
-            cursor = self.verbindung.cursor()
-            
-            # Zuerst prüfen ob der Eintrag existiert
-            cursor.execute(f"SELECT * FROM {self.table_name} WHERE id = ?", (id,))
-            if not cursor.fetchone():
-                print(f"Eintrag mit ID {id} nicht gefunden.")
-                return False
-            
-            # Update-Statement dynamisch erstellen
-            update_felder = []
-            werte = []
-            
-            if neue_frage is not None:
-                update_felder.append("frage = ?")
-                werte.append(neue_frage)
-            if neue_antwort is not None:
-                update_felder.append("antwort = ?")
-                werte.append(neue_antwort)
-            if neuer_schwierigkeitsgrad is not None:
-                update_felder.append("schwierigkeitsgrad = ?")
-                werte.append(neuer_schwierigkeitsgrad)
-            
-            if not update_felder:
-                print("Keine Änderungen angegeben.")
-                return False
-            
-            werte.append(id)  # ID für WHERE-Klausel
-            
-            query = f"UPDATE {self.table_name} SET {', '.join(update_felder)} WHERE id = ?"
-            cursor.execute(query, werte)
-            self.verbindung.commit()
-            
-            print(f"Eintrag mit ID {id} erfolgreich bearbeitet.")
-            return True
+            with self.verbindungen.schreiben() as verbindung:
+                cursor = verbindung.cursor()
+            
+                # Zuerst prüfen ob der Eintrag existiert
+                cursor.execute(f"SELECT * FROM {self.table_name} WHERE id = ?", (id,))
+                if not cursor.fetchone():
+                    print(f"Eintrag mit ID {id} nicht gefunden.")
+                    return False
+            
+                # Update-Statement dynamisch erstellen
+                update_felder = []
+                werte = []
+            
+                if neue_frage is not None:
+                    update_felder.append("frage = ?")
+                    werte.append(neue_frage)
+                if neue_antwort is not None:
+                    update_felder.append("antwort = ?, antwort_schluessel = ?")
+                    werte.extend((neue_antwort, Antwortpruefung.schluessel(neue_antwort)))
+                if neuer_schwierigkeitsgrad is not None:
+                    update_felder.append("schwierigkeitsgrad = ?")
+                    werte.append(neuer_schwierigkeitsgrad)
+            
+                if not update_felder:
+                    print("Keine Änderungen angegeben.")
+                    return False
             
+                werte.append(id)  # ID für WHERE-Klausel
+            
+                query = f"UPDATE {self.table_name} SET {', '.join(update_felder)} WHERE id = ?"
+                cursor.execute(query, werte)
+                verbindung.commit()
+
         except sqlite3.Error as e:
             print(f"Fehler beim Bearbeiten: {e}")
             return False
+
+        # Den Cache erst nach der Schreibsperre anpassen (sein Laden braucht sie)
+        if self.deck_cache is not None:
+            self.deck_cache.aendern(id, neue_frage, neue_antwort, neuer_schwierigkeitsgrad)
+        print(f"Eintrag mit ID {id} erfolgreich bearbeitet.")
+        return True
     
+    @gemessen
     def lesen(self, schwierigkeitsgrad: Optional[int] = None, limit: Optional[int] = None) -> List[Tuple]:
         """
         Liest Frage-Antwort Paare aus der Datenbank.
@@ -140,28 +560,507 @@ class Trainer:
             List[Tuple]: Liste von Tupeln (id, frage, antwort, schwierigkeitsgrad, ...)
         """
         try:
-            cursor = self.verbindung.cursor()
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
             
-            query = f"SELECT * FROM {self.table_name}"
-            params = []
+                query = f"SELECT * FROM {self.table_name}"
+                params = []
             
-            if schwierigkeitsgrad is not None:
-                query += " WHERE schwierigkeitsgrad = ?"
-                params.append(schwierigkeitsgrad)
+                if schwierigkeitsgrad is not None:
+                    query += " WHERE schwierigkeitsgrad = ?"
+                    params.append(schwierigkeitsgrad)
             
-            if limit is not None:
-                query += " LIMIT ?"
-                params.append(limit)
+                if limit is not None:
+                    query += " LIMIT ?"
+                    params.append(limit)
             
-            cursor.execute(query, params)
-            ergebnisse = cursor.fetchall()
+                cursor.execute(query, params)
+                ergebnisse = cursor.fetchall()
             
-            return ergebnisse
+                return ergebnisse
             
         except sqlite3.Error as e:
             print(f"Fehler beim Lesen: {e}")
             return []
     
+    def lesen_stream(self, schwierigkeitsgrad: Optional[int] = None,
+                     spalten: Optional[Sequence[str]] = None,
+                     chunk_groesse: int = 1000) -> Iterator[Tuple]:
+        """
+        Liest die Tabelle als Strom, blockweise per Keyset-Paginierung
+        (WHERE id > letzte_id ORDER BY id LIMIT chunk_groesse).
+        Im Speicher liegt immer nur ein Block, egal wie groß die Tabelle ist.
+        
+        Args:
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            spalten: Auszugebende Spalten aus SPALTEN (Standard: alle)
+            chunk_groesse: Anzahl Zeilen pro Abfrage
+            
+        Yields:
+            Tuple: Eine Zeile mit den gewünschten Spalten
+        """
+        if spalten is None:
+            spalten = self.SPALTEN
+        if not spalten:
+            raise ValueError("Mindestens eine Spalte angeben")
+        unbekannt = [spalte for spalte in spalten if spalte not in self.SPALTEN]
+        if unbekannt:
+            raise ValueError(f"Unbekannte Spalten: {', '.join(unbekannt)}")
+        
+        # Die id wird für die Paginierung immer mitgelesen und bei Bedarf wieder entfernt
+        mit_id = spalten[0] == "id"
+        abfrage_spalten = list(spalten) if mit_id else ["id"] + list(spalten)
+        
+        query = f"SELECT {', '.join(abfrage_spalten)} FROM {self.table_name} WHERE id > ?"
+        filter_params = []
+        if schwierigkeitsgrad is not None:
+            query += " AND schwierigkeitsgrad = ?"
+            filter_params.append(schwierigkeitsgrad)
+        query += " ORDER BY id LIMIT ?"
+        
+        letzte_id = -1
+        while True:
+            try:
+                # Die Leseverbindung nur für einen Block ausleihen
+                with self.verbindungen.lesen() as verbindung:
+                    block = verbindung.execute(query, [letzte_id] + filter_params + [chunk_groesse]).fetchall()
+            except sqlite3.Error as e:
+                print(f"Fehler beim Lesen: {e}")
+                return
+            
+            if not block:
+                return
+            letzte_id = block[-1][0]
+            
+            if mit_id:
+                yield from block
+            else:
+                for zeile in block:
+                    yield zeile[1:]
+            
+            if len(block) < chunk_groesse:
+                return
+    
+    @gemessen
+    def exportieren(self, dateipfad: str, format: Optional[str] = None,
+                    schwierigkeitsgrad: Optional[int] = None,
+                    spalten: Sequence[str] = ("frage", "antwort", "schwierigkeitsgrad"),
+                    encoding: str = "utf-8") -> int:
+        """
+        Exportiert die Tabelle als CSV, TSV oder JSONL mit konstantem Speicherbedarf.
+        Mit den Standard-Spalten kann die Datei wieder mit importieren() eingelesen werden.
+        
+        Args:
+            dateipfad: Pfad der Zieldatei
+            format: 'csv', 'tsv' oder 'jsonl' (Standard: aus der Dateiendung)
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            spalten: Zu exportierende Spalten aus SPALTEN
+            encoding: Zeichenkodierung der Datei
+            
+        Returns:
+            int: Anzahl der exportierten Zeilen
+        """
+        try:
+            zeilen = self.lesen_stream(schwierigkeitsgrad=schwierigkeitsgrad, spalten=spalten)
+            anzahl = schreibe_datei(dateipfad, spalten, zeilen, format, encoding)
+        except (OSError, ValueError) as e:
+            print(f"Fehler beim Exportieren nach '{dateipfad}': {e}")
+            return 0
+        
+        print(f"{anzahl} Einträge nach '{dateipfad}' exportiert.")
+        return anzahl
+    
+    @gemessen
+    def stichprobe(self, anzahl: int, schwierigkeitsgrad: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """
+        Wählt zufällige Fragen direkt in der Datenbank aus, ohne die ganze Tabelle zu laden.
+        
+        Es werden zufällige IDs zwischen kleinster und größter ID gezogen und nur
+        die tatsächlich vorhandenen übernommen (Verwerfen bei Lücken). Bleiben zu
+        viele Lücken, wird die nächste vorhandene ID nach einem Zufallspunkt genommen.
+        Mit Schwierigkeitsgrad läuft alles über den Index auf schwierigkeitsgrad.
+        
+        Args:
+            anzahl: Anzahl der gewünschten Fragen
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort) in zufälliger Reihenfolge,
+                         weniger als anzahl wenn nicht genug Fragen vorhanden sind
+        """
+        # Mit DeckCache ganz ohne Datenbankzugriff (sofern er geladen werden kann)
+        if self.deck_cache is not None:
+            auswahl = self.deck_cache.stichprobe(anzahl, schwierigkeitsgrad)
+            if auswahl is not None:
+                return auswahl
+        
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+            
+                filter_sql = ""
+                filter_params = []
+                if schwierigkeitsgrad is not None:
+                    filter_sql = " AND schwierigkeitsgrad = ?"
+                    filter_params.append(schwierigkeitsgrad)
+            
+                # MIN und MAX getrennt abfragen, damit SQLite beide über den Index auflöst
+                cursor.execute(f"SELECT MIN(id) FROM {self.table_name} WHERE 1{filter_sql}", filter_params)
+                kleinste_id = cursor.fetchone()[0]
+                if kleinste_id is None or anzahl <= 0:
+                    return []
+                cursor.execute(f"SELECT MAX(id) FROM {self.table_name} WHERE 1{filter_sql}", filter_params)
+                groesste_id = cursor.fetchone()[0]
+            
+                gefunden = {}
+            
+                # Kleiner ID-Bereich: einfach alle passenden IDs holen
+                if groesste_id - kleinste_id + 1 <= anzahl * 4:
+                    cursor.execute(f"SELECT id FROM {self.table_name} WHERE 1{filter_sql}", filter_params)
+                    ids = [zeile[0] for zeile in cursor.fetchall()]
+                    return self._zeilen_zu_ids(cursor, random.sample(ids, min(anzahl, len(ids))))
+            
+                # Zufällige IDs ziehen und Lücken verwerfen
+                for _ in range(self.STICHPROBE_RUNDEN):
+                    fehlend = anzahl - len(gefunden)
+                    kandidaten = {random.randint(kleinste_id, groesste_id) for _ in range(fehlend * 2)}
+                    kandidaten.difference_update(gefunden)
+                    for zeile in self._zeilen_zu_ids(cursor, list(kandidaten), filter_sql, filter_params):
+                        if len(gefunden) < anzahl:
+                            gefunden[zeile[0]] = zeile
+                    if len(gefunden) >= anzahl:
+                        break
+            
+                # Sehr lückenhafte Tabellen: nächste vorhandene ID nach einem Zufallspunkt
+                versuche = 0
+                while len(gefunden) < anzahl and versuche < anzahl * 4:
+                    versuche += 1
+                    cursor.execute(f'''
+                        SELECT id, frage, antwort FROM {self.table_name}
+                        WHERE id >= ?{filter_sql} ORDER BY id LIMIT 1
+                    ''', [random.randint(kleinste_id, groesste_id)] + filter_params)
+                    zeile = cursor.fetchone()
+                    if zeile is not None:
+                        gefunden[zeile[0]] = zeile
+            
+                # Weniger passende Fragen als gewünscht: alle passenden IDs holen
+                if len(gefunden) < anzahl:
+                    cursor.execute(f"SELECT id FROM {self.table_name} WHERE 1{filter_sql}", filter_params)
+                    ids = [zeile[0] for zeile in cursor.fetchall()]
+                    return self._zeilen_zu_ids(cursor, random.sample(ids, min(anzahl, len(ids))))
+            
+                auswahl = list(gefunden.values())
+                random.shuffle(auswahl)
+                return auswahl
+            
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Stichprobe: {e}")
+            return []
+    
+    @gemessen
+    def naechste_faellige(self, anzahl: int = 10, schwierigkeitsgrad: Optional[int] = None,
+                          jetzt: Optional[float] = None) -> List[Tuple[int, str, str]]:
+        """
+        Liefert die am längsten fälligen Karten der verteilten Wiederholung.
+        Die Abfrage läuft als Bereichsabfrage über den Index auf faellig_am.
+        
+        Args:
+            anzahl: Maximale Anzahl der Karten
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            jetzt: Zeitpunkt als Unix-Zeitstempel (Standard: aktuelle Zeit)
+            
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort), die fälligste zuerst
+        """
+        if jetzt is None:
+            jetzt = time.time()
+        
+        # Noch nicht geschriebene Lernstände können Karten schon weitergeschoben haben
+        vorgemerkt = self.statistik_puffer.vorgemerkte_lernstaende()
+        
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+            
+                query = f"SELECT id, frage, antwort FROM {self.table_name} WHERE faellig_am <= ?"
+                params = [jetzt]
+            
+                if schwierigkeitsgrad is not None:
+                    query += " AND schwierigkeitsgrad = ?"
+                    params.append(schwierigkeitsgrad)
+            
+                query += " ORDER BY faellig_am LIMIT ?"
+                params.append(anzahl + len(vorgemerkt))
+            
+                cursor.execute(query, params)
+                faellige = [zeile for zeile in cursor.fetchall()
+                            if zeile[0] not in vorgemerkt or vorgemerkt[zeile[0]].faellig_am <= jetzt]
+                return faellige[:anzahl]
+            
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen der fälligen Karten: {e}")
+            return []
+    
+    @gemessen
+    def suchen(self, text: str, anzahl: int = 20, schwierigkeitsgrad: Optional[int] = None,
+               praefix: bool = True, unscharf: bool = True) -> List[Tuple[int, str, str]]:
+        """
+        Sucht Fragen, deren Frage oder Antwort alle Wörter des Suchtexts enthält,
+        die besten Treffer (BM25) zuerst. Groß-/Kleinschreibung und Akzente werden ignoriert.
+        
+        Args:
+            text: Suchtext, z.B. "haus gart" findet "Das Haus mit Garten"
+            anzahl: Maximale Anzahl Treffer
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            praefix: True = Wörter dürfen auch nur der Anfang eines Wortes sein
+            unscharf: True = ohne Treffer mit unscharf_suchen() weitersuchen (Tippfehler)
+            
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort), der beste Treffer zuerst
+        """
+        woerter = re.findall(r"\w+", text)
+        if not woerter or not self.suche_verfuegbar:
+            return self.unscharf_suchen(text, anzahl, schwierigkeitsgrad) if unscharf else []
+        
+        # Jedes Wort als Phrase, damit Eingaben nicht als FTS5-Syntax gelesen werden
+        ausdruck = " ".join(f'"{wort}"' + ("*" if praefix else "") for wort in woerter)
+        query = f'''
+            SELECT t.id, t.frage, t.antwort
+            FROM {self.table_name}_suche s JOIN {self.table_name} t ON t.id = s.rowid
+            WHERE {self.table_name}_suche MATCH ?
+        '''
+        params = [ausdruck]
+        if schwierigkeitsgrad is not None:
+            query += " AND t.schwierigkeitsgrad = ?"
+            params.append(schwierigkeitsgrad)
+        query += " ORDER BY s.rank LIMIT ?"
+        params.append(anzahl)
+        
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                treffer = verbindung.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Suche: {e}")
+            return []
+        
+        if not treffer and unscharf:
+            return self.unscharf_suchen(text, anzahl, schwierigkeitsgrad)
+        return treffer
+    
+    @gemessen
+    def unscharf_suchen(self, text: str, anzahl: int = 20,
+                        schwierigkeitsgrad: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """
+        Tippfehler-tolerante Suche über den Trigramm-Index. Kandidaten sind Fragen, die
+        mindestens zwei der seltensten Trigramme (Drei-Zeichen-Folgen) des Suchtexts
+        enthalten. Für kurze Wörter reicht das nicht, dort werden zusätzlich alle Varianten
+        mit einem Tippfehler im Wortverzeichnis des Volltextindex gesucht.
+        Bewertet wird jedes Suchwort mit dem ähnlichsten Wort der Frage bzw. Antwort
+        (difflib), gemittelt über alle Suchwörter; Treffer unter UNSCHARF_MIN_AEHNLICHKEIT
+        werden verworfen.
+        
+        Args:
+            text: Suchtext (Wörter mit weniger als 3 Zeichen werden ignoriert)
+            anzahl: Maximale Anzahl Treffer
+            schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort), der ähnlichste zuerst
+        """
+        gesucht = self._trigramme(text)
+        if not gesucht or not self.unscharfe_suche_verfuegbar:
+            return []
+        
+        filter_sql = ""
+        filter_params = []
+        if schwierigkeitsgrad is not None:
+            filter_sql = " AND t.schwierigkeitsgrad = ?"
+            filter_params.append(schwierigkeitsgrad)
+        kandidaten = {}
+        
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+                
+                def kandidaten_holen(index, ausdruck):
+                    cursor.execute(f'''
+                        SELECT t.id, t.frage, t.antwort
+                        FROM {index} s JOIN {self.table_name} t ON t.id = s.rowid
+                        WHERE {index} MATCH ?{filter_sql} LIMIT ?
+                    ''', [ausdruck] + filter_params + [anzahl * self.UNSCHARF_KANDIDATEN])
+                    for zeile in cursor.fetchall():
+                        kandidaten[zeile[0]] = zeile
+                
+                # In wie vielen Fragen kommt jedes Trigramm vor? (aus dem Vokabular des Index)
+                haeufigkeit = {}
+                for trigramm in gesucht:
+                    cursor.execute(f"SELECT doc FROM {self.table_name}_trigramm_vokabular WHERE term = ?",
+                                   (trigramm,))
+                    zeile = cursor.fetchone()
+                    if zeile is not None:
+                        haeufigkeit[trigramm] = zeile[0]
+                seltenste = sorted(haeufigkeit, key=haeufigkeit.get)[:self.UNSCHARF_TRIGRAMME]
+                
+                # Je zwei Trigramme per AND: grenzt viel stärker ein als ein einzelnes
+                phrasen = ['"' + trigramm.replace('"', '""') + '"' for trigramm in seltenste]
+                if len(phrasen) == 1:
+                    kandidaten_holen(f"{self.table_name}_trigramm", phrasen[0])
+                elif phrasen:
+                    kandidaten_holen(f"{self.table_name}_trigramm",
+                                     " OR ".join(f"({a} AND {b})" for i, a in enumerate(phrasen)
+                                                 for b in phrasen[i + 1:]))
+                
+                # Kurze Wörter behalten nach einem Tippfehler kaum richtige Trigramme:
+                # alle Varianten mit einem Fehler im Wortverzeichnis des Volltextindex nachschlagen
+                if self.suche_verfuegbar:
+                    vorhanden = set()
+                    for wort in re.findall(r"\w{3,}", self._ohne_akzente(text.lower())):
+                        if len(wort) >= self.UNSCHARF_KURZES_WORT:
+                            continue
+                        for variante in self._tippfehler_varianten(wort):
+                            cursor.execute(f"SELECT 1 FROM {self.table_name}_suche_vokabular WHERE term = ?",
+                                           (variante,))
+                            if cursor.fetchone() is not None:
+                                vorhanden.add(variante)
+                    if vorhanden:
+                        kandidaten_holen(f"{self.table_name}_suche",
+                                         " OR ".join(f'"{variante}"' for variante in vorhanden))
+        except sqlite3.Error as e:
+            print(f"Fehler bei der unscharfen Suche: {e}")
+            return []
+        
+        suchwoerter = re.findall(r"\w{3,}", self._ohne_akzente(text.lower()))
+        
+        def aehnlichkeit(zeile):
+            woerter = set(re.findall(r"\w+", self._ohne_akzente(f"{zeile[1]} {zeile[2]}".lower())))
+            gesamt = 0.0
+            for suchwort in suchwoerter:
+                vergleich = difflib.SequenceMatcher(None, "", suchwort)
+                bester = 0.0
+                for wort in woerter:
+                    vergleich.set_seq1(wort)
+                    if vergleich.real_quick_ratio() > bester and vergleich.quick_ratio() > bester:
+                        bester = max(bester, vergleich.ratio())
+                gesamt += bester
+            return gesamt / len(suchwoerter)
+        
+        bewertet = [(aehnlichkeit(zeile), zeile) for zeile in kandidaten.values()]
+        bewertet = [(wert, zeile) for wert, zeile in bewertet if wert >= self.UNSCHARF_MIN_AEHNLICHKEIT]
+        bewertet.sort(key=lambda eintrag: eintrag[0], reverse=True)
+        return [zeile for _, zeile in bewertet[:anzahl]]
+    
+    @staticmethod
+    def _ohne_akzente(text: str) -> str:
+        """
+        Entfernt Akzente und Umlaut-Punkte (wie der Volltextindex: "schön" -> "schon").
+        Private Methode zur internen Verwendung.
+        """
+        return "".join(zeichen for zeichen in unicodedata.normalize("NFKD", text)
+                       if not unicodedata.combining(zeichen))
+    
+    @staticmethod
+    def _tippfehler_varianten(wort: str) -> set:
+        """
+        Alle Wörter, die durch genau einen Tippfehler (Buchstabe fehlt, zu viel,
+        falsch oder vertauscht) aus wort entstehen bzw. zu wort geführt haben.
+        Private Methode zur internen Verwendung.
+        """
+        buchstaben = "abcdefghijklmnopqrstuvwxyzß"
+        teile = [(wort[:i], wort[i:]) for i in range(len(wort) + 1)]
+        varianten = {a + b[1:] for a, b in teile if b}
+        varianten |= {a + b[1] + b[0] + b[2:] for a, b in teile if len(b) > 1}
+        varianten |= {a + c + b[1:] for a, b in teile if b for c in buchstaben}
+        varianten |= {a + c + b for a, b in teile for c in buchstaben}
+        varianten.discard(wort)
+        return varianten
+    
+    @staticmethod
+    def _trigramme(text: str) -> set:
+        """
+        Alle Drei-Zeichen-Folgen der Wörter eines Texts (klein geschrieben).
+        Private Methode zur internen Verwendung.
+        """
+        return {wort[i:i + 3] for wort in re.findall(r"\w{3,}", text.lower())
+                for i in range(len(wort) - 2)}
+    
+    @gemessen
+    def suchindex_neu_aufbauen(self) -> bool:
+        """
+        Baut die Suchindizes aus der Themen-Tabelle neu auf.
+        
+        Returns:
+            bool: True wenn erfolgreich, False bei Fehler
+        """
+        try:
+            with self.verbindungen.schreiben() as verbindung:
+                for index in self._suchindizes():
+                    verbindung.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+                verbindung.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Fehler beim Neuaufbau des Suchindex: {e}")
+            return False
+    
+    @gemessen
+    def fragen_zu_ids(self, ids: Sequence[int]) -> List[Tuple[int, str, str]]:
+        """
+        Liest bestimmte Fragen anhand ihrer IDs.
+        
+        Args:
+            ids: IDs der gewünschten Fragen
+            
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort) in der Reihenfolge der IDs,
+                         nicht vorhandene IDs werden ausgelassen
+        """
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                return self._zeilen_zu_ids(verbindung.cursor(), list(ids))
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen der Fragen: {e}")
+            return []
+
+    @gemessen
+    def fragen_zur_antwort(self, antwort: str, anzahl: int = 20) -> List[Tuple[int, str, str]]:
+        """
+        Findet Karten mit derselben Antwort (nach Normalisierung, z.B. "Schön" = "schoen"),
+        über den Index auf antwort_schluessel. Nützlich gegen doppelte Karten.
+
+        Returns:
+            List[Tuple]: Liste von Tupeln (id, frage, antwort)
+        """
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+                cursor.execute(f'''
+                    SELECT id, frage, antwort FROM {self.table_name}
+                    WHERE antwort_schluessel = ? LIMIT ?
+                ''', (Antwortpruefung.schluessel(antwort), anzahl))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Suche nach der Antwort: {e}")
+            return []
+
+    def _zeilen_zu_ids(self, cursor: sqlite3.Cursor, ids: List[int], filter_sql: str = "",
+                       filter_params: Optional[List] = None) -> List[Tuple[int, str, str]]:
+        """
+        Holt (id, frage, antwort) für die angegebenen IDs, blockweise per IN (...).
+        Die Reihenfolge der IDs bleibt erhalten, fehlende IDs werden ausgelassen.
+        Private Methode zur internen Verwendung.
+        """
+        zeilen = {}
+        for i in range(0, len(ids), self.IN_BLOCK_GROESSE):
+            block = ids[i:i + self.IN_BLOCK_GROESSE]
+            platzhalter = ", ".join("?" * len(block))
+            cursor.execute(f'''
+                SELECT id, frage, antwort FROM {self.table_name}
+                WHERE id IN ({platzhalter}){filter_sql}
+            ''', block + (filter_params or []))
+            for zeile in cursor.fetchall():
+                zeilen[zeile[0]] = zeile
+        return [zeilen[id] for id in ids if id in zeilen]
+    
+    @gemessen
     def loeschen(self, id: int) -> bool:
         """
         Löscht einen Eintrag aus der Datenbank.
@@ -173,135 +1072,370 @@ class Trainer:
             bool: True wenn erfolgreich gelöscht, False bei Fehler
         """
         try:
-            cursor = self.verbindung.cursor()
-            cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ?", (id,))
+            with self.verbindungen.schreiben() as verbindung:
+                cursor = verbindung.cursor()
+                cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ?", (id,))
             
-            if cursor.rowcount == 0:
-                print(f"Eintrag mit ID {id} nicht gefunden.")
-                return False
-            
-            self.verbindung.commit()
-            print(f"Eintrag mit ID {id} erfolgreich gelöscht.")
-            return True
+                if cursor.rowcount == 0:
+                    print(f"Eintrag mit ID {id} nicht gefunden.")
+                    return False
             
+                verbindung.commit()
+
         except sqlite3.Error as e:
             print(f"Fehler beim Löschen: {e}")
             return False
+
+        # Den Cache erst nach der Schreibsperre anpassen (sein Laden braucht sie)
+        if self.deck_cache is not None:
+            self.deck_cache.entfernen(id)
+        print(f"Eintrag mit ID {id} erfolgreich gelöscht.")
+        return True
     
-    def ueben(self, anzahl_fragen: int = 10, schwierigkeitsgrad: Optional[int] = None):
+    def ueben(self, anzahl_fragen: int = 10, schwierigkeitsgrad: Optional[int] = None,
+              nur_faellige: bool = False, ea=None):
         """
         Startet eine Übungseinheit mit zufälligen Fragen.
         
         Args:
             anzahl_fragen: Anzahl der zu stellenden Fragen
             schwierigkeitsgrad: Filtert nach bestimmtem Schwierigkeitsgrad (optional)
+            nur_faellige: True = nur fällige Karten der verteilten Wiederholung abfragen
+            ea: Ein- und Ausgabe (Standard: Konsole, siehe EinAusgabe)
         """
-        fragen = self.lesen(schwierigkeitsgrad=schwierigkeitsgrad)
+        ea = ea or KONSOLE
+        if nur_faellige:
+            ausgewaehlte_fragen = self.naechste_faellige(anzahl_fragen, schwierigkeitsgrad=schwierigkeitsgrad)
+            if not ausgewaehlte_fragen:
+                ea.ausgabe("Keine fälligen Fragen - alles wiederholt!")
+                return
+        else:
+            # Zufällige Auswahl der Fragen direkt in der Datenbank
+            ausgewaehlte_fragen = self.stichprobe(anzahl_fragen, schwierigkeitsgrad=schwierigkeitsgrad)
         
-        if not fragen:
-            print("Keine Fragen in der Datenbank gefunden!")
+        if not ausgewaehlte_fragen:
+            ea.ausgabe("Keine Fragen in der Datenbank gefunden!")
             return
         
-        # Zufällige Auswahl der Fragen
-        if len(fragen) < anzahl_fragen:
-            print(f"Nur {len(fragen)} Fragen verfügbar. Alle werden verwendet.")
-            ausgewaehlte_fragen = fragen
-        else:
-            ausgewaehlte_fragen = random.sample(fragen, anzahl_fragen)
+        if len(ausgewaehlte_fragen) < anzahl_fragen:
+            ea.ausgabe(f"Nur {len(ausgewaehlte_fragen)} Fragen verfügbar. Alle werden verwendet.")
         
         richtige_antworten = 0
         
-        print(f"\n=== Übung gestartet mit {len(ausgewaehlte_fragen)} Fragen ===\n")
+        ea.ausgabe(f"\n=== Übung gestartet mit {len(ausgewaehlte_fragen)} Fragen ===\n")
         
-        for i, (id, frage, korrekte_antwort, schwierigkeit, richtig, falsch, erstellt) in enumerate(ausgewaehlte_fragen, 1):
-            print(f"Frage {i}/{len(ausgewaehlte_fragen)}: {frage}")
-            benutzer_antwort = input("Deine Antwort: ").strip()
-            
-            if benutzer_antwort.lower() == korrekte_antwort.lower():
-                print("✓ Richtig!\n")
-                richtige_antworten += 1
-                self._statistik_aktualisieren(id, richtig=True)
-            else:
-                print(f"✗ Falsch! Die richtige Antwort war: {korrekte_antwort}\n")
-                self._statistik_aktualisieren(id, richtig=False)
+        try:
+            for i, (id, frage, korrekte_antwort) in enumerate(ausgewaehlte_fragen, 1):
+                ea.ausgabe(f"Frage {i}/{len(ausgewaehlte_fragen)}: {frage}")
+                benutzer_antwort = ea.eingabe("Deine Antwort: ").strip()
+                
+                schluessel = self.deck_cache.antwort_schluessel(id) if self.deck_cache is not None else None
+                ergebnis = self.antwort_bewerten(korrekte_antwort, benutzer_antwort, schluessel)
+                if ergebnis.tippfehler:
+                    ea.ausgabe(f"✓ Richtig! (Achte auf die Schreibweise: {korrekte_antwort})\n")
+                    richtige_antworten += 1
+                    self.antwort_verbuchen(id, richtig=True)
+                elif ergebnis.richtig:
+                    ea.ausgabe("✓ Richtig!\n")
+                    richtige_antworten += 1
+                    self.antwort_verbuchen(id, richtig=True)
+                else:
+                    ea.ausgabe(f"✗ Falsch! Die richtige Antwort war: {korrekte_antwort}\n")
+                    self.antwort_verbuchen(id, richtig=False)
+        finally:
+            # Am Ende der Übung (auch bei Abbruch) alle Antworten schreiben
+            self.statistik_puffer.flush()
         
         # Endergebnis anzeigen
         prozent = (richtige_antworten / len(ausgewaehlte_fragen)) * 100
-        print(f"=== Übung beendet ===")
-        print(f"Richtige Antworten: {richtige_antworten}/{len(ausgewaehlte_fragen)} ({prozent:.1f}%)")
+        ea.ausgabe(f"=== Übung beendet ===")
+        ea.ausgabe(f"Richtige Antworten: {richtige_antworten}/{len(ausgewaehlte_fragen)} ({prozent:.1f}%)")
         
         if prozent >= 80:
-            print("🎉 Ausgezeichnet!")
+            ea.ausgabe("🎉 Ausgezeichnet!")
         elif prozent >= 60:
-            print("👍 Gut gemacht!")
+            ea.ausgabe("👍 Gut gemacht!")
         else:
-            print("💪 Weiter üben!")
+            ea.ausgabe("💪 Weiter üben!")
     
     def _statistik_aktualisieren(self, id: int, richtig: bool):
         """
         Aktualisiert die Statistiken für eine Frage.
+        Die Änderung wird im Statistik-Puffer vorgemerkt und gebündelt
+        mit anderen Antworten geschrieben (siehe StatistikPuffer).
         Private Methode zur internen Verwendung.
         
         Args:
             id: ID der Frage
             richtig: True wenn richtig beantwortet, False wenn falsch
         """
+        self.statistik_puffer.hinzufuegen(id, richtig)
+    
+    def antwort_pruefen(self, korrekte_antwort: str, benutzer_antwort: str) -> bool:
+        """
+        Prüft eine Antwort des Benutzers (siehe antwort_bewerten).
+        
+        Args:
+            korrekte_antwort: Die gespeicherte Antwort
+            benutzer_antwort: Die Eingabe des Benutzers
+            
+        Returns:
+            bool: True wenn die Antwort richtig ist
+        """
+        return self.antwort_bewerten(korrekte_antwort, benutzer_antwort).richtig
+    
+    def antwort_bewerten(self, korrekte_antwort: str, benutzer_antwort: str,
+                         antwort_schluessel: Optional[str] = None) -> Pruefergebnis:
+        """
+        Prüft eine Antwort tolerant: Groß-/Kleinschreibung, Umlaute ("Schoen"), Leerzeichen
+        und Alternativen ("got/gotten") werden berücksichtigt, kleine Tippfehler zählen
+        als richtig, werden aber gemeldet. Der Aufwand ist unabhängig von der Anzahl Karten.
+        
+        Args:
+            korrekte_antwort: Die gespeicherte Antwort
+            benutzer_antwort: Die Eingabe des Benutzers
+            antwort_schluessel: Der gespeicherte Schlüssel (Spalte antwort_schluessel),
+                                sonst wird er aus korrekte_antwort berechnet
+            
+        Returns:
+            Pruefergebnis: (richtig, tippfehler, abstand)
+        """
+        if antwort_schluessel is None:
+            antwort_schluessel = Antwortpruefung.schluessel(korrekte_antwort)
+        return Antwortpruefung.pruefen(antwort_schluessel, benutzer_antwort)
+    
+    def antwort_verbuchen(self, id: int, richtig: bool, qualitaet: Optional[int] = None):
+        """
+        Verbucht eine Antwort: Statistik und nächste Wiederholung (siehe antworten_verbuchen).
+        
+        Args:
+            id: ID der Frage
+            richtig: True wenn richtig beantwortet, False wenn falsch
+            qualitaet: Qualität der Antwort 0-5 für SM-2 (optional)
+        """
+        self.antworten_verbuchen([(id, richtig, qualitaet)])
+    
+    @gemessen
+    def antworten_verbuchen(self, antworten: Iterable[Tuple]) -> int:
+        """
+        Verbucht viele Antworten auf einmal. Die Lernstände aller Fragen werden mit
+        einer Abfrage gelesen, die nächsten Wiederholungen mit dem eingestellten
+        Planer berechnet und alles im Statistik-Puffer vorgemerkt.
+        
+        Args:
+            antworten: Iterable von (id, richtig[, qualitaet])
+            
+        Returns:
+            int: Anzahl der verbuchten Antworten (unbekannte IDs werden übersprungen)
+        """
+        antworten = [(a[0], a[1], a[2] if len(a) > 2 else None) for a in antworten]
+        
+        # Lernstände aus dem Puffer übernehmen (er kann während der Schleife geschrieben
+        # werden), die übrigen gesammelt lesen
+        staende = {}
+        for id, _, _ in antworten:
+            stand = self.statistik_puffer.lernstand(id)
+            if stand is not None:
+                staende[id] = stand
+        fehlend = list({id for id, _, _ in antworten} - staende.keys())
+        try:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
+                for i in range(0, len(fehlend), self.IN_BLOCK_GROESSE):
+                    block = fehlend[i:i + self.IN_BLOCK_GROESSE]
+                    cursor.execute(f'''
+                        SELECT id, leitner_box, intervall, leichtigkeit, wiederholungen, faellig_am
+                        FROM {self.table_name} WHERE id IN ({", ".join("?" * len(block))})
+                    ''', block)
+                    for zeile in cursor.fetchall():
+                        staende[zeile[0]] = Lernstand(*zeile[1:])
+        except sqlite3.Error as e:
+            print(f"Fehler beim Lesen des Lernstands: {e}")
+            return 0
+        
+        jetzt = time.time()
+        verbucht = 0
+        for id, richtig, qualitaet in antworten:
+            stand = staende.get(id)
+            if stand is None:
+                continue
+            staende[id] = self.planer.planen(stand, richtig, jetzt, qualitaet)
+            self.statistik_puffer.lernstand_vormerken(id, staende[id])
+            self._statistik_aktualisieren(id, richtig)
+            if self.deck_cache is not None:
+                self.deck_cache.antwort_verbuchen(id, richtig, staende[id].faellig_am)
+            verbucht += 1
+        return verbucht
+    
+    @gemessen
+    def statistik(self) -> dict:
+        """
+        Liefert die Statistiken aus den laufend mitgeführten Zusammenfassungs-Tabellen.
+        Die Kosten sind unabhängig von der Anzahl der Fragen (kein Durchlauf der Tabelle).
+        
+        Returns:
+            dict: gesamt, durchschnittliche_schwierigkeit, richtig, falsch, erfolgsrate
+                  (in Prozent oder None), nach_schwierigkeitsgrad (Schwierigkeitsgrad ->
+                  dict mit anzahl, richtig, falsch, erfolgsrate) und histogramm
+                  (Erfolgsraten-Klasse -> Anzahl Fragen, siehe HISTOGRAMM_KLASSEN)
+        """
+        self.statistik_puffer.flush()
         try:
-            cursor = self.verbindung.cursor()
-            if richtig:
+            with self.verbindungen.lesen() as verbindung:
+                cursor = verbindung.cursor()
                 cursor.execute(f'''
-                    UPDATE {self.table_name} 
-                    SET richtig_beantwortet = richtig_beantwortet + 1 
-                    WHERE id = ?
-                ''', (id,))
-            else:
+                    SELECT schwierigkeitsgrad, anzahl, richtig, falsch
+                    FROM {self.table_name}_zusammenfassung WHERE anzahl > 0
+                    ORDER BY schwierigkeitsgrad
+                ''')
+                zusammenfassung = cursor.fetchall()
                 cursor.execute(f'''
-                    UPDATE {self.table_name} 
-                    SET falsch_beantwortet = falsch_beantwortet + 1 
-                    WHERE id = ?
-                ''', (id,))
-            self.verbindung.commit()
-            
+                    SELECT klasse, anzahl FROM {self.table_name}_histogramm
+                    WHERE anzahl > 0 ORDER BY klasse
+                ''')
+                histogramm = dict(cursor.fetchall())
         except sqlite3.Error as e:
-            print(f"Fehler beim Aktualisieren der Statistik: {e}")
+            print(f"Fehler beim Lesen der Statistiken: {e}")
+            return {}
+        return self.statistik_berechnen(zusammenfassung, histogramm)
+    
+    @staticmethod
+    def statistik_berechnen(zusammenfassung: Sequence[Tuple], histogramm: dict) -> dict:
+        """
+        Berechnet das Ergebnis von statistik() aus den Zeilen der Zusammenfassungs-Tabelle.
+        
+        Args:
+            zusammenfassung: Zeilen (schwierigkeitsgrad, anzahl, richtig, falsch), nach
+                             Schwierigkeitsgrad sortiert, jeder Schwierigkeitsgrad nur einmal
+            histogramm: Erfolgsraten-Klasse -> Anzahl Fragen
+            
+        Returns:
+            dict: Wie statistik()
+        """
+        def erfolgsrate(richtig, falsch):
+            return richtig / (richtig + falsch) * 100 if richtig + falsch > 0 else None
+        
+        gesamt = sum(anzahl for _, anzahl, _, _ in zusammenfassung)
+        richtig = sum(r for _, _, r, _ in zusammenfassung)
+        falsch = sum(f for _, _, _, f in zusammenfassung)
+        summe_schwierigkeit = sum(grad * anzahl for grad, anzahl, _, _ in zusammenfassung)
+        
+        return {
+            "gesamt": gesamt,
+            "durchschnittliche_schwierigkeit": summe_schwierigkeit / gesamt if gesamt else 0.0,
+            "richtig": richtig,
+            "falsch": falsch,
+            "erfolgsrate": erfolgsrate(richtig, falsch),
+            "nach_schwierigkeitsgrad": {
+                grad: {"anzahl": anzahl, "richtig": r, "falsch": f, "erfolgsrate": erfolgsrate(r, f)}
+                for grad, anzahl, r, f in zusammenfassung
+            },
+            "histogramm": histogramm,
+        }
+    
+    def metriken(self) -> dict:
+        """
+        Liefert die gesammelten Messwerte (nur mit messung, siehe Messung.metriken),
+        die Zähler des Statistik-Puffers und ggf. den Zustand des DeckCaches.
+        
+        Returns:
+            dict: methoden, sql, commits, langsame_abfragen, statistik_puffer und deck_cache
+                  (leer bis auf statistik_puffer, wenn keine Messung aktiv ist)
+        """
+        metriken = self.messung.metriken() if self.messung is not None else {}
+        metriken["statistik_puffer"] = self.statistik_puffer.zaehler()
+        if self.deck_cache is not None:
+            metriken["deck_cache"] = {"geladen": self.deck_cache.geladen,
+                                      "ladevorgaenge": self.deck_cache.ladevorgaenge,
+                                      "bytes": self.deck_cache.speicherbedarf()}
+        return metriken
     
     def statistik_anzeigen(self):
         """
         Zeigt Statistiken über die gespeicherten Fragen an.
         """
+        stats = self.statistik()
+        if not stats:
+            return
+        
+        print(f"\n=== Statistiken für {self.table_name} ===")
+        print(f"Gesamt Fragen: {stats['gesamt']}")
+        print(f"Durchschnittliche Schwierigkeit: {stats['durchschnittliche_schwierigkeit']:.1f}")
+        print(f"Richtig beantwortet: {stats['richtig']}")
+        print(f"Falsch beantwortet: {stats['falsch']}")
+        
+        if stats["erfolgsrate"] is not None:
+            print(f"Erfolgsrate: {stats['erfolgsrate']:.1f}%")
+        
+        print("\nNach Schwierigkeitsgrad:")
+        for grad, werte in stats["nach_schwierigkeitsgrad"].items():
+            rate = f"{werte['erfolgsrate']:.1f}%" if werte["erfolgsrate"] is not None else "-"
+            print(f"  Stufe {grad}: {werte['anzahl']} Fragen, Erfolgsrate {rate}")
+        
+        print("\nErfolgsraten der einzelnen Fragen:")
+        for klasse, anzahl in stats["histogramm"].items():
+            print(f"  {self.HISTOGRAMM_KLASSEN[klasse]:>13}: {anzahl}")
+    
+    @gemessen
+    def statistik_neu_aufbauen(self) -> bool:
+        """
+        Baut die Zusammenfassungs-Tabellen einmalig aus der Themen-Tabelle neu auf
+        (z.B. für Tabellen, die schon vor den Zusammenfassungen existierten).
+        
+        Returns:
+            bool: True wenn erfolgreich, False bei Fehler
+        """
+        self.statistik_puffer.flush()
         try:
-            cursor = self.verbindung.cursor()
-            cursor.execute(f'''
-                SELECT 
-                    COUNT(*) as gesamt,
-                    AVG(schwierigkeitsgrad) as durchschnittliche_schwierigkeit,
-                    SUM(richtig_beantwortet) as gesamt_richtig,
-                    SUM(falsch_beantwortet) as gesamt_falsch
-                FROM {self.table_name}
-            ''')
-            
-            stats = cursor.fetchone()
-            gesamt, avg_schwierigkeit, richtig, falsch = stats
-            
-            print(f"\n=== Statistiken für {self.table_name} ===")
-            print(f"Gesamt Fragen: {gesamt}")
-            print(f"Durchschnittliche Schwierigkeit: {avg_schwierigkeit:.1f}")
-            print(f"Richtig beantwortet: {richtig}")
-            print(f"Falsch beantwortet: {falsch}")
-            
-            if richtig + falsch > 0:
-                erfolgsrate = (richtig / (richtig + falsch)) * 100
-                print(f"Erfolgsrate: {erfolgsrate:.1f}%")
-            
+            with self.verbindungen.schreiben() as verbindung:
+                self._zusammenfassung_aufbauen(verbindung.cursor())
+                verbindung.commit()
+            return True
         except sqlite3.Error as e:
-            print(f"Fehler beim Anzeigen der Statistiken: {e}")
+            print(f"Fehler beim Neuaufbau der Statistiken: {e}")
+            return False
+    
+    def _zusammenfassung_aufbauen(self, cursor: sqlite3.Cursor):
+        """
+        Füllt die Zusammenfassungs-Tabellen mit einem Durchlauf über die Themen-Tabelle.
+        Private Methode zur internen Verwendung.
+        """
+        cursor.execute(f"DELETE FROM {self.table_name}_zusammenfassung")
+        cursor.execute(f"DELETE FROM {self.table_name}_histogramm")
+        cursor.execute(f'''
+            INSERT INTO {self.table_name}_zusammenfassung (schwierigkeitsgrad, anzahl, richtig, falsch)
+            SELECT COALESCE(schwierigkeitsgrad, 0), COUNT(*),
+                   SUM(richtig_beantwortet), SUM(falsch_beantwortet)
+            FROM {self.table_name} GROUP BY 1
+        ''')
+        cursor.execute(f'''
+            INSERT INTO {self.table_name}_histogramm (klasse, anzahl)
+            SELECT {self._histogramm_klasse("")}, COUNT(*)
+            FROM {self.table_name} GROUP BY 1
+        ''')
+    
+    @staticmethod
+    def _histogramm_klasse(zeile: str) -> str:
+        """
+        SQL-Ausdruck für die Erfolgsraten-Klasse einer Zeile (zeile = 'NEW.', 'OLD.' oder '').
+        -1 = noch nie beantwortet, 0 = 0-9%, 1 = 10-19%, ..., 9 = 90-100%.
+        Private Methode zur internen Verwendung.
+        """
+        r = f"{zeile}richtig_beantwortet"
+        f = f"{zeile}falsch_beantwortet"
+        return f"CASE WHEN {r} + {f} = 0 THEN -1 ELSE MIN(9, ({r} * 10) / ({r} + {f})) END"
     
     def schliessen(self):
         """
         Schließt die Datenbankverbindung.
+        Die gemeinsamen Verbindungen werden erst geschlossen, wenn kein
+        anderer Trainer für dieselbe Datei sie mehr benutzt.
         """
         if self.verbindung:
-            self.verbindung.close()
+            self.statistik_puffer.schliessen()
+            if self._gemeinsame_verbindungen:
+                self.verbindungen.freigeben()
+            self.verbindung = None
             print("Datenbankverbindung geschlossen.")
 
 
@@ -322,7 +1456,12 @@ if __name__ == "__main__":
     mathe_trainer.speichern("2 + 3 = ?", "5", 1)
     mathe_trainer.speichern("7 * 8 = ?", "56", 2)
     mathe_trainer.speichern("144 / 12 = ?", "12", 2)
-    
+
+    # Beispiel 3: Massenimport aus den Dateien der anderen Lernprogramme
+    verben_trainer = Trainer("lerntrainer.db", "irregular_verbs")
+    verben_trainer.importieren("../IrregularVerbs/irregular_verbs.txt", abbildung="irregular_verbs")
+    verben_trainer.schliessen()
+
     # Übung starten
     print("Möchtest du Vokabeln (v) oder Mathe (m) üben?")
     auswahl = input("Deine Wahl: ").lower()
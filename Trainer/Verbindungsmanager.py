@@ -0,0 +1,245 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from Messung import MessVerbindung
+
+
+class Verbindungsmanager:
+    """
+    Verwaltet die Verbindungen zu einer SQLite Datenbankdatei.
+    Alle Trainer-Instanzen für dieselbe Datei teilen sich einen Manager:
+    eine Schreibverbindung (immer nur ein Schreiber gleichzeitig) und einen
+    Pool von Leseverbindungen, die dank WAL-Modus parallel lesen können.
+    """
+
+    # Pragmas für jede Verbindung (Name -> Wert)
+    STANDARD_PRAGMAS = {
+        "auto_vacuum": "INCREMENTAL", # neue Dateien: freie Seiten per incremental_vacuum abgeben
+        "journal_mode": "WAL",        # Leser blockieren den Schreiber nicht (und umgekehrt)
+        "synchronous": "NORMAL",      # im WAL-Modus sicher und deutlich schneller als FULL
+        "cache_size": -20000,         # ca. 20 MB Seiten-Cache (negativ = KiB)
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,         # Millisekunden warten falls ein anderer Prozess schreibt
+    }
+
+    # Klasse der Verbindungen (meldet Anweisungen an eine Messung, falls gesetzt)
+    VERBINDUNGSKLASSE = MessVerbindung
+
+    _manager: Dict[str, "Verbindungsmanager"] = {}
+    _manager_sperre = threading.Lock()
+
+    @classmethod
+    def fuer(cls, db_name: str, max_leser: int = 8) -> "Verbindungsmanager":
+        """
+        Liefert den gemeinsamen Manager für eine Datenbankdatei (legt ihn bei Bedarf an).
+        Für ':memory:' wird immer ein eigener Manager erstellt.
+
+        Args:
+            db_name: Name der SQLite Datenbankdatei
+            max_leser: Maximale Anzahl gleichzeitiger Leseverbindungen
+
+        Returns:
+            Verbindungsmanager: Der gemeinsame Manager (mit erhöhtem Referenzzähler)
+        """
+        if db_name == ":memory:":
+            manager = cls(db_name, max_leser)
+            manager.referenzen += 1
+            return manager
+
+        schluessel = os.path.abspath(db_name)
+        with cls._manager_sperre:
+            manager = cls._manager.get(schluessel)
+            if manager is None:
+                manager = cls(db_name, max_leser)
+                cls._manager[schluessel] = manager
+            manager.referenzen += 1
+            return manager
+
+    def __init__(self, db_name: str, max_leser: int = 8, pragmas: Optional[dict] = None):
+        """
+        Öffnet die Schreibverbindung. Leseverbindungen werden erst bei Bedarf geöffnet.
+
+        Args:
+            db_name: Name der SQLite Datenbankdatei
+            max_leser: Maximale Anzahl gleichzeitiger Leseverbindungen
+            pragmas: Eigene Pragmas (Standard: STANDARD_PRAGMAS)
+        """
+        self.db_name = db_name
+        self.max_leser = max_leser
+        self.pragmas = pragmas if pragmas is not None else self.STANDARD_PRAGMAS
+        self.referenzen = 0
+        self.messung = None
+
+        # Eine In-Memory Datenbank existiert nur in ihrer eigenen Verbindung
+        self.nur_schreiber = db_name == ":memory:"
+
+        self._schreibsperre = threading.RLock()
+        self._leser: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._leser_anzahl = 0
+        self._leser_sperre = threading.Lock()
+        self._alle_leser = []
+
+        self.schreiber = self._verbinden()
+
+    def _verbinden(self, nur_lesen: bool = False) -> sqlite3.Connection:
+        """
+        Öffnet eine neue Verbindung und setzt die Pragmas.
+        Private Methode zur internen Verwendung.
+        """
+        verbindung = sqlite3.connect(self.db_name, check_same_thread=False, factory=self.VERBINDUNGSKLASSE)
+        verbindung.messung = self.messung
+        for name, wert in self.pragmas.items():
+            verbindung.execute(f"PRAGMA {name} = {wert}")
+        if nur_lesen:
+            verbindung.execute("PRAGMA query_only = 1")
+        return verbindung
+
+    def messung_setzen(self, messung):
+        """
+        Meldet ab jetzt alle Anweisungen aller Verbindungen an die Messung (None = aus).
+
+        Args:
+            messung: Messung aus Messung.py oder None
+        """
+        self.messung = messung
+        with self._leser_sperre:
+            for verbindung in [self.schreiber] + self._alle_leser:
+                verbindung.messung = messung
+
+    @contextmanager
+    def schreiben(self) -> Iterator[sqlite3.Connection]:
+        """
+        Kontextmanager für Schreibzugriffe. Es schreibt immer nur ein Thread gleichzeitig.
+        Bei einer Exception wird die offene Transaktion zurückgerollt.
+
+        Yields:
+            sqlite3.Connection: Die Schreibverbindung
+        """
+        with self._schreibsperre:
+            try:
+                yield self.schreiber
+            except BaseException:
+                if self.schreiber.in_transaction:
+                    self.schreiber.rollback()
+                raise
+
+    def sichern(self, ziel: sqlite3.Connection, seiten_pro_schritt: int = 256, pause: float = 0.005,
+                fortschritt: Optional[Callable[[int, int], None]] = None) -> dict:
+        """
+        Online-Sicherung mit der Backup-API von SQLite, in Schritten zu seiten_pro_schritt Seiten.
+        Quelle ist die Schreibverbindung: was zwischen zwei Schritten über sie geschrieben
+        wird, übernimmt SQLite direkt in die Sicherung, ohne von vorne zu beginnen.
+        Die Schreibsperre wird nur während eines Schrittes gehalten, dazwischen (pause)
+        können alle Trainer weiter schreiben. Schreibt ein anderer Prozess, beginnt
+        SQLite die Sicherung neu (siehe neustarts).
+
+        Args:
+            ziel: Verbindung zur Zieldatei
+            seiten_pro_schritt: Seiten pro Schritt (-1 = alles in einem Schritt)
+            pause: Sekunden zwischen zwei Schritten
+            fortschritt: Optionale Funktion fortschritt(kopierte_seiten, seiten_gesamt)
+
+        Returns:
+            dict: schritte, neustarts, seiten und max_sperre_ms (längste Sperre des Schreibers)
+        """
+        zaehler = {"schritte": 0, "neustarts": 0, "seiten": 0, "max_sperre_ms": 0.0}
+        zustand = {"rest": None, "gesperrt_seit": 0.0}
+
+        def nach_schritt(status, rest, gesamt):
+            gesperrt_ms = (time.perf_counter() - zustand["gesperrt_seit"]) * 1000
+            zaehler["max_sperre_ms"] = max(zaehler["max_sperre_ms"], gesperrt_ms)
+            zaehler["schritte"] += 1
+            zaehler["seiten"] = gesamt
+            if zustand["rest"] is not None and rest > zustand["rest"]:
+                zaehler["neustarts"] += 1
+            zustand["rest"] = rest
+            if rest == 0:
+                return
+
+            self._schreibsperre.release()
+            try:
+                if fortschritt is not None:
+                    fortschritt(gesamt - rest, gesamt)
+                time.sleep(pause)
+            finally:
+                self._schreibsperre.acquire()
+                zustand["gesperrt_seit"] = time.perf_counter()
+
+        with self._schreibsperre:
+            zustand["gesperrt_seit"] = time.perf_counter()
+            self.schreiber.backup(ziel, pages=seiten_pro_schritt, progress=nach_schritt)
+        return zaehler
+
+    @contextmanager
+    def lesen(self) -> Iterator[sqlite3.Connection]:
+        """
+        Kontextmanager für Lesezugriffe. Leiht eine Leseverbindung aus dem Pool aus;
+        sind alle vergeben und das Maximum erreicht, wird gewartet.
+
+        Yields:
+            sqlite3.Connection: Eine Leseverbindung
+        """
+        if self.nur_schreiber:
+            with self._schreibsperre:
+                yield self.schreiber
+            return
+
+        verbindung = self._leser_ausleihen()
+        try:
+            yield verbindung
+        finally:
+            self._leser.put(verbindung)
+
+    def _leser_ausleihen(self) -> sqlite3.Connection:
+        """
+        Nimmt eine freie Leseverbindung oder öffnet eine neue, solange max_leser nicht erreicht ist.
+        Private Methode zur internen Verwendung.
+        """
+        try:
+            return self._leser.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._leser_sperre:
+            if self._leser_anzahl < self.max_leser:
+                self._leser_anzahl += 1
+                verbindung = self._verbinden(nur_lesen=True)
+                self._alle_leser.append(verbindung)
+                return verbindung
+
+        return self._leser.get()
+
+    def freigeben(self):
+        """
+        Gibt eine Referenz frei. Wenn keine Trainer-Instanz den Manager mehr benutzt,
+        werden alle Verbindungen geschlossen.
+        """
+        with self._manager_sperre:
+            self.referenzen -= 1
+            if self.referenzen > 0:
+                return
+            schluessel = os.path.abspath(self.db_name)
+            if self._manager.get(schluessel) is self:
+                del self._manager[schluessel]
+
+        self.schliessen()
+
+    def schliessen(self):
+        """
+        Schließt alle Verbindungen (Lesen und Schreiben).
+        """
+        with self._leser_sperre:
+            for verbindung in self._alle_leser:
+                verbindung.close()
+            self._alle_leser = []
+            self._leser_anzahl = 0
+            self._leser = queue.LifoQueue()
+
+        with self._schreibsperre:
+            self.schreiber.close()
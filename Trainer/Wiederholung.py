@@ -0,0 +1,96 @@
+from typing import NamedTuple, Optional
+
+SEKUNDEN_PRO_TAG = 24 * 60 * 60
+
+# Falsch beantwortete Karten kommen nach 10 Minuten wieder dran
+WIEDERHOLEN_NACH_FEHLER = 10 * 60
+
+
+class Lernstand(NamedTuple):
+    """
+    Lernstand einer Karte, so wie er in der Themen-Tabelle gespeichert ist.
+    """
+    leitner_box: int = 1
+    intervall: float = 0.0      # in Tagen
+    leichtigkeit: float = 2.5   # SM-2 Ease-Faktor
+    wiederholungen: int = 0     # richtige Antworten in Folge
+    faellig_am: float = 0.0     # Unix-Zeitstempel
+
+
+class LeitnerPlaner:
+    """
+    Klassisches Leitner-System mit 5 Boxen.
+    Richtig: eine Box weiter, Falsch: zurück in Box 1.
+    """
+
+    # Abstand in Tagen je Box (Index = Box)
+    INTERVALLE = [0, 1, 2, 4, 8, 16]
+
+    def planen(self, stand: Lernstand, richtig: bool, jetzt: float,
+               qualitaet: Optional[int] = None) -> Lernstand:
+        """
+        Berechnet den neuen Lernstand nach einer Antwort.
+
+        Args:
+            stand: Bisheriger Lernstand der Karte
+            richtig: True wenn richtig beantwortet
+            jetzt: Aktueller Unix-Zeitstempel
+            qualitaet: Wird vom Leitner-System nicht verwendet
+
+        Returns:
+            Lernstand: Der neue Lernstand
+        """
+        if not richtig:
+            return stand._replace(leitner_box=1, intervall=0.0, wiederholungen=0,
+                                  faellig_am=jetzt + WIEDERHOLEN_NACH_FEHLER)
+
+        box = min(stand.leitner_box + 1, len(self.INTERVALLE) - 1)
+        intervall = float(self.INTERVALLE[box])
+        return stand._replace(leitner_box=box, intervall=intervall,
+                              wiederholungen=stand.wiederholungen + 1,
+                              faellig_am=jetzt + intervall * SEKUNDEN_PRO_TAG)
+
+
+class SM2Planer:
+    """
+    SuperMemo-2 Verfahren: das Intervall wächst mit dem Ease-Faktor der Karte,
+    der sich nach der Qualität der Antworten richtet.
+    """
+
+    MIN_LEICHTIGKEIT = 1.3
+
+    def planen(self, stand: Lernstand, richtig: bool, jetzt: float,
+               qualitaet: Optional[int] = None) -> Lernstand:
+        """
+        Berechnet den neuen Lernstand nach einer Antwort.
+
+        Args:
+            stand: Bisheriger Lernstand der Karte
+            richtig: True wenn richtig beantwortet
+            jetzt: Aktueller Unix-Zeitstempel
+            qualitaet: Qualität der Antwort 0-5 (Standard: 4 bei richtig, 1 bei falsch)
+
+        Returns:
+            Lernstand: Der neue Lernstand
+        """
+        if qualitaet is None:
+            qualitaet = 4 if richtig else 1
+
+        leichtigkeit = stand.leichtigkeit + 0.1 - (5 - qualitaet) * (0.08 + (5 - qualitaet) * 0.02)
+        leichtigkeit = max(self.MIN_LEICHTIGKEIT, leichtigkeit)
+
+        if qualitaet < 3:
+            return stand._replace(leitner_box=1, intervall=0.0, wiederholungen=0,
+                                  leichtigkeit=leichtigkeit,
+                                  faellig_am=jetzt + WIEDERHOLEN_NACH_FEHLER)
+
+        if stand.wiederholungen == 0:
+            intervall = 1.0
+        elif stand.wiederholungen == 1:
+            intervall = 6.0
+        else:
+            intervall = round(stand.intervall * leichtigkeit, 2)
+
+        return stand._replace(leitner_box=min(stand.leitner_box + 1, 5), intervall=intervall,
+                              leichtigkeit=leichtigkeit, wiederholungen=stand.wiederholungen + 1,
+                              faellig_am=jetzt + intervall * SEKUNDEN_PRO_TAG)
@@ -0,0 +1,245 @@
+#encoding: latin-1
+"""
+Messungen fr den Vokabeltrainer.
+
+Aufruf:
+    python Benchmark.py auswahl [--vokabeln 1000000] [--ziehungen 100000]
+    python Benchmark.py gui [--vokabeln 1000000] [--runden 2000]
+    python Benchmark.py sync [--vokabeln 1000000] [--aenderungen 1000]
+"""
+import argparse
+import os
+import queue
+import random
+import statistics
+import tempfile
+import time
+from collections import deque
+
+from Datenbank import VokabeltrainerDB
+from DatenbankWorker import DatenbankWorker
+from Trainer import Trainer
+# Aus dem Trainer-Projekt (Pfad wird von Datenbank.py gesetzt)
+from Antwortpruefung import pruefen
+
+
+def _messen(funktion, wiederholungen):
+    """
+    Returns:
+        float: Median der Laufzeit in Mikrosekunden
+    """
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(zeiten)
+
+
+def _perzentil(werte, p):
+    werte = sorted(werte)
+    return werte[min(len(werte) - 1, int(len(werte) * p / 100))]
+
+
+class _Fenster:
+    """
+    Nimmt wie sg.Window die Ereignisse des Workers entgegen (fr die Messung ohne Oberflche).
+    """
+
+    def __init__(self):
+        self.ereignisse = queue.Queue()
+
+    def write_event_value(self, key, value):
+        self.ereignisse.put((key, value))
+
+
+def benchmark_gui(vokabeln=1000000, runden=2000, denkzeit=0.002, uebersicht_alle=100):
+    """
+    Wie lange die Ereignisschleife der GUI pro Ereignis blockiert: Datenbankzugriffe
+    direkt in der Schleife gegen den DatenbankWorker mit vorab geladenen Fragen.
+    Nachgestellt werden "ben", "Prfen" und ab und zu "Fortschritt anzeigen".
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        db_name = os.path.join(verzeichnis, "vokabeln.db")
+        db = VokabeltrainerDB(db_name)
+        start = time.perf_counter()
+        for i in range(0, vokabeln, 100000):
+            db.vokabeln_hinzufuegen((f"wort{j}", f"bedeutung {j}") for j in range(i, min(i + 100000, vokabeln)))
+        db.conn.close()
+        print(f"{vokabeln} Vokabeln gespeichert in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'':>12} | {'p50 ms':>7} | {'p99 ms':>7} | {'max ms':>7} | {'Frage bereit':>12} | {'max Warten ms':>13}")
+        for im_hintergrund in (False, True):
+            fenster = _Fenster()
+            worker = DatenbankWorker(fenster, db_name, im_hintergrund=im_hintergrund)
+            if im_hintergrund:
+                worker.start()
+            vorrat = deque()
+            stockungen = []
+            sofort_bereit = 0
+            wartezeiten = [0.0]
+
+            def blockiert(funktion):
+                start = time.perf_counter()
+                ergebnis = funktion()
+                stockungen.append((time.perf_counter() - start) * 1000)
+                return ergebnis
+
+            def ereignis_verarbeiten(ereignis):
+                art, daten = ereignis[1]
+                if art == "fragen":
+                    vorrat.extend(daten)
+
+            def ueben():
+                frage = vorrat.popleft()
+                worker.fragen_anfordern(1)
+                return frage
+
+            def pruefen_und_speichern(frage):
+                antwort = frage.bedeutung if random.random() < 0.7 else "falsch"
+                worker.antwort_speichern(frage.begriff, pruefen(frage.schluessel, antwort).richtig)
+
+            worker.fragen_anfordern(5)
+            for runde in range(runden):
+                while not fenster.ereignisse.empty():
+                    blockiert(lambda: ereignis_verarbeiten(fenster.ereignisse.get()))
+                if vorrat:
+                    sofort_bereit += 1
+                else:
+                    # Die Schleife ist frei, nur der Benutzer wartet auf die Frage
+                    start = time.perf_counter()
+                    while not vorrat:
+                        ereignis_verarbeiten(fenster.ereignisse.get())
+                    wartezeiten.append((time.perf_counter() - start) * 1000)
+                frage = blockiert(ueben)
+                blockiert(lambda: pruefen_und_speichern(frage))
+                if runde % uebersicht_alle == 0:
+                    blockiert(worker.fortschritt_anfordern)
+                time.sleep(denkzeit)
+            worker.beenden()
+
+            name = "Worker" if im_hintergrund else "direkt"
+            print(f"{name:>12} | {_perzentil(stockungen, 50):>7.3f} | {_perzentil(stockungen, 99):>7.2f} | "
+                  f"{max(stockungen):>7.1f} | {sofort_bereit / runden * 100:>11.1f}% | {max(wartezeiten):>13.1f}")
+
+
+def benchmark_sync(vokabeln=1000000, aenderungen=1000):
+    """
+    Abgleich des Trainers im Speicher mit der VokabeltrainerDB: Journal schreiben und
+    nderungen eines anderen Programms laden, gegen komplettes Neuladen.
+    """
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        db_name = os.path.join(verzeichnis, "vokabeln.db")
+        db = VokabeltrainerDB(db_name)
+        start = time.perf_counter()
+        for i in range(0, vokabeln, 100000):
+            db.vokabeln_hinzufuegen((f"wort{j}", f"bedeutung {j}") for j in range(i, min(i + 100000, vokabeln)))
+        print(f"{vokabeln} Vokabeln gespeichert in {time.perf_counter() - start:.1f}s")
+
+        trainer = Trainer()
+        start = time.perf_counter()
+        trainer.aenderungen_laden(db)
+        laden_s = time.perf_counter() - start
+
+        # Eigene nderungen: vor allem Fortschritt, dazu genderte, gelschte und neue Vokabeln
+        begriffe = random.sample(list(trainer.vokabeln), aenderungen)
+        zehntel = aenderungen // 10
+        for begriff in begriffe[:-3 * zehntel]:
+            trainer.fortschritt_setzen(begriff, trainer.fortschritt[begriff] + 1)
+        for begriff in begriffe[-3 * zehntel:-2 * zehntel]:
+            trainer.vokabel_aendern(begriff, begriff, "neu " + begriff)
+        for begriff in begriffe[-2 * zehntel:-zehntel]:
+            trainer.vokabel_loeschen(begriff)
+        for i in range(zehntel):
+            trainer.vokabel_hinzufuegen(f"neu{i}", f"new {i}")
+        start = time.perf_counter()
+        geschrieben = trainer.journal_schreiben(db)
+        schreiben_ms = (time.perf_counter() - start) * 1000
+
+        # nderungen ber eine zweite Verbindung (z.B. die GUI)
+        andere = VokabeltrainerDB(db_name)
+        fremde = random.sample([b for b in trainer.vokabeln if b.startswith("wort")], aenderungen)
+        andere.update_fortschritt_viele({begriff: 3 for begriff in fremde[:-2 * zehntel]})
+        andere.aenderungen_schreiben(vokabeln=[(b, "fremd", 0) for b in fremde[-2 * zehntel:-zehntel]],
+                                     geloescht=fremde[-zehntel:])
+        andere.conn.close()
+        start = time.perf_counter()
+        uebernommen = trainer.aenderungen_laden(db)
+        delta_ms = (time.perf_counter() - start) * 1000
+
+        vergleich = Trainer()
+        vergleich.aus_datenbank_laden(db)
+        gleich = vergleich.vokabeln == trainer.vokabeln and vergleich.fortschritt == trainer.fortschritt
+        db.conn.close()
+
+        print(f"Komplett laden:                 {laden_s * 1000:>9.1f} ms")
+        print(f"journal_schreiben ({geschrieben} Begriffe): {schreiben_ms:>6.1f} ms")
+        print(f"aenderungen_laden ({uebernommen} Begriffe): {delta_ms:>6.1f} ms")
+        print(f"Speicher und Datenbank gleich: {gleich}")
+
+
+def benchmark_auswahl(vokabeln=1000000, ziehungen=100000):
+    """
+    Nchste Vokabel: random.choice(list(keys)) gegen die gewichtete Auswahl,
+    dazu die Kosten der nderungen und die Verteilung der gezogenen Vokabeln.
+    """
+    trainer = Trainer()
+    start = time.perf_counter()
+    for i in range(vokabeln):
+        trainer.vokabel_hinzufuegen(f"wort{i}", f"bedeutung {i}")
+    print(f"{vokabeln} Vokabeln hinzugefgt in {time.perf_counter() - start:.2f}s")
+
+    # Ein Zehntel der Vokabeln gut gelernt (5 Mal richtig), der Rest neu
+    gelernt = random.sample(list(trainer.vokabeln), vokabeln // 10)
+    start = time.perf_counter()
+    for begriff in gelernt:
+        trainer.fortschritt_setzen(begriff, 5)
+    setzen_us = (time.perf_counter() - start) / len(gelernt) * 1e6
+
+    kopie_us = _messen(lambda: random.choice(list(trainer.vokabeln.keys())), 20)
+    start = time.perf_counter()
+    gezogen = [trainer.naechste_vokabel() for _ in range(ziehungen)]
+    ziehen_us = (time.perf_counter() - start) / ziehungen * 1e6
+
+    loeschen = random.sample(list(trainer.vokabeln), 10000)
+    start = time.perf_counter()
+    for begriff in loeschen:
+        trainer.vokabel_loeschen(begriff)
+    loeschen_us = (time.perf_counter() - start) / len(loeschen) * 1e6
+
+    print(f"{'':>34} | {'s pro Aufruf':>13}")
+    for name, dauer in (("random.choice(list(keys))", kopie_us),
+                        ("naechste_vokabel()", ziehen_us),
+                        ("fortschritt_setzen()", setzen_us),
+                        ("vokabel_loeschen()", loeschen_us)):
+        print(f"{name:>34} | {dauer:>13.2f}")
+
+    gelernt = set(gelernt)
+    anteil = sum(begriff in gelernt for begriff in gezogen) / ziehungen
+    print(f"\nGut gelernte Vokabeln: 10% des Bestands, {anteil * 100:.1f}% der Ziehungen "
+          f"(erwartet {100 / (1 + 9 * 6):.1f}% bei Gewicht 1/(fortschritt+1))")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Messungen fr den Vokabeltrainer")
+    unterbefehle = parser.add_subparsers(dest="befehl", required=True)
+
+    auswahl = unterbefehle.add_parser("auswahl", help="gewichtete Auswahl der nchsten Vokabel")
+    auswahl.add_argument("--vokabeln", type=int, default=1000000)
+    auswahl.add_argument("--ziehungen", type=int, default=100000)
+
+    gui = unterbefehle.add_parser("gui", help="Blockieren der GUI-Ereignisschleife mit und ohne Worker")
+    gui.add_argument("--vokabeln", type=int, default=1000000)
+    gui.add_argument("--runden", type=int, default=2000)
+
+    sync = unterbefehle.add_parser("sync", help="Journal schreiben und nderungen laden")
+    sync.add_argument("--vokabeln", type=int, default=1000000)
+    sync.add_argument("--aenderungen", type=int, default=1000)
+
+    argumente = parser.parse_args()
+    if argumente.befehl == "auswahl":
+        benchmark_auswahl(argumente.vokabeln, argumente.ziehungen)
+    elif argumente.befehl == "gui":
+        benchmark_gui(argumente.vokabeln, argumente.runden)
+    elif argumente.befehl == "sync":
+        benchmark_sync(argumente.vokabeln, argumente.aenderungen)
@@ -1,10 +1,178 @@
+#encoding: latin-1
+import os
+import random
 import sqlite3
+import sys
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+# Gemeinsame Antwortpruefung aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from Antwortpruefung import pruefen, schluessel
+
+class VokabelAnsicht(MutableMapping):
+    """
+    Die Vokabeln der Datenbank als Mapping begriff -> bedeutung, ohne sie zu laden.
+    Eintrge werden bei Bedarf aus SQLite gelesen, die zuletzt benutzten in einem
+    LRU-Cache mit hchstens cache_groesse Eintrgen gehalten. nderungen werden sofort
+    in die Datenbank geschrieben (write-through). Der Speicherbedarf hngt damit nur
+    von cache_groesse und blockgroesse ab, nicht von der Anzahl der Vokabeln.
+
+    Gibt es einen Begriff mehrfach, gilt die zuerst gespeicherte Bedeutung.
+    """
+
+    # Versuche mit zuflligen Ids, bevor die nchste vorhandene Id genommen wird
+    ZUFALL_VERSUCHE = 8
+
+    def __init__(self, db, cache_groesse=10000, blockgroesse=1000):
+        self.db = db
+        self.cache_groesse = cache_groesse
+        self.blockgroesse = blockgroesse
+        self._cache = OrderedDict()
+        self._laenge = None
+        self.treffer = 0
+        self.fehlgriffe = 0
+
+    def _merken(self, begriff, bedeutung):
+        """
+        Legt einen Eintrag als zuletzt benutzt in den Cache und verdrngt den ltesten.
+        Private Methode zur internen Verwendung.
+        """
+        self._cache[begriff] = bedeutung
+        self._cache.move_to_end(begriff)
+        if len(self._cache) > self.cache_groesse:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, begriff):
+        if begriff in self._cache:
+            self.treffer += 1
+            self._cache.move_to_end(begriff)
+            return self._cache[begriff]
+
+        self.fehlgriffe += 1
+        cursor = self.db.conn.cursor()
+        cursor.execute('''
+            SELECT bedeutung FROM vokabeln WHERE begriff = ? ORDER BY Id LIMIT 1
+        ''', (begriff,))
+        result = cursor.fetchone()
+        if result is None:
+            raise KeyError(begriff)
+        self._merken(begriff, result[0])
+        return result[0]
+
+    def __contains__(self, begriff):
+        if begriff in self._cache:
+            return True
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT 1 FROM vokabeln WHERE begriff = ? LIMIT 1", (begriff,))
+        return cursor.fetchone() is not None
+
+    def __setitem__(self, begriff, bedeutung):
+        cursor = self.db.conn.cursor()
+        cursor.execute('''
+            UPDATE vokabeln SET bedeutung = ?, bedeutung_schluessel = ? WHERE begriff = ?
+        ''', (bedeutung, schluessel(bedeutung), begriff))
+        if cursor.rowcount == 0:
+            self.db.vokabel_hinzufuegen(begriff, bedeutung)
+        else:
+            self.db.conn.commit()
+        self._merken(begriff, bedeutung)
+
+    def __delitem__(self, begriff):
+        cursor = self.db.conn.cursor()
+        cursor.execute("DELETE FROM vokabeln WHERE begriff = ?", (begriff,))
+        if cursor.rowcount == 0:
+            raise KeyError(begriff)
+        cursor.execute("DELETE FROM fortschritt WHERE begriff = ?", (begriff,))
+        self.db.conn.commit()
+        self._cache.pop(begriff, None)
+        if self._laenge is not None:
+            self._laenge -= 1
+
+    def __len__(self):
+        # Einmal ber den Index auf begriff zhlen, danach mitfhren
+        if self._laenge is None:
+            cursor = self.db.conn.cursor()
+            cursor.execute("SELECT COUNT(DISTINCT begriff) FROM vokabeln")
+            self._laenge = cursor.fetchone()[0]
+        return self._laenge
+
+    def __iter__(self):
+        for block in self.bloecke():
+            for begriff, _ in block:
+                yield begriff
+
+    def items(self):
+        for block in self.bloecke():
+            yield from block
+
+    def bloecke(self, blockgroesse=None):
+        """
+        Liefert alle Vokabeln alphabetisch in Blcken von Paaren (begriff, bedeutung).
+        Jeder Block wird ber den Index ab dem letzten Begriff des vorigen gelesen
+        (keine wachsenden OFFSETs), im Speicher ist immer nur ein Block.
+        """
+        blockgroesse = blockgroesse or self.blockgroesse
+        letzter = None
+        cursor = self.db.conn.cursor()
+        while True:
+            # MIN(Id) macht bedeutung zur Bedeutung der ersten Zeile des Begriffs
+            cursor.execute(f'''
+                SELECT begriff, bedeutung, MIN(Id) FROM vokabeln
+                {"" if letzter is None else "WHERE begriff > ?"}
+                GROUP BY begriff ORDER BY begriff LIMIT ?
+            ''', (blockgroesse,) if letzter is None else (letzter, blockgroesse))
+            block = [(begriff, bedeutung) for begriff, bedeutung, _ in cursor.fetchall()]
+            if not block:
+                return
+            yield block
+            letzter = block[-1][0]
+
+    def zufaelliger_begriff(self):
+        """
+        Whlt einen zuflligen Begriff ohne die Tabelle zu durchlaufen: zufllige Ids
+        zwischen kleinster und grter Id, bei Lcken die nchste vorhandene.
+        Gibt None zurck, wenn es keine Vokabeln gibt.
+        """
+        cursor = self.db.conn.cursor()
+        # Getrennte Unterabfragen, damit SQLite beide ber den Primrschlssel auflst
+        cursor.execute("SELECT (SELECT MIN(Id) FROM vokabeln), (SELECT MAX(Id) FROM vokabeln)")
+        kleinste, groesste = cursor.fetchone()
+        if kleinste is None:
+            return None
+        for _ in range(self.ZUFALL_VERSUCHE):
+            cursor.execute("SELECT begriff FROM vokabeln WHERE Id = ?", (random.randint(kleinste, groesste),))
+            result = cursor.fetchone()
+            if result is not None:
+                return result[0]
+        cursor.execute('''
+            SELECT begriff FROM vokabeln WHERE Id >= ? ORDER BY Id LIMIT 1
+        ''', (random.randint(kleinste, groesste),))
+        return cursor.fetchone()[0]
+
+    def hinzugefuegt(self):
+        """
+        Meldet, dass Vokabeln an der Ansicht vorbei hinzugefgt wurden.
+        """
+        self._laenge = None
+
+    def cache_leeren(self):
+        self._cache.clear()
+
 
 class VokabeltrainerDB:
-    def __init__(self, db_name="vokabeltrainer.db"):
+    # Maximale Anzahl SQL-Parameter pro IN (...) Abfrage
+    IN_BLOCK_GROESSE = 500
+
+    def __init__(self, db_name="vokabeltrainer.db", cache_groesse=10000):
         self.db_name = db_name
         self.conn = sqlite3.connect(db_name)
+        # Wie im Trainer-Projekt: WAL, damit Commits nur anhngen statt Seiten doppelt zu schreiben
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
         self.create_tables()
+        # Mapping begriff -> bedeutung, liest bei Bedarf aus der Datenbank
+        self.vokabeln = VokabelAnsicht(self, cache_groesse)
 
     def create_tables(self):
         cursor = self.conn.cursor()
@@ -14,10 +182,22 @@ class VokabeltrainerDB:
             CREATE TABLE IF NOT EXISTS vokabeln (
                 Id INTEGER PRIMARY KEY,           
                 begriff TEXT,
-                bedeutung TEXT
+                bedeutung TEXT,
+                bedeutung_schluessel TEXT
             )
         ''')
 
+        # ltere Datenbanken um den Schlssel der Bedeutung ergnzen
+        cursor.execute("PRAGMA table_info(vokabeln)")
+        if "bedeutung_schluessel" not in {zeile[1] for zeile in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE vokabeln ADD COLUMN bedeutung_schluessel TEXT")
+            cursor.execute("SELECT Id, bedeutung FROM vokabeln")
+            cursor.executemany("UPDATE vokabeln SET bedeutung_schluessel = ? WHERE Id = ?",
+                               [(schluessel(bedeutung or ""), id) for id, bedeutung in cursor.fetchall()])
+
+        # Index fr die Abfrage einer Vokabel beim ben
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vokabeln_begriff ON vokabeln (begriff)")
+
         # Tabelle fr Fortschritt erstellen
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS fortschritt (
@@ -28,20 +208,103 @@ class VokabeltrainerDB:
             )
         ''')
 
+        # Jeder Begriff nur einmal: ltere Datenbanken enthalten doppelte Zeilen (ohne Index
+        # hat INSERT OR IGNORE nichts ignoriert), behalten wird die mit dem hchsten Stand
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_fortschritt_begriff'")
+        if cursor.fetchone() is None:
+            cursor.execute('''
+                DELETE FROM fortschritt WHERE Id NOT IN (
+                    SELECT Id FROM (
+                        SELECT Id, ROW_NUMBER() OVER (PARTITION BY begriff ORDER BY richtig DESC, Id) AS nr
+                        FROM fortschritt
+                    ) WHERE nr = 1
+                )
+            ''')
+            cursor.execute("CREATE UNIQUE INDEX idx_fortschritt_begriff ON fortschritt (begriff)")
+
+        # nderungsprotokoll: jede nderung an vokabeln oder fortschritt hngt per Trigger
+        # den Begriff mit fortlaufender Nummer an und entfernt seinen vorigen Eintrag -
+        # aenderungen_seit braucht nur die letzte nderung, so wchst das Protokoll
+        # hchstens auf eine Zeile pro Begriff
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS aenderungen (
+                nr INTEGER PRIMARY KEY AUTOINCREMENT,
+                begriff TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_aenderungen_begriff'")
+        if cursor.fetchone() is None:
+            # ltere Datenbanken: Trigger, die nur anhngen, ersetzen und das Protokoll krzen
+            for tabelle in ("vokabeln", "fortschritt"):
+                for ereignis in ("insert", "update", "delete"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {tabelle}_aenderung_{ereignis}")
+            self.aenderungen_kuerzen()
+            cursor.execute("CREATE UNIQUE INDEX idx_aenderungen_begriff ON aenderungen (begriff)")
+        for tabelle, ereignis, begriffe in (("vokabeln", "INSERT", ["NEW"]),
+                                            ("vokabeln", "UPDATE", ["OLD", "NEW"]),
+                                            ("vokabeln", "DELETE", ["OLD"]),
+                                            ("fortschritt", "INSERT", ["NEW"]),
+                                            ("fortschritt", "UPDATE OF richtig", ["NEW"]),
+                                            ("fortschritt", "DELETE", ["OLD"])):
+            protokollieren = "".join(f'''
+                DELETE FROM aenderungen WHERE begriff = {zeile}.begriff;
+                INSERT INTO aenderungen (begriff) VALUES ({zeile}.begriff);''' for zeile in begriffe)
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {tabelle}_aenderung_{ereignis.split()[0].lower()}
+                AFTER {ereignis} ON {tabelle}
+                BEGIN{protokollieren}
+                END
+            ''')
+
         self.conn.commit()
 
     def vokabel_hinzufuegen(self, begriff, bedeutung):
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT INTO vokabeln (begriff, bedeutung)
-            VALUES (?, ?)
-        ''', (begriff, bedeutung))
+            INSERT INTO vokabeln (begriff, bedeutung, bedeutung_schluessel)
+            VALUES (?, ?, ?)
+        ''', (begriff, bedeutung, schluessel(bedeutung)))
 
         cursor.execute('''
             INSERT OR IGNORE INTO fortschritt (begriff) VALUES (?)
         ''', (begriff,))
 
         self.conn.commit()
+        self.vokabeln.hinzugefuegt()
+
+    def vokabeln_hinzufuegen(self, vokabeln):
+        """
+        Fgt viele Vokabeln (Paare begriff, bedeutung) in einer Transaktion hinzu.
+        Gibt die Anzahl der Vokabeln zurck.
+        """
+        vokabeln = [(begriff, bedeutung, schluessel(bedeutung)) for begriff, bedeutung in vokabeln]
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            INSERT INTO vokabeln (begriff, bedeutung, bedeutung_schluessel)
+            VALUES (?, ?, ?)
+        ''', vokabeln)
+
+        cursor.executemany('''
+            INSERT OR IGNORE INTO fortschritt (begriff) VALUES (?)
+        ''', [(begriff,) for begriff, _, _ in vokabeln])
+
+        self.conn.commit()
+        self.vokabeln.hinzugefuegt()
+        return len(vokabeln)
+
+    def antwort_pruefen(self, begriff, antwort):
+        """
+        Prft eine Antwort gegen den gespeicherten Schlssel der Bedeutung
+        (tolerant bei Umlauten, Leerzeichen, Alternativen und kleinen Tippfehlern).
+        Gibt ein Pruefergebnis zurck oder None, wenn der Begriff unbekannt ist.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT bedeutung_schluessel FROM vokabeln WHERE begriff = ?
+        ''', (begriff,))
+
+        result = cursor.fetchone()
+        return pruefen(result[0], antwort) if result else None
 
     def get_fortschritt(self, begriff):
         cursor = self.conn.cursor()
@@ -52,11 +315,138 @@ class VokabeltrainerDB:
         result = cursor.fetchone()
         return result[0] if result else 0
 
-    def update_fortschritt(self, begriff, richtig):
+    def get_fortschritt_viele(self, begriffe):
+        """
+        Liest den Fortschritt vieler Begriffe ber den Index, blockweise mit
+        IN (...) statt einer Abfrage pro Begriff.
+        Gibt ein dict begriff -> richtig zurck (0 fr unbekannte Begriffe).
+        """
+        begriffe = list(dict.fromkeys(begriffe))
+        fortschritt = dict.fromkeys(begriffe, 0)
         cursor = self.conn.cursor()
+        for i in range(0, len(begriffe), self.IN_BLOCK_GROESSE):
+            block = begriffe[i:i + self.IN_BLOCK_GROESSE]
+            cursor.execute(f'''
+                SELECT begriff, richtig FROM fortschritt WHERE begriff IN ({", ".join("?" * len(block))})
+            ''', block)
+            fortschritt.update(cursor.fetchall())
+        return fortschritt
+
+    def fortschritt_uebersicht(self, anzahl=20):
+        """
+        Gibt (Anzahl Begriffe, davon mindestens einmal richtig, die anzahl Begriffe
+        mit dem hchsten Fortschritt als Paare begriff, richtig) zurck.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(richtig > 0), 0) FROM fortschritt")
+        gesamt, gelernt = cursor.fetchone()
         cursor.execute('''
-            UPDATE fortschritt SET richtig = ? WHERE begriff = ?
-        ''', (richtig, begriff))
+            SELECT begriff, richtig FROM fortschritt ORDER BY richtig DESC, begriff LIMIT ?
+        ''', (anzahl,))
+        return gesamt, gelernt, cursor.fetchall()
+
+    def aenderungsstand(self):
+        """
+        Gibt die Nummer der letzten nderung zurck (0 ohne nderungen).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(nr), 0) FROM aenderungen")
+        return cursor.fetchone()[0]
+
+    def aenderungen_seit(self, stand):
+        """
+        Liest alle seit stand genderten Begriffe mit ihrem aktuellen Zustand, in einer
+        Abfrage ber den Index auf der nderungsnummer.
+        Gibt (neuer_stand, dict begriff -> (bedeutung, bedeutung_schluessel, fortschritt)
+        oder None fr gelschte Begriffe) zurck.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT a.nr, a.begriff, v.bedeutung, v.bedeutung_schluessel, COALESCE(f.richtig, 0)
+            FROM (SELECT MAX(nr) AS nr, begriff FROM aenderungen WHERE nr > ? GROUP BY begriff) a
+            LEFT JOIN vokabeln v ON v.Id = (SELECT MIN(Id) FROM vokabeln WHERE begriff = a.begriff)
+            LEFT JOIN fortschritt f ON f.begriff = a.begriff
+            ORDER BY a.nr
+        ''', (stand,))
+        geaendert = {}
+        for nr, begriff, bedeutung, bedeutung_schluessel, richtig in cursor.fetchall():
+            stand = nr
+            geaendert[begriff] = None if bedeutung is None else (bedeutung, bedeutung_schluessel, richtig)
+        return stand, geaendert
+
+    def aenderungen_kuerzen(self):
+        """
+        Entfernt alle Eintrge des nderungsprotokolls, zu deren Begriff es einen
+        neueren gibt. Gefahrlos fr jeden Stand: die jeweils letzte nderung bleibt.
+        Die Trigger halten das Protokoll selbst so kurz; ntig ist das nur einmal fr
+        Datenbanken, die noch mit den alten Triggern geschrieben wurden (create_tables).
+        Gibt die Anzahl der entfernten Eintrge zurck.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            DELETE FROM aenderungen WHERE nr IN (
+                SELECT nr FROM (
+                    SELECT nr, ROW_NUMBER() OVER (PARTITION BY begriff ORDER BY nr DESC) AS neuere
+                    FROM aenderungen
+                ) WHERE neuere > 1
+            )
+        ''')
+        self.conn.commit()
+        return cursor.rowcount
+
+    def aenderungen_schreiben(self, vokabeln=(), fortschritt=(), geloescht=()):
+        """
+        Schreibt gesammelte nderungen in einer Transaktion: vokabeln als Tripel
+        (begriff, bedeutung, fortschritt), fortschritt als Paare (begriff, richtig)
+        und die Begriffe in geloescht.
+        Gibt (stand_vorher, stand_nachher) zurck - sind sie bis auf die eigenen
+        nderungen gleich, hat niemand anderes dazwischen geschrieben.
+        """
+        vokabeln = [(begriff, bedeutung, schluessel(bedeutung), richtig) for begriff, bedeutung, richtig in vokabeln]
+        if isinstance(fortschritt, dict):
+            fortschritt = fortschritt.items()
+        cursor = self.conn.cursor()
+        try:
+            # Sofort sperren, damit zwischen den beiden Stnden niemand anderes schreibt
+            cursor.execute("BEGIN IMMEDIATE")
+            vorher = self.aenderungsstand()
+            cursor.executemany("DELETE FROM vokabeln WHERE begriff = ?", [(begriff,) for begriff in geloescht])
+            cursor.executemany("DELETE FROM fortschritt WHERE begriff = ?", [(begriff,) for begriff in geloescht])
+            cursor.executemany('''
+                UPDATE vokabeln SET bedeutung = ?, bedeutung_schluessel = ? WHERE begriff = ?
+            ''', [(bedeutung, bedeutung_schl, begriff) for begriff, bedeutung, bedeutung_schl, _ in vokabeln])
+            cursor.executemany('''
+                INSERT INTO vokabeln (begriff, bedeutung, bedeutung_schluessel)
+                SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM vokabeln WHERE begriff = ?)
+            ''', [(begriff, bedeutung, bedeutung_schl, begriff) for begriff, bedeutung, bedeutung_schl, _ in vokabeln])
+            cursor.executemany('''
+                INSERT INTO fortschritt (begriff, richtig) VALUES (?, ?)
+                ON CONFLICT (begriff) DO UPDATE SET richtig = excluded.richtig
+            ''', [(begriff, richtig) for begriff, _, _, richtig in vokabeln] + list(fortschritt))
+            nachher = self.aenderungsstand()
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        self.vokabeln.cache_leeren()
+        self.vokabeln.hinzugefuegt()
+        return vorher, nachher
+
+    def update_fortschritt(self, begriff, richtig):
+        self.update_fortschritt_viele([(begriff, richtig)])
+
+    def update_fortschritt_viele(self, fortschritt):
+        """
+        Schreibt den Fortschritt vieler Begriffe (dict begriff -> richtig oder Paare)
+        in einer Transaktion. Fehlende Begriffe werden angelegt (Upsert).
+        """
+        if isinstance(fortschritt, dict):
+            fortschritt = fortschritt.items()
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            INSERT INTO fortschritt (begriff, richtig) VALUES (?, ?)
+            ON CONFLICT (begriff) DO UPDATE SET richtig = excluded.richtig
+        ''', fortschritt)
 
         self.conn.commit()
 
@@ -65,14 +455,12 @@ if __name__ == "__main__":
     trainer_db = VokabeltrainerDB()
 
     # Vokabeln hinzufgen
-    trainer_db.vokabel_hinzufuegen("Haus", "House")
-    trainer_db.vokabel_hinzufuegen("Auto", "Car")
-    trainer_db.vokabel_hinzufuegen("Apfel", "Apple")
+    trainer_db.vokabeln_hinzufuegen([("Haus", "House"), ("Auto", "Car"), ("Apfel", "Apple")])
 
     # Vokabeln ben
     for _ in range(3):  # be 3 Mal
-        begriff = random.choice(list(trainer_db.vokabeln.keys()))
-        richtig = input(f"Bedeutung von {begriff}: ").strip().lower() == trainer_db.vokabeln[begriff].lower()
+        begriff = trainer_db.vokabeln.zufaelliger_begriff()
+        richtig = trainer_db.antwort_pruefen(begriff, input(f"Bedeutung von {begriff}: ")).richtig
         fortschritt = trainer_db.get_fortschritt(begriff)
 
         if richtig:
@@ -83,8 +471,7 @@ if __name__ == "__main__":
         trainer_db.update_fortschritt(begriff, fortschritt)
 
     # Fortschritt anzeigen
-    for begriff in trainer_db.vokabeln:
-        fortschritt = trainer_db.get_fortschritt(begriff)
+    for begriff, fortschritt in trainer_db.get_fortschritt_viele(trainer_db.vokabeln).items():
         print(f"{begriff}: {fortschritt} Mal richtig")
 
     trainer_db.conn.close()
@@ -0,0 +1,192 @@
+#encoding: latin-1
+import itertools
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import NamedTuple
+
+# Gemeinsame Antwortpruefung aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from Datenbank import VokabeltrainerDB
+from Antwortpruefung import schluessel
+
+
+class Frage(NamedTuple):
+    begriff: str
+    bedeutung: str
+    schluessel: str      # zum Prfen ohne Datenbank (Antwortpruefung.pruefen)
+    fortschritt: int
+
+
+class DatenbankWorker(threading.Thread):
+    """
+    Besitzt die SQLite-Verbindung des Vokabeltrainers in einem eigenen Thread.
+
+    Die Methoden fragen_anfordern, antwort_speichern, vokabel_hinzufuegen und
+    fortschritt_anfordern stellen nur einen Auftrag in die Warteschlange und kehren
+    sofort zurck; das Ergebnis kommt als Fenster-Ereignis
+    fenster.write_event_value(EREIGNIS, (art, daten)) zurck:
+
+        ("bereit", anzahl_vokabeln)
+        ("fragen", [Frage, ...])
+        ("fortschritt", (begriff, neuer_fortschritt))
+        ("hinzugefuegt", begriff)
+        ("uebersicht", (gesamt, gelernt, [(begriff, richtig), ...]))
+        ("fehler", meldung)
+
+    Fragen werden vor allen anderen Auftrgen bearbeitet, damit eine langsame bersicht
+    den Vorrat der GUI nicht leerlaufen lsst; sonst gilt die Reihenfolge der Auftrge.
+
+    Mit im_hintergrund=False wird jeder Auftrag sofort im aufrufenden Thread
+    ausgefhrt (wie bisher direkt aus der Ereignisschleife, zum Vergleich).
+    """
+
+    EREIGNIS = "-DATENBANK-"
+    # Reihenfolge der Bearbeitung (kleiner zuerst), gleiche Prioritt in Auftragsreihenfolge
+    PRIORITAETEN = {"fragen": 0, "fortschritt": 1, "hinzugefuegt": 1, "uebersicht": 2}
+    ENDE = 3
+
+    def __init__(self, fenster, db_name="vokabeltrainer.db", cache_groesse=10000, im_hintergrund=True):
+        super().__init__(name="DatenbankWorker", daemon=True)
+        self.fenster = fenster
+        self.db_name = db_name
+        self.cache_groesse = cache_groesse
+        self.im_hintergrund = im_hintergrund
+        self._auftraege = queue.PriorityQueue()
+        self._nummern = itertools.count()
+        self.db = None
+
+        # Zhler
+        self.bearbeitet = 0
+        self.fehler = 0
+        self.max_dauer = 0.0
+
+        if not im_hintergrund:
+            self._oeffnen()
+
+    def fragen_anfordern(self, anzahl=1):
+        self._auftrag("fragen", anzahl)
+
+    def antwort_speichern(self, begriff, richtig):
+        self._auftrag("fortschritt", begriff, richtig)
+
+    def vokabel_hinzufuegen(self, begriff, bedeutung):
+        self._auftrag("hinzugefuegt", begriff, bedeutung)
+
+    def fortschritt_anfordern(self, anzahl=20):
+        self._auftrag("uebersicht", anzahl)
+
+    def ausstehend(self):
+        return self._auftraege.qsize()
+
+    def beenden(self, timeout=5.0):
+        """
+        Arbeitet die restlichen Auftrge ab und schliet die Verbindung.
+        """
+        if self.im_hintergrund:
+            self._auftraege.put((self.ENDE, next(self._nummern), None, ()))
+            if self.is_alive():
+                self.join(timeout)
+        elif self.db is not None:
+            self.db.conn.close()
+            self.db = None
+
+    def run(self):
+        if not self._oeffnen():
+            return
+        try:
+            while True:
+                _, _, art, argumente = self._auftraege.get()
+                if art is None:
+                    break
+                self._ausfuehren(art, argumente)
+        finally:
+            self.db.conn.close()
+            self.db = None
+
+    def _oeffnen(self):
+        """
+        ffnet die Datenbank im Thread, der sie benutzt.
+        Private Methode zur internen Verwendung.
+        """
+        try:
+            self.db = VokabeltrainerDB(self.db_name, self.cache_groesse)
+            self._melden("bereit", len(self.db.vokabeln))
+            return True
+        except Exception as e:
+            print(f"Fehler beim ffnen der Datenbank: {e}")
+            self._melden("fehler", self._meldung(e))
+            return False
+
+    def _auftrag(self, art, *argumente):
+        """
+        Private Methode zur internen Verwendung.
+        """
+        if self.im_hintergrund:
+            self._auftraege.put((self.PRIORITAETEN[art], next(self._nummern), art, argumente))
+        else:
+            self._ausfuehren(art, argumente)
+
+    def _ausfuehren(self, art, argumente):
+        """
+        Fhrt einen Auftrag aus und meldet das Ergebnis an das Fenster.
+        Private Methode zur internen Verwendung.
+        """
+        start = time.perf_counter()
+        try:
+            ergebnis = getattr(self, f"_{art}")(*argumente)
+        except Exception as e:
+            # Jeder Fehler wird gemeldet und der Worker luft weiter - sonst wrde die GUI
+            # ohne Meldung ewig auf die nchste Antwort warten
+            self.fehler += 1
+            print(f"Fehler im Datenbank-Worker ({art}): {e}")
+            self._melden("fehler", self._meldung(e))
+            return
+        self.bearbeitet += 1
+        self.max_dauer = max(self.max_dauer, time.perf_counter() - start)
+        self._melden(art, ergebnis)
+
+    @staticmethod
+    def _meldung(fehler):
+        """
+        Fehlertext fr die GUI; bei unerwarteten Fehlern mit der Art des Fehlers.
+        Private Methode zur internen Verwendung.
+        """
+        if isinstance(fehler, sqlite3.Error):
+            return str(fehler)
+        return f"{type(fehler).__name__}: {fehler}"
+
+    def _melden(self, art, daten):
+        """
+        Private Methode zur internen Verwendung.
+        """
+        self.fenster.write_event_value(self.EREIGNIS, (art, daten))
+
+    def _fragen(self, anzahl):
+        begriffe = []
+        for _ in range(anzahl):
+            begriff = self.db.vokabeln.zufaelliger_begriff()
+            if begriff is None:
+                break
+            begriffe.append(begriff)
+        fortschritt = self.db.get_fortschritt_viele(begriffe)
+        fragen = []
+        for begriff in begriffe:
+            bedeutung = self.db.vokabeln[begriff]
+            fragen.append(Frage(begriff, bedeutung, schluessel(bedeutung), fortschritt[begriff]))
+        return fragen
+
+    def _fortschritt(self, begriff, richtig):
+        fortschritt = self.db.get_fortschritt(begriff) + 1 if richtig else 0
+        self.db.update_fortschritt(begriff, fortschritt)
+        return begriff, fortschritt
+
+    def _hinzugefuegt(self, begriff, bedeutung):
+        self.db.vokabel_hinzufuegen(begriff, bedeutung)
+        return begriff
+
+    def _uebersicht(self, anzahl):
+        return self.db.fortschritt_uebersicht(anzahl)
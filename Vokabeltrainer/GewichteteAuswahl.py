@@ -0,0 +1,119 @@
+#encoding: latin-1
+import random
+
+
+class GewichteteAuswahl:
+    """
+    Zufllige Auswahl von Schlsseln mit ganzzahligen Gewichten.
+
+    Die Schlssel liegen in einer Liste (Index -> Schlssel, dazu ein dict Schlssel ->
+    Index), die Gewichte in einem Fenwick-Baum ber diese Liste. Hinzufgen, Entfernen,
+    Gewicht ndern und Ziehen kosten damit O(log n), ohne die Schlssel zu kopieren.
+    Ganzzahlige Gewichte, damit sich bei vielen nderungen keine Rundungsfehler aufsummieren.
+    """
+
+    def __init__(self):
+        self._schluessel = []       # Index -> Schlssel
+        self._index = {}            # Schlssel -> Index
+        self._gewichte = []         # Index -> Gewicht
+        self._baum = [0]            # Fenwick-Baum, 1-basiert
+        self.gesamt = 0
+
+    def __len__(self):
+        return len(self._schluessel)
+
+    def __contains__(self, schluessel):
+        return schluessel in self._index
+
+    def _aendern(self, position, delta):
+        """
+        Addiert delta auf das Gewicht an position (1-basiert) im Fenwick-Baum.
+        Private Methode zur internen Verwendung.
+        """
+        baum = self._baum
+        while position < len(baum):
+            baum[position] += delta
+            position += position & -position
+
+    def _summe(self, position):
+        """
+        Summe der Gewichte an den Positionen 1 bis position.
+        Private Methode zur internen Verwendung.
+        """
+        summe = 0
+        while position > 0:
+            summe += self._baum[position]
+            position -= position & -position
+        return summe
+
+    def hinzufuegen(self, schluessel, gewicht):
+        """
+        Fgt einen Schlssel hinzu oder ndert sein Gewicht.
+        """
+        if schluessel in self._index:
+            self.setzen(schluessel, gewicht)
+            return
+        if gewicht < 0:
+            raise ValueError("Gewichte drfen nicht negativ sein")
+        self._index[schluessel] = len(self._schluessel)
+        self._schluessel.append(schluessel)
+        self._gewichte.append(gewicht)
+        # Der neue Knoten umfasst die Positionen (position - lowbit, position]
+        position = len(self._baum)
+        self._baum.append(gewicht + self._summe(position - 1) - self._summe(position - (position & -position)))
+        self.gesamt += gewicht
+
+    def setzen(self, schluessel, gewicht):
+        """
+        ndert das Gewicht eines vorhandenen Schlssels (KeyError, wenn er fehlt).
+        """
+        if gewicht < 0:
+            raise ValueError("Gewichte drfen nicht negativ sein")
+        index = self._index[schluessel]
+        delta = gewicht - self._gewichte[index]
+        if delta:
+            self._gewichte[index] = gewicht
+            self._aendern(index + 1, delta)
+            self.gesamt += delta
+
+    def gewicht(self, schluessel):
+        return self._gewichte[self._index[schluessel]]
+
+    def entfernen(self, schluessel):
+        """
+        Entfernt einen Schlssel (KeyError, wenn er fehlt). Der letzte Schlssel
+        rckt an seine Stelle, danach wird nur der letzte Knoten des Baums entfernt.
+        """
+        index = self._index.pop(schluessel)
+        letzter = len(self._schluessel) - 1
+        gewicht_letzter = self._gewichte[letzter]
+        self._aendern(index + 1, gewicht_letzter - self._gewichte[index])
+        self.gesamt -= self._gewichte[index]
+        if index != letzter:
+            verschoben = self._schluessel[letzter]
+            self._schluessel[index] = verschoben
+            self._gewichte[index] = gewicht_letzter
+            self._index[verschoben] = index
+        self._schluessel.pop()
+        self._gewichte.pop()
+        self._baum.pop()
+
+    def ziehen(self, zufall=random):
+        """
+        Zieht einen Schlssel mit Wahrscheinlichkeit gewicht / gesamt.
+        Gibt None zurck, wenn es keine Schlssel (oder nur Gewicht 0) gibt.
+        """
+        if self.gesamt <= 0:
+            return None
+        rest = zufall.randrange(self.gesamt)
+        # Im Baum absteigen: grte Position mit Prfixsumme <= rest
+        baum = self._baum
+        position = 0
+        schritt = 1 << (len(baum) - 1).bit_length()
+        while schritt:
+            naechste = position + schritt
+            if naechste < len(baum) and baum[naechste] <= rest:
+                position = naechste
+                rest -= baum[naechste]
+            schritt >>= 1
+        return self._schluessel[position]
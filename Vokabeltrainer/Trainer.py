@@ -1,35 +1,173 @@
 
 #encoding: latin-1
-import random
+import os
+import sys
+
+# Gemeinsame Antwortprfung aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from Antwortpruefung import pruefen, schluessel
+from GewichteteAuswahl import GewichteteAuswahl
 
 class Trainer:
+    # Gewicht einer Vokabel: GEWICHT_SKALA // (fortschritt + 1), ganzzahlig und durch
+    # 1..16 teilbar - neue und falsch beantwortete Vokabeln kommen am hufigsten dran
+    GEWICHT_SKALA = 720720
+
+    # Arten von nderungen im Journal
+    FORTSCHRITT, VOKABEL, GELOESCHT = "fortschritt", "vokabel", "geloescht"
+
     def __init__(self):
         self.vokabeln = {}
         self.fortschritt = {}
+        # Normalisierte Bedeutung je Begriff, einmal beim Hinzufgen berechnet
+        self.schluessel = {}
+        # Gewichtete Auswahl der nchsten Vokabel, wird bei jeder nderung mitgefhrt
+        self.auswahl = GewichteteAuswahl()
+        # Noch nicht in die Datenbank geschriebene nderungen: begriff -> Art der nderung
+        # (VOKABEL, FORTSCHRITT oder GELOESCHT), mehrere nderungen zhlen als eine
+        self.journal = {}
+        # nderungsstand der Datenbank beim letzten Abgleich (None = nie geladen)
+        self.stand = None
+
+    def gewicht(self, fortschritt):
+        return max(1, self.GEWICHT_SKALA // (fortschritt + 1))
 
     def vokabel_hinzufuegen(self, begriff, bedeutung):
-        self.vokabeln[begriff] = bedeutung
-        self.fortschritt[begriff] = 0
+        self._uebernehmen(begriff, bedeutung, schluessel(bedeutung), 0)
+        self.journal[begriff] = self.VOKABEL
     
     def vokabel_aendern(self,begriff_org,begriff,bedeutung):
-        self.vokabeln[begriff] = bedeutung
-        self.fortschritt[begriff] = 0
+        if begriff_org != begriff and begriff_org in self.vokabeln:
+            self.vokabel_loeschen(begriff_org)
+        self.vokabel_hinzufuegen(begriff, bedeutung)
     
     def vokabel_loeschen(self,begriff):
-        self.vokabeln.
+        if begriff not in self.vokabeln:
+            print(f"Die Vokabel '{begriff}' ist nicht vorhanden.")
+            return False
+        self._entfernen(begriff)
+        self.journal[begriff] = self.GELOESCHT
+        return True
+
+    def _uebernehmen(self, begriff, bedeutung, bedeutung_schluessel, fortschritt):
+        """
+        Setzt eine Vokabel im Speicher, ohne sie ins Journal einzutragen.
+        Private Methode zur internen Verwendung.
+        """
+        self.vokabeln[begriff] = bedeutung
+        self.schluessel[begriff] = bedeutung_schluessel
+        self.fortschritt[begriff] = fortschritt
+        self.auswahl.hinzufuegen(begriff, self.gewicht(fortschritt))
+
+    def _entfernen(self, begriff):
+        """
+        Entfernt eine Vokabel aus dem Speicher, ohne sie ins Journal einzutragen.
+        Private Methode zur internen Verwendung.
+        """
+        del self.vokabeln[begriff]
+        del self.schluessel[begriff]
+        del self.fortschritt[begriff]
+        self.auswahl.entfernen(begriff)
+
+    def naechste_vokabel(self):
+        """
+        Zieht die nchste Vokabel, gewichtet nach dem Fortschritt (siehe gewicht) -
+        in O(log n), ohne die Begriffe zu kopieren. None, wenn es keine Vokabeln gibt.
+        """
+        return self.auswahl.ziehen()
+
+    def fortschritt_setzen(self, begriff, fortschritt):
+        self.fortschritt[begriff] = fortschritt
+        self.auswahl.setzen(begriff, self.gewicht(fortschritt))
+        # Eine neue oder genderte Vokabel wird ohnehin mit ihrem Fortschritt geschrieben
+        self.journal.setdefault(begriff, self.FORTSCHRITT)
+
+    def journal_schreiben(self, db):
+        """
+        Schreibt alle nderungen aus dem Journal in einer Transaktion in die
+        VokabeltrainerDB und leert es. Gibt die Anzahl der Begriffe zurck.
+        """
+        if not self.journal:
+            return 0
+        vokabeln, fortschritt, geloescht = [], [], []
+        for begriff, art in self.journal.items():
+            if art == self.GELOESCHT:
+                geloescht.append(begriff)
+            elif art == self.VOKABEL:
+                vokabeln.append((begriff, self.vokabeln[begriff], self.fortschritt[begriff]))
+            else:
+                fortschritt.append((begriff, self.fortschritt[begriff]))
+        vorher, nachher = db.aenderungen_schreiben(vokabeln, fortschritt, geloescht)
+        # Hat seit dem letzten Abgleich niemand anderes geschrieben, sind die eigenen
+        # nderungen schon bekannt und mssen nicht wieder geladen werden
+        if self.stand == vorher:
+            self.stand = nachher
+        anzahl = len(self.journal)
+        self.journal = {}
+        return anzahl
+
+    def aus_datenbank_laden(self, db, blockgroesse=50000):
+        """
+        Ldt alle Vokabeln mit Fortschritt aus der VokabeltrainerDB (ersetzt den Inhalt).
+        """
+        self.vokabeln, self.fortschritt, self.schluessel = {}, {}, {}
+        self.auswahl = GewichteteAuswahl()
+        self.journal = {}
+        # Den Stand vor dem Lesen merken: was whrenddessen gendert wird, kommt mit
+        # dem nchsten aenderungen_laden noch einmal
+        stand = db.aenderungsstand()
+        for block in db.vokabeln.bloecke(blockgroesse):
+            fortschritt = db.get_fortschritt_viele([begriff for begriff, _ in block])
+            for begriff, bedeutung in block:
+                self._uebernehmen(begriff, bedeutung, schluessel(bedeutung), fortschritt[begriff])
+        self.stand = stand
+
+    def aenderungen_laden(self, db):
+        """
+        bernimmt nur die seit dem letzten Abgleich in der Datenbank genderten Begriffe
+        (beim ersten Mal alles, siehe aus_datenbank_laden). Begriffe mit noch nicht
+        geschriebenen eigenen nderungen bleiben unverndert.
+        Gibt die Anzahl der bernommenen Begriffe zurck.
+        """
+        if self.stand is None:
+            self.aus_datenbank_laden(db)
+            return len(self.vokabeln)
+        self.stand, geaendert = db.aenderungen_seit(self.stand)
+        uebernommen = 0
+        for begriff, zustand in geaendert.items():
+            if begriff in self.journal:
+                continue
+            if zustand is None:
+                if begriff in self.vokabeln:
+                    self._entfernen(begriff)
+            else:
+                self._uebernehmen(begriff, *zustand)
+            uebernommen += 1
+        return uebernommen
+
+    def synchronisieren(self, db):
+        """
+        Schreibt das Journal und ldt danach die nderungen anderer.
+        Gibt (geschrieben, bernommen) zurck.
+        """
+        return self.journal_schreiben(db), self.aenderungen_laden(db)
 
     def vokabel_ueben(self):
         if not self.vokabeln:
             print("Der Vokabeltrainer enthlt keine Vokabeln. Fgen Sie welche hinzu.")
             return
 
-        begriff = random.choice(list(self.vokabeln.keys()))
+        begriff = self.naechste_vokabel()
         richtig = False
 
         print("Begriff:", begriff)
         antwort = input("Bedeutung: ")
 
-        if antwort.lower() == self.vokabeln[begriff].lower():
+        ergebnis = pruefen(self.schluessel[begriff], antwort)
+        if ergebnis.tippfehler:
+            print(f"Richtig! (Achte auf die Schreibweise: {self.vokabeln[begriff]})\n")
+            richtig = True
+        elif ergebnis.richtig:
             print("Richtig!\n")
             richtig = True
         else:
@@ -37,9 +175,9 @@ class Trainer:
 
         # Fortschritt aktualisieren
         if richtig:
-            self.fortschritt[begriff] += 1
+            self.fortschritt_setzen(begriff, self.fortschritt[begriff] + 1)
         else:
-            self.fortschritt[begriff] = 0
+            self.fortschritt_setzen(begriff, 0)
 
     def fortschritt_anzeigen(self):
         print("Fortschritt:")
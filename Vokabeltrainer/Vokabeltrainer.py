@@ -1,8 +1,7 @@
 
 #encoding: latin-1
 import random
-import Vokabeltrainer
-import VokabeltrainerGUI
+from VokabeltrainerGUI import VokabeltrainerGUI
 
 
 
@@ -1,23 +1,128 @@
+#encoding: latin-1
+import os
+import sys
+import time
+from collections import deque
+
 import PySimpleGUI as sg
-from Datenbank import VokabeltrainerDB
-import random
+
+# Antwortpruefung und Messung aus dem Trainer-Projekt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Trainer"))
+from DatenbankWorker import DatenbankWorker
+from Antwortpruefung import pruefen
+from Messung import Histogramm
 
 class VokabeltrainerGUI:
+    # So viele Fragen liegen immer schon bereit, damit "ben" sofort reagiert
+    VORRAT = 5
 
-    def __init__(self):
-        self.trainer_db = VokabeltrainerDB()
+    def __init__(self, db_name="vokabeltrainer.db", mit_worker=True):
         self.current_begriff = None
+        self.current_frage = None
+        self.vorrat = deque()
+        self.wartet_auf_frage = False
+
+        # Wie lange die Ereignisschleife pro Ereignis blockiert war (das Fenster reagiert dann nicht)
+        self.stockungen = Histogramm()
 
         # Layout definieren
         layout = [
             [sg.Text("Vokabeltrainer")],
             [sg.Text("Begriff:"), sg.Text("", size=(20, 1), key="-Begriff-")],
             [sg.Text("Bedeutung:"), sg.InputText(key="-Antwort-")],
-            [sg.Button("ben"), sg.Button("Fortschritt anzeigen"), sg.Menu([['Hinzufgen', ['Neue Vokabel']]])]
+            [sg.Button("ben"), sg.Button("Prfen", bind_return_key=True), sg.Button("Fortschritt anzeigen"),
+             sg.Menu([['Hinzufgen', ['Neue Vokabel']]])],
+            [sg.Text("", size=(50, 1), key="-Status-")]
         ]
 
         # Fenster erstellen
         self.window = sg.Window("Vokabeltrainer", layout, resizable=True, finalize=True)
 
+        # Die Datenbank gehrt dem Worker-Thread, Ergebnisse kommen als Ereignisse zurck
+        self.worker = DatenbankWorker(self.window, db_name, im_hintergrund=mit_worker)
+        if mit_worker:
+            self.worker.start()
+        self.worker.fragen_anfordern(self.VORRAT)
+
+    def run(self):
+        while True:
+            event, values = self.window.read()
+            if event == sg.WIN_CLOSED:
+                break
+            start = time.perf_counter()
+            self.ereignis_verarbeiten(event, values)
+            self.stockungen.hinzufuegen((time.perf_counter() - start) * 1000)
+
+        self.worker.beenden()
+        self.window.close()
+        print(f"Ereignisschleife: {self.stockungen.anzahl} Ereignisse, "
+              f"p99 {self.stockungen.perzentil(99):.1f} ms, max {self.stockungen.max_ms:.1f} ms blockiert")
+
+    def ereignis_verarbeiten(self, event, values):
+        if event == DatenbankWorker.EREIGNIS:
+            self.datenbank_ereignis(*values[event])
+        elif event == "ben":
+            self.naechste_frage()
+        elif event == "Prfen":
+            self.antwort_pruefen(values["-Antwort-"])
+        elif event == "Fortschritt anzeigen":
+            self.worker.fortschritt_anfordern()
+        elif event == "Neue Vokabel":
+            begriff = sg.popup_get_text("Begriff:")
+            bedeutung = sg.popup_get_text("Bedeutung:") if begriff else None
+            if begriff and bedeutung:
+                self.worker.vokabel_hinzufuegen(begriff, bedeutung)
+
+    def datenbank_ereignis(self, art, daten):
+        if art == "fragen":
+            self.vorrat.extend(daten)
+            if self.wartet_auf_frage:
+                self.wartet_auf_frage = False
+                if not daten:
+                    # Leere Datenbank: nicht erneut anfragen, sonst fragen GUI und Worker endlos
+                    self.window["-Status-"].update("Keine Vokabeln vorhanden")
+                    return
+                self.naechste_frage()
+        elif art == "fortschritt":
+            begriff, fortschritt = daten
+            self.window["-Status-"].update(f"{begriff}: {fortschritt} Mal richtig")
+        elif art == "hinzugefuegt":
+            self.window["-Status-"].update(f"'{daten}' hinzugefgt")
+        elif art == "uebersicht":
+            gesamt, gelernt, liste = daten
+            zeilen = [f"{begriff}: {richtig} Mal richtig" for begriff, richtig in liste]
+            sg.popup_scrolled(f"{gelernt} von {gesamt} Vokabeln mindestens einmal richtig\n",
+                              *zeilen, title="Fortschritt", non_blocking=True)
+        elif art == "fehler":
+            # Eine fehlgeschlagene Anforderung liefert keine Fragen: "ben" fragt neu an
+            self.wartet_auf_frage = False
+            self.window["-Status-"].update(f"Datenbankfehler: {daten}")
 
+    def naechste_frage(self):
+        if not self.vorrat:
+            # Noch nichts da: die Frage wird angezeigt, sobald der Worker sie liefert
+            if not self.wartet_auf_frage:
+                self.worker.fragen_anfordern(self.VORRAT)
+            self.wartet_auf_frage = True
+            self.window["-Status-"].update("Lade Fragen ...")
+            return
+        self.current_frage = self.vorrat.popleft()
+        self.current_begriff = self.current_frage.begriff
+        self.window["-Begriff-"].update(self.current_begriff)
+        self.window["-Antwort-"].update("")
+        self.window["-Status-"].update("")
+        self.worker.fragen_anfordern(1)
 
+    def antwort_pruefen(self, antwort):
+        if self.current_frage is None:
+            return
+        # Geprft wird ohne Datenbank gegen den mitgelieferten Schlssel
+        ergebnis = pruefen(self.current_frage.schluessel, antwort)
+        if ergebnis.tippfehler:
+            self.window["-Status-"].update(f"Richtig! (Achte auf die Schreibweise: {self.current_frage.bedeutung})")
+        elif ergebnis.richtig:
+            self.window["-Status-"].update("Richtig!")
+        else:
+            self.window["-Status-"].update(f"Falsch! Die richtige Bedeutung ist: {self.current_frage.bedeutung}")
+        self.worker.antwort_speichern(self.current_begriff, ergebnis.richtig)
+        self.current_frage = None